@@ -0,0 +1,315 @@
+"""
+=========================
+CompiledSnapshot
+=========================
+
+Author: Matija Piskorec, Jaime de Vivero Woods
+Last update: October 2026
+
+CompiledSnapshot class.
+
+Stellarbeat network snapshot (e.g. quorumset_05_06_2025.json) compiled once into a binary .npz file, which loads
+in milliseconds and can be used by the simulator as well as by analysis tools without parsing JSON again.
+
+Validators are interned: validator i is the i-th validator defined in the snapshot, and its public key is
+public_keys[i]. Quorum sets are flattened into a tree of numbered quorum sets, root[i] is the quorum set of
+validator i (-1 if it has none), and quorum set q has threshold qset_threshold[q], validators
+qset_validators[qset_validators_indptr[q]:qset_validators_indptr[q + 1]] and inner quorum sets
+qset_children[qset_children_indptr[q]:qset_children_indptr[q + 1]]. Validators which are referenced in quorum
+sets but not defined in the snapshot are dropped (and listed in dropped_keys), as Network has always done.
+
+Older stellarbeat exports (e.g. quorumset_20250131_095020.json) have the quorum set fields (threshold,
+validators, innerQuorumSets) at the top level of every node entry instead of under "quorumSet", which is read
+the same way.
+
+Per validator metadata (names, isps, countries, active, validating, organization) and the source of the
+snapshot (metadata, including the SHA-1 of the JSON file) are stored with it.
+
+Usage: python CompiledSnapshot.py quorumset_05_06_2025.json [--output quorumset_05_06_2025.snapshot.npz]
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import os
+from functools import cached_property
+import tempfile
+import time
+
+import numpy as np
+
+from Log import log
+from Node import Node
+
+FORMAT_VERSION = 2 # 2: quorum sets given at the top level of node entries (older stellarbeat exports)
+SUFFIX = '.snapshot.npz'
+ARRAYS = ('public_keys', 'names', 'isps', 'countries', 'active', 'validating', 'organization', 'organization_names',
+          'root', 'qset_threshold', 'qset_validators_indptr', 'qset_validators', 'qset_children_indptr', 'qset_children',
+          'dropped_keys')
+
+
+def source_digest(path):
+    with open(path, 'rb') as file:
+        return hashlib.sha1(file.read()).hexdigest()
+
+
+class CompiledSnapshot():
+
+    def __init__(self, arrays, metadata):
+        for name in ARRAYS:
+            setattr(self, name, arrays[name])
+        self.metadata = metadata
+        self.position = {key: i for i, key in enumerate(self.public_keys.tolist())}
+
+    def __repr__(self):
+        return '[CompiledSnapshot, validators = %s, quorum sets = %s, source = %s]' % (
+            len(self.public_keys), len(self.qset_threshold), self.metadata.get('source'))
+
+    def __len__(self):
+        return len(self.public_keys)
+
+    @staticmethod
+    def compiled_path(json_path):
+        return os.path.splitext(json_path)[0] + SUFFIX
+
+    @classmethod
+    def open(cls, json_path):
+        """
+        Compiled snapshot of json_path, compiled and saved next to it unless it already is (for the same JSON content).
+        """
+        path = cls.compiled_path(json_path)
+        digest = source_digest(json_path)
+        if os.path.exists(path):
+            snapshot = cls.load(path)
+            if snapshot.metadata.get('version') == FORMAT_VERSION and snapshot.metadata.get('sha1') == digest:
+                return snapshot
+            log.network.info('Compiled snapshot %s is out of date, compiling %s again', path, json_path)
+        snapshot = cls.compile(json_path)
+        snapshot.save(path)
+        return snapshot
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            arrays = {name: data[name] for name in ARRAYS}
+            metadata = json.loads(str(data['metadata']))
+        return cls(arrays, metadata)
+
+    def save(self, path):
+        arrays = {name: getattr(self, name) for name in ARRAYS}
+        arrays['metadata'] = np.array(json.dumps(self.metadata, sort_keys=True))
+        # Write to a temporary file first, so that parallel runs never load a partially written file
+        descriptor, temporary = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix='.npz')
+        with os.fdopen(descriptor, 'wb') as file:
+            np.savez(file, **arrays)
+        os.replace(temporary, path)
+        log.network.info('Saved compiled snapshot of %d validators to %s', len(self), path)
+
+    @classmethod
+    def compile(cls, json_path):
+        """
+        Parse a stellarbeat snapshot ({"nodes": [...], "organizations": [...]}) into a CompiledSnapshot.
+        """
+        with open(json_path, 'r') as file:
+            raw = json.load(file)
+        entries = raw["nodes"]
+
+        position = {}
+        for entry in entries:
+            public_key = entry.get("publicKey")
+            if not isinstance(public_key, str):
+                raise RuntimeError(f"All publicKey fields must be strings. Got: {public_key!r}")
+            position.setdefault(public_key, len(position))
+        quorum_sets = {} # Later definitions of a validator replace earlier ones
+        details = {}
+        for entry in entries:
+            quorum_set = entry.get("quorumSet")
+            if quorum_set is None and "threshold" in entry:
+                quorum_set = entry # Quorum set at the top level of the entry
+            quorum_sets[position[entry["publicKey"]]] = quorum_set
+            details[position[entry["publicKey"]]] = entry
+
+        organizations = raw.get("organizations") or []
+        organization = np.full(len(position), -1, dtype=np.int32)
+        for k, org in enumerate(organizations):
+            for public_key in org.get("validators", []):
+                if public_key in position:
+                    organization[position[public_key]] = k
+
+        qset_threshold, validators_indptr, validators, children = [], [0], [], []
+        dropped = set()
+
+        def add_qset(qset_json, parent_key):
+            if not isinstance(qset_json, dict):
+                raise RuntimeError(f"innerQuorumSets entry must be a dict. Got {qset_json!r}")
+            q = len(qset_threshold)
+            qset_threshold.append(qset_json.get("threshold", 1))
+            for public_key in qset_json.get("validators", []):
+                if public_key in position:
+                    validators.append(position[public_key])
+                else:
+                    dropped.add(public_key)
+                    log.network.warning("Dropping undefined validator %s in quorum set of %s", public_key, parent_key)
+            validators_indptr.append(len(validators))
+            children.append([])
+            for inner_json in qset_json.get("innerQuorumSets", []):
+                children[q].append(add_qset(inner_json, parent_key))
+            return q
+
+        public_keys = list(position)
+        root = np.full(len(position), -1, dtype=np.int32)
+        for i, public_key in enumerate(public_keys):
+            if quorum_sets[i] is not None:
+                root[i] = add_qset(quorum_sets[i], public_key)
+
+        children_indptr = np.zeros(len(children) + 1, dtype=np.int32)
+        np.cumsum([len(c) for c in children], out=children_indptr[1:])
+
+        arrays = {
+            'public_keys': np.array(public_keys, dtype=str),
+            'names': np.array([details[i].get("name") or "" for i in range(len(public_keys))], dtype=str),
+            'isps': np.array([details[i].get("isp") or "" for i in range(len(public_keys))], dtype=str),
+            'countries': np.array([(details[i].get("geoData") or {}).get("countryCode") or "" for i in range(len(public_keys))], dtype=str),
+            'active': np.array([bool(details[i].get("active")) for i in range(len(public_keys))], dtype=bool),
+            'validating': np.array([bool(details[i].get("isValidating")) for i in range(len(public_keys))], dtype=bool),
+            'organization': organization,
+            'organization_names': np.array([org.get("name") or "" for org in organizations], dtype=str),
+            'root': root,
+            'qset_threshold': np.array(qset_threshold, dtype=np.int32),
+            'qset_validators_indptr': np.array(validators_indptr, dtype=np.int32),
+            'qset_validators': np.array(validators, dtype=np.int32),
+            'qset_children_indptr': children_indptr,
+            'qset_children': np.array([c for cs in children for c in cs], dtype=np.int32),
+            'dropped_keys': np.array(sorted(dropped), dtype=str),
+        }
+        metadata = {'version': FORMAT_VERSION, 'source': os.path.basename(json_path), 'sha1': source_digest(json_path),
+                    'compiled_at': time.strftime('%Y-%m-%dT%H:%M:%S'), 'validators': len(public_keys),
+                    'quorum_sets': len(qset_threshold), 'organizations': len(organizations)}
+        log.network.info('Compiled snapshot %s: %d validators, %d quorum sets, %d undefined validators dropped',
+                         json_path, len(public_keys), len(qset_threshold), len(dropped))
+        return cls(arrays, metadata)
+
+    def qset_validators_of(self, q):
+        return self.qset_validators[self.qset_validators_indptr[q]:self.qset_validators_indptr[q + 1]]
+
+    def qset_children_of(self, q):
+        return self.qset_children[self.qset_children_indptr[q]:self.qset_children_indptr[q + 1]]
+
+    def quorum_members(self, i):
+        """
+        Indices of all validators anywhere in the quorum set of validator i (with repetitions).
+        """
+        members = []
+        pending = [self.root[i]] if self.root[i] >= 0 else []
+        while pending:
+            q = pending.pop()
+            members.extend(self.qset_validators_of(q).tolist())
+            pending.extend(self.qset_children_of(q).tolist())
+        return members
+
+    @cached_property
+    def subtree_size(self):
+        """
+        Number of validators in the subtree of every quorum set (with repetitions).
+        """
+        validators_indptr = self.qset_validators_indptr.tolist()
+        children_indptr, children = self.qset_children_indptr.tolist(), self.qset_children.tolist()
+        size = [validators_indptr[q + 1] - validators_indptr[q] for q in range(len(validators_indptr) - 1)]
+        # Inner quorum sets are numbered after their parent
+        for q in range(len(size) - 1, -1, -1):
+            for child in children[children_indptr[q]:children_indptr[q + 1]]:
+                size[q] += size[child]
+        return size
+
+    @cached_property
+    def declared_needed(self):
+        """
+        Fewest validators (with repetitions) satisfying every quorum set with its declared nested thresholds: the
+        cheapest threshold of its validators (one each) and inner quorum sets. Infinite if it can never be satisfied.
+        """
+        validators_indptr = self.qset_validators_indptr.tolist()
+        children_indptr, children = self.qset_children_indptr.tolist(), self.qset_children.tolist()
+        thresholds = self.qset_threshold.tolist()
+        needed = [0] * len(thresholds)
+        # Inner quorum sets are numbered after their parent
+        for q in range(len(thresholds) - 1, -1, -1):
+            costs = [1] * (validators_indptr[q + 1] - validators_indptr[q])
+            costs.extend(needed[child] for child in children[children_indptr[q]:children_indptr[q + 1]])
+            costs.sort()
+            needed[q] = sum(costs[:thresholds[q]]) if thresholds[q] <= len(costs) else math.inf
+        return needed
+
+    def canonical_qset(self, q, thresholds=True):
+        """
+        Quorum set q as nested tuples (threshold, public keys, inner quorum sets) in a canonical order, so that
+        quorum sets of two snapshots compare equal when they are the same. Without thresholds, only the structure.
+        """
+        keys = tuple(sorted(self.public_keys[self.qset_validators_of(q)].tolist()))
+        inner = tuple(sorted(self.canonical_qset(child, thresholds) for child in self.qset_children_of(q).tolist()))
+        return (int(self.qset_threshold[q]) if thresholds else None, keys, inner)
+
+    def set_quorum_set(self, i, nodes, percent_threshold):
+        """
+        Set the quorum set of the node of validator i from the snapshot: top level validators as nodes, every
+        inner quorum set as a (nested) list of nodes, and threshold of percent_threshold of all validators in the
+        quorum set, rounded up. nodes maps validator indices of this snapshot to nodes.
+
+        Without percent_threshold, the threshold follows the declared thresholds instead. Simulated quorum sets
+        have one threshold over all of their validators, so the nested thresholds are flattened into the fewest
+        validators satisfying them (declared_needed): the node needs as many of its validators, whichever they are.
+        """
+        q = int(self.root[i])
+        if q < 0:
+            return
+
+        def inner_list(q):
+            result = [nodes[v] for v in self.qset_validators_of(q).tolist()]
+            for child in self.qset_children_of(q).tolist():
+                result.append(inner_list(child))
+            return result
+
+        top_level = [nodes[v] for v in self.qset_validators_of(q).tolist()]
+        inner_lists = [inner_list(child) for child in self.qset_children_of(q).tolist()]
+        total_peers = self.subtree_size[q]
+        if percent_threshold is None:
+            total = max(1, total_peers)
+            needed = min(max(1, self.declared_needed[q]), total)
+            # Fraction just below needed / total, so that minimum_quorum rounds it up to needed exactly
+            nodes[i].quorum_set.threshold = (needed - 0.5) / total
+            nodes[i].quorum_set.set(nodes=top_level, inner_sets=inner_lists)
+            log.network.info("Node %s : declared threshold=%d of %d peers; top=%d, nested_lists=%d",
+                             nodes[i].name, needed, total_peers, len(top_level), len(inner_lists))
+            return
+
+        dynamic_thr = math.ceil(total_peers * percent_threshold)
+
+        nodes[i].quorum_set.threshold = dynamic_thr
+        nodes[i].quorum_set.set(nodes=top_level, inner_sets=inner_lists)
+
+        log.network.info("Node %s : dynamic threshold=%d (%d%% of %d peers); top=%d, nested_lists=%d",
+                         nodes[i].name, dynamic_thr, percent_threshold * 100, total_peers, len(top_level), len(inner_lists))
+
+    def build_nodes(self, percent_threshold=None):
+        """
+        Nodes of all validators with their quorum sets (see set_quorum_set).
+        """
+        nodes = [Node(public_key) for public_key in self.public_keys.tolist()]
+        for i in range(len(nodes)):
+            self.set_quorum_set(i, nodes, percent_threshold)
+
+        if len(self.dropped_keys):
+            log.network.info("Dropped %d undefined nodes: %s", len(self.dropped_keys), self.dropped_keys.tolist())
+
+        return nodes
+
+if __name__=='__main__':
+
+    parser=argparse.ArgumentParser()
+    parser.add_argument("snapshot", help="Stellarbeat snapshot JSON file.")
+    parser.add_argument("--output","-o", default=None, help="Compiled file (default: next to the snapshot, with suffix %s)." % SUFFIX)
+    args = parser.parse_args()
+
+    snapshot = CompiledSnapshot.compile(args.snapshot)
+    snapshot.save(args.output or CompiledSnapshot.compiled_path(args.snapshot))
+    print(snapshot)
@@ -0,0 +1,75 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+from CompiledSnapshot import CompiledSnapshot
+
+SNAPSHOT = {
+    "nodes": [
+        {"publicKey": "A", "name": "Alice", "active": True, "isValidating": True,
+         "quorumSet": {"threshold": 2, "validators": ["B", "C"],
+                       "innerQuorumSets": [{"threshold": 1, "validators": ["D", "UNKNOWN"],
+                                            "innerQuorumSets": [{"threshold": 1, "validators": ["A"], "innerQuorumSets": []}]}]}},
+        {"publicKey": "B", "name": "Bob", "quorumSet": {"threshold": 1, "validators": ["A"], "innerQuorumSets": []}},
+        {"publicKey": "C", "quorumSet": {"threshold": 1, "validators": [], "innerQuorumSets": []}},
+        {"publicKey": "D", "quorumSet": {"threshold": 2, "validators": ["A", "B", "C"], "innerQuorumSets": []}},
+    ],
+    "organizations": [{"name": "Wonderland", "validators": ["A", "B"]}],
+}
+
+
+def names(members):
+    return [names(member) if isinstance(member, list) else member.name for member in members]
+
+
+class CompiledSnapshotTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.json_path = os.path.join(self.directory, 'snapshot.json')
+        with open(self.json_path, 'w') as file:
+            json.dump(SNAPSHOT, file)
+
+    def test_compile_interns_validators_and_flattens_quorum_tree(self):
+        snapshot = CompiledSnapshot.compile(self.json_path)
+        self.assertEqual(snapshot.public_keys.tolist(), ['A', 'B', 'C', 'D'])
+        self.assertEqual(snapshot.dropped_keys.tolist(), ['UNKNOWN'])
+        self.assertEqual(snapshot.organization.tolist(), [0, 0, -1, -1])
+
+        root = snapshot.root[0]
+        self.assertEqual(snapshot.qset_threshold[root], 2)
+        self.assertEqual(snapshot.qset_validators_of(root).tolist(), [1, 2])
+        inner = snapshot.qset_children_of(root).tolist()
+        self.assertEqual(len(inner), 1)
+        self.assertEqual(snapshot.qset_validators_of(inner[0]).tolist(), [3])
+        self.assertEqual(sorted(snapshot.quorum_members(0)), [0, 1, 2, 3])
+
+    def test_build_nodes(self):
+        nodes = {node.name: node for node in CompiledSnapshot.compile(self.json_path).build_nodes(percent_threshold=0.8)}
+        alice = nodes['A'].quorum_set
+        self.assertEqual(names(alice.nodes), ['B', 'C'])
+        self.assertEqual(names(alice.inner_sets), [['D', ['A']]])
+        self.assertEqual(alice.threshold, 4) # 80% of 4 peers
+        self.assertEqual(nodes['C'].quorum_set.threshold, 0)
+        self.assertEqual(nodes['D'].quorum_set.threshold, 3)
+
+    def test_open_compiles_once_and_recompiles_changed_snapshot(self):
+        snapshot = CompiledSnapshot.open(self.json_path)
+        path = CompiledSnapshot.compiled_path(self.json_path)
+        self.assertTrue(os.path.exists(path))
+
+        loaded = CompiledSnapshot.open(self.json_path)
+        self.assertEqual(loaded.metadata, snapshot.metadata)
+        for name in ('public_keys', 'root', 'qset_validators', 'qset_children', 'names'):
+            np.testing.assert_array_equal(getattr(loaded, name), getattr(snapshot, name))
+
+        changed = dict(SNAPSHOT, nodes=SNAPSHOT["nodes"][1:])
+        with open(self.json_path, 'w') as file:
+            json.dump(changed, file)
+        self.assertEqual(CompiledSnapshot.open(self.json_path).public_keys.tolist(), ['B', 'C', 'D'])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,300 @@
+"""
+=========================
+CriticalSets
+=========================
+
+Author: Matija Piskorec, Jaime de Vivero Woods
+Last update: October 2026
+
+CriticalSets class.
+
+Minimal blocking sets (liveness) and minimal splitting sets (safety) of a generated network (any topology of
+Network.generate_nodes, including HARDCODE), computed from the quorum sets instead of by rerunning simulations.
+
+Quorum sets are compiled the way the simulator evaluates them: node i needs minimum_quorum of its quorum set
+(top level and inner set members flattened, together with i itself), so quorum set i is a bitmask members[i]
+with a threshold[i]. The HARDCODE network of the simulator reads its integer thresholds as percentages, which
+makes most nodes quorums on their own, so the command line analyses the snapshot with its declared (nested)
+thresholds instead, flattened by CompiledSnapshot.build_nodes. Networks where nodes are quorums on their own
+are logged as degenerate. Sets of nodes are Python ints used as bitmasks (bit i is node i).
+- A quorum is a non-empty set of nodes Q with at least threshold[i] of members[i] in Q for every i in Q.
+- A blocking set intersects every quorum: if its nodes crash, no quorum is left and consensus stalls.
+  Minimal blocking sets are the minimal hitting sets of the minimal quorums.
+- A splitting set contains the intersection of two quorums: if its nodes are Byzantine, they can make the two
+  quorums externalize different values. Minimal splitting sets are the minimal pairwise intersections of
+  minimal quorums (the empty set if there are disjoint quorums).
+
+Enumeration is branch and bound over bitsets, pruning every branch which already contains (dominates) a set
+found before, and it stops once the time budget is used up. The heuristic mode (also used for the rest of the
+budget when the exact enumeration did not finish) shrinks random quorums and blocking sets greedily to minimal
+ones instead, which finds small sets quickly on large networks but not necessarily all of them. It stops early
+once HEURISTIC_PATIENCE draws in a row found no new set.
+
+Usage: python CriticalSets.py --topology HARDCODE --budget 10
+"""
+
+import argparse
+import random
+import time
+
+from Log import log
+from QuorumIntersection import members_of
+
+BUDGET_DEFAULT = 10.0 # Seconds per kind of set
+HEURISTIC_PATIENCE = 100 # Draws in a row without a new set before the heuristic gives up
+SNAPSHOT = "quorumset_05_06_2025.json" # Snapshot of the HARDCODE topology
+MODES = ['exact', 'heuristic']
+
+
+def flatten(members):
+    flat = []
+    for member in members:
+        if isinstance(member, list):
+            flat.extend(flatten(member))
+        else:
+            flat.append(member)
+    return flat
+
+
+def minimal(sets):
+    """
+    Sets (bitmasks) without the ones containing another of them, smallest first.
+    """
+    result = []
+    for candidate in sorted(set(sets), key=lambda mask: (mask.bit_count(), mask)):
+        if not any(found & candidate == found for found in result):
+            result.append(candidate)
+    return result
+
+
+class CriticalSets():
+
+    def __init__(self, nodes, budget=BUDGET_DEFAULT, mode='exact', seed=None):
+        if mode not in MODES:
+            raise ValueError('Unknown mode %s, expected one of %s' % (mode, MODES))
+        self.nodes = list(nodes)
+        self.n = len(self.nodes)
+        self.budget = budget
+        self.mode = mode
+        self.random = random.Random(seed)
+        self.complete = {} # {kind of set: whether all minimal sets of that kind were found}
+
+        position = {node.name: i for i, node in enumerate(self.nodes)}
+        self.members, self.threshold = [], []
+        for i, node in enumerate(self.nodes):
+            quorum_set = node.quorum_set
+            mask = 1 << i
+            for member in quorum_set.get_nodes() + flatten(quorum_set.get_inner_sets()):
+                if member.name in position: # Members outside of the network never sign anything
+                    mask |= 1 << position[member.name]
+            self.members.append(mask)
+            self.threshold.append(quorum_set.minimum_quorum)
+        self.all = (1 << self.n) - 1
+
+        alone = sum(1 for i in range(self.n) if self.threshold[i] <= 1 and self.members[i] != 1 << i)
+        if alone:
+            log.network.warning('%d of %d nodes are quorums on their own (threshold of 1 of several members), '
+                                'the critical sets are degenerate', alone, self.n)
+
+        self._quorums = None
+
+    def __repr__(self):
+        return '[CriticalSets, nodes = %s, mode = %s, budget = %s]' % (self.n, self.mode, self.budget)
+
+    def names(self, sets):
+        return [[self.nodes[i].name for i in members_of(mask)] for mask in sets]
+
+    def satisfied(self, i, mask):
+        return (self.members[i] & mask).bit_count() >= self.threshold[i]
+
+    def is_quorum(self, mask):
+        return mask != 0 and all(self.satisfied(i, mask) for i in members_of(mask))
+
+    def max_quorum(self, mask):
+        """
+        Largest quorum within mask (the union of all of them), 0 if there is none.
+        """
+        while mask:
+            unsatisfied = 0
+            for i in members_of(mask):
+                if not self.satisfied(i, mask):
+                    unsatisfied |= 1 << i
+            if not unsatisfied:
+                return mask
+            mask &= ~unsatisfied
+        return 0
+
+    def is_blocking(self, mask):
+        return self.max_quorum(self.all & ~mask) == 0
+
+    def shrink(self, mask, keeps):
+        """
+        Remove nodes of mask in random order as long as keeps(mask) holds, which gives a minimal such set.
+        """
+        order = members_of(mask)
+        self.random.shuffle(order)
+        for i in order:
+            if keeps(mask & ~(1 << i)):
+                mask &= ~(1 << i)
+        return mask
+
+    def sample(self, draw, found, deadline):
+        """
+        Append sets drawn by draw() to found until the deadline, or until HEURISTIC_PATIENCE draws in a row gave
+        sets found before. At least one set is drawn.
+        """
+        seen, repeats = set(found), 0
+        while True:
+            mask = draw()
+            if mask in seen:
+                repeats += 1
+            else:
+                seen.add(mask)
+                found.append(mask)
+                repeats = 0
+            if repeats >= HEURISTIC_PATIENCE or time.time() > deadline:
+                return found
+
+    # Minimal quorums
+
+    def _quorums_exact(self, deadline):
+        found = []
+        stack = [(0, self.max_quorum(self.all))]
+        while stack:
+            if time.time() > deadline:
+                return found, False
+            committed, remaining = stack.pop()
+            if any(quorum & committed == quorum for quorum in found):
+                continue # Dominated, every quorum from here on contains a minimal quorum found before
+            maximal = self.max_quorum(committed | remaining)
+            if committed & ~maximal:
+                continue
+            remaining = maximal & ~committed
+            if committed and self.is_quorum(committed):
+                if all(self.max_quorum(committed & ~(1 << i)) == 0 for i in members_of(committed)):
+                    found.append(committed)
+                continue
+            if not remaining:
+                continue
+            # Branch on a member of the quorum set of a committed node which is not satisfied yet
+            unsatisfied = [i for i in members_of(committed) if not self.satisfied(i, committed)]
+            candidates = self.members[unsatisfied[0]] & remaining if unsatisfied else remaining
+            v = members_of(candidates or remaining)[0]
+            stack.append((committed, remaining & ~(1 << v)))
+            stack.append((committed | 1 << v, remaining & ~(1 << v)))
+        return found, True
+
+    def _quorums_heuristic(self, deadline, found):
+        maximal = self.max_quorum(self.all)
+        if not maximal:
+            return found
+        # Nodes left are exactly a minimal quorum
+        return self.sample(lambda: self.max_quorum(self.shrink(maximal, lambda mask: self.max_quorum(mask) != 0)),
+                           found, deadline)
+
+    def minimal_quorums(self):
+        """
+        Minimal quorums as bitmasks, smallest first.
+        """
+        if self._quorums is None:
+            deadline = time.time() + self.budget
+            found, complete = ([], False) if self.mode == 'heuristic' else self._quorums_exact(deadline)
+            if not complete:
+                found = self._quorums_heuristic(deadline, found) # Rest of the same budget
+            self._quorums = minimal(found)
+            self.complete['quorums'] = complete
+            log.network.info('Found %d minimal quorums (complete=%s)', len(self._quorums), complete)
+        return self._quorums
+
+    # Minimal blocking sets
+
+    def minimal_blocking_sets(self):
+        """
+        Minimal blocking sets as bitmasks, smallest first.
+        """
+        quorums = self.minimal_quorums()
+        deadline = time.time() + self.budget
+        found, complete = [], self.complete['quorums'] and self.mode == 'exact'
+        if complete:
+            # Minimal hitting sets: branch on the nodes of a smallest quorum not hit yet
+            stack = [(0, 0)] # (chosen nodes, nodes excluded from being chosen)
+            while stack:
+                if time.time() > deadline:
+                    complete = False
+                    break
+                chosen, excluded = stack.pop()
+                if any(blocking & chosen == blocking for blocking in found):
+                    continue
+                missed = [quorum for quorum in quorums if not quorum & chosen]
+                if not missed:
+                    found.append(chosen)
+                    continue
+                candidates = min(missed, key=lambda quorum: (quorum & ~excluded).bit_count()) & ~excluded
+                for v in reversed(members_of(candidates)):
+                    stack.append((chosen | 1 << v, excluded))
+                    excluded |= 1 << v
+        if not self.max_quorum(self.all):
+            found, complete = [0], True # Without quorums, nothing needs to fail
+        if not complete:
+            found = self.sample(lambda: self.shrink(self.all, self.is_blocking), found, deadline)
+        self.complete['blocking'] = complete
+        found = minimal(found)
+        log.network.info('Found %d minimal blocking sets (complete=%s)', len(found), complete)
+        return found
+
+    # Minimal splitting sets
+
+    def minimal_splitting_sets(self):
+        """
+        Minimal splitting sets as bitmasks, smallest first.
+        """
+        quorums = self.minimal_quorums()
+        deadline = time.time() + self.budget
+        complete = self.complete['quorums']
+        intersections = []
+        for k, first in enumerate(quorums):
+            if time.time() > deadline:
+                complete = False
+                break
+            intersections.extend(first & second for second in quorums[k + 1:])
+        self.complete['splitting'] = complete
+        found = minimal(intersections)
+        log.network.info('Found %d minimal splitting sets (complete=%s)', len(found), complete)
+        return found
+
+    def analyse(self):
+        """
+        All minimal sets as lists of node names, and whether each kind is complete.
+        """
+        quorums = self.minimal_quorums()
+        blocking, splitting = self.minimal_blocking_sets(), self.minimal_splitting_sets()
+        return {'minimal_quorums': self.names(quorums), 'minimal_blocking_sets': self.names(blocking),
+                'minimal_splitting_sets': self.names(splitting), 'complete': dict(self.complete)}
+
+
+if __name__=='__main__':
+
+    from CompiledSnapshot import CompiledSnapshot
+    from Network import Network
+
+    parser=argparse.ArgumentParser()
+    parser.add_argument("--topology","-t", choices=Network.topologies, default='HARDCODE', help="Network topology.")
+    parser.add_argument("--nodes","-n", type=int, default=10, help="Number of nodes (for generated topologies).")
+    parser.add_argument("--budget","-b", type=float, default=BUDGET_DEFAULT, help="Seconds of search per kind of set.")
+    parser.add_argument("--mode","-m", choices=MODES, default='exact', help="Enumerate all minimal sets, or sample them greedily.")
+    parser.add_argument("--seed", type=int, default=None, help="Seed of the heuristic mode.")
+    args = parser.parse_args()
+
+    if args.topology == 'HARDCODE':
+        nodes = CompiledSnapshot.open(SNAPSHOT).build_nodes() # Declared thresholds of the snapshot
+    else:
+        nodes = Network.generate_nodes(n_nodes=args.nodes, topology=args.topology)
+    critical = CriticalSets(nodes, budget=args.budget, mode=args.mode, seed=args.seed)
+    result = critical.analyse()
+    print(critical)
+    for kind in ('minimal_quorums', 'minimal_blocking_sets', 'minimal_splitting_sets'):
+        sets = result[kind]
+        print('%s: %d, smallest of size %s' % (kind, len(sets), len(sets[0]) if sets else None))
+        for members in sets[:5]:
+            print('  ' + ', '.join(str(name) for name in members))
+    print('complete: %s' % result['complete'])
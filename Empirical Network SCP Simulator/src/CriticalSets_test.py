@@ -0,0 +1,73 @@
+import os
+import time
+import unittest
+from itertools import combinations
+from CompiledSnapshot import CompiledSnapshot
+from CriticalSets import CriticalSets, minimal, SNAPSHOT
+from Network import Network
+from QuorumIntersection import members_of
+
+
+class CriticalSetsTest(unittest.TestCase):
+
+    def test_full_topology_exact(self):
+        # 7 nodes with threshold 55% need 4 of 7: quorums of 4, blocking sets of 4 and splitting sets of 1
+        critical = CriticalSets(Network.generate_nodes(n_nodes=7, topology='FULL'))
+        self.assertEqual(critical.threshold, [4] * 7)
+        subsets = sorted(sum(1 << i for i in subset) for subset in combinations(range(7), 4))
+        self.assertEqual(sorted(critical.minimal_quorums()), subsets)
+        self.assertEqual(sorted(critical.minimal_blocking_sets()), subsets)
+        self.assertEqual(sorted(critical.minimal_splitting_sets()), [1 << i for i in range(7)])
+        self.assertEqual(critical.complete, {'quorums': True, 'blocking': True, 'splitting': True})
+
+    def test_lunch_topology(self):
+        critical = CriticalSets(Network.generate_nodes(topology='LUNCH'))
+        result = critical.analyse()
+        self.assertTrue(all(result['complete'].values()))
+        for quorum in critical.minimal_quorums():
+            self.assertTrue(critical.is_quorum(quorum))
+            self.assertTrue(all(critical.max_quorum(quorum & ~(1 << i)) == 0 for i in members_of(quorum)))
+        for blocking in critical.minimal_blocking_sets():
+            self.assertTrue(critical.is_blocking(blocking))
+            self.assertFalse(any(critical.is_blocking(blocking & ~(1 << i)) for i in members_of(blocking)))
+
+    def test_heuristic_sets_are_minimal(self):
+        critical = CriticalSets(Network.generate_nodes(n_nodes=12, topology='FULL'), budget=0.2, mode='heuristic', seed=1)
+        quorums, blocking = critical.minimal_quorums(), critical.minimal_blocking_sets()
+        self.assertFalse(critical.complete['quorums'] or critical.complete['blocking'])
+        self.assertTrue(quorums and blocking)
+        self.assertTrue(all(quorum.bit_count() == 7 and critical.is_quorum(quorum) for quorum in quorums))
+        self.assertTrue(all(critical.is_blocking(mask) and mask.bit_count() == 6 for mask in blocking))
+        with self.assertRaises(ValueError):
+            CriticalSets([], mode='fast')
+
+    def test_heuristic_fallback_stays_within_budget(self):
+        # Exact enumeration of 30 nodes does not finish, the heuristic gets the rest of the same budget
+        critical = CriticalSets(Network.generate_nodes(n_nodes=30, topology='FULL'), budget=0.5, seed=1)
+        start = time.time()
+        self.assertTrue(critical.minimal_quorums())
+        self.assertFalse(critical.complete['quorums'])
+        self.assertLess(time.time() - start, 0.8)
+        # Once no new sets turn up, the heuristic stops early
+        critical = CriticalSets(Network.generate_nodes(topology='LUNCH'), budget=30, mode='heuristic', seed=1)
+        start = time.time()
+        self.assertTrue(critical.minimal_quorums() and critical.minimal_blocking_sets())
+        self.assertLess(time.time() - start, 5)
+
+    def test_degenerate_thresholds_are_logged(self):
+        # Integer thresholds are read as percentages, 3 of 4 members becomes 3% of them: a quorum of one node
+        nodes = Network.generate_nodes(topology='LUNCH')
+        nodes[0].quorum_set.threshold = 3
+        with self.assertLogs('NETWORK', level='WARNING'):
+            self.assertEqual(CriticalSets(nodes).threshold[0], 1)
+
+        snapshot = CompiledSnapshot.open(os.path.join(os.path.dirname(os.path.abspath(__file__)), SNAPSHOT))
+        critical = CriticalSets(snapshot.build_nodes())
+        self.assertTrue(all(threshold > 1 for threshold, members in zip(critical.threshold, critical.members)
+                            if members.bit_count() > 1))
+
+    def test_minimal_drops_dominated_sets(self):
+        self.assertEqual(minimal([0b111, 0b011, 0b100, 0b011]), [0b100, 0b011])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -30,6 +30,14 @@ class Gillespie:
         # Probabilities for each specific event happening to a specific node
         self.node_probabilities = {}
 
+        self.update_rates()
+
+        log.gillespie.info('Initialized Gillespie algorithm.')
+
+    def update_rates(self):
+        """
+        Rates of all events, from the current sizes of their tau domains (call again when they change).
+        """
         # Waiting times until a specific event happens
         self.event_lambdas = []
         for event in self.events:
@@ -46,8 +54,6 @@ class Gillespie:
         # Event probabilities
         self.event_probabilities = self.event_lambdas/self.lambda_sum
 
-        log.gillespie.info('Initialized Gillespie algorithm.')
-
     def next_event(self):
         # Time increment to the next random event
         time_increment = -np.log(np.random.random()) / self.lambda_sum
@@ -15,6 +15,7 @@ from Log import log
 from Event import Event
 from Transaction import Transaction
 from SCPNominate import SCPNominate
+from TransactionPool import TransactionPool
 # import Globals
 from Globals import Globals
 
@@ -27,7 +28,7 @@ class Mempool():
     def __init__(self):
     # def __init__(self,simulation_time=None):
     # def __init__(self,simulation_time):
-        self.transactions = []
+        self.transactions = TransactionPool()
         self.messages = []
         # self.simulation_time = simulation_time
 
@@ -49,9 +50,8 @@ class Mempool():
     def mine(self):
 
         transaction_mined = Transaction(time=Globals.simulation_time)
-        if transaction_mined not in self.transactions:
+        if self.transactions.add(transaction_mined):
             log.mempool.info('Transaction %s mined to the mempool!', transaction_mined)
-            self.transactions.append(transaction_mined)
             if not os.path.exists(self.log_path):
                 with open(self.log_path, 'w') as log_file:
                     log_file.write("")
@@ -64,7 +64,7 @@ class Mempool():
 
     def get_transaction(self):
         if len(self.transactions) > 0:
-            transaction = np.random.choice(self.transactions) if len(self.transactions) > 0 else None
+            transaction = self.transactions.sample()
 
             log.mempool.info('Transaction %s retrieved from the mempool!', transaction)
         else:
@@ -75,7 +75,17 @@ class Mempool():
     def get_all_transactions(self):
         if len(self.transactions) > 0:
             log.mempool.info('All transactions retrieved from the mempool: %s', self.transactions)
-            return self.transactions.copy()  # Return a copy to avoid external mutation
+            return self.transactions.copy()  # Return a list copy (in FIFO order) to avoid external mutation
         else:
             log.mempool.info('No transactions in the mempool!')
             return []
+
+    def remove_transactions(self, transactions):
+        """
+        Remove transactions (or transaction IDs) from the mempool, returns how many were actually removed.
+        """
+        removed = 0
+        for tx in transactions:
+            if self.transactions.discard(tx) is not None:
+                removed += 1
+        return removed
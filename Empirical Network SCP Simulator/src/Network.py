@@ -8,17 +8,18 @@ Last update: March 2025
 
 Network class. Setup Stellar validator network by initializing nodes and setting their quorum sets based on a predefined topology.
 """
-import math
 
 from Log import log
 from Node import Node
 from QuorumSet import QuorumSet
+from CompiledSnapshot import CompiledSnapshot
+from TieredTopology import TieredTopology
 import json
 import networkx as nx
 
 class Network():
 
-    topologies = ['FULL','ER-SINGLEQUORUMSET','ER_singlequorumset','HARDCODE', 'LUNCH']
+    topologies = ['FULL','ER-SINGLEQUORUMSET','ER_singlequorumset','HARDCODE', 'TIERED', 'LUNCH']
 
     @classmethod
     def parse_all_validators(cls, file_path):
@@ -44,7 +45,7 @@ class Network():
         return nodes
 
     @classmethod
-    def generate_nodes(cls,n_nodes=2,topology='FULL', percent_threshold = None):
+    def generate_nodes(cls,n_nodes=2,topology='FULL', percent_threshold = None, seed = None, topology_params = None):
 
         assert n_nodes > 0
         assert topology in cls.topologies
@@ -160,83 +161,18 @@ class Network():
                 return sq_nodes
 
             case 'HARDCODE':
-                import math
-
                 PERCENT_THRESHOLD = 0.8
 
-                file_path = "quorumset_05_06_2025.json"
-                with open(file_path, 'r') as f:
-                    raw = json.load(f)
-
-                data_list = raw["nodes"]
-
-                defined_ids = {entry.get("publicKey") for entry in data_list} # 2) collect all defined publicKeys
-                if any(not isinstance(pk, str) for pk in defined_ids):
-                    raise RuntimeError(f"All publicKey fields must be strings. Got: {defined_ids}")
-
-                nodes_dict = {pk: Node(pk) for pk in defined_ids} # Initalise all Nodes
-                referenced_undefined = set()
-
-                def build_inner_list(inner_json, parent_id): # Helper function to build the inner quorum sets
-                    if not isinstance(inner_json, dict):
-                        raise RuntimeError(f"innerQuorumSets entry must be a dict. Got {inner_json!r}")
-                    result = []
-                    for v_id in inner_json.get("validators", []):
-                        if v_id not in defined_ids:
-                            referenced_undefined.add(v_id)
-                            log.network.warning("Dropping undefined validator %s in innerQuorumSets of %s",
-                                                v_id, parent_id)
-                        else:
-                            result.append(nodes_dict[v_id])
-                    for sub in inner_json.get("innerQuorumSets", []):
-                        result.append(build_inner_list(sub, parent_id))
-                    return result
-
-                for entry in data_list:
-                    node_id = entry["publicKey"]
-                    node = nodes_dict[node_id]
-
-                    q = entry.get("quorumSet")
-
-                    top_level = [] # build top-level list "validators'
-                    for v_id in q.get("validators", []):
-                        if v_id not in defined_ids:
-                            referenced_undefined.add(v_id)
-                            log.network.warning("Dropping undefined top-level validator %s of %s", v_id, node_id)
-                        else:
-                            top_level.append(nodes_dict[v_id])
-
-                    inner_lists = [build_inner_list(inner_json, node_id)
-                                   for inner_json in q.get("innerQuorumSets", [])] # build the nested inner-quorum set lists
-
-                    def _flatten(qs): # flatten is used to count all peers across all inner quorum sets
-                        flat = []
-                        for x in qs:
-                            if isinstance(x, list):
-                                flat.extend(_flatten(x))
-                            else:
-                                flat.append(x)
-                        return flat
-
-                    total_peers = len(top_level) + len(_flatten(inner_lists))
-                    dynamic_thr = math.ceil(total_peers * PERCENT_THRESHOLD)
-
-                    node.quorum_set.threshold = dynamic_thr # calculate dynamically the threshold based on total peers, we can set via PERCENT_THRESHOLD variable
-                    node.quorum_set.set(nodes=top_level, inner_sets=inner_lists)
-
-                    log.network.info(
-                        "Node %s : dynamic threshold=%d (100%% of %d peers); top=%d, nested_lists=%d",
-                        node_id, dynamic_thr, total_peers, len(top_level), len(inner_lists)
-                    )
-
-                if referenced_undefined: # if there are isolated nodes here they are logged
-                    log.network.info(
-                        "Dropped %d undefined nodes: %s",
-                        len(referenced_undefined), sorted(referenced_undefined)
-                    )
-
-                return list(nodes_dict.values())
+                # The snapshot is compiled into a binary file once, later runs load the compiled file
+                snapshot = CompiledSnapshot.open("quorumset_05_06_2025.json")
+                return snapshot.build_nodes(percent_threshold=PERCENT_THRESHOLD) # threshold of every node is PERCENT_THRESHOLD of its total peers
 
+            case 'TIERED':
+                # Synthetic Stellar-like network of n_nodes validators, tier-1 core and long tail (see TieredTopology),
+                # topology_params are the parameters of TieredTopology.generate (thresholds, tail_peers, ...)
+                snapshot = TieredTopology.generate(n_nodes, seed=seed, **(topology_params or {}))
+                # Declared nested thresholds, flattened (see CompiledSnapshot.set_quorum_set), unless percent_threshold
+                return snapshot.build_nodes(percent_threshold=percent_threshold)
 
             case 'LUNCH':
                 names = ["Alice", "Bob", "Carol", "Dave", "Elsie", "Fred", "Gwen", "Hank", "Inez", "John"]
@@ -15,13 +15,12 @@ Documentation:
 """
 import math
 import random
-from collections import deque
 
 import numpy as np
 from Log import log
 from Event import Event
 from Ledger import Ledger
-from QuorumSet import QuorumSet
+from QuorumSet import QuorumSet, NO_SIGNERS
 from SCPNominate import SCPNominate
 from SCPBallot import SCPBallot
 from SCPPrepare import SCPPrepare
@@ -29,12 +28,16 @@ from SCPCommit import SCPCommit
 from SCPExternalize import SCPExternalize
 from Value import Value
 from Storage import Storage
+from TransactionPool import TransactionPool
 from Globals import Globals
 import copy
 import xdrlib3
 import hashlib
 import os
 from typing import List
+from types import MappingProxyType
+
+NO_STATEMENTS = MappingProxyType({"voted": NO_SIGNERS, "accepted": NO_SIGNERS}) # Shared default of values nobody signed
 
 
 class Node():
@@ -51,7 +54,7 @@ class Node():
         self.ledger = ledger if ledger is not None else Ledger(self)
         self.slot = 1
         self.mempool = None
-        self.tx_queue = deque()
+        self.tx_queue = TransactionPool() # FIFO queue of transactions waiting to be nominated, indexed by transaction ID
 
         self.storage = storage if storage is not None else Storage(self)
         default_state = {'voted': [], 'accepted': [], 'confirmed': []}
@@ -243,7 +246,7 @@ class Node():
                 log.node.info('Node %s ignored transaction %s as it was already externalized.', self.name,
                               transaction_id)
                 # Do not add the transaction to the ledger in this branch
-                self.mempool.transactions.remove(transaction)
+                self.mempool.transactions.discard(transaction)
                 self.log_to_file(
                     f"NODE - INFO - Node {self.name} ignored {transaction} as it was already externalized.")
                 return None  # Explicitly return None as the transaction is externalized
@@ -431,18 +434,34 @@ class Node():
         self.broadcast_flags = [new_nom_msg]
         log.node.info("Node %s updated its local nomination broadcast flag: %s", self.name, new_nom_msg)
 
-    def process_received_message(self, message):
-        finalized_tx_ids = self.get_finalized_transaction_ids()
+    def prune_finalised_nomination_values(self, finalized_tx_ids):
+        """
+        Remove finalised transactions (given by their IDs) from the nomination state. Values are immutable,
+        so a phase is only rebuilt if one of its Values actually contains a finalised transaction.
+        """
+        for phase in ('voted', 'accepted', 'confirmed'):
+            values = self.nomination_state.get(phase)
+            if values is None:
+                self.nomination_state[phase] = []
+                continue
+            if not finalized_tx_ids or not any(tx.hash in finalized_tx_ids for val in values for tx in val.transactions):
+                continue
 
-        # Prune any already-finalized tx from our current nomination state
-        for phase in ['voted', 'accepted', 'confirmed']:
             pruned = []
-            for old_val in self.nomination_state.get(phase, []):
-                keep = {t for t in old_val.transactions if t.hash not in finalized_tx_ids}
-                if keep:
+            for old_val in values:
+                keep = [t for t in old_val.transactions if t.hash not in finalized_tx_ids]
+                if len(keep) == len(old_val.transactions):
+                    pruned.append(old_val)
+                elif keep:
                     pruned.append(Value(transactions=keep))
             self.nomination_state[phase] = pruned
 
+    def process_received_message(self, message):
+        finalized_tx_ids = self.get_finalized_transaction_ids()
+
+        # Prune any already-finalized tx from our current nomination state
+        self.prune_finalised_nomination_values(finalized_tx_ids)
+
         incoming_voted = message[0]
         if isinstance(incoming_voted, Value):
             # Prune out finalized txs
@@ -570,31 +589,19 @@ class Node():
         using a sliding-window queue. Every seen transaction is enqueued, and each slot
         nominates at most MAX_SLOT_TXS in FIFO order, ensuring no starvation.
         """
-        # Initialize tx_queue if not already present
-        if not hasattr(self, 'tx_queue'):
-            from collections import deque
-            self.tx_queue = deque()
-
         all_tx = self.mempool.get_all_transactions()
         for tx in all_tx:
-            if tx.hash not in self.finalised_transactions and tx not in self.tx_queue:
-                self.tx_queue.append(tx)
+            # tx_queue is hash-indexed so membership check is O(1)
+            if tx.hash not in self.finalised_transactions:
+                self.tx_queue.add(tx)
 
         # Prune nomination_state of finalized txs
         self.collect_finalised_transactions()
         self.clean_prepare_and_commit_state()
-        for phase in ['voted', 'accepted', 'confirmed']:
-            pruned = []
-            for old_val in self.nomination_state.get(phase, []):
-                keep = {t for t in old_val.transactions if t.hash not in self.finalised_transactions}
-                if keep:
-                    pruned.append(Value(transactions=keep))
-            self.nomination_state[phase] = pruned
+        self.prune_finalised_nomination_values(self.finalised_transactions)
 
         # Select up to MAX_SLOT_TXS from the front of the tx_queue
-        to_nominate = []
-        for _ in range(min(self.MAX_SLOT_TXS, len(self.tx_queue))):
-            to_nominate.append(self.tx_queue.popleft())
+        to_nominate = self.tx_queue.pop_batch(self.MAX_SLOT_TXS)
 
         if not to_nominate:
             log.node.info('Node %s found no transactions to nominate after queue processing.', self.name)
@@ -825,21 +832,9 @@ class Node():
             # make sure Node itself has voted or accepted message before checking quorum
             return False
 
-        # get all peers
-        top = self.quorum_set.get_nodes()
-        inner = self.quorum_set.get_inner_sets()
-
-        all_peers = list(top) + self._flatten_nested(inner)
-
-        seen_ids = set()
-        unique = []
-        for p in all_peers + [self]: # remove possible duplicate nodes
-            if id(p) not in seen_ids:
-                seen_ids.add(id(p))
-                unique.append(p)
-
-        entry = self.statement_counter.get(val.hash, {"voted": set(), "accepted": set()})
-        signed = sum( 1 for p in unique if p is self or p.name in entry["voted"] or p.name in entry["accepted"]) # count signatures
+        # count signatures of the distinct peers, starting with 1 for the node itself
+        entry = self.statement_counter.get(val.hash, NO_STATEMENTS)
+        signed = 1 + sum(1 for p in self.quorum_set.members() if p is not self and (p.name in entry["voted"] or p.name in entry["accepted"]))
 
         needed = self.quorum_set.minimum_quorum
         log.node.debug("Nomination quorum check at Node %s for Value %s: signed=%d, needed=%d", self.name, val, signed, needed )
@@ -850,48 +845,25 @@ class Node():
         if val not in self.nomination_state["voted"] and val not in self.nomination_state["accepted"]:
             return False
 
-        validators, inner_sets = self.quorum_set.get_quorum()
-
-        def _flatten(q):
-            flat = []
-            for x in q:
-                if isinstance(x, list):
-                    flat.extend(_flatten(x))
-                else:
-                    flat.append(x)
-            return flat
-
-        all_quorum_nodes = list(validators) + _flatten(inner_sets)
-
-        unique_quorum_nodes = []
-        seen_ids = set()
-        for node in all_quorum_nodes:
-            if id(node) not in seen_ids:
-                seen_ids.add(id(node))
-                unique_quorum_nodes.append(node)
-        n = len(unique_quorum_nodes)
-
         k = self.quorum_set.minimum_quorum # this is the threshold
 
-        if n == 0:
-            return False
-
+        n = 0
         signed_count = 1  # start with “1” because this node itself has signed (by step #1)
-        seen_signed = set()  # to avoid double‐counting the same Node
-        for node in unique_quorum_nodes:
+        for node in self.quorum_set.members(): # distinct nodes, so none is counted twice
+            n += 1
             if node is self:
                 continue
             # check if that node has “voted” or “accepted” in statement_counter for this value
-            voted_set = self.statement_counter[val.hash]["voted"]
-            accepted_set = self.statement_counter[val.hash]["accepted"]
-            if (node in voted_set or node in accepted_set) and node not in seen_signed:
-                seen_signed.add(node)
+            entry = self.statement_counter[val.hash]
+            if node in entry["voted"] or node in entry["accepted"]:
                 signed_count += 1
 
+        if n == 0:
+            return False
+
         inner_set_count = 0
-        for raw_slice in inner_sets:
-            flat_slice = _flatten([raw_slice])
-            inner_set_count += self.quorum_set.check_inner_set_blocking_threshold( calling_node=self, val=val, quorum=flat_slice)
+        for node in self.quorum_set._walk(self.quorum_set.get_inner_sets()):
+            inner_set_count += self.quorum_set.check_inner_set_blocking_threshold( calling_node=self, val=val, quorum=[node])
 
         return (signed_count + inner_set_count) > (n - k)
 
@@ -1113,12 +1085,9 @@ class Node():
                 val_hash not in self.balloting_state["accepted"]:
             return False
 
-        validators, inner_sets = self.quorum_set.get_quorum()
-        all_quorum = list(validators) + self._flatten_nested(inner_sets)
-
-        entry = self.ballot_statement_counter.get(ballot.value, {"voted": set(), "accepted": set()})
+        entry = self.ballot_statement_counter.get(ballot.value, NO_STATEMENTS)
         signed = 1
-        for n in all_quorum:
+        for n in self.quorum_set.iter_nodes():
             if n is not self and (n in entry["voted"] or n in entry["accepted"]):
                 signed += 1
 
@@ -1180,16 +1149,12 @@ class Node():
 
 
     def is_v_blocking(self, other_ballot):
-        validators, inner_sets = self.quorum_set.get_quorum()
-        all_quorum = list(validators) + self._flatten_nested(inner_sets)
-
-        unique_peers = {id(n) for n in all_quorum}
-        n = len(unique_peers)
+        n = sum(1 for _ in self.quorum_set.members())
 
         k = self.quorum_set.minimum_quorum
         threshold = n - k
 
-        entry = self.ballot_statement_counter.get(other_ballot.value, {"voted": set(), "accepted": set()})
+        entry = self.ballot_statement_counter.get(other_ballot.value, NO_STATEMENTS)
         count = len(entry["voted"] | entry["accepted"])
         return count > threshold
 
@@ -1322,29 +1287,10 @@ class Node():
         if h not in self.commit_ballot_state["voted"] and h not in self.commit_ballot_state["accepted"]:
             return False
 
-        validators, inner_sets = self.quorum_set.get_quorum()
-
-        def _flatten(q):
-            flat = []
-            for x in q:
-                if isinstance(x, list):
-                    flat.extend(_flatten(x))
-                else:
-                    flat.append(x)
-            return flat
-
-        all_peers = list(validators) + _flatten(inner_sets) + [self]
-        seen_ids = set()
-        unique_peers = []
-        for node in all_peers:
-            if id(node) not in seen_ids:
-                seen_ids.add(id(node))
-                unique_peers.append(node)
-
-        entry = self.commit_ballot_statement_counter.get(ballot.value, {"voted": set(), "accepted": set()})
-        signed = 0
-        for node in unique_peers:
-            if node is self or node in entry["voted"] or node in entry["accepted"]:
+        entry = self.commit_ballot_statement_counter.get(ballot.value, NO_STATEMENTS)
+        signed = 1 # the node itself
+        for node in self.quorum_set.members():
+            if node is not self and (node in entry["voted"] or node in entry["accepted"]):
                 signed += 1
 
         needed = self.quorum_set.minimum_quorum
@@ -1401,34 +1347,17 @@ class Node():
 
     def _is_v_blocking_commit(self, ballot: SCPBallot) -> bool:
         entry = self.commit_ballot_statement_counter.get(
-            ballot.value, {"voted": set(), "accepted": set()}
+            ballot.value, NO_STATEMENTS
         )
 
-        validators, inner_sets = self.quorum_set.get_quorum()
-
-        def _flatten(q):
-            flat = []
-            for x in q:
-                if isinstance(x, list):
-                    flat.extend(_flatten(x))
-                else:
-                    flat.append(x)
-            return flat
-
-        all_peers = list(validators) + _flatten(inner_sets)
-
-        seen_ids = set()
-        unique_peers = []
-        for p in all_peers: # remove duplicates
-            if id(p) not in seen_ids:
-                seen_ids.add(id(p))
-                unique_peers.append(p)
-
-        n = len(unique_peers)
+        n = 0
+        signed = 0
+        for p in self.quorum_set.members():
+            n += 1
+            if p in entry["voted"] or p in entry["accepted"]:
+                signed += 1
         k = self.quorum_set.minimum_quorum
 
-        signed = sum( 1 for p in unique_peers if (p in entry["voted"] or p in entry["accepted"]))
-
         return signed > (n - k)
 
     def receive_commit_message(self):
@@ -1506,7 +1435,7 @@ class Node():
         finalised_ballot = self.retrieve_confirmed_commit_ballot() # Retrieve a Value from the SCPPrepare 'confirmed' state
         if finalised_ballot is not None:
             externalize_msg = SCPExternalize(ballot=finalised_ballot, hCounter=finalised_ballot.counter, timestamp=Globals.simulation_time)
-            temp_value = copy.deepcopy(externalize_msg.ballot.value)
+            temp_value = externalize_msg.ballot.value # Values are immutable, so no copy is needed to survive the reset below
             # Store the externalized value in the ledger
             self.ledger.add_slot(self.slot, externalize_msg)
             # self.externalize_broadcast_flags.add(externalize_msg)
@@ -1721,20 +1650,15 @@ class Node():
         """
         self.collect_finalised_transactions()
 
-        for tx in self.finalised_transactions:
-            try:
-                self.mempool.transactions.remove(tx)
-                log.mempool.info(
-                    "Removed finalized tx %s from mempool for Node %s.", tx, self.name
-                )
-            except ValueError:
-                pass
+        # finalised_transactions holds transaction IDs, which the mempool index accepts directly
+        removed = self.mempool.remove_transactions(self.finalised_transactions)
+        if removed:
+            log.mempool.info("Removed %d finalized txs from mempool for Node %s.", removed, self.name)
 
         for tx in value.transactions:
-            try:
-                self.mempool.transactions.remove(tx)
+            if self.mempool.transactions.discard(tx) is not None:
                 log.mempool.info('Removed transaction %s from mempool for Node %s.', tx, self.name)
-            except ValueError:
+            else:
                 # Transaction might not be present; that's fine.
                 log.mempool.info('Transaction %s was not found in mempool for Node %s.', tx, self.name)
 
@@ -1769,8 +1693,10 @@ class Node():
                 # Make sure the value has transactions
                 if hasattr(value, 'transactions'):
                     # Filter out any transactions whose hash is in finalized_hashes
-                    filtered_tx = {tx for tx in value.transactions if tx.hash not in finalized_hashes}
-                    if filtered_tx:
+                    filtered_tx = [tx for tx in value.transactions if tx.hash not in finalized_hashes]
+                    if len(filtered_tx) == len(value.transactions):
+                        new_values.append(value) # Nothing finalised, Values are immutable so it can be kept as is
+                    elif filtered_tx:
                         new_values.append(Value(transactions=filtered_tx))
                     else:
                         log.node.info("Removing an empty nomination value from '%s'.", key)
@@ -15,6 +15,7 @@ from unittest.mock import MagicMock, patch
 from unittest import mock
 from Globals import Globals
 from QuorumSet import QuorumSet
+import tracemalloc
 
 
 class NodeTest(unittest.TestCase):
@@ -2338,5 +2339,59 @@ class NodeTest(unittest.TestCase):
                 self.assertNotEqual(msg.ballot.value.hash, value_finalized.hash,
                                     f"Received prepare broadcast messages for peer {peer} should not include messages with the finalized value.")
 
+    def test_threshold_checks_do_not_allocate_per_call(self):
+        nodes = [Node("test_node%d" % i) for i in range(2, 8)]
+        self.node = Node(name="Node1")
+        self.node.quorum_set.set(nodes=nodes[:2], inner_sets=[nodes[2:4], nodes[4:]])
+
+        value = Value(transactions={Transaction(0)})
+        ballot = SCPBallot(counter=1, value=value)
+        self.node.nomination_state = {"voted": [value], "accepted": [], "confirmed": []}
+        self.node.balloting_state = {"voted": {value.hash: ballot}, "accepted": {}, "confirmed": {}}
+        self.node.commit_ballot_state = {"voted": {value.hash: ballot}, "accepted": {}, "confirmed": {}}
+        # Large statement counter, so that copying it on every check would show up clearly
+        self.node.statement_counter = {i: {"voted": set(), "accepted": set()} for i in range(500)}
+        self.node.statement_counter[value.hash] = {"voted": {node.name for node in nodes}, "accepted": set()}
+        self.node.ballot_statement_counter = {value: {"voted": set(nodes), "accepted": set()}}
+        self.node.commit_ballot_statement_counter = {value: {"voted": set(nodes), "accepted": set()}}
+
+        def check():
+            return (self.node.check_Quorum_threshold(value), self.node.check_Prepare_Quorum_threshold(ballot),
+                    self.node.check_Commit_Quorum_threshold(ballot), self.node.is_v_blocking(ballot))
+
+        self.assertEqual(check(), (True, True, True, True)) # warm up
+        tracemalloc.start()
+        try:
+            before, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            for _ in range(200):
+                check()
+            after, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        self.assertLess(after - before, 1024) # no allocation growth across events
+        self.assertLess(peak - before, 4096) # no per-event copies of the statement counters or quorum
+
+    def test_prune_finalised_nomination_values_keeps_unchanged_values(self):
+        self.node = Node(name="Node1")
+        tx1, tx2, tx3 = Transaction(0), Transaction(0), Transaction(0)
+        kept = Value(transactions={tx1})
+        mixed = Value(transactions={tx2, tx3})
+        voted = [kept]
+        self.node.nomination_state = {"voted": voted, "accepted": [kept, mixed], "confirmed": []}
+
+        self.node.prune_finalised_nomination_values(set())
+        self.assertIs(self.node.nomination_state["voted"], voted) # nothing finalised, nothing rebuilt
+
+        self.node.prune_finalised_nomination_values({tx2.hash})
+        self.assertIs(self.node.nomination_state["voted"], voted)
+        self.assertIs(self.node.nomination_state["accepted"][0], kept) # same Value object, not a copy
+        self.assertEqual(self.node.nomination_state["accepted"][1], Value(transactions={tx3}))
+
+        self.node.prune_finalised_nomination_values({tx1.hash})
+        self.assertEqual(self.node.nomination_state["voted"], [])
+
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
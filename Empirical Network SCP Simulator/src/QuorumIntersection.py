@@ -0,0 +1,259 @@
+"""
+=========================
+QuorumIntersection
+=========================
+
+Author: Matija Piskorec, Jaime de Vivero Woods
+Last update: October 2026
+
+QuorumIntersection class.
+
+Checks whether a network snapshot enjoys quorum intersection (every two quorums share a validator) before it is
+simulated, using the quorum sets of a CompiledSnapshot with the thresholds declared in the snapshot. Sets of
+validators are Python ints used as bitmasks (bit i is validator i).
+
+A quorum is a non-empty set of validators which satisfies the quorum set of each of its members. Every quorum
+contains a quorum within a single strongly connected component (SCC) of the graph of quorum set membership, so:
+- if quorums exist in two SCCs, they are disjoint and the snapshot does not enjoy quorum intersection;
+- otherwise it is enough to search the one SCC with quorums (the main SCC) for a quorum whose complement in the
+  SCC contains another quorum. One of two disjoint quorums has at most half of the validators of the SCC, so
+  only quorums up to that size are enumerated.
+
+The search commits validators one at a time (or excludes them), and prunes branches whose committed validators
+are not in any quorum of the remaining ones, whose complement contains no quorum, or which are too large.
+Branches are split up front and searched by a pool of processes, which stops at the first pair of disjoint
+quorums found (the counterexample).
+
+Usage: python QuorumIntersection.py quorumset_05_06_2025.json [--processes 4]
+"""
+
+import argparse
+import multiprocessing
+import os
+
+from CompiledSnapshot import CompiledSnapshot
+from Log import log
+
+SPLIT_FACTOR = 8 # Branches per process, so that processes with pruned branches do not sit idle
+
+
+def members_of(mask):
+    """
+    Indices of the validators in mask, in increasing order.
+    """
+    members = []
+    while mask:
+        low = mask & -mask
+        members.append(low.bit_length() - 1)
+        mask ^= low
+    return members
+
+
+class QuorumIntersection():
+
+    def __init__(self, snapshot):
+        self.snapshot = snapshot
+        self.n = len(snapshot)
+        self.threshold = snapshot.qset_threshold.tolist()
+        self.root = snapshot.root.tolist()
+        self.validators_mask = [sum(1 << v for v in snapshot.qset_validators_of(q).tolist())
+                                for q in range(len(self.threshold))]
+        self.children = [snapshot.qset_children_of(q).tolist() for q in range(len(self.threshold))]
+        self.dependencies = [set(snapshot.quorum_members(i)) - {i} for i in range(self.n)]
+        self.components = self.strongly_connected_components()
+
+        # Validators most depended upon first, they get the search to quorums quickest
+        in_degree = [0] * self.n
+        for members in self.dependencies:
+            for j in members:
+                in_degree[j] += 1
+        self.order = sorted(range(self.n), key=lambda i: -in_degree[i])
+
+    def __repr__(self):
+        return '[QuorumIntersection, validators = %s, SCCs = %s]' % (self.n, len(self.components))
+
+    @classmethod
+    def open(cls, json_path):
+        return cls(CompiledSnapshot.open(json_path))
+
+    def satisfied(self, q, mask):
+        """
+        Whether the validators in mask satisfy quorum set q.
+        """
+        threshold = self.threshold[q]
+        count = (self.validators_mask[q] & mask).bit_count()
+        if count >= threshold:
+            return True
+        for child in self.children[q]:
+            if self.satisfied(child, mask):
+                count += 1
+                if count >= threshold:
+                    return True
+        return False
+
+    def is_quorum(self, mask):
+        return mask != 0 and all(self.root[i] >= 0 and self.satisfied(self.root[i], mask) for i in members_of(mask))
+
+    def max_quorum(self, mask):
+        """
+        Largest quorum within mask (the union of all of them), 0 if there is none.
+        """
+        while mask:
+            unsatisfied = 0
+            for i in members_of(mask):
+                if self.root[i] < 0 or not self.satisfied(self.root[i], mask):
+                    unsatisfied |= 1 << i
+            if not unsatisfied:
+                return mask
+            mask &= ~unsatisfied
+        return 0
+
+    def strongly_connected_components(self):
+        """
+        SCCs of the graph with an edge from every validator to the validators in its quorum set, as masks
+        (Tarjan's algorithm, without recursion).
+        """
+        index, lowlink, on_stack = {}, {}, set()
+        stack, components = [], []
+        for start in range(self.n):
+            if start in index:
+                continue
+            work = [(start, iter(sorted(self.dependencies[start])))]
+            index[start] = lowlink[start] = len(index)
+            stack.append(start)
+            on_stack.add(start)
+            while work:
+                v, successors = work[-1]
+                for w in successors:
+                    if w not in index:
+                        index[w] = lowlink[w] = len(index)
+                        stack.append(w)
+                        on_stack.add(w)
+                        work.append((w, iter(sorted(self.dependencies[w]))))
+                        break
+                    if w in on_stack:
+                        lowlink[v] = min(lowlink[v], index[w])
+                else:
+                    work.pop()
+                    if work:
+                        lowlink[work[-1][0]] = min(lowlink[work[-1][0]], lowlink[v])
+                    if lowlink[v] == index[v]:
+                        component = 0
+                        while True:
+                            w = stack.pop()
+                            on_stack.discard(w)
+                            component |= 1 << w
+                            if w == v:
+                                break
+                        components.append(component)
+        return components
+
+    def _step(self, scc, limit, committed, remaining):
+        """
+        One node of the search: (pair of disjoint quorums or None, branches to search below it).
+        """
+        maximal = self.max_quorum(committed | remaining)
+        if committed & ~maximal:
+            return None, [] # No quorum of the remaining validators contains the committed ones
+        remaining = maximal & ~committed
+        if committed and self.is_quorum(committed):
+            other = self.max_quorum(scc & ~committed)
+            return ((committed, other) if other else None), []
+        if committed and not self.max_quorum(scc & ~committed):
+            return None, [] # Nothing disjoint from the committed validators is a quorum
+        if committed.bit_count() >= limit or not remaining:
+            return None, []
+        v = next(i for i in self.order if remaining >> i & 1)
+        return None, [(committed | 1 << v, remaining & ~(1 << v)), (committed, remaining & ~(1 << v))]
+
+    def search(self, scc, branches):
+        """
+        Depth first search of branches (committed, remaining) of the SCC for a pair of disjoint quorums.
+        """
+        limit = scc.bit_count() // 2
+        stack = list(reversed(branches))
+        while stack:
+            found, below = self._step(scc, limit, *stack.pop())
+            if found:
+                return found
+            stack.extend(reversed(below))
+        return None
+
+    def find_disjoint_quorums(self, processes=None):
+        """
+        A pair of disjoint quorums as lists of validator indices, or None if the snapshot enjoys quorum intersection.
+        With processes other than 1, the search is split across a pool of processes (all CPUs by default).
+        """
+        quorums = [(scc, self.max_quorum(scc)) for scc in self.components]
+        quorums = [(scc, quorum) for scc, quorum in quorums if quorum]
+        if len(quorums) > 1:
+            log.network.info('Quorums in %d different SCCs', len(quorums))
+            return members_of(quorums[0][1]), members_of(quorums[1][1])
+        if not quorums:
+            log.network.info('No quorums at all')
+            return None
+
+        scc = quorums[0][1] # Validators of the main SCC outside of its largest quorum are in no quorum
+        log.network.info('Searching main SCC of %d validators for disjoint quorums', scc.bit_count())
+        processes = processes or os.cpu_count() or 1
+        if processes == 1:
+            found = self.search(scc, [(0, scc)])
+        else:
+            found = self._search_parallel(scc, processes)
+        return None if found is None else (members_of(found[0]), members_of(found[1]))
+
+    def _search_parallel(self, scc, processes):
+        # Split the search breadth first until there are enough branches for all processes
+        limit = scc.bit_count() // 2
+        branches = [(0, scc)]
+        while branches and len(branches) < SPLIT_FACTOR * processes:
+            split = []
+            for branch in branches:
+                found, below = self._step(scc, limit, *branch)
+                if found:
+                    return found
+                split.extend(below)
+            branches = split
+
+        with multiprocessing.Pool(processes, initializer=_start_worker, initargs=(self, scc)) as pool:
+            for found in pool.imap_unordered(_search_branch, branches):
+                if found:
+                    pool.terminate() # The first counterexample is enough
+                    return found
+        return None
+
+    def enjoys_quorum_intersection(self, processes=None):
+        return self.find_disjoint_quorums(processes=processes) is None
+
+
+_worker = None
+
+
+def _start_worker(checker, scc):
+    global _worker
+    _worker = (checker, scc)
+
+
+def _search_branch(branch):
+    checker, scc = _worker
+    return checker.search(scc, [branch])
+
+
+if __name__=='__main__':
+
+    parser=argparse.ArgumentParser()
+    parser.add_argument("snapshot", help="Stellarbeat snapshot JSON file.")
+    parser.add_argument("--processes","-p", type=int, default=None, help="Number of processes (default: all CPUs).")
+    args = parser.parse_args()
+
+    checker = QuorumIntersection.open(args.snapshot)
+    print(checker)
+    disjoint = checker.find_disjoint_quorums(processes=args.processes)
+    if disjoint is None:
+        print('%s enjoys quorum intersection' % args.snapshot)
+    else:
+        names = checker.snapshot.names.tolist()
+        keys = checker.snapshot.public_keys.tolist()
+        print('%s does NOT enjoy quorum intersection, disjoint quorums:' % args.snapshot)
+        for quorum in disjoint:
+            print('  ' + ', '.join(names[i] or keys[i] for i in quorum))
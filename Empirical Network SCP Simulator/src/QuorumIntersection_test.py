@@ -0,0 +1,69 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from CompiledSnapshot import CompiledSnapshot
+from QuorumIntersection import QuorumIntersection, members_of
+
+
+def snapshot_of(quorum_sets):
+    """
+    Snapshot JSON of {public key: (threshold, validators)}.
+    """
+    return {"nodes": [{"publicKey": key, "quorumSet": {"threshold": threshold, "validators": validators, "innerQuorumSets": []}}
+                      for key, (threshold, validators) in quorum_sets.items()],
+            "organizations": []}
+
+
+class QuorumIntersectionTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def checker(self, quorum_sets):
+        path = os.path.join(self.directory, 'snapshot.json')
+        with open(path, 'w') as file:
+            json.dump(snapshot_of(quorum_sets), file)
+        return QuorumIntersection(CompiledSnapshot.compile(path))
+
+    def assertDisjointQuorums(self, checker, disjoint):
+        self.assertIsNotNone(disjoint)
+        first, second = (sum(1 << i for i in quorum) for quorum in disjoint)
+        self.assertTrue(checker.is_quorum(first) and checker.is_quorum(second))
+        self.assertEqual(first & second, 0)
+
+    def test_majority_thresholds_intersect(self):
+        keys = [str(i) for i in range(8)]
+        checker = self.checker({key: (5, keys) for key in keys})
+        self.assertEqual(len(checker.components), 1)
+        for processes in (1, 2):
+            self.assertTrue(checker.enjoys_quorum_intersection(processes=processes))
+
+    def test_quorums_in_two_sccs(self):
+        checker = self.checker({'A': (2, ['A', 'B']), 'B': (2, ['A', 'B']), 'C': (2, ['C', 'D']), 'D': (2, ['C', 'D'])})
+        self.assertEqual(sorted(members_of(component) for component in checker.components), [[0, 1], [2, 3]])
+        disjoint = checker.find_disjoint_quorums(processes=1)
+        self.assertDisjointQuorums(checker, disjoint)
+
+    def test_low_thresholds_in_one_scc(self):
+        keys = [str(i) for i in range(10)]
+        checker = self.checker({key: (4, keys) for key in keys})
+        self.assertEqual(len(checker.components), 1)
+        for processes in (1, 2):
+            self.assertDisjointQuorums(checker, checker.find_disjoint_quorums(processes=processes))
+
+    def test_validators_without_quorum_sets_are_in_no_quorum(self):
+        checker = self.checker({'A': (1, ['B']), 'B': (1, ['B'])})
+        self.assertFalse(checker.is_quorum(0b01))
+        self.assertEqual(checker.max_quorum(0b11), 0b11)
+        checker.root[1] = -1
+        self.assertEqual(checker.max_quorum(0b11), 0)
+
+    def test_stellarbeat_snapshot_enjoys_quorum_intersection(self):
+        checker = QuorumIntersection(CompiledSnapshot.compile(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'quorumset_05_06_2025.json')))
+        self.assertTrue(checker.enjoys_quorum_intersection(processes=1))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -7,6 +7,7 @@ Author: Matija Piskorec, Jaime de Vivero Woods
 Last update: June 2025
 QuorumSet class.
 """
+import itertools
 import math
 import random
 from Log import log
@@ -14,6 +15,7 @@ from Log import log
 import numpy as np
 
 THRESHOLD_DEFAULT = 55 # 25% threshold by default
+NO_SIGNERS = frozenset() # Shared default of statements nobody signed, never mutated
 
 class QuorumSet():
 
@@ -69,11 +71,12 @@ class QuorumSet():
         else:
             return np.random.choice([node for node in self.nodes if node != self.node])
 
+    # The quorum itself, not a copy - callers must not mutate it, re-assign the quorum with set() instead
     def get_nodes(self):
-        return self.nodes.copy()
+        return self.nodes
 
     def get_inner_sets(self):
-        return self.inner_sets.copy()
+        return self.inner_sets
 
     def _flatten(self, xs):
         out = []
@@ -84,18 +87,34 @@ class QuorumSet():
                 out.append(x)
         return out
 
+    def _walk(self, xs):
+        # Generator counterpart of _flatten, for hot paths that only iterate over the quorum once
+        for x in xs:
+            if isinstance(x, list):
+                yield from self._walk(x)
+            else:
+                yield x
+
+    def iter_nodes(self):
+        """
+        Iterate over the top-level nodes and the nodes of all (nested) inner sets without copying the quorum.
+        A node listed more than once is yielded more than once, see members() for distinct nodes.
+        """
+        return itertools.chain(self._walk(self.nodes), self._walk(self.inner_sets))
+
+    def members(self):
+        """
+        Iterate over the distinct nodes of the quorum (top-level and all nested inner sets) without copying it.
+        """
+        seen = set()
+        for node in self.iter_nodes():
+            if id(node) not in seen:
+                seen.add(id(node))
+                yield node
+
     @property
     def size(self):
-        def _flatten(q):
-            flat = []
-            for x in q:
-                if isinstance(x, list):
-                    flat.extend(_flatten(x))
-                else:
-                    flat.append(x)
-            return flat
-
-        return len(self.nodes) + len(_flatten(self.inner_sets))
+        return sum(1 for _ in self.iter_nodes())
 
     @property
     def minimum_quorum(self):
@@ -112,14 +131,17 @@ class QuorumSet():
         return needed
 
     def get_quorum(self):
-        return self.nodes.copy(), self._flatten(self.inner_sets)
+        return self.nodes, self._flatten(self.inner_sets)
 
     # This function checks if the quorum meets threshold - it checks every node, it doesn't check for nested QuorumSlices
     def check_threshold(self, val, quorum, threshold, node_statement_counter):
-        entry = node_statement_counter.get(val.hash, {"voted": set(), "accepted": set()})
+        entry = node_statement_counter.get(val.hash)
+        if entry is None:
+            return threshold <= 0
+        voted, accepted = entry.get("voted", NO_SIGNERS), entry.get("accepted", NO_SIGNERS)
         signed = 0
         for peer in self._flatten(quorum):
-            if peer.name in entry.get("voted", set()) or peer.name in entry.get("accepted", set()):
+            if peer.name in voted or peer.name in accepted:
                 signed += 1
         return signed >= threshold
 
@@ -137,7 +159,7 @@ class QuorumSet():
                 continue
 
             for state in ('voted', 'accepted'):
-                if peer in entry.get(state, set()):
+                if peer in entry.get(state, NO_SIGNERS):
                     seen.add(peer)
                     signed += 1
                     break
@@ -158,7 +180,7 @@ class QuorumSet():
                 continue
 
             for state in ('voted', 'accepted'):
-                if peer in entry.get(state, set()):
+                if peer in entry.get(state, NO_SIGNERS):
                     seen.add(peer)
                     signed += 1
                     break
@@ -26,6 +26,13 @@ class QuorumSetTest(unittest.TestCase):
         check = self.node.quorum_set.check_threshold(value, quorum, threshold, statement_counter)
         self.assertTrue(check)
 
+    def test_check_threshold_without_statements(self):
+        quorum = [Node("test_node1"), Node("test_node2")]
+        value = Value(transactions={Transaction(0)})
+        self.assertFalse(self.node.quorum_set.check_threshold(value, quorum, 1, {}))
+        self.assertTrue(self.node.quorum_set.check_threshold(value, quorum, 1, {value.hash: {'accepted': {"test_node2": 1}}}))
+        self.assertFalse(self.node.quorum_set.check_threshold(value, quorum, 2, {value.hash: {'accepted': {"test_node2": 1}}}))
+
     def test_inner_set_blocking_threshold_is_met(self):
         test_node1 = Node("test_node1")
         test_node2 = Node("test_node2")
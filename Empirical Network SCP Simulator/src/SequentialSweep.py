@@ -0,0 +1,193 @@
+"""
+=========================
+SequentialSweep
+=========================
+
+Author: Matija Piskorec, Jaime de Vivero Woods
+Last update: October 2026
+
+SequentialSweep class.
+
+Runs replicates of every configuration of a sweep until the confidence intervals of chosen metrics (e.g.
+avg_inter_slot_time, avg_txs_per_slot, any numeric column of the rows of a result) are narrow enough, instead of a fixed number of replicates everywhere:
+low-variance configurations stop early and the CPU goes to the noisy ones.
+
+Replicates run in rounds on a SweepRunner, so they are stored as they finish and an interrupted sweep resumes
+where it stopped. Replicate k of a configuration is the configuration with replicate_seed(seed, k), the k-th
+child of the SeedSequence of its seed, so replicates of configurations with different seeds never share random
+numbers. Configurations must be seeded, unseeded replicates could be neither stored nor resumed. Every configuration first runs min_replicates. After every round, a configuration is done
+once the half-width of the Student t confidence interval of every metric is at most width (times the absolute
+mean with relative widths), or once it ran max_replicates. Otherwise the number of replicates it needs is
+estimated from the current standard deviations, n = (t * s / width)^2, and the next round runs the missing
+ones (at most doubling the replicates of a configuration per round, since early estimates of s are rough).
+
+Usage: see scripts/parallel_simulations.py (--ci-width)
+"""
+
+import math
+
+import numpy as np
+
+from Log import log
+
+CONFIDENCE_DEFAULT = 0.95
+MIN_REPLICATES_DEFAULT = 3
+MAX_REPLICATES_DEFAULT = 30
+
+
+def replicate_seed(seed, k):
+    """
+    Seed of replicate k of a configuration with seed, the k-th child of SeedSequence(seed).spawn.
+    """
+    return int(np.random.SeedSequence(seed, spawn_key=(k,)).generate_state(1)[0])
+
+
+def t_coverage(t, df):
+    """
+    P(|T| < t) of the Student t distribution with integer df degrees of freedom.
+    """
+    theta = math.atan(t / math.sqrt(df))
+    cos2 = math.cos(theta) ** 2
+    total, term = 0.0, 1.0
+    if df % 2:
+        for k in range((df - 1) // 2):
+            total += term
+            term *= cos2 * (2 * k + 2) / (2 * k + 3)
+        return 2 / math.pi * (theta + math.sin(theta) * math.cos(theta) * total)
+    for k in range(df // 2):
+        total += term
+        term *= cos2 * (2 * k + 1) / (2 * k + 2)
+    return math.sin(theta) * total
+
+
+def t_quantile(confidence, df):
+    """
+    t such that P(|T| < t) = confidence, the multiplier of a two-sided confidence interval.
+    """
+    low, high = 0.0, 1.0
+    while t_coverage(high, df) < confidence:
+        high *= 2
+    for _ in range(60):
+        middle = (low + high) / 2
+        if t_coverage(middle, df) < confidence:
+            low = middle
+        else:
+            high = middle
+    return high
+
+
+def interval(values, confidence=CONFIDENCE_DEFAULT):
+    """
+    (mean, half-width) of the confidence interval of the mean of values, half-width is infinite for fewer than two.
+    """
+    values = np.asarray(values, dtype=float)
+    if len(values) == 0:
+        return math.nan, math.inf
+    mean = float(values.mean())
+    if len(values) < 2:
+        return mean, math.inf
+    return mean, t_quantile(confidence, len(values) - 1) * float(values.std(ddof=1)) / math.sqrt(len(values))
+
+
+class SequentialSweep():
+
+    def __init__(self, runner, metrics, width, relative=True, confidence=CONFIDENCE_DEFAULT,
+                 min_replicates=MIN_REPLICATES_DEFAULT, max_replicates=MAX_REPLICATES_DEFAULT, rows=None):
+        """
+        rows(result) gives the rows (dicts of metrics) of the result of a replicate job, the result itself by default.
+        """
+        if not 2 <= min_replicates <= max_replicates:
+            raise ValueError('Expected 2 <= min_replicates <= max_replicates, got %s and %s' % (min_replicates, max_replicates))
+        self.runner = runner
+        self.metrics = list(metrics)
+        self.width = width
+        self.relative = relative
+        self.confidence = confidence
+        self.min_replicates = min_replicates
+        self.max_replicates = max_replicates
+        self.rows = rows if rows is not None else (lambda result: [result])
+
+    def __repr__(self):
+        return '[SequentialSweep, metrics = %s, width = %s%s, replicates = %s-%s]' % (
+            self.metrics, self.width, ' (relative)' if self.relative else '', self.min_replicates, self.max_replicates)
+
+    def target_width(self, mean):
+        return self.width * abs(mean) if self.relative else self.width
+
+    def summary(self, samples):
+        """
+        {metric: {'mean', 'half_width', 'n'}} of the samples of one configuration.
+        """
+        summary = {}
+        for metric in self.metrics:
+            mean, half_width = interval(samples[metric], self.confidence)
+            summary[metric] = {'mean': mean, 'half_width': half_width, 'n': len(samples[metric])}
+        return summary
+
+    def converged(self, samples):
+        return all(item['half_width'] <= self.target_width(item['mean']) for item in self.summary(samples).values())
+
+    def replicates_needed(self, samples, replicates):
+        """
+        Replicates a configuration should have after the next round, given its samples after replicates.
+        """
+        needed = replicates + 1
+        for metric in self.metrics:
+            values = samples[metric]
+            if len(values) < 2:
+                continue
+            mean, deviation = float(np.mean(values)), float(np.std(values, ddof=1))
+            width = self.target_width(mean)
+            if width > 0:
+                t = t_quantile(self.confidence, len(values) - 1)
+                needed = max(needed, math.ceil((t * deviation / width) ** 2))
+            elif deviation > 0:
+                needed = self.max_replicates
+        return min(self.max_replicates, needed, 2 * replicates)
+
+    def run(self, configurations, on_result=None, emitted=None):
+        """
+        Run replicates of all configurations (job dicts) until their confidence intervals are narrow enough, and
+        return a dict for every configuration with its replicates, metric intervals and whether it converged.
+        on_result and emitted are passed on to SweepRunner.run.
+        """
+        configurations = list(configurations)
+        for configuration in configurations:
+            if configuration.get('seed') is None:
+                raise ValueError('Sequential replicates are seeded from the seed of the configuration, got %s' % configuration)
+        replicates = [0] * len(configurations)
+        samples = [{metric: [] for metric in self.metrics} for _ in configurations]
+        done = [False] * len(configurations)
+        rounds = 0
+        while True:
+            jobs = []
+            for i, configuration in enumerate(configurations):
+                if done[i]:
+                    continue
+                if replicates[i] == 0:
+                    target = self.min_replicates
+                elif replicates[i] >= self.max_replicates or self.converged(samples[i]):
+                    done[i] = True
+                    continue
+                else:
+                    target = self.replicates_needed(samples[i], replicates[i])
+                for k in range(replicates[i], target):
+                    jobs.append((i, dict(configuration, seed=replicate_seed(configuration['seed'], k))))
+            if not jobs:
+                break
+
+            rounds += 1
+            log.simulator.info('Round %d of the sequential sweep: %d replicates of %d configurations', rounds,
+                               len(jobs), len({i for i, _ in jobs}))
+            results = self.runner.run([job for _, job in jobs], on_result=on_result, emitted=emitted)
+            for (i, job), result in zip(jobs, results):
+                replicates[i] += 1 # Failed replicates count towards max_replicates too
+                if result is None:
+                    continue
+                for row in self.rows(result):
+                    for metric in self.metrics:
+                        if row.get(metric) is not None:
+                            samples[i][metric].append(float(row[metric]))
+
+        return [{'configuration': configuration, 'replicates': replicates[i], 'converged': self.converged(samples[i]),
+                 'metrics': self.summary(samples[i])} for i, configuration in enumerate(configurations)]
@@ -0,0 +1,72 @@
+import math
+import tempfile
+import unittest
+import numpy as np
+from SequentialSweep import SequentialSweep, interval, replicate_seed, t_quantile
+from SweepRunner import SweepRunner
+
+
+def noisy(job):
+    # Metric with mean job['mean'] and standard deviation job['noise'], a different draw for every seed
+    rng = np.random.default_rng(job['seed'])
+    return {'avg_inter_slot_time': job['mean'] + job['noise'] * rng.standard_normal(), 'avg_txs_per_slot': 10.0}
+
+
+class SequentialSweepTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def test_t_quantile(self):
+        for df, expected in [(1, 12.706), (2, 4.303), (4, 2.776), (10, 2.228), (30, 2.042)]:
+            self.assertAlmostEqual(t_quantile(0.95, df), expected, places=3)
+        self.assertAlmostEqual(t_quantile(0.99, 5), 4.032, places=3)
+        mean, half_width = interval([1.0, 2.0, 3.0])
+        self.assertEqual(mean, 2.0)
+        self.assertAlmostEqual(half_width, 4.303 / math.sqrt(3), places=3)
+        self.assertEqual(interval([1.0])[1], math.inf)
+
+    def test_replicates_follow_variance(self):
+        configurations = [{'mean': 5.0, 'noise': 0.0, 'seed': 1}, {'mean': 5.0, 'noise': 0.3, 'seed': 101}, {'mean': 5.0, 'noise': 50.0, 'seed': 0}]
+        runner = SweepRunner(noisy, self.directory.name, processes=2)
+        sweep = SequentialSweep(runner, ['avg_inter_slot_time', 'avg_txs_per_slot'], width=0.05, min_replicates=3, max_replicates=12)
+        finished = []
+        summaries = sweep.run(configurations, on_result=lambda job, result, error: finished.append(job))
+
+        self.assertEqual(summaries[0]['replicates'], 3) # No variance, stops right away
+        self.assertTrue(summaries[0]['converged'])
+        self.assertGreater(summaries[1]['replicates'], 3)
+        self.assertLess(summaries[1]['replicates'], 12)
+        self.assertTrue(summaries[1]['converged'])
+        self.assertEqual(summaries[2]['replicates'], 12) # Too noisy, runs up to the cap
+        self.assertFalse(summaries[2]['converged'])
+        self.assertEqual(sorted(job['seed'] for job in finished if job['noise'] == 0.0), sorted(replicate_seed(1, k) for k in range(3)))
+        self.assertEqual(summaries[2]['metrics']['avg_txs_per_slot'], {'mean': 10.0, 'half_width': 0.0, 'n': 12})
+
+        # Stored replicates are not run again
+        finished.clear()
+        self.assertEqual(sweep.run(configurations, on_result=lambda *args: finished.append(args)), summaries)
+        self.assertEqual(finished, [])
+
+    def test_absolute_width(self):
+        sweep = SequentialSweep(SweepRunner(noisy, self.directory.name, processes=1), ['avg_inter_slot_time'],
+                                width=1.0, relative=False, min_replicates=2, max_replicates=40)
+        summary, = sweep.run([{'mean': 0.0, 'noise': 1.0, 'seed': 3}])
+        self.assertTrue(summary['converged'])
+        self.assertLessEqual(summary['metrics']['avg_inter_slot_time']['half_width'], 1.0)
+        with self.assertRaises(ValueError):
+            SequentialSweep(None, ['avg_inter_slot_time'], width=1.0, min_replicates=1)
+        with self.assertRaises(ValueError):
+            sweep.run([{'mean': 0.0, 'noise': 1.0}])
+
+    def test_replicate_seeds_do_not_overlap(self):
+        # With seed + k, replicate 0 of seed 1 would be replicate 1 of seed 0
+        seeds = [[replicate_seed(seed, k) for k in range(20)] for seed in range(20)]
+        self.assertEqual(len({seed for replicates in seeds for seed in replicates}), 400)
+        self.assertEqual(replicate_seed(0, 1), int(np.random.SeedSequence(0).spawn(2)[1].generate_state(1)[0]))
+        self.assertNotEqual(replicate_seed(0, 0), replicate_seed(1, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -34,6 +34,7 @@ from Mempool import Mempool
 # import Globals
 from Globals import Globals
 from SCPExternalize import SCPExternalize
+from TopologySchedule import TopologySchedule
 
 VERBOSITY_DEFAULT = 1
 N_NODES_DEFAULT = 50
@@ -43,13 +44,18 @@ class Simulator:
     Command line (CLI) interface for the simulator.
     '''
 
-    def __init__(self,verbosity=VERBOSITY_DEFAULT,n_nodes=N_NODES_DEFAULT, max_simulation_time=10, simulation_params=None, **kvargs):
+    def __init__(self,verbosity=VERBOSITY_DEFAULT,n_nodes=N_NODES_DEFAULT, max_simulation_time=10, simulation_params=None, topology='HARDCODE', topology_seed=None, topology_schedule=None, topology_params=None, **kvargs):
 
         self._verbosity = verbosity
         self._n_nodes = n_nodes
 
         self._nodes = []
         self._max_simulation_time = max_simulation_time
+        self.topology = topology
+        self.topology_seed = topology_seed # Seed of synthetic topologies (TIERED)
+        self.topology_params = dict(topology_params or {}) # Parameters of synthetic topologies, see TieredTopology.generate
+        # Snapshots replayed at given simulation times [(time, snapshot JSON path), ...], instead of the topology
+        self.topology_schedule = TopologySchedule.open(topology_schedule) if topology_schedule else None
 
 
         self._set_logging()
@@ -57,7 +63,13 @@ class Simulator:
         # Total elapsed time doesn't include initialization!
         self.timeStart = time.time()
 
-        self._nodes = Network.generate_nodes(n_nodes=self._n_nodes, topology='HARDCODE', percent_threshold=1.0)
+        if self.topology_schedule is not None:
+            self._nodes = self.topology_schedule.build_nodes()
+            self._n_nodes = len(self._nodes)
+        else:
+            # TIERED nodes follow the thresholds of the generated quorum sets, HARDCODE has its own percent threshold
+            self._nodes = Network.generate_nodes(n_nodes=self._n_nodes, topology=self.topology, seed=self.topology_seed,
+                                                 topology_params=self.topology_params)
 
         if simulation_params is not None:
             self.simulation_params = simulation_params
@@ -148,10 +160,28 @@ class Simulator:
         # Run simulation
         while gillespie.check_max_time():
             event_random, Globals.simulation_time = gillespie.next_event()
+            if self.topology_schedule is not None:
+                self._apply_topology_changes(gillespie)
             self._handle_event(event_random)
 
         log.export_logs_to_txt("ledger_logs.txt")
 
+    def _apply_topology_changes(self, gillespie):
+        """
+        Applies the snapshots of the topology schedule which are due, nodes are changed in place.
+        """
+        diffs = self.topology_schedule.apply_due(Globals.simulation_time, self._nodes)
+        if not diffs:
+            return
+        for diff in diffs:
+            for key in diff['joined']:
+                self.topology_schedule.nodes_by_key[key].attach_mempool(Mempool())
+            if self._verbosity:
+                log.simulator.info('Topology changed at simulation time = %.3f: %d joined, %d left, %d quorum sets changed',
+                                   Globals.simulation_time, len(diff['joined']), len(diff['left']), len(diff['quorum_set']))
+        self._n_nodes = len(self._nodes)
+        gillespie.update_rates() # Event rates scale with the number of nodes
+
     def _handle_event(self,event):
         """
         Handles an event - chooses a random node to which event applies and send it to node.
@@ -209,9 +239,19 @@ if __name__=='__main__':
     parser=argparse.ArgumentParser()
     parser.add_argument("--verbosity","-v", type=int, default=VERBOSITY_DEFAULT, help="Verbosity level (0-5).")
     parser.add_argument("--nodes","-n", type=int, default=N_NODES_DEFAULT, help="Number of nodes.")
+    parser.add_argument("--topology","-t", choices=Network.topologies, default='HARDCODE', help="Network topology.")
+    parser.add_argument("--topology-seed", type=int, default=None, help="Seed of synthetic topologies.")
+    parser.add_argument("--tier1-threshold", type=float, default=None, help="Fraction of tier-1 organizations needed (TIERED).")
+    parser.add_argument("--organization-threshold", type=float, default=None, help="Fraction of the validators of an organization needed (TIERED).")
+    parser.add_argument("--tail-threshold", type=float, default=None, help="Fraction of the organizations in the local group of tail validators needed (TIERED).")
+    parser.add_argument("--tail-peers", type=int, default=None, help="Other tail organizations trusted by tail validators (TIERED).")
+    parser.add_argument("--topology-schedule", nargs='+', default=None, metavar="TIME=SNAPSHOT", help="Snapshots replayed at simulation times, instead of the topology.")
     args = parser.parse_args()
 
-    simulator = Simulator(verbosity=args.verbosity,n_nodes=args.nodes)
+    schedule = TopologySchedule.parse(args.topology_schedule) if args.topology_schedule else None
+    topology_params = {name: value for name, value in [('tier1_threshold', args.tier1_threshold), ('organization_threshold', args.organization_threshold),
+                                                       ('tail_threshold', args.tail_threshold), ('tail_peers', args.tail_peers)] if value is not None}
+    simulator = Simulator(verbosity=args.verbosity,n_nodes=args.nodes,topology=args.topology,topology_seed=args.topology_seed,topology_schedule=schedule,topology_params=topology_params)
 
     simulator.run()
 
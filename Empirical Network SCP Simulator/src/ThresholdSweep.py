@@ -0,0 +1,200 @@
+"""
+=========================
+ThresholdSweep
+=========================
+
+Author: Matija Piskorec, Jaime de Vivero Woods
+Last update: October 2026
+
+ThresholdSweep class.
+
+Static feasibility of a generated network (any topology of Network.generate_nodes) for a whole vector of quorum
+set thresholds at once, so that only the thresholds worth simulating are queued for full simulation runs.
+
+The topology is loaded once and compiled the way CriticalSets compiles it: node i needs minimum_quorum of its
+quorum set (top level and inner set members flattened, together with i itself). Every threshold t is applied
+to all nodes as QuorumSet.threshold, so node i needs ceil(size[i] * t) members (t a float in (0, 1]) or
+ceil(size[i] * t / 100) (t a percentage), exactly as QuorumSet.minimum_quorum. All thresholds are evaluated
+together, with the sets of nodes of every threshold as rows of a matrix and membership counts as one matrix
+product per step:
+- quorum: the largest quorum (the fixpoint removing unsatisfied nodes), a quorum exists if it is not empty;
+- intersection: True if every two quorums provably intersect, since for every two nodes i and j of the largest
+  quorum the members they share outnumber the members they can both miss (slack[i] + slack[j], slack being the
+  members a node can do without); False if two disjoint quorums were found (the largest quorum within a witness
+  region, either outside of the members of a node or a random half of the nodes, and the largest quorum outside
+  of that one); None if neither, QuorumIntersection or CriticalSets can then decide;
+- blocking sets: bounds on the size of the smallest blocking set. The lower bound holds since the first node
+  to drop out of the largest quorum must lose more than its slack within the largest quorum (members outside of
+  it never are in a quorum, so they cannot make up for the lost ones), or the whole largest quorum is the
+  blocking set. The upper bound is the size of a blocking set found by greedily removing the most trusted node.
+
+Usage: python ThresholdSweep.py --topology HARDCODE --thresholds 0.1 0.25 0.5 0.67 0.8 1.0
+"""
+
+import argparse
+
+import numpy as np
+
+from CriticalSets import flatten
+from Log import log
+
+WITNESSES_DEFAULT = 16 # Witness regions of each kind searched for disjoint quorums, per threshold
+
+
+def fraction(threshold):
+    """
+    Fraction of the members needed with QuorumSet.threshold of threshold, see QuorumSet.minimum_quorum.
+    """
+    if isinstance(threshold, float) and 0 < threshold <= 1:
+        return threshold
+    return threshold / 100.0
+
+
+class ThresholdSweep():
+
+    def __init__(self, nodes, seed=None):
+        self.nodes = list(nodes)
+        self.n = len(self.nodes)
+        self.rng = np.random.default_rng(seed)
+
+        position = {node.name: i for i, node in enumerate(self.nodes)}
+        self.members = np.zeros((self.n, self.n), dtype=bool) # members[i, j]: node j counts for node i
+        self.size = np.zeros(self.n, dtype=np.int64)
+        for i, node in enumerate(self.nodes):
+            quorum_set = node.quorum_set
+            self.size[i] = quorum_set.size
+            self.members[i, i] = True
+            for member in quorum_set.get_nodes() + flatten(quorum_set.get_inner_sets()):
+                if member.name in position: # Members outside of the network never sign anything
+                    self.members[i, position[member.name]] = True
+        self._members = self.members.astype(np.float32) # Counts are exact in float32 up to 2^24 nodes
+        self.member_counts = self.members.sum(axis=1)
+        self.shared = self._members @ self._members.T # Members shared by every two nodes
+
+    def __repr__(self):
+        return '[ThresholdSweep, nodes = %s]' % self.n
+
+    def needed(self, thresholds):
+        """
+        Members needed by every node (columns) with every threshold (rows).
+        """
+        fractions = np.array([fraction(t) for t in thresholds], dtype=np.float64)
+        return np.ceil(self.size[None, :] * fractions[:, None]).astype(np.int64)
+
+    def max_quorums(self, masks, needed):
+        """
+        Largest quorum within every row of masks, each row with the members needed in the same row of needed.
+        """
+        masks = masks.copy()
+        while True:
+            counts = masks.astype(np.float32) @ self._members.T
+            kept = masks & (counts >= needed)
+            if np.array_equal(kept, masks):
+                return masks
+            masks = kept
+
+    def intersection(self, quorums, needed, slack, witnesses=WITNESSES_DEFAULT):
+        """
+        Whether quorums intersect, for every row of largest quorums (and members needed, slacks): True, False or
+        None (unknown).
+        """
+        result = np.full(len(quorums), None, dtype=object)
+        for k, quorum in enumerate(quorums):
+            inside = np.flatnonzero(quorum)
+            if len(inside) == 0:
+                result[k] = True # No quorums, nothing to split
+                continue
+            margin = self.shared[np.ix_(inside, inside)] - slack[k, inside][:, None] - slack[k, inside][None, :]
+            if margin.min() > 0:
+                result[k] = True
+        unknown = np.flatnonzero(result == None)
+        if len(unknown) == 0:
+            return result
+
+        # Witness regions: the nodes of the largest quorum outside of the members of the nodes trusting the fewest
+        # others (they leave the most room outside), and random halves of the largest quorum
+        rows, regions = [], []
+        for k in unknown.tolist():
+            inside = np.flatnonzero(quorums[k])
+            for seed in inside[np.argsort(self.member_counts[inside], kind='stable')[:witnesses]].tolist():
+                rows.append(k)
+                regions.append(quorums[k] & ~self.members[seed])
+            for _ in range(witnesses):
+                half = np.zeros(self.n, dtype=bool)
+                half[self.rng.permutation(inside)[:(len(inside) + 1) // 2]] = True
+                rows.append(k)
+                regions.append(half)
+        rows, regions = np.array(rows), np.array(regions)
+        first = self.max_quorums(regions, needed[rows])
+        second = self.max_quorums(quorums[rows] & ~first, needed[rows])
+        disjoint = first.any(axis=1) & second.any(axis=1)
+        result[np.unique(rows[disjoint])] = False
+        return result
+
+    def blocking_bounds(self, quorums, needed):
+        """
+        (lower, upper) bounds of the size of the smallest blocking set, for every row of largest quorums.
+        """
+        sizes = quorums.sum(axis=1)
+        # Members a node can do without, counting only its members within the largest quorum of the row
+        slack = (quorums.astype(np.float32) @ self._members.T).astype(np.int64) - needed
+        lower = np.where(quorums, slack + 1, np.iinfo(np.int64).max).min(axis=1, initial=np.iinfo(np.int64).max)
+        lower = np.minimum(lower, sizes)
+        upper = np.zeros(len(quorums), dtype=np.int64)
+        remaining = quorums.copy()
+        while remaining.any():
+            alive = remaining.any(axis=1)
+            # Remove the node trusted by most nodes of the largest quorum left, in every row with a quorum left
+            trusted = remaining.astype(np.float32) @ self._members
+            trusted[~remaining] = -1
+            chosen = trusted.argmax(axis=1)
+            remaining[np.flatnonzero(alive), chosen[alive]] = False
+            upper += alive
+            remaining = self.max_quorums(remaining, needed)
+        return lower, upper
+
+    def evaluate(self, thresholds, witnesses=WITNESSES_DEFAULT):
+        """
+        Feasibility of every threshold, as a list of dicts (one per threshold, in order).
+        """
+        thresholds = list(thresholds)
+        needed = self.needed(thresholds)
+        slack = self.member_counts[None, :] - needed # Members a node can do without, negative if it never is satisfied
+        quorums = self.max_quorums(np.ones((len(thresholds), self.n), dtype=bool), needed)
+        intersection = self.intersection(quorums, needed, slack, witnesses=witnesses)
+        lower, upper = self.blocking_bounds(quorums, needed)
+        results = []
+        for k, t in enumerate(thresholds):
+            results.append({'threshold': t, 'quorum': bool(quorums[k].any()), 'largest_quorum': int(quorums[k].sum()),
+                            'intersection': intersection[k], 'blocking_lower': int(lower[k]), 'blocking_upper': int(upper[k])})
+        log.network.info('Evaluated %d thresholds on %d nodes', len(thresholds), self.n)
+        return results
+
+    @staticmethod
+    def feasible(results):
+        """
+        Thresholds worth simulating: quorums exist and they are not known to be split.
+        """
+        return [result['threshold'] for result in results if result['quorum'] and result['intersection'] is not False]
+
+
+if __name__=='__main__':
+
+    from Network import Network
+
+    parser=argparse.ArgumentParser()
+    parser.add_argument("--topology","-t", choices=Network.topologies, default='HARDCODE', help="Network topology.")
+    parser.add_argument("--nodes","-n", type=int, default=10, help="Number of nodes (for generated topologies).")
+    parser.add_argument("--thresholds", type=float, nargs='+', default=[round(0.05 * k, 2) for k in range(1, 21)], help="Thresholds (fractions up to 1, percentages above).")
+    parser.add_argument("--witnesses", type=int, default=WITNESSES_DEFAULT, help="Witness regions of each kind searched for disjoint quorums per threshold.")
+    parser.add_argument("--seed", type=int, default=None, help="Seed of the random witness regions.")
+    args = parser.parse_args()
+
+    sweep = ThresholdSweep(Network.generate_nodes(n_nodes=args.nodes, topology=args.topology), seed=args.seed)
+    results = sweep.evaluate(args.thresholds, witnesses=args.witnesses)
+    print(sweep)
+    print('threshold quorum largest_quorum intersection blocking_lower blocking_upper')
+    for result in results:
+        print('%9s %6s %14d %12s %14d %14d' % (result['threshold'], result['quorum'], result['largest_quorum'],
+                                                result['intersection'], result['blocking_lower'], result['blocking_upper']))
+    print('feasible: %s' % ThresholdSweep.feasible(results))
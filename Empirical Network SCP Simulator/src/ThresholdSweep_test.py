@@ -0,0 +1,77 @@
+import unittest
+import numpy as np
+from CriticalSets import CriticalSets
+from Network import Network
+from Node import Node
+from ThresholdSweep import ThresholdSweep, fraction
+
+THRESHOLDS = [0.1, 0.3, 0.5, 0.55, 0.67, 0.9, 1.0, 60]
+
+
+class ThresholdSweepTest(unittest.TestCase):
+
+    def assert_matches_critical_sets(self, nodes):
+        results = ThresholdSweep(nodes, seed=1).evaluate(THRESHOLDS)
+        self.assertEqual([result['threshold'] for result in results], THRESHOLDS)
+        for result in results:
+            for node in nodes:
+                node.quorum_set.threshold = result['threshold']
+            critical = CriticalSets(nodes)
+            largest = critical.max_quorum(critical.all)
+            self.assertEqual(result['quorum'], largest != 0)
+            self.assertEqual(result['largest_quorum'], largest.bit_count())
+            splitting = critical.minimal_splitting_sets()
+            if result['intersection'] is not None:
+                self.assertEqual(result['intersection'], 0 not in splitting, result)
+            smallest = min(blocking.bit_count() for blocking in critical.minimal_blocking_sets())
+            self.assertLessEqual(result['blocking_lower'], smallest)
+            self.assertGreaterEqual(result['blocking_upper'], smallest)
+        return results
+
+    def test_full_topology(self):
+        results = self.assert_matches_critical_sets(Network.generate_nodes(n_nodes=7, topology='FULL'))
+        by_threshold = {result['threshold']: result for result in results}
+        self.assertIs(by_threshold[0.3]['intersection'], False)
+        self.assertIs(by_threshold[0.67]['intersection'], True)
+        self.assertEqual(by_threshold[0.67]['blocking_lower'], by_threshold[0.67]['blocking_upper'])
+        self.assertEqual(ThresholdSweep.feasible(results), [0.5, 0.55, 0.67, 0.9, 1.0, 60])
+
+    def test_lunch_topology(self):
+        self.assert_matches_critical_sets(Network.generate_nodes(topology='LUNCH'))
+
+    def test_needed_follows_minimum_quorum(self):
+        nodes = Network.generate_nodes(n_nodes=5, topology='FULL')
+        sweep = ThresholdSweep(nodes)
+        for t in THRESHOLDS:
+            nodes[0].quorum_set.threshold = t
+            self.assertEqual(sweep.needed([t])[0, 0], nodes[0].quorum_set.minimum_quorum)
+        self.assertEqual(fraction(60), 0.6)
+        self.assertEqual(fraction(0.6), 0.6)
+
+    def test_members_outside_of_the_largest_quorum(self):
+        # X and Y are never satisfied, so A, B and C cannot count on them and any one of A, B, C blocks the quorum
+        nodes = [Node(name) for name in 'ABCXY']
+        for node in nodes[:3]:
+            node.set_quorum(nodes=nodes, inner_sets=[])
+        for node in nodes[3:]:
+            node.set_quorum(nodes=[Node('Z'), Node('W')], inner_sets=[])
+        result, = ThresholdSweep(nodes).evaluate([0.6])
+        self.assertEqual(result['largest_quorum'], 3)
+        for node in nodes:
+            node.quorum_set.threshold = 0.6
+        critical = CriticalSets(nodes)
+        smallest = min(blocking.bit_count() for blocking in critical.minimal_blocking_sets())
+        self.assertEqual(smallest, 1)
+        self.assertEqual((result['blocking_lower'], result['blocking_upper']), (1, 1))
+
+    def test_no_quorum(self):
+        nodes = Network.generate_nodes(n_nodes=4, topology='FULL')
+        for node in nodes:
+            node.set_quorum(nodes=[Node('X'), Node('Y')], inner_sets=[]) # Outside of the network, never satisfied
+        result, = ThresholdSweep(nodes).evaluate([1.0])
+        self.assertEqual((result['quorum'], result['intersection'], result['blocking_upper']), (False, True, 0))
+        self.assertTrue(np.all(ThresholdSweep(nodes).members == np.eye(4, dtype=bool)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,176 @@
+"""
+=========================
+TieredTopology
+=========================
+
+Author: Matija Piskorec, Jaime de Vivero Woods
+Last update: October 2026
+
+TieredTopology class.
+
+Synthetic Stellar-like networks of any size, generated straight into a CompiledSnapshot (see CompiledSnapshot
+for the arrays), so they are simulated (build_nodes) and analysed (QuorumIntersection, CriticalSets) exactly
+like the stellarbeat snapshots.
+
+Validators belong to organizations of 3-5 validators (a tail of fewer than 3 validators is one smaller organization). A tier-1 core of organizations trusts only itself, and
+the long tail trusts the core and a few other organizations:
+- tier-1 validator: threshold tier1_threshold of the tier-1 organizations, each an inner set with threshold
+  organization_threshold of its validators (the structure of the quorum sets of stellarbeat tier-1 validators);
+- tail validator: both the tier-1 core (an inner set with the tier-1 quorum set above nested in it) and its local
+  group, an inner set with threshold tail_threshold of its own organization and tail_peers other tail
+  organizations. Requiring the core keeps the tail from forming quorums of its own, as on the real network.
+Thresholds are fractions of the inner sets or validators, rounded up.
+
+Usage: python TieredTopology.py 1000 --seed 1 [--output tiered_1000.snapshot.npz]
+"""
+
+import argparse
+import math
+import time
+
+import numpy as np
+
+from CompiledSnapshot import CompiledSnapshot, FORMAT_VERSION
+from Log import log
+
+TIER1_ORGANIZATIONS_DEFAULT = 7
+TIER1_ORGANIZATION_SIZE = 3
+ORGANIZATION_SIZES = (3, 5) # Sizes of tail organizations, inclusive
+TAIL_PEERS_DEFAULT = 2
+
+
+def needed(fraction, count):
+    return max(1, math.ceil(fraction * count)) if count else 0
+
+
+class TieredTopology():
+
+    @classmethod
+    def organizations(cls, n_validators, tier1_organizations, rng):
+        """
+        Validator indices of every organization, tier-1 organizations first.
+        """
+        tier1_validators = tier1_organizations * TIER1_ORGANIZATION_SIZE
+        if n_validators < tier1_validators:
+            raise ValueError('Need at least %d validators for %d tier-1 organizations, got %d' %
+                             (tier1_validators, tier1_organizations, n_validators))
+        sizes = [TIER1_ORGANIZATION_SIZE] * tier1_organizations
+        left = n_validators - tier1_validators
+        while left > 0:
+            if left <= ORGANIZATION_SIZES[1]:
+                size = left # The last organization takes the rest
+            else:
+                # Leave at least the smallest organization for the rest
+                size = int(rng.integers(ORGANIZATION_SIZES[0], min(ORGANIZATION_SIZES[1], left - ORGANIZATION_SIZES[0]) + 1))
+            sizes.append(size)
+            left -= size
+        bounds = np.cumsum([0] + sizes).tolist()
+        return [list(range(bounds[k], bounds[k + 1])) for k in range(len(sizes))]
+
+    @classmethod
+    def generate(cls, n_validators, tier1_organizations=TIER1_ORGANIZATIONS_DEFAULT, tier1_threshold=0.67,
+                 organization_threshold=0.51, tail_threshold=0.67, tail_peers=TAIL_PEERS_DEFAULT, seed=None):
+        """
+        CompiledSnapshot of a tiered network of n_validators.
+        """
+        rng = np.random.default_rng(seed)
+        organizations = cls.organizations(n_validators, tier1_organizations, rng)
+        tier1, tail = organizations[:tier1_organizations], organizations[tier1_organizations:]
+
+        qset_threshold, validators, validators_indptr, children = [], [], [0], []
+
+        def add_qset(threshold, members):
+            q = len(qset_threshold)
+            qset_threshold.append(threshold)
+            validators.extend(members)
+            validators_indptr.append(len(validators))
+            children.append([])
+            return q
+
+        def add_core(parent):
+            # Inner sets are numbered after their parent, as in compiled snapshots
+            core = add_qset(needed(tier1_threshold, len(tier1)), [])
+            if parent is not None:
+                children[parent].append(core)
+            for members in tier1:
+                children[core].append(add_qset(needed(organization_threshold, len(members)), members))
+            return core
+
+        organization = np.empty(n_validators, dtype=np.int32)
+        for k, members in enumerate(organizations):
+            organization[members] = k
+
+        root = np.empty(n_validators, dtype=np.int32)
+        for members in tier1:
+            for v in members:
+                root[v] = add_core(None)
+        tail_validators = sum(len(members) for members in tail)
+        if len(tail) > 1 and tail_peers > 0:
+            # Other tail organizations of every tail validator (repeats are dropped, so sometimes fewer)
+            drawn = rng.integers(0, len(tail) - 1, size=(tail_validators, tail_peers)).tolist()
+        else:
+            drawn = [[] for _ in range(tail_validators)]
+        t = 0
+        for k, members in enumerate(tail):
+            for v in members:
+                peers = sorted({j + (j >= k) for j in drawn[t]}) # Skipping the own organization k
+                t += 1
+                trusted = [members] + [tail[j] for j in peers]
+                root[v] = add_qset(2, [])
+                add_core(root[v])
+                local = add_qset(needed(tail_threshold, len(trusted)), [])
+                children[root[v]].append(local)
+                for trusted_members in trusted:
+                    children[local].append(add_qset(needed(organization_threshold, len(trusted_members)), trusted_members))
+
+        children_indptr = np.zeros(len(children) + 1, dtype=np.int32)
+        np.cumsum([len(c) for c in children], out=children_indptr[1:])
+        public_keys = np.array(['V%d' % v for v in range(n_validators)], dtype=str)
+        arrays = {
+            'public_keys': public_keys,
+            'names': public_keys,
+            'isps': np.full(n_validators, '', dtype=str),
+            'countries': np.full(n_validators, '', dtype=str),
+            'active': np.ones(n_validators, dtype=bool),
+            'validating': np.ones(n_validators, dtype=bool),
+            'organization': organization,
+            'organization_names': np.array(['%s-%d' % ('tier1' if k < len(tier1) else 'tail', k)
+                                            for k in range(len(organizations))], dtype=str),
+            'root': root,
+            'qset_threshold': np.array(qset_threshold, dtype=np.int32),
+            'qset_validators_indptr': np.array(validators_indptr, dtype=np.int32),
+            'qset_validators': np.array(validators, dtype=np.int32),
+            'qset_children_indptr': children_indptr,
+            'qset_children': np.array([c for cs in children for c in cs], dtype=np.int32),
+            'dropped_keys': np.array([], dtype=str),
+        }
+        params = {'n_validators': n_validators, 'tier1_organizations': tier1_organizations,
+                  'tier1_threshold': tier1_threshold, 'organization_threshold': organization_threshold,
+                  'tail_threshold': tail_threshold, 'tail_peers': tail_peers, 'seed': seed}
+        metadata = {'version': FORMAT_VERSION, 'source': 'TieredTopology', 'params': params,
+                    'compiled_at': time.strftime('%Y-%m-%dT%H:%M:%S'), 'validators': n_validators,
+                    'quorum_sets': len(qset_threshold), 'organizations': len(organizations)}
+        log.network.info('Generated tiered topology: %d validators, %d organizations (%d tier-1), %d quorum sets',
+                         n_validators, len(organizations), len(tier1), len(qset_threshold))
+        return CompiledSnapshot(arrays, metadata)
+
+
+if __name__=='__main__':
+
+    parser=argparse.ArgumentParser()
+    parser.add_argument("validators", type=int, help="Number of validators.")
+    parser.add_argument("--tier1-organizations", type=int, default=TIER1_ORGANIZATIONS_DEFAULT, help="Number of tier-1 organizations.")
+    parser.add_argument("--tier1-threshold", type=float, default=0.67, help="Fraction of tier-1 organizations needed.")
+    parser.add_argument("--organization-threshold", type=float, default=0.51, help="Fraction of the validators of an organization needed.")
+    parser.add_argument("--tail-threshold", type=float, default=0.67, help="Fraction of the organizations in the local group of tail validators needed.")
+    parser.add_argument("--tail-peers", type=int, default=TAIL_PEERS_DEFAULT, help="Other tail organizations trusted by tail validators.")
+    parser.add_argument("--seed", type=int, default=None, help="Seed of the random generator.")
+    parser.add_argument("--output","-o", default=None, help="Compiled file to write.")
+    args = parser.parse_args()
+
+    snapshot = TieredTopology.generate(args.validators, tier1_organizations=args.tier1_organizations,
+                                       tier1_threshold=args.tier1_threshold, organization_threshold=args.organization_threshold,
+                                       tail_threshold=args.tail_threshold, tail_peers=args.tail_peers, seed=args.seed)
+    if args.output:
+        snapshot.save(args.output)
+    print(snapshot)
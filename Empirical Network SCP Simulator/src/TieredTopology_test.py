@@ -0,0 +1,86 @@
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+from CompiledSnapshot import CompiledSnapshot
+from Network import Network
+from QuorumIntersection import QuorumIntersection
+from TieredTopology import TieredTopology
+
+
+class TieredTopologyTest(unittest.TestCase):
+
+    def test_organizations_and_tiers(self):
+        snapshot = TieredTopology.generate(200, seed=1)
+        self.assertEqual(len(snapshot), 200)
+        sizes = np.bincount(snapshot.organization)
+        self.assertEqual(sizes[:7].tolist(), [3] * 7)
+        self.assertEqual(sizes.sum(), 200)
+        for n_validators in range(24, 60):
+            sizes = np.bincount(TieredTopology.generate(n_validators, seed=n_validators).organization)
+            self.assertTrue(all(3 <= size <= 5 for size in sizes[7:]), (n_validators, sizes))
+
+        # Tier-1: 5 of 7 organizations, 2 of 3 validators each
+        tier1 = snapshot.root[0]
+        self.assertEqual(snapshot.qset_threshold[tier1], 5)
+        self.assertEqual(len(snapshot.qset_validators_of(tier1)), 0)
+        organizations = snapshot.qset_children_of(tier1)
+        self.assertEqual([snapshot.qset_threshold[q] for q in organizations], [2] * 7)
+        self.assertEqual(sorted(v for q in organizations for v in snapshot.qset_validators_of(q)), list(range(21)))
+
+        # Tail: the whole tier-1 core nested in the quorum set, and its own organization
+        tail = snapshot.root[199]
+        self.assertEqual(snapshot.qset_threshold[tail], 2)
+        core, local = snapshot.qset_children_of(tail)
+        self.assertEqual(len(snapshot.qset_children_of(core)), 7)
+        self.assertIn(199, snapshot.qset_validators_of(snapshot.qset_children_of(local)[0]))
+        # Inner quorum sets are numbered after their parent
+        for q in range(len(snapshot.qset_threshold)):
+            self.assertTrue(all(child > q for child in snapshot.qset_children_of(q)))
+
+    def test_seeded_and_thresholds_configurable(self):
+        first, second = TieredTopology.generate(500, seed=3), TieredTopology.generate(500, seed=3)
+        self.assertTrue(np.array_equal(first.qset_validators, second.qset_validators))
+        loose = TieredTopology.generate(100, tier1_organizations=4, tier1_threshold=0.5, seed=3)
+        self.assertEqual(loose.qset_threshold[loose.root[0]], 2)
+        with self.assertRaises(ValueError):
+            TieredTopology.generate(10)
+
+    def test_quorum_intersection_depends_on_tier1_threshold(self):
+        self.assertTrue(QuorumIntersection(TieredTopology.generate(150, seed=2)).enjoys_quorum_intersection(processes=1))
+        self.assertFalse(QuorumIntersection(TieredTopology.generate(150, tier1_threshold=0.4, seed=2)).enjoys_quorum_intersection(processes=1))
+
+    def test_save_load_and_network(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, 'tiered.snapshot.npz')
+        snapshot = TieredTopology.generate(60, seed=4)
+        snapshot.save(path)
+        loaded = CompiledSnapshot.load(path)
+        self.assertEqual(loaded.metadata['params']['seed'], 4)
+        self.assertTrue(np.array_equal(loaded.qset_children, snapshot.qset_children))
+
+        nodes = Network.generate_nodes(n_nodes=60, topology='TIERED', seed=4)
+        self.assertEqual(len(nodes), 60)
+        self.assertEqual(len(nodes[59].quorum_set.get_inner_sets()), 2)
+
+    def test_simulated_thresholds_follow_declared_ones(self):
+        snapshot = TieredTopology.generate(60, seed=4)
+        nodes = Network.generate_nodes(n_nodes=60, topology='TIERED', seed=4)
+        # Tier-1: 5 of 7 organizations, 2 of 3 validators each
+        self.assertEqual((nodes[0].quorum_set.minimum_quorum, nodes[0].quorum_set.size), (10, 21))
+        # Tail: both the core (10 validators) and its local group
+        core, local = snapshot.qset_children_of(snapshot.root[59])
+        self.assertEqual(snapshot.declared_needed[core], 10)
+        self.assertEqual(snapshot.declared_needed[snapshot.root[59]], 10 + snapshot.declared_needed[local])
+        for i, node in enumerate(nodes):
+            self.assertEqual(node.quorum_set.minimum_quorum, snapshot.declared_needed[snapshot.root[i]])
+
+        loose = Network.generate_nodes(n_nodes=60, topology='TIERED', seed=4, topology_params={'tier1_organizations': 4, 'tier1_threshold': 0.5})
+        self.assertEqual((loose[0].quorum_set.minimum_quorum, loose[0].quorum_set.size), (4, 12))
+        flat = Network.generate_nodes(n_nodes=60, topology='TIERED', seed=4, percent_threshold=0.8)
+        self.assertEqual(flat[0].quorum_set.threshold, 17)
+
+if __name__ == "__main__":
+    unittest.main()
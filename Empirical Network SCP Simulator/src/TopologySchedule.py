@@ -0,0 +1,138 @@
+"""
+=========================
+TopologySchedule
+=========================
+
+Author: Matija Piskorec, Jaime de Vivero Woods
+Last update: October 2026
+
+TopologySchedule class.
+
+Replay of a time-varying network: a sequence of snapshots (CompiledSnapshot) with the simulation times at which
+they take effect, e.g. successive stellarbeat exports. The simulation starts from the nodes of the first
+snapshot, and every later snapshot is applied as a diff against the one before it, matched by public key:
+- joined: validators which are new, they get new nodes;
+- left: validators which are gone, their nodes are taken out of the simulation;
+- quorum_set: validators whose quorum set changed (validators, inner quorum sets or thresholds);
+- threshold: the validators among them whose quorum set changed in thresholds only.
+Quorum sets are compared in the canonical form of CompiledSnapshot.canonical_qset after undefined validators
+are dropped, so validators trusting a validator which joins or leaves count as changed too.
+
+Only the nodes of joined and changed validators get their quorum sets built again (and their priority lists,
+which are derived from their quorum sets, cleared). All other nodes, with all their state, are kept as they are.
+As in CompiledSnapshot.build_nodes, simulated thresholds are percent_threshold of the validators in the quorum
+set, so thresholds declared in the snapshots only matter for analysis of the current snapshot (e.g. with
+QuorumIntersection).
+
+Usage: python Simulator.py --topology-schedule 0=quorumset_20250131_095020.json 5=quorumset_05_06_2025.json
+"""
+
+from CompiledSnapshot import CompiledSnapshot
+from Log import log
+from Node import Node
+
+
+class TopologySchedule():
+
+    def __init__(self, snapshots, percent_threshold=1.0):
+        """
+        snapshots is a list of (simulation time, CompiledSnapshot), the first one is the initial topology.
+        """
+        if not snapshots:
+            raise ValueError('A topology schedule needs at least one snapshot')
+        self.snapshots = sorted(snapshots, key=lambda item: item[0])
+        self.percent_threshold = percent_threshold
+        self.snapshot = None # Snapshot currently simulated
+        self.next = 0 # Index of the next snapshot to apply
+        self.nodes_by_key = {}
+        self.diffs = [] # (time, diff) of every snapshot applied after the first one
+
+    def __repr__(self):
+        return '[TopologySchedule, snapshots = %s, times = %s]' % (len(self.snapshots), [t for t, _ in self.snapshots])
+
+    @classmethod
+    def open(cls, schedule, percent_threshold=1.0):
+        """
+        Schedule of (simulation time, snapshot JSON path), compiling the snapshots as needed.
+        """
+        return cls([(float(t), CompiledSnapshot.open(path)) for t, path in schedule], percent_threshold=percent_threshold)
+
+    @staticmethod
+    def parse(specs):
+        """
+        (simulation time, path) of every TIME=PATH of the command line.
+        """
+        schedule = []
+        for spec in specs:
+            t, separator, path = spec.partition('=')
+            if not separator or not path:
+                raise ValueError('Expected TIME=SNAPSHOT, got %s' % spec)
+            schedule.append((float(t), path))
+        return schedule
+
+    @staticmethod
+    def diff(old, new):
+        """
+        Public keys of the validators which joined, left, or changed quorum set (and threshold only) from snapshot
+        old to snapshot new.
+        """
+        old_keys, new_keys = old.public_keys.tolist(), new.public_keys.tolist()
+        diff = {'joined': sorted(set(new_keys) - set(old_keys)), 'left': sorted(set(old_keys) - set(new_keys)),
+                'quorum_set': [], 'threshold': []}
+        for key in sorted(set(old_keys) & set(new_keys)):
+            q_old, q_new = int(old.root[old.position[key]]), int(new.root[new.position[key]])
+            if q_old < 0 or q_new < 0:
+                if q_old != q_new:
+                    diff['quorum_set'].append(key)
+                continue
+            if old.canonical_qset(q_old) == new.canonical_qset(q_new):
+                continue
+            diff['quorum_set'].append(key)
+            if old.canonical_qset(q_old, thresholds=False) == new.canonical_qset(q_new, thresholds=False):
+                diff['threshold'].append(key)
+        return diff
+
+    def build_nodes(self):
+        """
+        Nodes of the first snapshot, the nodes which the simulation starts with.
+        """
+        self.snapshot = self.snapshots[0][1]
+        nodes = self.snapshot.build_nodes(self.percent_threshold)
+        self.nodes_by_key = {node.name: node for node in nodes}
+        self.next = 1
+        return nodes
+
+    def apply(self, snapshot, nodes):
+        """
+        Change nodes (the list of nodes in the simulation, in place) from the current snapshot to snapshot.
+        Returns the diff, see diff.
+        """
+        diff = self.diff(self.snapshot, snapshot)
+        for key in diff['joined']:
+            self.nodes_by_key[key] = Node(key)
+        left = {self.nodes_by_key.pop(key) for key in diff['left']}
+        nodes[:] = [node for node in nodes if node not in left] + [self.nodes_by_key[key] for key in diff['joined']]
+
+        indexed = [self.nodes_by_key[key] for key in snapshot.public_keys.tolist()]
+        for key in diff['joined'] + diff['quorum_set']:
+            node = self.nodes_by_key[key]
+            snapshot.set_quorum_set(snapshot.position[key], indexed, self.percent_threshold)
+            node.priority_list.clear()
+
+        self.snapshot = snapshot
+        log.network.info('Applied topology diff: %d joined, %d left, %d quorum sets changed (%d thresholds only)',
+                         len(diff['joined']), len(diff['left']), len(diff['quorum_set']), len(diff['threshold']))
+        return diff
+
+    def apply_due(self, time, nodes):
+        """
+        Apply all snapshots due by simulation time, returns their diffs.
+        """
+        applied = []
+        while self.next < len(self.snapshots) and self.snapshots[self.next][0] <= time:
+            t, snapshot = self.snapshots[self.next]
+            self.next += 1
+            diff = self.apply(snapshot, nodes)
+            self.diffs.append((t, diff))
+            applied.append(diff)
+        return applied
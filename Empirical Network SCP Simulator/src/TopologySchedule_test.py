@@ -0,0 +1,87 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from CompiledSnapshot import CompiledSnapshot
+from TopologySchedule import TopologySchedule
+
+
+def qset(threshold, validators, inner=()):
+    return {"threshold": threshold, "validators": validators, "innerQuorumSets": list(inner)}
+
+
+BEFORE = {"nodes": [
+    {"publicKey": "A", "quorumSet": qset(2, ["A", "B", "C"])},
+    {"publicKey": "B", "quorumSet": qset(2, ["A", "B", "C"])},
+    {"publicKey": "C", "quorumSet": qset(2, ["A", "B", "C"])},
+    {"publicKey": "D", "quorumSet": qset(1, ["D"], [qset(2, ["A", "B", "C"])])},
+    {"publicKey": "E", "quorumSet": qset(1, ["A", "E"])},
+]}
+
+AFTER = {"nodes": [
+    {"publicKey": "B", "quorumSet": qset(2, ["A", "B", "C"])}, # Order of validators does not matter
+    {"publicKey": "A", "quorumSet": qset(2, ["C", "B", "A"])},
+    {"publicKey": "C", "quorumSet": qset(3, ["A", "B", "C"])}, # Threshold only
+    {"publicKey": "D", "quorumSet": qset(1, ["D"], [qset(2, ["A", "B", "C", "F"])])}, # Trusts F
+    {"publicKey": "F", "quorumSet": qset(2, ["A", "B", "F"])}, # E left, F joined
+]}
+
+
+def names(members):
+    return [names(member) if isinstance(member, list) else member.name for member in members]
+
+
+class TopologyScheduleTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.schedule = []
+        for t, snapshot in ((0.0, BEFORE), (5.0, AFTER)):
+            path = os.path.join(self.directory, 'snapshot_%d.json' % t)
+            with open(path, 'w') as file:
+                json.dump(snapshot, file)
+            self.schedule.append((t, path))
+
+    def test_diff(self):
+        before, after = (CompiledSnapshot.open(path) for _, path in self.schedule)
+        self.assertEqual(TopologySchedule.diff(before, after),
+                         {'joined': ['F'], 'left': ['E'], 'quorum_set': ['C', 'D'], 'threshold': ['C']})
+        self.assertEqual(TopologySchedule.diff(before, before),
+                         {'joined': [], 'left': [], 'quorum_set': [], 'threshold': []})
+
+    def test_parse(self):
+        self.assertEqual(TopologySchedule.parse(['0=a.json', '2.5=b.json']), [(0.0, 'a.json'), (2.5, 'b.json')])
+        with self.assertRaises(ValueError):
+            TopologySchedule.parse(['a.json'])
+
+    def test_apply_due_rebuilds_only_affected_quorum_sets(self):
+        schedule = TopologySchedule.open(self.schedule)
+        nodes = schedule.build_nodes()
+        self.assertEqual([node.name for node in nodes], ['A', 'B', 'C', 'D', 'E'])
+        by_name = {node.name: node for node in nodes}
+        a_quorum_set = by_name['A'].quorum_set.nodes
+        by_name['A'].priority_list.add(by_name['B'])
+        by_name['D'].priority_list.add(by_name['A'])
+
+        self.assertEqual(schedule.apply_due(4.9, nodes), [])
+        diffs = schedule.apply_due(5.0, nodes)
+        self.assertEqual(len(diffs), 1)
+        self.assertEqual([node.name for node in nodes], ['A', 'B', 'C', 'D', 'F'])
+
+        # Unchanged nodes are the same objects, with the same quorum sets and caches
+        self.assertIs(nodes[0], by_name['A'])
+        self.assertIs(nodes[0].quorum_set.nodes, a_quorum_set)
+        self.assertEqual(len(by_name['A'].priority_list), 1)
+        # Changed ones trust the new nodes, and their caches are cleared
+        self.assertEqual(names(by_name['D'].quorum_set.inner_sets), [['A', 'B', 'C', 'F']])
+        self.assertIs(by_name['D'].quorum_set.inner_sets[0][3], nodes[4])
+        self.assertEqual(by_name['D'].priority_list, set())
+        self.assertEqual(names(nodes[4].quorum_set.nodes), ['A', 'B', 'F'])
+        self.assertIs(schedule.snapshot, schedule.snapshots[1][1])
+        self.assertEqual(schedule.apply_due(100.0, nodes), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
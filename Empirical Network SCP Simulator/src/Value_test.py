@@ -19,5 +19,16 @@ class ValueTest(unittest.TestCase):
         self.assertEqual(len(combined_value.transactions), 4)
         self.assertTrue(all(tx in combined_value.transactions for tx in transactions1 + transactions2)) # All transaction should be in the combined result
 
+    def test_value_is_immutable(self):
+        transactions = [Transaction(0), Transaction(0)]
+        value = Value(transactions=transactions)
+        transactions.append(Transaction(0)) # Changing the input afterwards does not change the value
+        self.assertEqual(len(value.transactions), 2)
+        self.assertEqual(value, Value(transactions=transactions[:2]))
+        with self.assertRaises(AttributeError):
+            value.transactions = []
+        with self.assertRaises(AttributeError):
+            value.transactions.add(Transaction(0))
+
 if __name__ == '__main__':
     unittest.main()
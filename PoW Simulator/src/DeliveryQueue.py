@@ -0,0 +1,62 @@
+"""
+=========================
+DeliveryQueue
+=========================
+
+Author: Matija Piskorec, Jaime de Vivero Woods
+Last update: October 2026
+
+DeliveryQueue class.
+
+Messages in flight between nodes, kept on a binary heap ordered by arrival time, so sending and delivering a
+message are both O(log n) in the number of messages in flight. The latency of every message is drawn from a
+LatencyModel. Links are FIFO: a message never arrives before a message sent earlier on the same link, so when
+latencies vary it arrives no earlier than its predecessor.
+"""
+
+import heapq
+import itertools
+
+from LatencyModel import LatencyModel
+
+
+class DeliveryQueue():
+
+    def __init__(self, latency=None):
+        self.latency = LatencyModel.of(latency)
+        self._heap = [] # (arrival time, sequence number, item), sequence number keeps equal arrival times in send order
+        self._sequence = itertools.count()
+        self._link_arrivals = {} # {(sender, receiver): arrival time of the last message sent on the link}
+
+    def __repr__(self):
+        return '[DeliveryQueue, in flight = %s, latency = %s]' % (len(self._heap), self.latency)
+
+    def __len__(self):
+        return len(self._heap)
+
+    def __bool__(self):
+        return bool(self._heap)
+
+    def send(self, time, sender, receiver, item):
+        """
+        Put item sent at time on the link between node indices sender and receiver, return its arrival time.
+        """
+        arrival = time + self.latency.sample(sender, receiver)
+        link = (sender, receiver)
+        previous = self._link_arrivals.get(link)
+        if previous is not None and previous > arrival:
+            arrival = previous
+        self._link_arrivals[link] = arrival
+        heapq.heappush(self._heap, (arrival, next(self._sequence), item))
+        return arrival
+
+    def next_arrival(self):
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, time):
+        """
+        Yield items which arrive up to time in order of arrival, including items sent while iterating.
+        """
+        heap = self._heap
+        while heap and heap[0][0] <= time:
+            yield heapq.heappop(heap)[2]
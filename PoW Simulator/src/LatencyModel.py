@@ -0,0 +1,93 @@
+"""
+=========================
+LatencyModel
+=========================
+
+Author: Matija Piskorec, Jaime de Vivero Woods
+Last update: October 2026
+
+LatencyModel class.
+
+Simulation time a message spends on the link between two nodes. Every link has a mean latency, either the same
+for all links or taken from a matrix of nodes x nodes (e.g. measured ping times between validators, loaded from
+a .npy or .csv file), and each message draws its latency from a distribution with that mean. Nodes are referred
+to by their index in the list of nodes of the simulation.
+"""
+
+import math
+import random
+
+import numpy as np
+
+LATENCY_DEFAULT = 0.01
+DISTRIBUTIONS = ('constant', 'uniform', 'exponential', 'lognormal')
+LOGNORMAL_SIGMA_DEFAULT = 0.5
+
+
+class LatencyModel():
+
+    def __init__(self, mean=LATENCY_DEFAULT, distribution='constant', matrix=None, sigma=LOGNORMAL_SIGMA_DEFAULT):
+        if distribution not in DISTRIBUTIONS:
+            raise ValueError('Unknown latency distribution %s, expected one of %s' % (distribution, DISTRIBUTIONS))
+        if matrix is not None:
+            matrix = np.asarray(matrix, dtype=float)
+            if matrix.ndim != 2 or matrix.shape[0] != matrix.shape[1]:
+                raise ValueError('Latency matrix must be square, got shape %s' % (matrix.shape,))
+            if (matrix < 0).any():
+                raise ValueError('Latency matrix must not contain negative latencies')
+        elif mean < 0:
+            raise ValueError('Latency must not be negative, got %s' % mean)
+
+        self.mean = mean
+        self.distribution = distribution
+        self.sigma = sigma
+        self.matrix = matrix
+        self._rows = matrix.tolist() if matrix is not None else None # Python floats are faster to look up one by one
+
+    def __repr__(self):
+        if self.matrix is not None:
+            return '[LatencyModel, distribution = %s, matrix = %sx%s]' % (self.distribution, *self.matrix.shape)
+        return '[LatencyModel, distribution = %s, mean = %s]' % (self.distribution, self.mean)
+
+    @classmethod
+    def from_file(cls, path, distribution='constant', sigma=LOGNORMAL_SIGMA_DEFAULT):
+        """
+        Mean latencies of all links from a .npy file or a comma separated text file.
+        """
+        matrix = np.load(path) if str(path).endswith('.npy') else np.loadtxt(path, delimiter=',')
+        return cls(distribution=distribution, matrix=matrix, sigma=sigma)
+
+    @classmethod
+    def of(cls, latency, distribution='constant'):
+        """
+        LatencyModel from a LatencyModel, a constant latency or the path of a latency matrix.
+        """
+        if isinstance(latency, cls):
+            return latency
+        if latency is None:
+            return cls(distribution=distribution)
+        try:
+            mean = float(latency)
+        except ValueError:
+            return cls.from_file(latency, distribution=distribution)
+        return cls(mean=mean, distribution=distribution)
+
+    def link_mean(self, sender, receiver):
+        if self._rows is None:
+            return self.mean
+        return self._rows[sender][receiver]
+
+    def sample(self, sender, receiver):
+        """
+        Latency of one message sent from node with index sender to node with index receiver.
+        """
+        mean = self.mean if self._rows is None else self._rows[sender][receiver]
+        if mean == 0 or self.distribution == 'constant':
+            return mean
+        match self.distribution:
+            case 'uniform':
+                return random.uniform(0, 2 * mean)
+            case 'exponential':
+                return random.expovariate(1 / mean)
+            case 'lognormal':
+                return random.lognormvariate(math.log(mean) - self.sigma ** 2 / 2, self.sigma)
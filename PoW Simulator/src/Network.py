@@ -4,27 +4,35 @@ Network
 =========================
 
 Author: Matija Piskorec, Jaime de Vivero Woods
-Last update: March 2025
+Last update: October 2026
 
 Network class. Setup Stellar validator network by initializing nodes and setting their quorum sets based on a predefined topology.
 """
 
 from Log import log
 from Node import Node
-import json
-import networkx as nx
+from TopologyGenerator import TopologyGenerator
+from TopologyStats import TopologyStats
 
 class Network():
 
-    topologies = ['FULL','ER', 'BA']
+    topologies = ['FULL','ER', 'BA', 'REGULAR']
+
+    @classmethod
+    def topology_stats(cls, nodes, seed=None):
+        """
+        TopologyStats of the peer graph of nodes, computed on demand.
+        """
+        return TopologyStats.of(nodes, lambda node: node.peers, seed=seed)
 
     @classmethod
     def generate_nodes(cls, n_nodes: int = 50, topology: str = 'FULL', *, degree: int = 10, seed=None):
         """
         Return a connected peer graph according to `topology`:
         - FULL: fully conntected graph (every node peers with every other).
-        - ER-SINGLEQUORUMSET: random connected Erdős–Rényi G(n,p) with avg degree ≈ `degree`.
-        - BA: Barabási–Albert scale-free network
+        - ER: random connected Erdős–Rényi G(n,p) with avg degree ≈ `degree`.
+        - BA: Barabási–Albert scale-free network, every new node linking to `degree` earlier nodes.
+        - REGULAR: random (near) regular graph, every node with `degree` peers.
         """
         assert topology in cls.topologies, f"Unknown topology: {topology}"
 
@@ -40,67 +48,21 @@ class Network():
             )
             return nodes
 
-        if topology == 'ER':
-            p = degree / (n_nodes - 1)
-            while True:
-                g = nx.fast_gnp_random_graph(n_nodes, p, seed=seed)
-                if nx.is_connected(g):
-                    break
-                seed = None
-
-            nodes = [Node(i) for i in range(n_nodes)]
-            for u, v in g.edges():
-                nodes[u].add_peer(nodes[v])
-                nodes[v].add_peer(nodes[u])
-
-            log.network.info(
-                "Built ER_STATIC graph: n=%d  k≈%d  p=%.4f  diameter=%d",
-                n_nodes, degree, p, nx.diameter(g)
-            )
-            return nodes
-
-        if topology == 'BA':
-            m = degree
-            nodes = [Node(i) for i in range(n_nodes)]
-            node_map = {int(n.name): n for n in nodes}
-
-            log.network.info(f"Building BA (Barabási–Albert) graph: n={n_nodes}, m={m}")
-            graph = nx.barabasi_albert_graph(n_nodes, m, seed=seed)
-
-            # Identify largest connected component (LCC)
-            lcc = max(nx.connected_components(graph), key=len)
-            missing = [i for i in range(n_nodes) if i not in lcc]
-            if missing:
-                log.network.info(f'Dropping isolated/excluded nodes: {missing}')
-
-            # Only keep nodes in the LCC
-            ba_nodes = [node_map[i] for i in lcc]
-            lcc_graph = graph.subgraph(lcc)
-
-            # Connect peers for each node in LCC
-            for node in ba_nodes:
-                idx = int(node.name)
-                nbrs = [nbr for nbr in lcc_graph.neighbors(idx)]
-                for n in nbrs:
-                    node.add_peer(node_map[n])  # Add peers (bi-directional)
-
-            for node in ba_nodes:
-                for peer in node.peers:
-                    if node not in peer.peers:
-                        peer.add_peer(node)
-
-            # Log peer degree stats
-            peer_degrees = [len(node.peers) for node in ba_nodes]
-            avg_degree = sum(peer_degrees) / len(peer_degrees) if peer_degrees else 0
-
-            with open('simulator_events_log.txt', 'a') as f:
-                f.write(
-                    f"[BA] n_nodes={n_nodes}, LCC_size={len(ba_nodes)}, avg_peer_degree={avg_degree:.2f}\n"
-                )
-
-            log.network.info(
-                f"Built BA graph: n={n_nodes}  LCC={len(ba_nodes)}  avg_degree={avg_degree:.2f}"
-            )
-            return ba_nodes
-
-
+        # Connected graphs without resampling (see TopologyGenerator), ER has average degree `degree`, BA m = `degree`
+        match topology:
+            case 'ER':
+                indptr, neighbors = TopologyGenerator.generate('ER', n_nodes, TopologyGenerator.rng(seed), degree=degree)
+            case 'BA':
+                log.network.info(f"Building BA (Barabási–Albert) graph: n={n_nodes}, m={degree}")
+                indptr, neighbors = TopologyGenerator.generate('BA', n_nodes, TopologyGenerator.rng(seed), m=degree)
+            case 'REGULAR':
+                indptr, neighbors = TopologyGenerator.generate('REGULAR', n_nodes, TopologyGenerator.rng(seed), degree=degree)
+
+        nodes = [Node(i) for i in range(n_nodes)]
+        for i, node in enumerate(nodes):
+            node.peers = [nodes[j] for j in neighbors[indptr[i]:indptr[i + 1]].tolist()] # Sorted and distinct already
+
+        log.network.info(
+            f"Built {topology} graph: n={n_nodes}  avg_degree={len(neighbors) / n_nodes:.2f}"
+        )
+        return nodes
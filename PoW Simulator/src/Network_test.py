@@ -26,5 +26,29 @@ class NetworkTest(unittest.TestCase):
                 log.test.debug('Node %s, all peers in quorum set = %s',node.name,node.quorum_set.get_nodes())
                 self.assertTrue(len(node.quorum_set.nodes) > 1)
 
+    def test_random_topologies_are_connected_with_degree(self):
+        for topology in ('ER', 'BA', 'REGULAR'):
+            nodes = Network.generate_nodes(n_nodes=300, topology=topology, degree=4, seed=1)
+            self.assertEqual(len(nodes), 300)
+            for node in nodes:
+                self.assertNotIn(node, node.peers)
+                self.assertTrue(all(node in peer.peers for peer in node.peers))
+            seen, frontier = {nodes[0]}, [nodes[0]]
+            while frontier:
+                frontier = [peer for node in frontier for peer in node.peers if peer not in seen]
+                seen.update(frontier)
+            self.assertEqual(len(seen), len(nodes))
+            average = sum(len(node.peers) for node in nodes) / len(nodes)
+            self.assertLess(abs(average - (8 if topology == 'BA' else 4)), 0.5)
+
+    def test_topology_stats_of_peer_graph(self):
+        nodes = Network.generate_nodes(n_nodes=200, topology='BA', degree=3, seed=2)
+        stats = Network.topology_stats(nodes, seed=0)
+        self.assertEqual(stats.n_edges, sum(len(node.peers) for node in nodes) // 2)
+        self.assertEqual(stats.n_components, 1)
+        lower, upper = stats.diameter
+        self.assertTrue(1 <= lower <= upper)
+        self.assertTrue(0 <= stats.average_clustering <= 1)
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
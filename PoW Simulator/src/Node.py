@@ -47,6 +47,10 @@ class Node():
         self.broadcast_flags = []  # Add every message here for other
         self.received_broadcast_msgs = {} # This hashmap (or dictionary) keeps track of all Messages retrieved by each node
 
+        # Set by the Simulator when blocks are pushed to peers over links with latency, instead of pulled from them
+        self.delivery_queue = None
+        self.index = None # Position of the node in the latency matrix
+
         log.node.info('Initialized node %s: blockchain=%s, mempool=%s, hash_rate=%.2f',
                       self.name,
                       self.blockchain,
@@ -86,14 +90,16 @@ class Node():
 
 
 
-    def create_transaction(self) -> Transaction:
+    def create_transaction(self, fee=None, tx_hash=None) -> Transaction:
         """
         Generate a tx, push it to the mempool, and set a fee equal to
         A log-normal distribution that models real-world variables.
         The fee cant be negative
+        Fee and hash are drawn here unless given (e.g. by an arrival of a TransactionStream)
         """
-        fee = max(1, int(random.lognormvariate(FEE_MEAN_LOG, FEE_SIGMA)))
-        tx = Transaction(fee=fee, timestamp=Globals.simulation_time)
+        if fee is None:
+            fee = max(1, int(random.lognormvariate(FEE_MEAN_LOG, FEE_SIGMA)))
+        tx = Transaction(fee=fee, timestamp=Globals.simulation_time, tx_hash=tx_hash)
 
         # Add local mempool but skip if duplicate
         if self.mempool.add_transaction(tx):
@@ -171,6 +177,9 @@ class Node():
             log.node.warning("Node %s: failed to add new block %s", self.name, new_block.hash)
             self.log_to_file(f"NODE - WARNING - Node {self.name} failed to add new block {new_block.hash}")
 
+        if added:
+            self.announce_block(new_block)
+
         # Remove selected txs from mempool
         for tx in selected:
             try:
@@ -257,6 +266,12 @@ class Node():
         if the new block with missing parents is longer then that one
         is set as the current main chain
         """
+        known = block.hash in self.blockchain.chain
+        self._process_received_block(peer, block)
+        if not known and block.hash in self.blockchain.chain:
+            self.announce_block(block, exclude=peer) # Relay blocks we learn about, like Bitcoin nodes do
+
+    def _process_received_block(self, peer, block):
         if block.prev_hash in self.blockchain.chain:
             log.node.info("Node %s received directly connectable block %s", self.name, block.hash)
             self.log_to_file(f"NODE - INFO - Node {self.name} received directly connectable block {block.hash}")
@@ -272,6 +287,16 @@ class Node():
             self.blockchain.orphans[block.hash] = block
             self.sync_missing_blocks(peer, block)
 
+    def announce_block(self, block, exclude=None):
+        """
+        Send block to all peers over the delivery queue, it reaches each of them after the latency of its link.
+        """
+        if self.delivery_queue is None:
+            return
+        for peer in self.peers:
+            if peer is not exclude:
+                self.delivery_queue.send(Globals.simulation_time, self.index, peer.index, (self, peer, block))
+
     def add_block_and_update_chain(self, block):
         """Add a block and update canonical chain if needed."""
         added = self.blockchain.add_block(block) # add block to blockchain
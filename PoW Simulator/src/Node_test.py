@@ -10,6 +10,8 @@ from Blockchain import Blockchain
 from unittest.mock import MagicMock, patch
 from unittest import mock
 from Globals import Globals
+from DeliveryQueue import DeliveryQueue
+from LatencyModel import LatencyModel
 import random
 
 
@@ -621,5 +623,30 @@ class NodeTest(unittest.TestCase):
 
         self.assertEqual(missing, [])  # All blocks already known
 
+    def test_mined_blocks_are_relayed_after_link_latency(self):
+        Globals.simulation_time = 0
+        queue = DeliveryQueue(LatencyModel(matrix=[[0, 1.0, 0], [1.0, 0, 2.0], [0, 2.0, 0]]))
+        nodes = [Node(i) for i in range(3)]
+        nodes[0].add_peer(nodes[1]); nodes[1].add_peer(nodes[0])
+        nodes[1].add_peer(nodes[2]); nodes[2].add_peer(nodes[1])
+        for i, node in enumerate(nodes):
+            node.index = i
+            node.delivery_queue = queue
+
+        block = nodes[0].mine()
+        self.assertEqual(queue.next_arrival(), 1.0)
+        for sender, receiver, received in queue.pop_due(1.0):
+            receiver.process_received_block(sender, received)
+        self.assertIn(block.hash, nodes[1].blockchain.chain)
+        self.assertNotIn(block.hash, nodes[2].blockchain.chain)
+
+        # Node 1 relays the block to node 2 only, it arrives two time units later
+        self.assertEqual(len(queue), 1)
+        self.assertEqual(queue.next_arrival(), 2.0)
+        for sender, receiver, received in queue.pop_due(2.0):
+            receiver.process_received_block(sender, received)
+        self.assertIn(block.hash, nodes[2].blockchain.chain)
+        self.assertFalse(queue)
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,272 @@
+"""
+=========================
+ResultsStore
+=========================
+
+Author: Matija Piskorec, Jaime de Vivero Woods
+Last update: October 2026
+
+ResultsStore class.
+
+Results of simulation runs (one row per run) in an SQLite database in WAL mode, instead of a CSV file which every
+worker appended to: readers (e.g. notebooks) never block the writer, and a run is either stored whole or not at
+all. Rows are written by a single ResultsWriter thread, fed through a queue by the workers (a multiprocessing
+queue) or by the process collecting their results (see SweepRunner).
+
+Columns are typed and created as rows bring them: ints and bools are INTEGER, floats REAL and everything else
+TEXT. Dicts (e.g. sim_params) are stored as JSON in their own column and flattened into one typed column per
+value as well (sim_params__mine__tau), so that sweeps can be filtered and grouped by any parameter in SQL.
+
+Reading is lazy: query yields rows from a cursor and dataframe reads only the rows and columns of its query
+(in chunks with chunksize), e.g. ResultsStore('simulation_summary.sqlite').dataframe('SELECT node_count,
+avg_inter_slot_time FROM runs WHERE all_tests_passed').
+
+Usage: python ResultsStore.py simulation_summary.sqlite [--csv simulation_summary.csv]
+"""
+
+import argparse
+import json
+import queue
+import re
+import sqlite3
+import threading
+import time
+
+from Log import log
+
+TABLE_DEFAULT = 'runs'
+JOB_KEY = 'job_key' # Column of the SweepRunner key of the job of a row
+BATCH_SIZE = 100 # Rows written by the writer in one transaction at most
+RETRIES = 8 # Attempts at writing a batch while the database is locked or busy
+RETRY_DELAY = 0.1 # Seconds before the first retry, doubled after every retry
+
+
+def column_type(value):
+    if isinstance(value, (bool, int)):
+        return 'INTEGER'
+    if isinstance(value, float):
+        return 'REAL'
+    return 'TEXT'
+
+
+def flatten(row, prefix=''):
+    """
+    Row as columns with plain values: dicts as JSON and flattened into prefixed columns, lists as JSON.
+    """
+    flat = {}
+    for name, value in row.items():
+        column = re.sub(r'\W', '_', prefix + str(name))
+        if isinstance(value, dict):
+            flat[column] = json.dumps(value, sort_keys=True)
+            flat.update(flatten(value, prefix=column + '__'))
+        elif isinstance(value, (list, tuple)):
+            flat[column] = json.dumps(value)
+        elif isinstance(value, bool):
+            flat[column] = int(value)
+        elif hasattr(value, 'item'): # NumPy scalars
+            flat[column] = value.item()
+        else:
+            flat[column] = value
+    return flat
+
+
+class ResultsStore():
+
+    def __init__(self, path, table=TABLE_DEFAULT):
+        self.path = path
+        self.table = table
+
+    def __repr__(self):
+        return '[ResultsStore, path = %s, table = %s]' % (self.path, self.table)
+
+    def connect(self):
+        connection = sqlite3.connect(self.path, timeout=60)
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute('PRAGMA synchronous=NORMAL')
+        return connection
+
+    def columns(self, connection):
+        return {row[1]: row[2] for row in connection.execute('PRAGMA table_info("%s")' % self.table)}
+
+    def insert(self, rows, connection=None):
+        """
+        Insert rows (dicts) in one transaction, adding the columns which are not in the table yet.
+        """
+        rows = [flatten(row) for row in rows]
+        if not rows:
+            return
+        own = connection is None
+        connection = connection or self.connect()
+        try:
+            with connection:
+                connection.execute('CREATE TABLE IF NOT EXISTS "%s" (id INTEGER PRIMARY KEY, recorded_at REAL)' % self.table)
+                existing = self.columns(connection)
+                for row in rows:
+                    for name, value in row.items():
+                        if name not in existing and value is not None:
+                            existing[name] = column_type(value)
+                            connection.execute('ALTER TABLE "%s" ADD COLUMN "%s" %s' % (self.table, name, existing[name]))
+                now = time.time()
+                for row in rows:
+                    names = [name for name in row if name in existing]
+                    connection.execute('INSERT INTO "%s" (recorded_at, %s) VALUES (?, %s)' % (
+                        self.table, ', '.join('"%s"' % name for name in names), ', '.join('?' * len(names))),
+                        [now] + [row[name] for name in names])
+        finally:
+            if own:
+                connection.close()
+
+    def job_keys(self, column=JOB_KEY):
+        """
+        Distinct values of column, the keys of the jobs whose rows are stored (see SweepRunner.run).
+        """
+        connection = self.connect()
+        try:
+            if column not in self.columns(connection):
+                return set()
+            return {row[0] for row in connection.execute(
+                'SELECT DISTINCT "%s" FROM "%s" WHERE "%s" IS NOT NULL' % (column, self.table, column))}
+        finally:
+            connection.close()
+
+    def query(self, sql=None, parameters=()):
+        """
+        Rows of sql (all rows by default) as dicts, read from the database as they are iterated.
+        """
+        connection = self.connect()
+        try:
+            cursor = connection.execute(sql or 'SELECT * FROM "%s"' % self.table, parameters)
+            names = [description[0] for description in cursor.description]
+            for row in cursor:
+                yield dict(zip(names, row))
+        finally:
+            connection.close()
+
+    def dataframe(self, sql=None, parameters=(), chunksize=None):
+        """
+        pandas DataFrame of sql (all rows by default), or an iterator of DataFrames of chunksize rows.
+        """
+        import pandas as pd
+        connection = self.connect()
+        if chunksize is None:
+            try:
+                return pd.read_sql_query(sql or 'SELECT * FROM "%s"' % self.table, connection, params=parameters)
+            finally:
+                connection.close()
+        return self._chunks(pd, connection, sql, parameters, chunksize)
+
+    def _chunks(self, pd, connection, sql, parameters, chunksize):
+        try:
+            yield from pd.read_sql_query(sql or 'SELECT * FROM "%s"' % self.table, connection, params=parameters, chunksize=chunksize)
+        finally:
+            connection.close()
+
+    def to_csv(self, path):
+        import csv
+        rows = self.query()
+        first = next(rows, None)
+        with open(path, 'w', newline='') as file:
+            if first is None:
+                return
+            writer = csv.DictWriter(file, fieldnames=list(first))
+            writer.writeheader()
+            writer.writerow(first)
+            writer.writerows(rows)
+
+    def writer(self, queue=None):
+        return ResultsWriter(self, queue)
+
+
+class ResultsWriter(threading.Thread):
+    """
+    The single writer of a ResultsStore: a thread inserting the rows put into its queue, in batches. Used as a
+    context manager, it starts on entry and writes everything put into the queue before exiting.
+
+    Batches are retried while the database is locked or busy. Rows which still cannot be written are counted in
+    failed (a failing batch is written row by row, so that only the bad rows are lost), and close() raises a
+    RuntimeError once the queue is drained, so that a sweep never loses results without failing.
+    """
+
+    def __init__(self, store, rows=None):
+        super().__init__(daemon=True)
+        self.store = store
+        self.queue = rows if rows is not None else queue.Queue()
+        self.written = 0
+        self.failed = 0
+        self.error = None # First error which lost rows
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def put(self, row):
+        self.queue.put(row)
+
+    def close(self):
+        self.queue.put(None)
+        self.join()
+        if self.failed:
+            raise RuntimeError('Could not write %d rows to %s: %s' % (self.failed, self.store.path, self.error)) from self.error
+
+    def write(self, rows, connection):
+        """
+        Insert rows in one transaction, retrying while the database is locked or busy.
+        """
+        for attempt in range(RETRIES):
+            try:
+                self.store.insert(rows, connection=connection)
+                return
+            except sqlite3.OperationalError as error:
+                if ('locked' not in str(error) and 'busy' not in str(error)) or attempt == RETRIES - 1:
+                    raise
+                log.simulator.warning('Database %s is busy, retrying: %s', self.store.path, error)
+                time.sleep(RETRY_DELAY * 2 ** attempt)
+
+    def run(self):
+        connection = self.store.connect()
+        try:
+            done = False
+            while not done:
+                batch = [self.queue.get()]
+                while len(batch) < BATCH_SIZE:
+                    try:
+                        batch.append(self.queue.get_nowait())
+                    except queue.Empty:
+                        break
+                if None in batch:
+                    done = True
+                    batch = [row for row in batch if row is not None]
+                try:
+                    self.write(batch, connection)
+                    self.written += len(batch)
+                except (sqlite3.Error, TypeError, ValueError):
+                    for row in batch:
+                        try:
+                            self.write([row], connection)
+                            self.written += 1
+                        except (sqlite3.Error, TypeError, ValueError) as error:
+                            log.simulator.error('Could not write row to %s: %s, row = %s', self.store.path, error, row)
+                            self.failed += 1
+                            self.error = self.error or error
+        finally:
+            connection.close()
+            log.simulator.info('Wrote %d rows to %s (%d failed)', self.written, self.store.path, self.failed)
+
+
+if __name__=='__main__':
+
+    parser=argparse.ArgumentParser()
+    parser.add_argument("database", help="Results database.")
+    parser.add_argument("--table", default=TABLE_DEFAULT, help="Table of results.")
+    parser.add_argument("--csv", default=None, help="Export all rows to this CSV file.")
+    args = parser.parse_args()
+
+    store = ResultsStore(args.database, table=args.table)
+    if args.csv:
+        store.to_csv(args.csv)
+    else:
+        for row in store.query():
+            print(row)
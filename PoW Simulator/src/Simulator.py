@@ -32,6 +32,9 @@ from Gillespie import Gillespie
 from POWConsensus import POWConsensus
 from Network import Network
 from Mempool import Mempool
+from DeliveryQueue import DeliveryQueue
+from LatencyModel import DISTRIBUTIONS as LATENCY_DISTRIBUTIONS, LatencyModel
+from TransactionStream import TransactionStream
 # import Globals
 from Globals import Globals
 
@@ -43,13 +46,25 @@ class Simulator:
     Command line (CLI) interface for the simulator.
     '''
 
-    def __init__(self,verbosity=VERBOSITY_DEFAULT,n_nodes=N_NODES_DEFAULT, simulation_params=None, topology='ER',**kvargs):
+    def __init__(self,verbosity=VERBOSITY_DEFAULT,n_nodes=N_NODES_DEFAULT, simulation_params=None, topology='ER', latency=None, degree=5, topology_seed=None, transaction_stream=None, **kvargs):
 
         self._verbosity = verbosity
         self._n_nodes = n_nodes
         self._nodes = []
         self._max_simulation_time = 5
         self.topology = topology
+        # Peer graph is BA with m = degree, reproducible with a topology_seed
+        self.degree = degree
+        # Transactions arrive from a TransactionStream instead of the create transaction event if given (common
+        # random numbers), on the peer graph of the stream unless topology_seed is given
+        self.transaction_stream = transaction_stream
+        if transaction_stream is not None and topology_seed is None:
+            topology_seed = transaction_stream.topology_seed
+        self.topology_seed = topology_seed
+        # Blocks are pulled from random peers, unless a latency (LatencyModel, constant or path of a latency matrix)
+        # is given, in which case mined blocks are pushed to peers and arrive after the latency of each link
+        self.latency = latency
+        self.delivery_queue = None
         self._set_logging()
 
         # Total elapsed time doesn't include initialization!
@@ -91,13 +106,20 @@ class Simulator:
         self._nodes = Network.generate_nodes(
             topology='BA',
             n_nodes=self._n_nodes,
-            degree=5,  # or pull from self._config if you’ve made it configurable
+            degree=self.degree,
+            seed=self.topology_seed,
         )
 
         # give each node its own mempool
         for node in self._nodes:
             node.attach_mempool(Mempool())
 
+        if self.latency is not None:
+            self.delivery_queue = DeliveryQueue(self.latency)
+            for i, node in enumerate(self._nodes):
+                node.index = i
+                node.delivery_queue = self.delivery_queue
+
         if self._verbosity:
             log.simulator.debug('Running Gillespie algorithm.')
 
@@ -129,6 +151,15 @@ class Simulator:
         # Remove events for which we don't have simulation parameters
         self._events = [event for event in self._events if event.simulation_params is not None]
 
+        # Pushed blocks are processed when they arrive, so there is nothing for nodes to pull
+        if self.delivery_queue is not None:
+            self._events = [event for event in self._events if event.name != 'receive block']
+
+        # Transactions of a stream are created when they arrive, in between the events
+        if self.transaction_stream is not None:
+            self.transaction_stream.reset()
+            self._events = [event for event in self._events if event.name != 'create transaction']
+
         print("Loaded events:")
         for event in self._events:
             print(f"  {event.name} — tau: {event.simulation_params.get('tau')}")
@@ -139,11 +170,27 @@ class Simulator:
 
         # Run simulation
         while gillespie.check_max_time():
-            event_random, Globals.simulation_time = gillespie.next_event()
+            event_random, event_time = gillespie.next_event()
+            if self.transaction_stream is not None:
+                # Arrivals after the end are never created, so every configuration creates the same ones
+                self._create_arrivals(min(event_time, self._max_simulation_time))
+            Globals.simulation_time = event_time
             self._handle_event(event_random)
+            if self.delivery_queue is not None:
+                for sender, receiver, block in self.delivery_queue.pop_due(Globals.simulation_time):
+                    receiver.process_received_block(sender, block)
 
         log.export_logs_to_txt("ledger_logs.txt")
 
+    def _create_arrivals(self, time):
+        """
+        Create the transactions of the stream which arrive up to time, each at its own arrival time.
+        """
+        for arrival in self.transaction_stream.due(time):
+            Globals.simulation_time = arrival.time
+            node = self._nodes[TransactionStream.node_index(arrival, len(self._nodes))]
+            node.create_transaction(fee=arrival.fee, tx_hash=arrival.hash)
+
     def _handle_event(self,event):
         """
         Handles an event - chooses a random node to which event applies and send it to node.
@@ -178,9 +225,17 @@ if __name__=='__main__':
     parser=argparse.ArgumentParser()
     parser.add_argument("--verbosity","-v", type=int, default=VERBOSITY_DEFAULT, help="Verbosity level (0-5).")
     parser.add_argument("--nodes","-n", type=int, default=N_NODES_DEFAULT, help="Number of nodes.")
+    parser.add_argument("--degree", type=int, default=5, help="Edges of every new node of the BA peer graph.")
+    parser.add_argument("--topology-seed", type=int, default=None, help="Seed of the random peer graph.")
+    parser.add_argument("--transaction-seed", type=int, default=None, help="Transactions arrive from a stream with this seed (shared by all configurations using it) instead of the create transaction event, on the peer graph of the stream unless --topology-seed is given.")
+    parser.add_argument("--latency", default=None, help="Push blocks to peers with this mean link latency - constant, or path of a .npy/.csv matrix of link latencies.")
+    parser.add_argument("--latency-distribution", choices=LATENCY_DISTRIBUTIONS, default='constant', help="Distribution of latencies around the mean latency of a link.")
     args = parser.parse_args()
 
-    simulator = Simulator(verbosity=args.verbosity,n_nodes=args.nodes)
+    latency = LatencyModel.of(args.latency, args.latency_distribution) if args.latency is not None else None
+    # Stream arrives at the rate of the default create transaction event, one transaction per node per unit of simulation time
+    transaction_stream = TransactionStream(args.transaction_seed, rate=args.nodes) if args.transaction_seed is not None else None
+    simulator = Simulator(verbosity=args.verbosity,n_nodes=args.nodes,latency=latency,degree=args.degree,topology_seed=args.topology_seed,transaction_stream=transaction_stream)
 
     simulator.run()
 
@@ -1,9 +1,12 @@
 import unittest
+import numpy as np
 from unittest.mock import patch
 from Gillespie import Gillespie
 from Simulator import Simulator, VERBOSITY_DEFAULT, N_NODES_DEFAULT
 from Mempool import Mempool
 from Event import Event
+from Node import Node
+from TransactionStream import TransactionStream
 
 
 class TestSimulatorPoW(unittest.TestCase):
@@ -24,6 +27,26 @@ class TestSimulatorPoW(unittest.TestCase):
         # Did we created the right number of nodes?
         self.assertTrue(len(simulator.nodes)==n_nodes)
 
+    def test_run_simulator_with_latency(self):
+        simulator = Simulator(verbosity=0, n_nodes=10, latency=0.05)
+        simulator.run()
+        self.assertTrue(all(node.delivery_queue is simulator.delivery_queue for node in simulator.nodes))
+        self.assertEqual(simulator.delivery_queue.latency.mean, 0.05)
+
+    def test_common_transaction_stream(self):
+        # Pulled and pushed blocks draw different random numbers, but create the same transactions on the same nodes
+        stream = TransactionStream(5, rate=10.0)
+        created = []
+        for seed, latency in [(1, None), (2, 0.05)]:
+            np.random.seed(seed)
+            simulator = Simulator(verbosity=0, n_nodes=10, latency=latency, transaction_stream=stream)
+            with patch.object(Node, 'create_transaction', autospec=True, side_effect=Node.create_transaction) as create:
+                simulator.run()
+            created.append([(node.name, kwargs['fee'], kwargs['tx_hash']) for (node,), kwargs in create.call_args_list])
+        self.assertEqual(simulator.topology_seed, 5)
+        self.assertEqual(created[0], created[1])
+        self.assertEqual(len(created[0]), len(list(TransactionStream(5, rate=10.0).due(simulator._max_simulation_time))))
+
     def test_gillespie(self):
         events = [Event('mine'),Event('gossip')]
         simulation_params = {'mine':{'tau':1.0,
@@ -0,0 +1,172 @@
+"""
+=========================
+TopologyGenerator
+=========================
+
+Author: Matija Piskorec, Jaime de Vivero Woods
+Last update: October 2026
+
+TopologyGenerator class.
+
+Random graph generators written with NumPy instead of networkx, so that topologies of 100k nodes build in
+seconds. Every generator returns an undirected simple graph as an edge array of shape (n_edges, 2) with
+u < v in every row, and adjacency turns it into CSR arrays (indptr, neighbors) with neighbors of every node
+in increasing order.
+
+Graphs are connected without resampling: connect_components adds one edge from every component other than
+the largest to a random node of the largest one.
+"""
+
+import random
+
+import numpy as np
+
+from Log import log
+
+VERSION = 1 # Part of the TopologyCache key, bump whenever the generated graphs change
+
+
+class TopologyGenerator():
+
+    @staticmethod
+    def rng(seed=None):
+        """
+        Random generator of the seed, or seeded from np.random when there is no seed (so np.random.seed applies).
+        """
+        return np.random.default_rng(seed if seed is not None else np.random.randint(2 ** 63 - 1, dtype=np.int64))
+
+    @staticmethod
+    def simple_edges(edges):
+        """
+        Edges without self loops and duplicates, as rows (u, v) with u < v.
+        """
+        edges = np.sort(np.asarray(edges, dtype=np.int64).reshape(-1, 2), axis=1)
+        edges = edges[edges[:, 0] != edges[:, 1]]
+        return np.unique(edges, axis=0)
+
+    @classmethod
+    def erdos_renyi(cls, n, p, rng):
+        """
+        G(n, p): every one of the n(n-1)/2 pairs is an edge with probability p.
+        """
+        pairs = n * (n - 1) // 2
+        n_edges = rng.binomial(pairs, p) if pairs else 0
+        # Distinct pair numbers k, drawn with replacement until there are enough of them
+        chosen = np.empty(0, dtype=np.int64)
+        while len(chosen) < n_edges:
+            chosen = np.unique(np.concatenate([chosen, rng.integers(0, pairs, n_edges - len(chosen), dtype=np.int64)]))
+        # Pair k is (i, j) with i < j, numbering pairs row by row of the upper triangle
+        k = chosen.astype(np.float64)
+        i = (n - 2 - np.floor(np.sqrt(-8 * k + 4 * n * (n - 1) - 7) / 2 - 0.5)).astype(np.int64)
+        j = chosen + i + 1 - pairs + (n - i) * (n - i - 1) // 2
+        return np.column_stack([i, j])
+
+    @classmethod
+    def barabasi_albert(cls, n, m, rng):
+        """
+        Preferential attachment: every new node links to m earlier nodes picked in proportion to their degree
+        (Batagelj-Brandes). The first m + 1 nodes form a star, as in networkx.
+        """
+        if m < 1 or m >= n:
+            raise ValueError('Barabasi-Albert network must have m >= 1 and m < n, m = %d, n = %d' % (m, n))
+        # ends[2e] and ends[2e + 1] are the ends of edge e, picking a random end picks a node by its degree
+        n_edges = m + (n - m - 1) * m
+        ends = [0] * (2 * n_edges)
+        ends[0:2 * m:2] = [0] * m
+        ends[1:2 * m:2] = range(1, m + 1)
+        draw = random.Random(int(rng.integers(2 ** 63 - 1))).random # Python floats one at a time are much faster
+        e = m
+        for v in range(m + 1, n):
+            limit = 2 * e # Only ends of edges of earlier nodes
+            targets = set()
+            while len(targets) < m:
+                targets.add(ends[int(draw() * limit)])
+            for target in targets:
+                ends[2 * e] = v
+                ends[2 * e + 1] = target
+                e += 1
+        return cls.simple_edges(ends)
+
+    @classmethod
+    def random_regular(cls, n, degree, rng):
+        """
+        Configuration model: degree stubs per node paired at random. Self loops and multiple edges of the pairing
+        are dropped instead of drawing the pairing again, so a few nodes end up with degree slightly below degree.
+        """
+        if n * degree % 2 != 0:
+            raise ValueError("n_nodes * degree must be even for a regular graph.")
+        stubs = np.repeat(np.arange(n, dtype=np.int64), degree)
+        rng.shuffle(stubs)
+        return cls.simple_edges(stubs.reshape(-1, 2))
+
+    @staticmethod
+    def components(n, edges):
+        """
+        Component label of every node, the smallest node index in its component.
+        """
+        labels = np.arange(n, dtype=np.int64)
+        if len(edges) == 0:
+            return labels
+        u, v = edges[:, 0], edges[:, 1]
+        while True:
+            previous = labels.copy()
+            smaller = np.minimum(labels[u], labels[v])
+            np.minimum.at(labels, u, smaller)
+            np.minimum.at(labels, v, smaller)
+            labels = labels[labels] # Pointer jumping, halves the distance to the smallest label
+            if np.array_equal(labels, previous):
+                return labels
+
+    @classmethod
+    def connect_components(cls, n, edges, rng):
+        """
+        Add one edge from a random node of every component to a random node of the largest component.
+        """
+        labels = cls.components(n, edges)
+        roots, sizes = np.unique(labels, return_counts=True)
+        if len(roots) <= 1:
+            return edges
+        largest = roots[np.argmax(sizes)]
+        giant = np.flatnonzero(labels == largest)
+        others = roots[roots != largest]
+        # A random node of every other component: shuffle all nodes, take the first of each label
+        order = rng.permutation(n)
+        first = {}
+        for node, label in zip(order.tolist(), labels[order].tolist()):
+            first.setdefault(label, node)
+        sources = np.array([first[label] for label in others.tolist()], dtype=np.int64)
+        targets = rng.choice(giant, len(sources))
+        log.network.debug('Connecting %d components to the largest component of %d nodes', len(sources), len(giant))
+        return cls.simple_edges(np.concatenate([edges, np.column_stack([sources, targets])]))
+
+    @staticmethod
+    def adjacency(n, edges):
+        """
+        CSR arrays (indptr, neighbors) of the undirected graph.
+        """
+        both = np.concatenate([edges, edges[:, ::-1]]) if len(edges) else np.empty((0, 2), dtype=np.int64)
+        order = np.lexsort((both[:, 1], both[:, 0]))
+        neighbors = both[order, 1]
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(both[:, 0], minlength=n), out=indptr[1:])
+        return indptr, neighbors
+
+    @classmethod
+    def generate(cls, kind, n, rng, p=None, degree=None, m=None):
+        """
+        Connected graph of the kind ('ER', 'BA' or 'REGULAR') as CSR arrays. ER takes p, or the average degree.
+        """
+        match kind:
+            case 'ER':
+                if p is None:
+                    p = min(1.0, degree / (n - 1)) if n > 1 else 0.0
+                edges = cls.erdos_renyi(n, p, rng)
+            case 'BA':
+                edges = cls.barabasi_albert(n, m, rng)
+            case 'REGULAR':
+                edges = cls.random_regular(n, degree, rng)
+            case _:
+                raise ValueError('Unknown graph kind %s' % kind)
+        edges = cls.connect_components(n, edges, rng)
+        log.network.debug('Generated %s graph with %d nodes and %d edges', kind, n, len(edges))
+        return cls.adjacency(n, edges)
@@ -14,9 +14,9 @@ import random
 import time
 
 class Transaction():
-    def __init__(self, *, fee=0, timestamp=None):
+    def __init__(self, *, fee=0, timestamp=None, tx_hash=None):
         self.fee = fee
-        self._hash = '%x' % random.getrandbits(32)
+        self._hash = tx_hash if tx_hash is not None else '%x' % random.getrandbits(32)
         self._timestamp = timestamp if timestamp is not None else time.time()
         log.transaction.info('Created transaction with hash %s and time %s', self._hash,self._timestamp)
 
@@ -0,0 +1,52 @@
+import unittest
+import numpy as np
+from TransactionStream import TransactionStream, BLOCK_SIZE
+
+
+class TransactionStreamTest(unittest.TestCase):
+
+    def test_same_seed_same_arrivals(self):
+        stream, ahead = TransactionStream(7, rate=20.0), TransactionStream(7, rate=20.0)
+        ahead.arrival(3 * BLOCK_SIZE) # Generated further ahead first
+        arrivals = [stream.arrival(k) for k in range(2 * BLOCK_SIZE)]
+        self.assertEqual(arrivals, [ahead.arrival(k) for k in range(2 * BLOCK_SIZE)])
+        self.assertNotEqual(arrivals[:10], [TransactionStream(8, rate=20.0).arrival(k) for k in range(10)])
+
+        times = [arrival.time for arrival in arrivals]
+        self.assertTrue(all(earlier < later for earlier, later in zip(times, times[1:])))
+        self.assertAlmostEqual(np.mean(np.diff(times)), 1 / 20.0, delta=0.005)
+        self.assertTrue(all(0 <= arrival.position < 1 and arrival.fee >= 1 for arrival in arrivals))
+        self.assertEqual(stream.topology_seed, 7)
+        self.assertEqual(TransactionStream(7, rate=1.0, topology_seed=3).topology_seed, 3)
+        with self.assertRaises(ValueError):
+            TransactionStream(7, rate=0)
+
+    def test_capacity_grows_geometrically(self):
+        stream = TransactionStream(7, rate=20.0)
+        capacities = set()
+        for k in range(0, 40 * BLOCK_SIZE, BLOCK_SIZE):
+            stream.arrival(k)
+            capacities.add(len(stream.times))
+        # 40 blocks fit in 6 doublings of the arrays, not 40 copies of everything generated so far
+        self.assertEqual(sorted(capacities), [BLOCK_SIZE * 2 ** i for i in range(7)])
+        self.assertEqual(stream.generated, 40 * BLOCK_SIZE)
+
+    def test_due(self):
+        stream = TransactionStream(1, rate=10.0)
+        first = list(stream.due(2.0))
+        self.assertTrue(all(arrival.time <= 2.0 for arrival in first))
+        self.assertGreater(stream.arrival(stream.next).time, 2.0)
+        later = list(stream.due(5.0))
+        self.assertTrue(all(2.0 < arrival.time <= 5.0 for arrival in later))
+
+        stream.reset()
+        self.assertEqual(list(stream.due(5.0)), first + later)
+        stream.reset(2)
+        self.assertEqual((stream.seed, stream.next, stream.topology_seed), (2, 0, 1))
+        self.assertNotEqual(list(stream.due(5.0)), first + later)
+        self.assertEqual([TransactionStream.node_index(arrival, 4) for arrival in first],
+                         [int(arrival.position * 4) for arrival in first])
+
+
+if __name__ == "__main__":
+    unittest.main()
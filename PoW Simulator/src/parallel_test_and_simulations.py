@@ -8,33 +8,9 @@ from collections import Counter
 import unittest
 import contextlib
 
-import os, csv, json
-
-SUMMARY_CSV = os.path.join("..", "simulation_summary.csv")
-FIELDNAMES = [
-    "node_count",
-    "simulation_time",
-    "sim_params",
-    "total_tx_created",
-    "main_chain_length",
-    "total_tx_in_mainchain",
-    "total_stale_blocks",
-    "avg_depth_stale_blocks",
-    "avg_blocks_per_node",
-    "avg_inter_block_time",
-    "avg_messages_per_block",
-    "all_tests_passed"
-]
-
-def append_summary_row(row: dict):
-    os.makedirs(os.path.dirname(SUMMARY_CSV), exist_ok=True)
-    file_exists = os.path.isfile(SUMMARY_CSV)
-    with open(SUMMARY_CSV, "a", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=FIELDNAMES)
-        if not file_exists:
-            writer.writeheader()
-        writer.writerow(row)
+import os, json
 
+RESULTS_DB = os.path.join("logs", "simulation_summary.sqlite")
 
 ROOT = os.path.abspath(os.path.join(__file__, os.pardir, os.pardir))
 SRC = os.path.join(ROOT, "src")
@@ -43,6 +19,7 @@ sys.path.insert(0, SRC)
 from Simulator import Simulator, Globals
 from TestPOWSimulator import parse_pow_logs
 from Block import Block
+from ResultsStore import ResultsStore
 
 ROOT = os.path.abspath(os.path.join(__file__, os.pardir, os.pardir))
 SRC = os.path.join(ROOT, "src")
@@ -189,6 +166,14 @@ class TestPoWSimulator(unittest.TestCase):
             return total_msg_count / n_blocks
 
 
+_rows = None # Queue of result rows, written by a single ResultsWriter in the main process
+
+
+def _start_worker(rows):
+    global _rows
+    _rows = rows
+
+
 def worker(run_id: int, n_nodes: int, max_sim_time: float) -> bool:
     """Runs PoW tests in its own log folder; returns True if all tests pass."""
     run_dir = os.path.join("logs", f"run_{run_id}")
@@ -303,23 +288,23 @@ def worker(run_id: int, n_nodes: int, max_sim_time: float) -> bool:
         blocks_per_node = [counts_dict.get(i, 0) for i in range(n_nodes)]
         avg_blocks_per_node = sum(blocks_per_node) / n_nodes
 
-        append_summary_row({
+        _rows.put({
             "node_count": n_nodes,
             "simulation_time": max_sim_time,
-            "sim_params": json.dumps({
+            "sim_params": {
                 "n_nodes": n_nodes,
                 "sim_duration": max_sim_time,
                 "mine": 1.0,
                 "Max_Txs": 100
-            }),
+            },
             "total_tx_created": total_tx_created,
             "main_chain_length": main_chain_length,
             "total_tx_in_mainchain": total_tx_in_mainchain,
             "total_stale_blocks": total_stale_blocks,
-            "avg_depth_stale_blocks": f"{avg_depth_stale:.2f}",
-            "avg_blocks_per_node": f"{avg_blocks_per_node:.2f}",
-            "avg_inter_block_time": f"{avg_inter:.2f}",
-            "avg_messages_per_block": f"{avg_messages_per_block:.2f}",
+            "avg_depth_stale_blocks": avg_depth_stale,
+            "avg_blocks_per_node": avg_blocks_per_node,
+            "avg_inter_block_time": avg_inter,
+            "avg_messages_per_block": avg_messages_per_block,
             "all_tests_passed": result.wasSuccessful(),
         })
 
@@ -348,6 +333,11 @@ def main():
         required=True,
         help="List of max simulation times, one per run."
     )
+    parser.add_argument(
+        "--results-db",
+        default=RESULTS_DB,
+        help="SQLite database the summary of every run is written to."
+    )
     args = parser.parse_args()
     if len(args.n_nodes) != len(args.max_simulation_time):
         parser.error(
@@ -358,8 +348,12 @@ def main():
     pool_size = min(cpu_count, len(params))
     print(f"Launching {len(params)} jobs on up to {pool_size} cores…")
 
-    with multiprocessing.Pool(pool_size) as pool:
-        results = pool.starmap(worker, params)
+    # Workers put their summary rows into a managed queue, written to the database by a single writer
+    with multiprocessing.Manager() as manager:
+        rows = manager.Queue()
+        with ResultsStore(os.path.abspath(args.results_db)).writer(rows):
+            with multiprocessing.Pool(pool_size, initializer=_start_worker, initargs=(rows,)) as pool:
+                results = pool.starmap(worker, params)
 
     if not all(results):
         print("One or more runs failed. Check individual logs for details.")
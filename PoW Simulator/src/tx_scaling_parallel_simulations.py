@@ -4,7 +4,6 @@ import argparse
 import multiprocessing
 import math
 import contextlib
-import csv
 import json
 from collections import Counter
 
@@ -15,25 +14,20 @@ sys.path.insert(0, SRC)
 from Simulator import Simulator, Globals
 from TestPOWSimulator import parse_pow_logs
 from Block import Block
+from ResultsStore import ResultsStore
+from TransactionStream import TransactionStream
 
-SUMMARY_CSV = os.path.join("..", "simulation_summary.csv")
-FIELDNAMES = [
-    "node_count", "simulation_time", "sim_params", "total_tx_created",
-    "main_chain_length", "total_tx_in_mainchain", "total_stale_blocks",
-    "avg_depth_stale_blocks", "avg_blocks_per_node", "avg_inter_block_time",
-    "avg_messages_per_block", "all_tests_passed"
-]
-
-def append_summary_row(row: dict):
-    os.makedirs(os.path.dirname(SUMMARY_CSV), exist_ok=True)
-    file_exists = os.path.isfile(SUMMARY_CSV)
-    with open(SUMMARY_CSV, "a", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=FIELDNAMES)
-        if not file_exists:
-            writer.writeheader()
-        writer.writerow(row)
-
-def worker(run_id, n_nodes, max_sim_time, simulation_params):
+RESULTS_DB = os.path.join("logs", "simulation_summary.sqlite")
+
+_rows = None # Queue of result rows, written by a single ResultsWriter in the main process
+
+
+def _start_worker(rows):
+    global _rows
+    _rows = rows
+
+
+def worker(run_id, n_nodes, max_sim_time, simulation_params, transaction_seed=None):
     run_dir = os.path.join("logs", f"run_{run_id}")
     os.makedirs(run_dir, exist_ok=True)
     cwd = os.getcwd()
@@ -41,7 +35,12 @@ def worker(run_id, n_nodes, max_sim_time, simulation_params):
 
     try:
         Globals.simulation_time = 0.0
-        sim = Simulator(verbosity=5, n_nodes=n_nodes, simulation_params=simulation_params)
+        # Runs with the same transaction seed create the same transactions on the same peer graph
+        transaction_stream = None
+        if transaction_seed is not None:
+            tau = simulation_params.get("create transaction", {}).get("tau", 1.0)
+            transaction_stream = TransactionStream(transaction_seed, rate=n_nodes / tau)
+        sim = Simulator(verbosity=5, n_nodes=n_nodes, simulation_params=simulation_params, transaction_stream=transaction_stream)
         sim._max_simulation_time = max_sim_time
         sim._simulation_params = simulation_params
         sim.run()
@@ -130,18 +129,19 @@ def worker(run_id, n_nodes, max_sim_time, simulation_params):
         blocks_per_node = [counts_dict.get(i, 0) for i in range(n_nodes)]
         avg_blocks_per_node = sum(blocks_per_node) / n_nodes
 
-        append_summary_row({
+        _rows.put({
             "node_count": n_nodes,
             "simulation_time": max_sim_time,
             "sim_params": simulation_params,
+            "transaction_seed": transaction_seed,
             "total_tx_created": total_tx_created,
             "main_chain_length": len(main_hashes),
             "total_tx_in_mainchain": total_tx_in_mainchain,
             "total_stale_blocks": len(stale_hashes),
-            "avg_depth_stale_blocks": f"{avg_depth_stale:.2f}",
-            "avg_blocks_per_node": f"{avg_blocks_per_node:.2f}",
-            "avg_inter_block_time": f"{avg_inter:.2f}",
-            "avg_messages_per_block": f"{avg_messages_per_block:.2f}",
+            "avg_depth_stale_blocks": avg_depth_stale,
+            "avg_blocks_per_node": avg_blocks_per_node,
+            "avg_inter_block_time": avg_inter,
+            "avg_messages_per_block": avg_messages_per_block,
             "all_tests_passed": True
         })
         return True
@@ -155,6 +155,8 @@ def main():
     parser.add_argument("--max-simulation-time", type=float, nargs='+', required=True)
     parser.add_argument("--simulation-params", type=str, nargs='+', required=True, help="List of JSON strings")
     parser.add_argument("--topology", type=str, required=True, help="Network topology (e.g., FULL, ER, BA)")
+    parser.add_argument("--results-db", default=RESULTS_DB, help="SQLite database the summary of every run is written to")
+    parser.add_argument("--transaction-seed", type=int, default=None, help="All runs create the transactions of a stream with this seed on the same peer graph (common random numbers)")
     args = parser.parse_args()
 
     if not (len(args.n_nodes) == len(args.max_simulation_time) == len(args.simulation_params)):
@@ -167,10 +169,14 @@ def main():
         param_dict["topology"] = args.topology
         parsed_params.append(param_dict)
 
-    params = [(i + 1, n, t, p) for i, (n, t, p) in enumerate(zip(args.n_nodes, args.max_simulation_time, parsed_params))]
+    params = [(i + 1, n, t, p, args.transaction_seed) for i, (n, t, p) in enumerate(zip(args.n_nodes, args.max_simulation_time, parsed_params))]
 
-    with multiprocessing.Pool(min(len(params), multiprocessing.cpu_count())) as pool:
-        results = pool.starmap(worker, params)
+    # Workers put their summary rows into a managed queue, written to the database by a single writer
+    with multiprocessing.Manager() as manager:
+        rows = manager.Queue()
+        with ResultsStore(os.path.abspath(args.results_db)).writer(rows):
+            with multiprocessing.Pool(min(len(params), multiprocessing.cpu_count()), initializer=_start_worker, initargs=(rows,)) as pool:
+                results = pool.starmap(worker, params)
 
     if not all(results):
         print("Some runs failed—check logs.")
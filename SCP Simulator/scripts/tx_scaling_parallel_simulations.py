@@ -1,42 +1,18 @@
 #!/usr/bin/env python3
 import copy
-import multiprocessing
+import hashlib
 import os
+import random
 import sys
 import argparse
-import csv
 import json
 import re
 from collections import defaultdict
+import numpy as np
 import pandas as pd
 
 print(f" Booting {__file__}, argv={sys.argv!r}")
 
-SUMMARY_CSV = os.path.abspath(
-    os.path.join(os.path.dirname(__file__), "simulation_summary.csv")
-)
-FIELDNAMES = [
-    "node_count",
-    "simulation_time",
-    "sim_params",
-    "total_tx_created",
-    "total_slots",
-    "total_tx_in_all_slots",
-    "avg_txs_per_slot",
-    "avg_inter_slot_time",
-    "messages_per_slot_finalisation",
-    "all_tests_passed",
-]
-
-def append_summary_row(row: dict):
-    os.makedirs(os.path.dirname(SUMMARY_CSV), exist_ok=True)
-    write_header = not os.path.isfile(SUMMARY_CSV)
-    with open(SUMMARY_CSV, "a", newline="") as f:
-        w = csv.DictWriter(f, fieldnames=FIELDNAMES)
-        if write_header:
-            w.writeheader()
-        w.writerow(row)
-
 def get_transaction_count(line):
     pattern = r"transactions = \{([^}]+)\}"
     match = re.search(pattern, line)
@@ -166,96 +142,219 @@ ROOT = os.path.abspath(os.path.join(__file__, os.pardir, os.pardir))
 SRC = os.path.join(ROOT, "src")
 sys.path.insert(0, SRC)
 from Simulator import Simulator
+from SweepRunner import SweepRunner, code_version, RETRIES_DEFAULT
+from WarmStart import WarmStart
+from ResultsStore import ResultsStore
+from SequentialSweep import SequentialSweep, CONFIDENCE_DEFAULT, MIN_REPLICATES_DEFAULT, MAX_REPLICATES_DEFAULT
+from TransactionStream import TransactionStream
+
+RESULTS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "sweep_results"))
+RESULTS_DB = os.path.abspath(os.path.join(os.path.dirname(__file__), "simulation_summary.sqlite"))
+CI_METRICS = ["avg_inter_slot_time", "avg_txs_per_slot"] # Metrics whose confidence intervals stop sequential replicates
+
+def run_name(job: dict) -> str:
+    return hashlib.sha1(json.dumps(job, sort_keys=True).encode()).hexdigest()[:12]
+
+def summary_row(job: dict, run_dir: str) -> dict:
+    n_nodes = job["n_nodes"]
+    events_log = os.path.join(run_dir, "simulator_events_log.txt")
+    ledger_log = os.path.join(run_dir, "ledger_logs.txt")
+    print(f"[worker] Parsing events from {events_log}")
+    (total_tx_created,
+     total_slots,
+     total_tx_in_all_slots,
+     avg_txs_per_slot,
+     avg_inter_slot_time,
+     avg_msgs_to_finalise) = compute_summary_metrics(events_log, ledger_log, n_nodes)
+    print(f"[worker] → created: {total_tx_created}, slots: {total_slots}, finalised: {total_tx_in_all_slots}")
+
+    mine_log = os.path.join(run_dir, "simulator_mine_events.txt")
+    if os.path.isfile(mine_log):
+        total_tx_created = compute_total_tx_created(mine_log)
+    else:
+        print(f"[worker] Mine log missing: {mine_log} -- will report 0 mined txs")
+        total_tx_created = 0
 
-def worker(run_id: int, n_nodes: int, max_sim_time: float, simulation_params: dict) -> bool:
-    serializable_simulation_params = copy.deepcopy(simulation_params)
+    return {
+        "node_count": n_nodes,
+        "simulation_time": job["max_simulation_time"],
+        "sim_params": job["simulation_params"],
+        "total_tx_created": total_tx_created,
+        "total_slots": int(total_slots),
+        "total_tx_in_all_slots": total_tx_in_all_slots,
+        "avg_txs_per_slot": avg_txs_per_slot,
+        "avg_inter_slot_time": avg_inter_slot_time,
+        "messages_per_slot_finalisation" : avg_msgs_to_finalise,
+        "seed": job["seed"],
+        "transaction_seed": job["seed"] if job.get("common_random_numbers") else None,
+        "all_tests_passed": True,
+    }
 
-    run_dir = os.path.join("logs", f"run_{run_id}")
+def transaction_stream(job: dict):
+    # With common random numbers, transactions arrive from a stream of the seed, the same for every job with that seed
+    if not job.get("common_random_numbers"):
+        return None
+    tau = job["simulation_params"].get("mine", {}).get("tau", 1.0)
+    return TransactionStream(job["seed"], rate=job["n_nodes"] / tau)
+
+def worker(job: dict) -> dict:
+    n_nodes, max_sim_time = job["n_nodes"], job["max_simulation_time"]
+    simulation_params, seed = job["simulation_params"], job["seed"]
+
+    run_dir = os.path.abspath(os.path.join("logs", f"run_{run_name(job)}"))
     os.makedirs(run_dir, exist_ok=True)
     cwd = os.getcwd()
     os.chdir(run_dir)
     try:
+        if seed is not None:
+            random.seed(seed)
+            np.random.seed(seed)
         print("instantiating simulator")
         sim = Simulator(
             verbosity=1,
             n_nodes=n_nodes,
             max_simulation_time=max_sim_time,
-            simulation_params=simulation_params
+            simulation_params=copy.deepcopy(simulation_params),
+            topology_seed=seed,
+            transaction_stream=transaction_stream(job)
         )
         print("RUNNING SIMULATION!!!")
         sim.run()
         print("RAN SIMULATION!!!")
-        events_log = "simulator_events_log.txt"
-        ledger_log = "ledger_logs.txt"
-        print(f"[worker] Parsing events from {events_log}")
-        (total_tx_created,
-         total_slots,
-         total_tx_in_all_slots,
-         avg_txs_per_slot,
-         avg_inter_slot_time,
-         avg_msgs_to_finalise) = compute_summary_metrics(events_log, ledger_log, n_nodes)
-        print(f"[worker] → created: {total_tx_created}, slots: {total_slots}, finalised: {total_tx_in_all_slots}")
-
-        mine_log = "simulator_mine_events.txt"
-        if os.path.isfile(mine_log):
-            total_tx_created = compute_total_tx_created(mine_log)
-        else:
-            print(f"[worker] Mine log missing: {mine_log} -- will report 0 mined txs")
-            total_tx_created = 0
-
-        append_summary_row({
-            "node_count": n_nodes,
-            "simulation_time": max_sim_time,
-            "sim_params": json.dumps({"n_nodes": n_nodes, "sim_duration": max_sim_time, "mine": 1.0, "Max_Txs": 100}),
-            "total_tx_created": total_tx_created,
-            "total_slots": total_slots,
-            "total_tx_in_all_slots": total_tx_in_all_slots,
-            "avg_txs_per_slot": f"{avg_txs_per_slot:.2f}",
-            "avg_inter_slot_time": f"{avg_inter_slot_time:.2f}",
-            "messages_per_slot_finalisation" : f"{avg_msgs_to_finalise:.2f}",
-            "all_tests_passed": True,
-        })
-        return True
-    except Exception as e:
-        print(f"[worker] Exception: {e!r}")
-        append_summary_row({
-            "node_count": n_nodes,
-            "simulation_time": max_sim_time,
-            "sim_params": simulation_params,
-            **dict.fromkeys(FIELDNAMES[3:], 0),
-            "all_tests_passed": False,
-        })
-        return False
+        return summary_row(job, run_dir)
     finally:
         os.chdir(cwd)
-        print(f"Run {run_id} finished. Logs in {run_dir}")
+        print(f"Run {run_name(job)} finished. Logs in {run_dir}")
+
+
+def warm_start(jobs: list, warmup_time: float, processes: int) -> list:
+    """
+    Runs all jobs as branches of one simulation (see WarmStart): the network of the first job is built once and
+    run with its parameters up to warmup_time, then every job continues from there with its own parameters and seed.
+    """
+    first = jobs[0]
+    if first["seed"] is not None:
+        random.seed(first["seed"])
+        np.random.seed(first["seed"])
+    sim = Simulator(
+        verbosity=1,
+        n_nodes=first["n_nodes"],
+        max_simulation_time=first["max_simulation_time"],
+        simulation_params=copy.deepcopy(first["simulation_params"]),
+        topology_seed=first["seed"]
+    )
+    branches = [{"simulation_params": job["simulation_params"], "seed": job["seed"],
+                 "max_simulation_time": job["max_simulation_time"], "job": k} for k, job in enumerate(jobs)]
+    run_dir = os.path.abspath(os.path.join("logs", f"warm_start_{run_name({'jobs': jobs, 'warmup': warmup_time})}"))
+    runs = WarmStart(sim, warmup_time=warmup_time, directory=run_dir)
+    print(f"Launching {len(jobs)} jobs with {runs}…")
+    return runs.run(branches, summarize=lambda simulator, branch, path: summary_row(jobs[branch["job"]], path),
+                    processes=processes)
+
+
+def result_row(job: dict, row: dict, error: str) -> dict:
+    # Failed runs are stored too, without metrics
+    if error is not None:
+        print(f"[worker] Exception: {error}")
+        row = {
+            "node_count": job["n_nodes"],
+            "simulation_time": job["max_simulation_time"],
+            "sim_params": job["simulation_params"],
+            "seed": job["seed"],
+            "all_tests_passed": False,
+            "error": error,
+        }
+    return row
+
 
+def run_sequential(runner, jobs, args, on_result, rows=None, emitted=None):
+    # Replicates of every run until the confidence intervals of its metrics are narrow enough (see SequentialSweep)
+    sweep = SequentialSweep(runner, args.ci_metrics, args.ci_width, relative=not args.ci_absolute, confidence=args.confidence,
+                            min_replicates=args.min_replicates, max_replicates=args.max_replicates, rows=rows)
+    print(f"Running replicates with {sweep}…")
+    summaries = sweep.run(jobs, on_result=on_result, emitted=emitted)
+    for summary in summaries:
+        intervals = ", ".join(f"{metric} = {item['mean']:.4f} ± {item['half_width']:.4f}" for metric, item in summary["metrics"].items())
+        print(f"{summary['configuration']}: {summary['replicates']} replicates, {'converged' if summary['converged'] else 'not converged'}, {intervals}")
+    # A run failed if none of its replicates gave metrics
+    return [any(item["n"] for item in summary["metrics"].values()) for summary in summaries]
 
 def main():
-    p = argparse.ArgumentParser("Parallel sim runs → summary CSV")
+    p = argparse.ArgumentParser("Parallel sim runs → results database")
     p.add_argument("--n-nodes", type=int, nargs='+', required=True)
     p.add_argument("--max-simulation-time", type=float, nargs='+', required=True)
     p.add_argument("--simulation-params", type=str, nargs='+', required=True,
                    help="Simulation parameters as a JSON string")
+    p.add_argument("--seeds", type=int, nargs='+', default=None, help="Seed of every run (default: unseeded)")
+    p.add_argument("--common-random-numbers", action="store_true",
+                   help="Runs with the same seed share their transaction arrivals (see TransactionStream), so their differences are due to their parameters")
+    p.add_argument("--results-dir", default=RESULTS_DIR, help="Directory of stored results, finished runs are skipped")
+    p.add_argument("--results-db", default=RESULTS_DB, help="Results database (see ResultsStore)")
+    p.add_argument("--retries", type=int, default=RETRIES_DEFAULT, help="Attempts of a failed run after the first one")
+    p.add_argument("--processes", type=int, default=None, help="Number of processes (default: all CPUs)")
+    p.add_argument("--chunksize", type=int, default=1, help="Runs sent to a process at a time")
+    p.add_argument("--ci-width", type=float, default=None,
+                   help="Run replicates of every run until the confidence intervals of --ci-metrics are this wide (relative to the mean unless --ci-absolute)")
+    p.add_argument("--ci-metrics", nargs='+', default=CI_METRICS, help="Metrics whose confidence intervals stop the replicates")
+    p.add_argument("--ci-absolute", action="store_true", help="--ci-width is absolute rather than relative to the mean")
+    p.add_argument("--confidence", type=float, default=CONFIDENCE_DEFAULT, help="Confidence level of the intervals")
+    p.add_argument("--min-replicates", type=int, default=MIN_REPLICATES_DEFAULT, help="Replicates of every run before its intervals are checked")
+    p.add_argument("--max-replicates", type=int, default=MAX_REPLICATES_DEFAULT, help="Replicates of a run at most")
+    p.add_argument("--warm-start", type=float, default=None, metavar="TIME",
+                   help="Build the network once, run the first run's parameters up to TIME and fork every run from there")
     args = p.parse_args()
     if not (len(args.n_nodes) == len(args.max_simulation_time) == len(args.simulation_params)):
         p.error("Must supply equal counts of --n-nodes, --max-simulation-time, and --simulation-params")
+    if args.seeds is not None and len(args.seeds) != len(args.n_nodes):
+        p.error("Must supply one --seeds value per run")
+    if args.common_random_numbers and args.seeds is None:
+        p.error("Common random numbers (--common-random-numbers) are drawn from the seeds, so --seeds is required")
+    if args.ci_width is not None and args.seeds is None:
+        p.error("Sequential replicates (--ci-width) are seeded from the seeds, so --seeds is required")
+    if args.warm_start is not None and len(set(args.n_nodes)) != 1:
+        p.error("Runs of a warm start share the network, so they must have the same --n-nodes")
+    if args.warm_start is not None and args.common_random_numbers:
+        # The stream replaces the mine event, so the mine tau of every branch would be silently ignored
+        p.error("Warm starts (--warm-start) and common random numbers (--common-random-numbers) cannot be combined")
+    if args.warm_start is not None and args.ci_width is not None:
+        p.error("Warm starts (--warm-start) and sequential replicates (--ci-width) cannot be combined")
 
-    params = []
+    jobs = []
     for i, (n, t, sim_json) in enumerate(zip(args.n_nodes, args.max_simulation_time, args.simulation_params)):
         try:
             sim_params = json.loads(sim_json)
         except json.JSONDecodeError as e:
             print(f"Error parsing simulation params JSON at index {i}: {e}")
             sys.exit(1)
-        params.append((i + 1, n, t, sim_params))
-    cores = min(multiprocessing.cpu_count(), len(params))
-    print(f"Launching {len(params)} jobs on up to {cores} cores…")
-    with multiprocessing.Pool(cores) as pool:
-        print("RUNNING WITH PARAMS = ", params)
-        results = pool.starmap(worker, params)
+        jobs.append({"n_nodes": n, "max_simulation_time": t, "simulation_params": sim_params,
+                     "seed": args.seeds[i] if args.seeds else None})
+        if args.common_random_numbers: # Only then, so that stored runs without it keep their names
+            jobs[-1]["common_random_numbers"] = True
+    if args.warm_start is not None:
+        # Branches are forked before the writer thread starts, and are not stored in the results directory
+        results = warm_start(jobs, args.warm_start, args.processes)
+        with ResultsStore(args.results_db).writer() as writer:
+            for job, row in zip(jobs, results):
+                writer.put(result_row(job, row, None if row else "warm start branch failed"))
+    else:
+        runner = SweepRunner(worker, args.results_dir, code_version=code_version(SRC), processes=args.processes,
+                             retries=args.retries, chunksize=args.chunksize)
+        print(f"Launching {len(jobs)} jobs with {runner}…")
+        # Rows of finished runs go through a queue to a single writer
+        results_store = ResultsStore(args.results_db)
+        with results_store.writer() as writer:
+            def store(job, row, error):
+                row = result_row(job, row, error)
+                if error is None: # Rows of stored runs carry their key, runs stored but not recorded are recorded on resume
+                    row = dict(row, job_key=runner.key(job))
+                writer.put(row)
+            emitted = results_store.job_keys()
+            if args.ci_width is not None:
+                results = run_sequential(runner, jobs, args, store, emitted=emitted)
+            else:
+                results = runner.run(jobs, on_result=store, emitted=emitted)
     if not all(results):
-        print("❌ Some runs failed—check logs.")
+        print("❌ Some runs failed—check logs, and run the sweep again to retry them.")
         sys.exit(1)
     print("✅ All simulations complete.")
 
@@ -0,0 +1,604 @@
+"""
+=========================
+ArrayEngine
+=========================
+
+Author: Matija Piskorec, Jaime de Vivero Woods
+Last update: October 2026
+
+ArrayEngine class.
+
+Structure-of-arrays alternative to the object engine (Node, Ledger, Storage, QuorumSet per validator).
+The SCP state of all nodes is kept in NumPy arrays with one row per node, and every Gillespie event is
+an array operation on the row of a single randomly chosen node:
+
+    slot            - current slot of each node
+    pending         - mined transactions waiting in the mempool of each node
+    queued          - transactions retrieved from the mempool, ready to be nominated
+    nom_voted, nom_accepted, nom_confirmed
+                    - nomination state as bitsets over the candidate values of the current slot
+    ballot_value, ballot_counter, prepare_phase
+                    - prepare ballot of each node (value bitset, counter, NONE/VOTED/ACCEPTED/CONFIRMED)
+    commit_value, commit_phase
+                    - commit ballot of each node
+    ledger          - ledger[node, slot] is the bitset of the value externalized for that slot (0 if none)
+
+Candidate values are registered per slot (at most MAX_CANDIDATES, one bit each; nominations beyond that are
+counted in candidates_dropped, and the node keeps its transactions for a later slot), so a nominated value is
+a union of candidates and combining values is a bitwise OR. Quorum sets are stored in CSR form (indptr,
+indices), so quorum checks are a gather and a bit count over the quorum members of one node.
+
+Federated voting follows the same rules as the object engine: a statement is accepted once a quorum
+threshold of the node (including itself) voted or accepted it, or a v-blocking set accepted it, and it
+is confirmed once a quorum threshold accepted it. Simplifications: every node may nominate (no priority
+list), each node contributes at most one candidate per slot, and messages are read directly from the
+state of peers rather than through broadcast logs.
+
+Besides single node events, step_round() advances all nodes at once in synchronous rounds (see ROUNDS).
+"""
+
+import numpy as np
+
+from Log import log
+from Globals import Globals
+
+# Phases of prepare and commit ballots
+NONE = 0
+VOTED = 1
+ACCEPTED = 2
+CONFIRMED = 3
+
+MAX_CANDIDATES = 64 # Candidate values per slot, one bit each in a uint64 value bitset
+MAX_SLOT_TXS = 200
+
+_SHIFTS = np.arange(MAX_CANDIDATES, dtype=np.uint64)
+_BITS = np.left_shift(np.uint64(1), _SHIFTS)
+_ZERO = np.uint64(0)
+_ONE = np.uint64(1)
+
+
+def bit_counts(masks):
+    """
+    Number of masks in which each of the MAX_CANDIDATES bits is set.
+    """
+    if len(masks) == 0:
+        return np.zeros(MAX_CANDIDATES, dtype=np.int64)
+    return ((masks[:, None] >> _SHIFTS) & _ONE).sum(axis=0)
+
+
+def mask_from_bits(bits):
+    """
+    Bitset with the given boolean vector of bits set.
+    """
+    return np.bitwise_or.reduce(np.where(bits, _BITS, _ZERO))
+
+
+def unpack_masks(masks):
+    """
+    Bits of every mask as a (len(masks), MAX_CANDIDATES) array of 0/1 values.
+    """
+    return np.unpackbits(masks.astype('<u8').view(np.uint8).reshape(-1, 8), axis=1, bitorder='little')
+
+
+def pack_masks(bits):
+    """
+    Inverse of unpack_masks.
+    """
+    return np.packbits(bits.astype(np.uint8), axis=1, bitorder='little').view('<u8').ravel().astype(np.uint64)
+
+
+class ArrayEngine():
+
+    def __init__(self, members, thresholds, names=None, max_slot_txs=MAX_SLOT_TXS):
+        """
+        members    - for every node a sequence of indices of its quorum members (node itself excluded)
+        thresholds - minimum quorum of every node (the node itself counts towards it)
+        """
+        n = len(members)
+        assert len(thresholds) == n
+
+        self.n_nodes = n
+        self.names = list(names) if names is not None else [str(i) for i in range(n)]
+        self.max_slot_txs = max_slot_txs
+
+        # Quorum sets in CSR form - members of node i are indices[indptr[i]:indptr[i+1]]
+        sizes = np.array([len(m) for m in members], dtype=np.int64)
+        self.indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(sizes, out=self.indptr[1:])
+        self.indices = np.concatenate([np.asarray(m, dtype=np.int64) for m in members]) if n else np.zeros(0, dtype=np.int64)
+        self.threshold = np.asarray(thresholds, dtype=np.int64)
+        self.quorum_size = sizes
+        self._rows = np.repeat(np.arange(n, dtype=np.int64), sizes) # node owning each entry of indices
+
+        self.reset()
+
+        self._handlers = {
+            'mine': self.mine,
+            'retrieve_transaction_from_mempool': self.retrieve_transaction_from_mempool,
+            'nominate': self.nominate,
+            'retrieve_message_from_peer': self.receive_message,
+            'prepare_ballot': self.prepare_ballot_msg,
+            'receive_prepare_message': self.receive_prepare_message,
+            'prepare_commit': self.prepare_SCPCommit_msg,
+            'receive_commit_message': self.receive_commit_message,
+            'prepare_externalize_message': self.prepare_Externalize_msg,
+            'receive_externalize_msg': self.receive_Externalize_msg,
+        }
+
+        log.consensus.info('Initialized array engine with %d nodes and %d quorum memberships.', n, len(self.indices))
+
+    def reset(self):
+        """
+        Reset the state of all nodes and slots, keeping the quorum sets, to run another replicate on the same network.
+        """
+        n = self.n_nodes
+
+        # Per node state
+        self.slot = np.ones(n, dtype=np.int64)
+        self.pending = np.zeros(n, dtype=np.int64)
+        self.queued = np.zeros(n, dtype=np.int64)
+        self.held = np.zeros(n, dtype=np.int64) # transactions the node moved from its mempool into its candidate
+        self.own_candidate = np.full(n, -1, dtype=np.int64) # bit of the candidate the node created in its current slot
+        self.nom_voted = np.zeros(n, dtype=np.uint64)
+        self.nom_accepted = np.zeros(n, dtype=np.uint64)
+        self.nom_confirmed = np.zeros(n, dtype=np.uint64)
+        self.ballot_value = np.zeros(n, dtype=np.uint64)
+        self.ballot_counter = np.zeros(n, dtype=np.int64)
+        self.prepare_phase = np.zeros(n, dtype=np.int8)
+        self.commit_value = np.zeros(n, dtype=np.uint64)
+        self.commit_phase = np.zeros(n, dtype=np.int8)
+
+        # Per slot state, grown on demand (index is the slot number, slot 0 is unused)
+        capacity = 16
+        self.ledger = np.zeros((n, capacity), dtype=np.uint64)
+        self.ledger_time = np.zeros((n, capacity), dtype=np.float64)
+        self.candidate_txs = np.zeros((capacity, MAX_CANDIDATES), dtype=np.int64)
+        self.candidate_creator = np.full((capacity, MAX_CANDIDATES), -1, dtype=np.int64)
+        self.candidate_count = np.zeros(capacity, dtype=np.int64)
+        self.candidates_dropped = np.zeros(capacity, dtype=np.int64) # nominations refused once a slot ran out of candidate bits
+        self.slot_value = np.zeros(capacity, dtype=np.uint64) # first value externalized for every slot, network wide
+
+    def __repr__(self):
+        return '[ArrayEngine, nodes = %s, slots = %s]' % (self.n_nodes, self.externalized_slots())
+
+    @classmethod
+    def from_nodes(cls, nodes, **kwargs):
+        """
+        Build the engine from the quorum sets of object engine Nodes (e.g. from Network.generate_nodes).
+        Inner sets are flattened into the quorum members of each node.
+        """
+        index = {node.name: i for i, node in enumerate(nodes)}
+        members = []
+        thresholds = []
+        for node in nodes:
+            peers = []
+            seen = {node.name}
+            for member in node.quorum_set.get_nodes():
+                if member.name not in seen:
+                    seen.add(member.name)
+                    peers.append(index[member.name])
+            for inner_set in node.quorum_set.get_inner_sets():
+                for member in (inner_set if isinstance(inner_set, (list, tuple)) else [inner_set]):
+                    if member.name not in seen:
+                        seen.add(member.name)
+                        peers.append(index[member.name])
+            members.append(peers)
+            thresholds.append(node.quorum_set.minimum_quorum)
+        return cls(members, thresholds, names=[node.name for node in nodes], **kwargs)
+
+    def handle_event(self, event_name, node=None):
+        """
+        Apply event to the given node (row index), or to a uniformly random node.
+        """
+        if node is None:
+            node = np.random.randint(self.n_nodes)
+        self._handlers[event_name](node)
+
+    ##################
+    # HELPERS        #
+    ##################
+
+    def members(self, i):
+        return self.indices[self.indptr[i]:self.indptr[i + 1]]
+
+    def _peers_in_slot(self, i):
+        members = self.members(i)
+        return members[self.slot[members] == self.slot[i]]
+
+    def _random_member(self, i):
+        members = self.members(i)
+        if len(members) == 0:
+            return None
+        return members[np.random.randint(len(members))]
+
+    def _ensure_capacity(self, slot):
+        capacity = self.ledger.shape[1]
+        if slot < capacity:
+            return
+        new_capacity = max(2 * capacity, slot + 1)
+        extra = new_capacity - capacity
+        self.ledger = np.pad(self.ledger, ((0, 0), (0, extra)))
+        self.ledger_time = np.pad(self.ledger_time, ((0, 0), (0, extra)))
+        self.candidate_txs = np.pad(self.candidate_txs, ((0, extra), (0, 0)))
+        self.candidate_creator = np.pad(self.candidate_creator, ((0, extra), (0, 0)), constant_values=-1)
+        self.candidate_count = np.pad(self.candidate_count, (0, extra))
+        self.candidates_dropped = np.pad(self.candidates_dropped, (0, extra))
+        self.slot_value = np.pad(self.slot_value, (0, extra))
+
+    def _federated_vote(self, i, value, phase, values, phases):
+        """
+        New phase of node i for a ballot with the given value, given the ballot values and phases of all nodes.
+        """
+        members = self.members(i)
+        peers = members[self.slot[members] == self.slot[i]]
+        same = values[peers] == value
+        voted = 1 + np.count_nonzero(same & (phases[peers] >= VOTED))
+        accepted = np.count_nonzero(same & (phases[peers] >= ACCEPTED))
+        k = self.threshold[i]
+        blocking = len(members) - k
+
+        if phase == VOTED and (voted >= k or accepted > blocking):
+            phase = ACCEPTED
+        if phase == ACCEPTED and 1 + accepted >= k:
+            phase = CONFIRMED
+        return phase
+
+    def _blocking_value(self, i, values, phases):
+        """
+        Value (other than the one of node i) which a v-blocking set of node i voted for, or 0.
+        """
+        members = self.members(i)
+        peers = members[self.slot[members] == self.slot[i]]
+        others = values[peers][(phases[peers] >= VOTED) & (values[peers] != values[i]) & (values[peers] != _ZERO)]
+        if len(others) == 0:
+            return _ZERO
+        candidates, counts = np.unique(others, return_counts=True)
+        best = np.argmax(counts)
+        if counts[best] > len(members) - self.threshold[i]:
+            return candidates[best]
+        return _ZERO
+
+    ##################
+    # EVENTS         #
+    ##################
+
+    def mine(self, i):
+        self.pending[i] += 1
+
+    def retrieve_transaction_from_mempool(self, i):
+        if self.pending[i] > 0:
+            self.pending[i] -= 1
+            self.queued[i] += 1
+
+    def nominate(self, i):
+        s = self.slot[i]
+        if self.held[i] == 0 and self.queued[i] > 0 and self.nom_confirmed[i] == _ZERO:
+            self._ensure_capacity(s)
+            b = self.candidate_count[s]
+            if b < MAX_CANDIDATES:
+                txs = min(self.queued[i], self.max_slot_txs)
+                self.candidate_txs[s, b] = txs
+                self.candidate_creator[s, b] = i
+                self.candidate_count[s] = b + 1
+                self.queued[i] -= txs
+                self.held[i] = txs
+                self.own_candidate[i] = b
+                self.nom_voted[i] |= _BITS[b]
+            else:
+                self._drop_candidates(s, 1)
+        self._update_nomination(i)
+
+    def _drop_candidates(self, s, count):
+        if self.candidates_dropped[s] == 0:
+            log.consensus.warning('Slot %d ran out of its %d candidate values, further nominations are dropped', s, MAX_CANDIDATES)
+        self.candidates_dropped[s] += count
+
+    def receive_message(self, i):
+        j = self._random_member(i)
+        if j is None or self.slot[j] != self.slot[i]:
+            return
+        # Votes for new candidates stop once something has been confirmed nominated
+        if self.nom_confirmed[i] == _ZERO:
+            self.nom_voted[i] |= self.nom_voted[j] | self.nom_accepted[j]
+        self._update_nomination(i)
+
+    def _update_nomination(self, i):
+        own = self.nom_voted[i] | self.nom_accepted[i]
+        if own == _ZERO:
+            return
+        members = self.members(i)
+        peers = members[self.slot[members] == self.slot[i]]
+        k = self.threshold[i]
+        blocking = len(members) - k
+
+        signed = 1 + bit_counts(self.nom_voted[peers] | self.nom_accepted[peers])
+        accepted_by_peers = bit_counts(self.nom_accepted[peers])
+
+        own_bits = ((own >> _SHIFTS) & _ONE).astype(bool)
+        newly_accepted = (own_bits & (signed >= k)) | (accepted_by_peers > blocking)
+        self.nom_accepted[i] |= mask_from_bits(newly_accepted)
+
+        accepted_bits = ((self.nom_accepted[i] >> _SHIFTS) & _ONE).astype(bool)
+        self.nom_confirmed[i] |= mask_from_bits(accepted_bits & (1 + accepted_by_peers >= k))
+
+    def prepare_ballot_msg(self, i):
+        if self.nom_confirmed[i] != _ZERO and self.prepare_phase[i] == NONE:
+            self.ballot_value[i] = self.nom_confirmed[i]
+            self.ballot_counter[i] = 1
+            self.prepare_phase[i] = VOTED
+        elif self.prepare_phase[i] == VOTED and self.ballot_value[i] != self.nom_confirmed[i]:
+            # More candidates got confirmed since we voted - bump the ballot to the new composite value. Array engine
+            # only: the object engine (Node.prepare_ballot_msg) prepares a random confirmed value instead of a composite
+            self.ballot_value[i] = self.nom_confirmed[i]
+            self.ballot_counter[i] += 1
+
+    def receive_prepare_message(self, i):
+        if self.prepare_phase[i] < CONFIRMED:
+            # Switch to a ballot which is v-blocking for us, with a higher counter
+            other = self._blocking_value(i, self.ballot_value, self.prepare_phase)
+            if other != _ZERO:
+                self.ballot_value[i] = other
+                self.ballot_counter[i] += 1
+                self.prepare_phase[i] = VOTED
+        if self.prepare_phase[i] >= VOTED:
+            self.prepare_phase[i] = self._federated_vote(i, self.ballot_value[i], self.prepare_phase[i],
+                                                         self.ballot_value, self.prepare_phase)
+
+    def prepare_SCPCommit_msg(self, i):
+        if self.prepare_phase[i] == CONFIRMED and self.commit_phase[i] == NONE:
+            self.commit_value[i] = self.ballot_value[i]
+            self.commit_phase[i] = VOTED
+
+    def receive_commit_message(self, i):
+        if self.commit_phase[i] >= VOTED:
+            self.commit_phase[i] = self._federated_vote(i, self.commit_value[i], self.commit_phase[i],
+                                                        self.commit_value, self.commit_phase)
+
+    def prepare_Externalize_msg(self, i):
+        if self.commit_phase[i] == CONFIRMED:
+            self._externalize(i, self.commit_value[i])
+
+    def receive_Externalize_msg(self, i):
+        j = self._random_member(i)
+        if j is None or self.slot[j] <= self.slot[i]:
+            return
+        value = self.ledger[j, self.slot[i]]
+        if value != _ZERO:
+            self._externalize(i, value)
+
+    def _externalize(self, i, value):
+        self._externalize_rows(np.array([i]), np.array([value], dtype=np.uint64))
+
+    def _externalize_rows(self, rows, values):
+        """
+        Externalize values for the current slot of the given nodes and move them to the next slot.
+        """
+        slots = self.slot[rows]
+        self._ensure_capacity(int(slots.max()) + 1)
+        self.ledger[rows, slots] = values
+        self.ledger_time[rows, slots] = Globals.simulation_time
+
+        for s, value, i in zip(slots, values, rows):
+            if self.slot_value[s] == _ZERO:
+                self.slot_value[s] = value
+                log.consensus.info('Slot %d externalized with value %s (%d transactions) by node %s at time %.3f',
+                                   s, hex(int(value)), self.value_transactions(s, value), self.names[i], Globals.simulation_time)
+
+        # Transactions of our own candidate which did not make it into the value are nominated again
+        own = self.own_candidate[rows]
+        included = (own >= 0) & (((values >> np.maximum(own, 0).astype(np.uint64)) & _ONE) == _ONE)
+        self.queued[rows] += np.where(included, 0, self.held[rows])
+        self.held[rows] = 0
+        self.own_candidate[rows] = -1
+
+        # Drop the whole slot state of the nodes
+        self.nom_voted[rows] = self.nom_accepted[rows] = self.nom_confirmed[rows] = _ZERO
+        self.ballot_value[rows] = self.commit_value[rows] = _ZERO
+        self.ballot_counter[rows] = 0
+        self.prepare_phase[rows] = self.commit_phase[rows] = NONE
+        self.slot[rows] = slots + 1
+
+    ##################
+    # ROUNDS         #
+    ##################
+
+    # Lockstep alternative to the Gillespie events: in every round each node mines and retrieves transactions,
+    # nominates, pulls, prepares, commits and externalizes once. Everything a node reads from its peers is the
+    # state they had at the start of the round, so messages sent in one round are delivered in the next one,
+    # and every step is a vectorized operation over all nodes (quorum checks are segment sums over indices).
+
+    def step_round(self, round_time=1.0, mine_tau=1.0, retrieve_tau=1.0):
+        """
+        Advance all nodes by one synchronous round of round_time simulated seconds. Mining and mempool
+        retrieval keep the per node rates 1/tau of the Gillespie events.
+        """
+        view = self._round_view()
+
+        self.pending += np.random.poisson(round_time / mine_tau, self.n_nodes)
+        retrieved = np.minimum(self.pending, np.random.poisson(round_time / retrieve_tau, self.n_nodes))
+        self.pending -= retrieved
+        self.queued += retrieved
+
+        self._nominate_round()
+        self._receive_message_round(view)
+        self._prepare_ballot_round(view)
+        self._commit_round(view)
+        self._externalize_round(view)
+
+    def _round_view(self):
+        # State of all nodes as their peers see it during the round
+        return {'slot': self.slot.copy(),
+                'nominated': self.nom_voted | self.nom_accepted,
+                'accepted': self.nom_accepted.copy(),
+                'ballot_value': self.ballot_value.copy(),
+                'prepare_phase': self.prepare_phase.copy(),
+                'commit_value': self.commit_value.copy(),
+                'commit_phase': self.commit_phase.copy()}
+
+    def _segment_sum(self, edge_values):
+        # Sum of edge_values (one per entry of indices) over the quorum members of every node
+        sums = np.zeros(len(edge_values) + 1, dtype=np.int64)
+        np.cumsum(edge_values, out=sums[1:])
+        return sums[self.indptr[1:]] - sums[self.indptr[:-1]]
+
+    def _segment_bit_counts(self, edge_masks):
+        # For every node and bit, number of its quorum members whose edge_masks entry has that bit set
+        counts = np.zeros((self.n_nodes, MAX_CANDIDATES), dtype=np.int32)
+        has_members = self.quorum_size > 0
+        if np.any(has_members):
+            counts[has_members] = np.add.reduceat(unpack_masks(edge_masks), self.indptr[:-1][has_members], axis=0, dtype=np.int32)
+        return counts
+
+    def _same_slot_edges(self, view):
+        return view['slot'][self.indices] == self.slot[self._rows]
+
+    def _nominate_round(self):
+        nominating = np.flatnonzero((self.held == 0) & (self.queued > 0) & (self.nom_confirmed == _ZERO))
+        if len(nominating) == 0:
+            return
+        nominating = np.random.permutation(nominating)
+        self._ensure_capacity(int(self.slot[nominating].max()))
+
+        for s in np.unique(self.slot[nominating]):
+            # Candidate bits of a slot are handed out in random order until they run out
+            start = self.candidate_count[s]
+            in_slot = nominating[self.slot[nominating] == s]
+            nodes = in_slot[:max(MAX_CANDIDATES - start, 0)]
+            if len(nodes) < len(in_slot):
+                self._drop_candidates(s, len(in_slot) - len(nodes))
+            bits = start + np.arange(len(nodes))
+            txs = np.minimum(self.queued[nodes], self.max_slot_txs)
+            self.candidate_txs[s, bits] = txs
+            self.candidate_creator[s, bits] = nodes
+            self.candidate_count[s] = start + len(nodes)
+            self.queued[nodes] -= txs
+            self.held[nodes] = txs
+            self.own_candidate[nodes] = bits
+            self.nom_voted[nodes] |= _BITS[bits]
+
+    def _receive_message_round(self, view):
+        same = self._same_slot_edges(view)
+
+        # Pull all votes of same slot peers, unless something has already been confirmed nominated
+        peer_votes = np.where(same, view['nominated'][self.indices], _ZERO)
+        pulled = np.zeros(self.n_nodes, dtype=np.uint64)
+        has_members = self.quorum_size > 0
+        if np.any(has_members):
+            pulled[has_members] = np.bitwise_or.reduceat(peer_votes, self.indptr[:-1][has_members])
+        open_nodes = self.nom_confirmed == _ZERO
+        self.nom_voted[open_nodes] |= pulled[open_nodes]
+
+        own = unpack_masks(self.nom_voted | self.nom_accepted).astype(bool)
+        signed = 1 + self._segment_bit_counts(np.where(same, view['nominated'][self.indices], _ZERO))
+        accepted_by_peers = self._segment_bit_counts(np.where(same, view['accepted'][self.indices], _ZERO))
+        k = self.threshold[:, None]
+        blocking = (self.quorum_size - self.threshold)[:, None]
+
+        accepted = unpack_masks(self.nom_accepted).astype(bool) | (own & (signed >= k)) | (accepted_by_peers > blocking)
+        self.nom_accepted = pack_masks(accepted)
+        self.nom_confirmed |= pack_masks(accepted & (1 + accepted_by_peers >= k))
+
+    def _federated_vote_round(self, values, phases, view_values, view_phases, same):
+        # Vectorized _federated_vote for all nodes, updates phases in place
+        agree = same & (view_values[self.indices] == values[self._rows])
+        voted = 1 + self._segment_sum(agree & (view_phases[self.indices] >= VOTED))
+        accepted = self._segment_sum(agree & (view_phases[self.indices] >= ACCEPTED))
+        blocking = self.quorum_size - self.threshold
+
+        phases[(phases == VOTED) & ((voted >= self.threshold) | (accepted > blocking))] = ACCEPTED
+        phases[(phases == ACCEPTED) & (1 + accepted >= self.threshold)] = CONFIRMED
+
+    def _blocking_values_round(self, values, view_values, view_phases, same):
+        # Vectorized _blocking_value - the most voted other value of every node if it is v-blocking, else 0
+        peer_values = view_values[self.indices]
+        other = same & (view_phases[self.indices] >= VOTED) & (peer_values != values[self._rows]) & (peer_values != _ZERO)
+        result = np.zeros(self.n_nodes, dtype=np.uint64)
+        if not np.any(other):
+            return result
+
+        rows = self._rows[other]
+        peer_values = peer_values[other]
+        order = np.lexsort((peer_values, rows))
+        rows, peer_values = rows[order], peer_values[order]
+        starts = np.flatnonzero(np.concatenate(([True], (rows[1:] != rows[:-1]) | (peer_values[1:] != peer_values[:-1]))))
+        counts = np.diff(np.append(starts, len(rows)))
+        run_rows, run_values = rows[starts], peer_values[starts]
+
+        # Largest run of every node
+        order = np.lexsort((-counts, run_rows))
+        first = np.concatenate(([True], run_rows[order][1:] != run_rows[order][:-1]))
+        best = order[first]
+        switch = counts[best] > (self.quorum_size - self.threshold)[run_rows[best]]
+        result[run_rows[best][switch]] = run_values[best][switch]
+        return result
+
+    def _prepare_ballot_round(self, view):
+        starting = (self.nom_confirmed != _ZERO) & (self.prepare_phase == NONE)
+        self.ballot_value[starting] = self.nom_confirmed[starting]
+        self.ballot_counter[starting] = 1
+        self.prepare_phase[starting] = VOTED
+
+        bumped = (self.prepare_phase == VOTED) & ~starting & (self.ballot_value != self.nom_confirmed)
+        self.ballot_value[bumped] = self.nom_confirmed[bumped]
+        self.ballot_counter[bumped] += 1
+
+        same = self._same_slot_edges(view)
+        other = self._blocking_values_round(self.ballot_value, view['ballot_value'], view['prepare_phase'], same)
+        switching = (other != _ZERO) & (self.prepare_phase < CONFIRMED)
+        self.ballot_value[switching] = other[switching]
+        self.ballot_counter[switching] += 1
+        self.prepare_phase[switching] = VOTED
+
+        self._federated_vote_round(self.ballot_value, self.prepare_phase, view['ballot_value'], view['prepare_phase'], same)
+
+    def _commit_round(self, view):
+        starting = (self.prepare_phase == CONFIRMED) & (self.commit_phase == NONE)
+        self.commit_value[starting] = self.ballot_value[starting]
+        self.commit_phase[starting] = VOTED
+
+        same = self._same_slot_edges(view)
+        self._federated_vote_round(self.commit_value, self.commit_phase, view['commit_value'], view['commit_phase'], same)
+
+    def _externalize_round(self, view):
+        confirmed = np.flatnonzero(self.commit_phase == CONFIRMED)
+        if len(confirmed):
+            self._externalize_rows(confirmed, self.commit_value[confirmed])
+
+        # Nodes behind a quorum member catch up with the value it externalized before this round
+        ahead = view['slot'][self.indices] > self.slot[self._rows]
+        if not np.any(ahead):
+            return
+        rows, peers = self._rows[ahead], self.indices[ahead]
+        rows, first = np.unique(rows, return_index=True)
+        values = self.ledger[peers[first], self.slot[rows]]
+        known = values != _ZERO
+        if np.any(known):
+            self._externalize_rows(rows[known], values[known])
+
+    ##################
+    # RESULTS        #
+    ##################
+
+    def value_transactions(self, slot, value):
+        bits = ((np.uint64(value) >> _SHIFTS) & _ONE).astype(bool)
+        return int(self.candidate_txs[slot][bits].sum())
+
+    def externalized_slots(self):
+        """
+        Number of slots externalized by every node.
+        """
+        return self.slot - 1
+
+    def check_agreement(self):
+        """
+        True if all nodes which externalized a slot externalized the same value for it.
+        """
+        ledger = self.ledger
+        reference = self.slot_value[:ledger.shape[1]]
+        return bool(np.all((ledger == _ZERO) | (ledger == reference[None, :])))
+
+    def finalised_transactions(self):
+        """
+        Number of transactions finalised in all slots externalized so far.
+        """
+        return sum(self.value_transactions(s, v) for s, v in enumerate(self.slot_value) if v != _ZERO)
@@ -0,0 +1,153 @@
+"""
+=========================
+BroadcastLog
+=========================
+
+Author: Matija Piskorec, Jaime de Vivero Woods
+Last update: October 2026
+
+BroadcastLog class.
+
+Outbox of messages a node broadcasts to its peers. Every broadcast message is stamped with a
+monotonic per-sender sequence number, so that a receiving node only has to remember a single
+integer cursor per peer (the next sequence number it has not seen yet) instead of the list of all
+messages it has already retrieved. Fetching new messages from a peer is then a slice of the log,
+proportional to the number of new messages only.
+
+Messages can be withdrawn from the log (e.g. when they get replaced or their value is finalised).
+Withdrawn messages are never handed out again, and their sequence numbers are never reused.
+"""
+
+from bisect import bisect_left
+
+
+class BroadcastLog():
+
+    def __init__(self, messages=None, start_seq=0):
+        self._messages = {} # {sequence number: message} for all live messages, in increasing sequence number
+        self._sequence = {} # {id(message): sequence number} for all live messages
+        self._seqs = [] # Increasing sequence numbers of live and withdrawn messages, used to bisect by cursor
+        self._next_seq = start_seq # A log which continues an older one starts after its last sequence number
+
+        if messages is not None:
+            self.extend(messages)
+
+    def __repr__(self):
+        return '[BroadcastLog, next_seq = %s, messages = %s]' % (self._next_seq, list(self._messages.values()))
+
+    def __len__(self):
+        return len(self._messages)
+
+    def __bool__(self):
+        return len(self._messages) > 0
+
+    def __iter__(self):
+        return iter(list(self._messages.values()))
+
+    def __contains__(self, message):
+        return id(message) in self._sequence
+
+    @property
+    def next_seq(self):
+        # Cursor value which marks everything currently in the log as seen
+        return self._next_seq
+
+    def sequence_number(self, message):
+        return self._sequence.get(id(message))
+
+    def add(self, message):
+        """
+        Append message to the log and return its sequence number.
+        If the message is already in the log it keeps its original sequence number.
+        """
+        if id(message) in self._sequence:
+            return self._sequence[id(message)]
+
+        seq = self._next_seq
+        self._next_seq += 1
+        self._messages[seq] = message
+        self._sequence[id(message)] = seq
+        self._seqs.append(seq)
+        return seq
+
+    # Keep list-like API so that existing callers (and tests) can keep using append
+    def append(self, message):
+        self.add(message)
+
+    def extend(self, messages):
+        for message in messages:
+            self.add(message)
+
+    def discard(self, message):
+        seq = self._sequence.pop(id(message), None)
+        if seq is None:
+            return False
+        del self._messages[seq]
+        self._compact()
+        return True
+
+    def remove(self, message):
+        # Same semantics as list.remove - raise ValueError if the message is not in the log
+        if not self.discard(message):
+            raise ValueError('%s not in broadcast log' % (message,))
+
+    def difference_update(self, messages):
+        for message in list(messages):
+            self.discard(message)
+
+    def pop(self):
+        # Withdraw and return the most recent message
+        if not self._messages:
+            raise KeyError('pop from an empty broadcast log')
+        seq = next(reversed(self._messages))
+        message = self._messages[seq]
+        self.discard(message)
+        return message
+
+    def retain(self, predicate):
+        """
+        Withdraw all messages for which predicate(message) is False, keeping sequence numbers of the rest.
+        """
+        for message in [message for message in self._messages.values() if not predicate(message)]:
+            self.discard(message)
+
+    def replace(self, messages):
+        """
+        Withdraw all messages and broadcast the given ones instead. Sequence numbers keep increasing,
+        so peers will see the new messages even if they have already seen everything before.
+        """
+        if messages is self:
+            return
+        messages = list(messages)
+        self.clear()
+        self.extend(messages)
+
+    def clear(self):
+        self._messages.clear()
+        self._sequence.clear()
+        self._seqs.clear()
+
+    def next_after(self, cursor):
+        """
+        First live message with sequence number >= cursor, as a (sequence number, message) tuple, or None.
+        """
+        i = bisect_left(self._seqs, cursor)
+        while i < len(self._seqs):
+            seq = self._seqs[i]
+            if seq in self._messages:
+                return seq, self._messages[seq]
+            i += 1
+        return None
+
+    def since(self, cursor):
+        """
+        All live messages with sequence number >= cursor (in broadcast order) and the new cursor.
+        """
+        i = bisect_left(self._seqs, cursor)
+        messages = [self._messages[seq] for seq in self._seqs[i:] if seq in self._messages]
+        return messages, self._next_seq
+
+    def _compact(self):
+        # Drop withdrawn sequence numbers once they outnumber the live ones
+        if len(self._seqs) > 32 and len(self._seqs) > 2 * len(self._messages):
+            self._seqs = list(self._messages)
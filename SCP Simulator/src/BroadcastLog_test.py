@@ -0,0 +1,63 @@
+import unittest
+from BroadcastLog import BroadcastLog
+from SCPNominate import SCPNominate
+
+
+class BroadcastLogTest(unittest.TestCase):
+
+    def setUp(self):
+        self.msgs = [SCPNominate(voted=[], accepted=[]) for _ in range(4)]
+        self.log = BroadcastLog(self.msgs)
+
+    def test_messages_get_increasing_sequence_numbers(self):
+        self.assertEqual([self.log.sequence_number(m) for m in self.msgs], [0, 1, 2, 3])
+        self.assertEqual(self.log.add(self.msgs[1]), 1)
+        self.assertEqual(self.log.next_seq, 4)
+
+    def test_since_returns_only_new_messages(self):
+        unseen, cursor = self.log.since(0)
+        self.assertEqual(unseen, self.msgs)
+        self.assertEqual(cursor, 4)
+
+        new_msg = SCPNominate(voted=[], accepted=[])
+        self.log.add(new_msg)
+        self.assertEqual(self.log.since(cursor), ([new_msg], 5))
+
+    def test_withdrawn_messages_are_skipped(self):
+        self.log.remove(self.msgs[0])
+        self.log.discard(self.msgs[2])
+        self.assertNotIn(self.msgs[0], self.log)
+        self.assertEqual(self.log.next_after(0), (1, self.msgs[1]))
+        self.assertEqual(self.log.next_after(2), (3, self.msgs[3]))
+        self.assertIsNone(self.log.next_after(4))
+        with self.assertRaises(ValueError):
+            self.log.remove(self.msgs[0])
+
+    def test_replace_keeps_sequence_numbers_growing(self):
+        new_msg = SCPNominate(voted=[], accepted=[])
+        self.log.replace([new_msg])
+        self.assertEqual(list(self.log), [new_msg])
+        self.assertEqual(self.log.since(4), ([new_msg], 5))
+
+    def test_retain_keeps_sequence_numbers(self):
+        self.log.retain(lambda m: m is not self.msgs[1])
+        self.assertEqual(list(self.log), [self.msgs[0], self.msgs[2], self.msgs[3]])
+        self.assertEqual(self.log.sequence_number(self.msgs[3]), 3)
+
+    def test_compares_by_identity(self):
+        # Compare the messages with list(log), a log is only equal to itself
+        self.assertNotEqual(self.log, self.msgs)
+        self.assertNotEqual(BroadcastLog(), [])
+        self.assertEqual(list(self.log), self.msgs)
+        self.assertEqual(list(BroadcastLog()), [])
+
+    def test_many_withdrawals_compact_sequence_index(self):
+        msgs = [SCPNominate(voted=[], accepted=[]) for _ in range(100)]
+        log = BroadcastLog(msgs)
+        for m in msgs[:80]:
+            log.discard(m)
+        self.assertLessEqual(len(log._seqs), 2 * len(log) + 1)
+        self.assertEqual(log.since(50), (msgs[80:], 100))
+
+if __name__ == '__main__':
+    unittest.main()
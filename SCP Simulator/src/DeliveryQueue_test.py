@@ -0,0 +1,39 @@
+import random
+import unittest
+from DeliveryQueue import DeliveryQueue
+from LatencyModel import LatencyModel
+
+
+class DeliveryQueueTest(unittest.TestCase):
+
+    def test_items_arrive_in_order_of_arrival_time(self):
+        queue = DeliveryQueue(LatencyModel(matrix=[[0, 3.0, 1.0], [0, 0, 0], [0, 2.0, 0]]))
+        queue.send(0, 0, 1, 'slow')
+        queue.send(0, 0, 2, 'fast')
+        queue.send(0.5, 2, 1, 'middle')
+
+        self.assertEqual(queue.next_arrival(), 1.0)
+        self.assertEqual(list(queue.pop_due(2.5)), ['fast', 'middle'])
+        self.assertEqual(len(queue), 1)
+        self.assertEqual(list(queue.pop_due(3.0)), ['slow'])
+        self.assertFalse(queue)
+
+    def test_links_are_fifo(self):
+        random.seed(0)
+        queue = DeliveryQueue(LatencyModel(mean=1.0, distribution='exponential'))
+        for i in range(1000):
+            queue.send(i * 0.01, 0, 1, i)
+        self.assertEqual(list(queue.pop_due(float('inf'))), list(range(1000)))
+
+    def test_items_sent_while_delivering(self):
+        queue = DeliveryQueue(0)
+        queue.send(0, 0, 1, 0)
+        delivered = []
+        for item in queue.pop_due(0):
+            delivered.append(item)
+            if item < 3:
+                queue.send(0, 1, 0, item + 1)
+        self.assertEqual(delivered, [0, 1, 2, 3])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,159 @@
+"""
+=========================
+DependentsIndex
+=========================
+
+Author: Matija Piskorec, Jaime de Vivero Woods
+Last update: October 2026
+
+DependentsIndex class.
+
+Reverse index of quorum membership: for every node, the nodes which include it in their quorum sets (its
+dependents), e.g. the nodes a broadcast has to reach or the nodes affected when it fails. Nodes are numbered
+by their position in the list of nodes, and dependents are stored as a CSR array (indptr, indices), so looking
+up the dependents of a node takes O(its number of dependents). A node is not its own dependent.
+
+Network.generate_nodes attaches the index to every node it creates, and Node.set_quorum keeps it up to date.
+Changed rows are kept as sets on top of the CSR arrays, and folded into them once a fraction of all rows has
+changed, the same way BroadcastLog compacts withdrawn messages.
+"""
+
+import numpy as np
+
+from Log import log
+
+COMPACT_FRACTION = 0.25 # Rebuild the CSR arrays once this fraction of rows has changed
+COMPACT_MIN = 64
+
+
+class DependentsIndex():
+
+    def __init__(self, nodes, indptr=None, indices=None):
+        """
+        The CSR arrays are built from the quorum sets of nodes, unless they are given (e.g. by TopologyCache).
+        """
+        self.nodes = list(nodes)
+        self.position = {node.name: i for i, node in enumerate(self.nodes)}
+        self._changed = {} # {node index: set of dependent indices}, overrides the CSR row of that node
+        if indptr is None:
+            self._build([self._member_indices(node) for node in self.nodes])
+        else:
+            self.indptr = np.asarray(indptr, dtype=np.int64)
+            self.indices = np.asarray(indices, dtype=np.int64)
+
+        log.network.debug('Built dependents index of %d nodes with %d memberships', len(self.nodes), len(self.indices))
+
+    def __repr__(self):
+        return '[DependentsIndex, nodes = %s, memberships = %s, changed = %s]' % (
+            len(self.nodes), len(self.indices), len(self._changed))
+
+    def __len__(self):
+        return len(self.nodes)
+
+    @staticmethod
+    def quorum_members(node):
+        """
+        All nodes in the quorum set of node, including the nodes of its inner sets.
+        """
+        members = list(node.quorum_set.get_nodes())
+        for inner_set in node.quorum_set.get_inner_sets():
+            members.extend(inner_set if isinstance(inner_set, list) else [inner_set])
+        return members
+
+    @classmethod
+    def attach(cls, nodes, indptr=None, indices=None):
+        """
+        Build the index of nodes and attach it to all of them, so that it follows changes of their quorum sets.
+        """
+        index = cls(nodes, indptr=indptr, indices=indices)
+        for node in index.nodes:
+            node.dependents_index = index
+        return index
+
+    @classmethod
+    def of(cls, nodes):
+        """
+        The index attached to nodes if it covers exactly these nodes in this order, otherwise attach a new one.
+        """
+        nodes = list(nodes)
+        index = nodes[0].dependents_index if nodes else None
+        if index is not None and len(index.nodes) == len(nodes) and all(a is b for a, b in zip(index.nodes, nodes)):
+            return index
+        return cls.attach(nodes)
+
+    def _member_indices(self, node):
+        own = self.position.get(node.name)
+        members = {self.position.get(member.name) for member in self.quorum_members(node)}
+        members.discard(None) # Members outside of the network (e.g. dropped from its largest component)
+        members.discard(own)
+        return members
+
+    def _build(self, member_rows):
+        n = len(self.nodes)
+        sources = np.fromiter((i for i, members in enumerate(member_rows) for _ in members), dtype=np.int64)
+        targets = np.fromiter((j for members in member_rows for j in members), dtype=np.int64)
+        order = np.lexsort((sources, targets)) # Dependents of each node in increasing order
+        self.indices = sources[order]
+        self.indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(targets, minlength=n), out=self.indptr[1:])
+        self._changed = {}
+
+    def dependent_indices(self, i):
+        """
+        Indices of the nodes which have the node with index i in their quorum sets.
+        """
+        changed = self._changed.get(i)
+        if changed is not None:
+            return np.fromiter(sorted(changed), dtype=np.int64, count=len(changed))
+        return self.indices[self.indptr[i]:self.indptr[i + 1]]
+
+    def dependents(self, node):
+        """
+        Nodes which have node in their quorum sets.
+        """
+        i = self.position.get(node.name)
+        if i is None:
+            return []
+        nodes = self.nodes
+        return [nodes[j] for j in self.dependent_indices(i).tolist()]
+
+    def update(self, node, old_members):
+        """
+        Record that the quorum set of node changed from old_members (nodes, see quorum_members) to its current one.
+        """
+        i = self.position.get(node.name)
+        if i is None:
+            return
+        old = {self.position.get(member.name) for member in old_members}
+        old.discard(None)
+        old.discard(i)
+        new = self._member_indices(node)
+
+        for j in old - new:
+            self._row(j).discard(i)
+        for j in new - old:
+            self._row(j).add(i)
+
+        if len(self._changed) >= max(COMPACT_MIN, COMPACT_FRACTION * len(self.nodes)):
+            self._compact()
+
+    def _row(self, j):
+        row = self._changed.get(j)
+        if row is None:
+            row = self._changed[j] = set(self.indices[self.indptr[j]:self.indptr[j + 1]].tolist())
+        return row
+
+    def csr(self):
+        """
+        CSR arrays (indptr, indices) of the whole index, with all changes folded in.
+        """
+        if self._changed:
+            self._compact()
+        return self.indptr, self.indices
+
+    def _compact(self):
+        member_rows = [set() for _ in self.nodes]
+        for j in range(len(self.nodes)):
+            for i in self.dependent_indices(j).tolist():
+                member_rows[i].add(j)
+        self._build(member_rows)
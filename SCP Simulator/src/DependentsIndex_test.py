@@ -0,0 +1,58 @@
+import unittest
+import numpy as np
+from DependentsIndex import DependentsIndex
+from Network import Network
+from Node import Node
+
+
+class DependentsIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        np.random.seed(0)
+
+    def scan(self, nodes, node):
+        # What the index replaces, a scan over all quorum sets
+        return sorted(other.name for other in nodes if other is not node and node in DependentsIndex.quorum_members(other))
+
+    def test_generate_nodes_attaches_index(self):
+        for topology in ('FULL', 'ER-SINGLEQUORUMSET', 'LUNCH'):
+            nodes = Network.generate_nodes(n_nodes=20, topology=topology)
+            index = nodes[0].dependents_index
+            self.assertIsInstance(index, DependentsIndex)
+            self.assertTrue(all(node.dependents_index is index for node in nodes))
+            self.assertEqual(len(index.indptr), len(nodes) + 1)
+            for node in nodes:
+                self.assertEqual(sorted(dependent.name for dependent in index.dependents(node)), self.scan(nodes, node))
+
+    def test_lunch_dependents(self):
+        nodes = {node.name: node for node in Network.generate_nodes(topology='LUNCH')}
+        index = nodes['Alice'].dependents_index
+        self.assertEqual([node.name for node in index.dependents(nodes['Elsie'])], ['Inez', 'John'])
+        self.assertEqual(index.dependents(nodes['John']), [])
+
+    def test_set_quorum_keeps_index_correct(self):
+        nodes = Network.generate_nodes(n_nodes=100, topology='ER-SINGLEQUORUMSET')
+        index = nodes[0].dependents_index
+        for step in range(200):
+            node = nodes[np.random.randint(len(nodes))]
+            members = [nodes[i] for i in np.random.choice(len(nodes), 5, replace=False)]
+            node.set_quorum(members + [node], [])
+            if step % 20 == 0:
+                for other in nodes:
+                    self.assertEqual(sorted(dependent.name for dependent in index.dependents(other)), self.scan(nodes, other))
+        self.assertLess(len(index._changed), len(nodes)) # Changes were folded into the CSR arrays
+        for other in nodes:
+            self.assertEqual(sorted(dependent.name for dependent in index.dependents(other)), self.scan(nodes, other))
+
+    def test_members_outside_index_are_ignored(self):
+        nodes = [Node(i) for i in range(3)]
+        outsider = Node('outsider')
+        nodes[0].set_quorum([nodes[1], outsider], [])
+        index = DependentsIndex.attach(nodes)
+        self.assertEqual(index.dependents(nodes[1]), [nodes[0]])
+        self.assertEqual(index.dependents(outsider), [])
+        self.assertIs(DependentsIndex.of(nodes), index)
+        self.assertIsNot(DependentsIndex.of(nodes[:2]), index)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -27,6 +27,14 @@ class Gillespie:
 
         self.time = 0.0
 
+        self.update_rates()
+
+        log.gillespie.info('Initialized Gillespie algorithm.')
+
+    def update_rates(self):
+        """
+        Rates of all events, from their current taus and tau domains (call again when they change).
+        """
         # Probabilities for each specific event happening to a specific node
         self.node_probabilities = {}
 
@@ -45,8 +53,9 @@ class Gillespie:
 
         # Event probabilities
         self.event_probabilities = self.event_lambdas/self.lambda_sum
-
-        log.gillespie.info('Initialized Gillespie algorithm.')
+        # Cumulative probabilities, to draw events exactly as np.random.choice(self.events, p=self.event_probabilities)
+        self._cumulative = np.cumsum(self.event_probabilities)
+        self._cumulative /= self._cumulative[-1]
 
     def next_event(self):
 
@@ -60,7 +69,7 @@ class Gillespie:
         self.time = self.time + time_increment
 
         # Random event happens
-        event_random = np.random.choice(self.events, p=self.event_probabilities)
+        event_random = self.events[self._cumulative.searchsorted(np.random.random(), side='right')]
 
         # TODO: Events will be handled in the Simulator rather than in Gillespie!
         return [event_random, self.time]
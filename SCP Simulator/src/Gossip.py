@@ -0,0 +1,112 @@
+"""
+=========================
+Gossip
+=========================
+
+Author: Matija Piskorec, Jaime de Vivero Woods
+Last update: October 2026
+
+Gossip class.
+
+Push (flooding) alternative to nodes pulling messages from random peers. When a node broadcasts a message,
+it is sent on the link to every subscriber of that node, i.e. every node which has it in its quorum set
+(looked up in the DependentsIndex of the network). Messages arrive after a latency drawn from a
+LatencyModel and wait on a DeliveryQueue, which the Simulator drains after each event. Links are FIFO.
+No receive event comes back empty. Nominations only ever grow, so a nomination still waiting on a link is
+replaced by a newer one from the same sender instead of queueing both.
+"""
+
+from Log import log
+from Globals import Globals
+from DeliveryQueue import DeliveryQueue
+from DependentsIndex import DependentsIndex
+
+NOMINATE = 'nominate'
+PREPARE = 'prepare'
+COMMIT = 'commit'
+EXTERNALIZE = 'externalize'
+KINDS = (NOMINATE, PREPARE, COMMIT, EXTERNALIZE)
+
+# Default latency of every link. With no latency at all, a delivery which triggers a new broadcast is
+# answered within the same instant, and nodes cascade through states without any events.
+LATENCY_DEFAULT = 0.01
+
+# Kinds of messages which supersede an undelivered message of the same kind on the same link
+SUPERSEDING_KINDS = (NOMINATE,)
+
+# Gillespie events in which nodes pull messages from peers, replaced by deliveries when messages are pushed
+PULL_EVENTS = ('retrieve_message_from_peer', 'receive_prepare_message', 'receive_commit_message', 'receive_externalize_msg')
+
+
+class Gossip():
+
+    def __init__(self, nodes, latency=LATENCY_DEFAULT):
+        """
+        latency is a LatencyModel, a constant latency or the path of a latency matrix (see LatencyModel.of),
+        the matrix is indexed by the position of nodes in the list of nodes.
+        """
+        self.nodes = list(nodes)
+        self.dependents = DependentsIndex.of(self.nodes)
+        self.in_flight = DeliveryQueue(latency) # items are (sender, receiver, [kind, message])
+        self.queued = {} # {(sender name, receiver name, kind): [kind, message] still in flight}, for superseding kinds
+        self.sent = {kind: 0 for kind in KINDS}
+        self.delivered = 0
+        self.superseded = 0
+
+        for node in self.nodes:
+            node.gossip = self
+
+        log.network.info('Initialized gossip with %d links between %d nodes.', len(self.dependents.indices), len(self.nodes))
+
+    def __repr__(self):
+        return '[Gossip, nodes = %s, sent = %s, delivered = %s, superseded = %s, pending = %s]' % (
+            len(self.nodes), self.sent, self.delivered, self.superseded, len(self.in_flight))
+
+    def subscribers(self, node):
+        """
+        Nodes which have node in their quorum set.
+        """
+        return self.dependents.dependents(node)
+
+    @property
+    def latency(self):
+        return self.in_flight.latency
+
+    def publish(self, sender, kind, message):
+        """
+        Send message on the links from sender to all of its subscribers.
+        """
+        nodes = self.nodes
+        supersedes = kind in SUPERSEDING_KINDS
+        sender_index = self.dependents.position[sender.name]
+        subscribers = self.dependents.dependent_indices(sender_index).tolist()
+        for receiver_index in subscribers:
+            receiver = nodes[receiver_index]
+            if supersedes:
+                entry = self.queued.get((sender.name, receiver.name, kind))
+                if entry is not None:
+                    entry[1] = message
+                    self.superseded += 1
+                    continue
+            entry = [kind, message]
+            if supersedes:
+                self.queued[(sender.name, receiver.name, kind)] = entry
+            self.in_flight.send(Globals.simulation_time, sender_index, receiver_index, (sender, receiver, entry))
+        self.sent[kind] += len(subscribers)
+        log.network.debug('Node %s pushed %s message to %d subscribers', sender.name, kind, len(subscribers))
+
+    def deliver_due(self, time):
+        """
+        Deliver all messages scheduled up to time (including messages sent while delivering), return their number.
+        """
+        delivered = 0
+        for sender, receiver, (kind, message) in self.in_flight.pop_due(time):
+            if kind in SUPERSEDING_KINDS:
+                del self.queued[(sender.name, receiver.name, kind)]
+            receiver.deliver(sender, kind, message)
+            delivered += 1
+        self.delivered += delivered
+        return delivered
+
+    def pending(self):
+        return len(self.in_flight)
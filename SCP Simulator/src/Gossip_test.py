@@ -0,0 +1,120 @@
+import random
+import unittest
+import numpy as np
+from Gossip import Gossip, NOMINATE, EXTERNALIZE
+from Globals import Globals
+from Mempool import Mempool
+from Network import Network
+from SCPNominate import SCPNominate
+from Simulator import Simulator
+from Transaction import Transaction
+from Value import Value
+
+
+class GossipTest(unittest.TestCase):
+
+    def setUp(self):
+        Globals.simulation_time = 0
+        self.nodes = Network.generate_nodes(n_nodes=4, topology='FULL')
+        for node in self.nodes:
+            node.attach_mempool(Mempool())
+        self.gossip = Gossip(self.nodes, latency=0.5)
+
+    def test_subscribers_are_reverse_quorum_index(self):
+        self.assertIs(self.gossip.dependents, self.nodes[0].dependents_index)
+        for node in self.nodes:
+            subscribers = self.gossip.subscribers(node)
+            self.assertNotIn(node, subscribers)
+            for subscriber in subscribers:
+                self.assertIn(node, subscriber.quorum_set.get_nodes())
+            self.assertEqual(len(subscribers), len(self.nodes) - 1)
+
+        # Only nodes which still have the sender in their quorum set get its messages
+        self.nodes[1].set_quorum(self.nodes[1:], [])
+        self.nodes[0].publish(NOMINATE, SCPNominate(voted=[Value(transactions={Transaction(0)})], accepted=[]))
+        self.assertEqual(self.gossip.pending(), len(self.nodes) - 2)
+
+    def test_messages_are_delivered_after_delay(self):
+        sender, receiver = self.nodes[0], self.nodes[1]
+        value = Value(transactions={Transaction(0)})
+        sender.publish(NOMINATE, SCPNominate(voted=[value], accepted=[]))
+        self.assertEqual(self.gossip.pending(), len(self.nodes) - 1)
+
+        self.assertEqual(self.gossip.deliver_due(0.4), 0)
+        receiver.priority_list = {sender}
+        receiver.check_update_nomination_round = lambda: None
+        receiver.get_priority_list = lambda: receiver.priority_list
+        self.assertEqual(self.gossip.deliver_due(0.5), len(self.nodes) - 1)
+        self.assertEqual(self.gossip.pending(), 0)
+        self.assertIn(value.hash, receiver.statement_counter)
+
+    def test_nominations_outside_priority_list_are_buffered(self):
+        sender, receiver = self.nodes[0], self.nodes[1]
+        value = Value(transactions={Transaction(0)})
+        receiver.priority_list = set()
+        receiver.check_update_nomination_round = lambda: None
+        receiver.get_priority_list = lambda: receiver.priority_list
+        receiver.deliver(sender, NOMINATE, SCPNominate(voted=[value], accepted=[]))
+        self.assertNotIn(value.hash, receiver.statement_counter)
+        self.assertIn(sender.name, receiver.buffered_nominations)
+
+        # The statement is not pushed again, it is processed once the sender gets into the priority list
+        receiver.priority_list.add(sender)
+        receiver.process_buffered_nominations()
+        self.assertIn(value.hash, receiver.statement_counter)
+        self.assertEqual(receiver.buffered_nominations, {})
+
+    def test_same_statement_is_pushed_once(self):
+        sender = self.nodes[0]
+        value = Value(transactions={Transaction(0)})
+        sender.publish(NOMINATE, SCPNominate(voted=[value], accepted=[]))
+        sender.publish(NOMINATE, SCPNominate(voted=[value], accepted=[]))
+        self.assertEqual(self.gossip.sent[NOMINATE], len(self.nodes) - 1)
+
+        sender.finish_slot(value)
+        sender.publish(NOMINATE, SCPNominate(voted=[value], accepted=[]))
+        self.assertEqual(self.gossip.sent[NOMINATE], 2 * (len(self.nodes) - 1))
+
+    def test_newer_nomination_supersedes_queued_one(self):
+        sender = self.nodes[0]
+        first = Value(transactions={Transaction(0)})
+        second = Value(transactions={Transaction(0), Transaction(0)})
+        sender.publish(NOMINATE, SCPNominate(voted=[first], accepted=[]))
+        sender.publish(NOMINATE, SCPNominate(voted=[second], accepted=[]))
+
+        self.assertEqual(self.gossip.pending(), len(self.nodes) - 1)
+        self.assertEqual(self.gossip.superseded, len(self.nodes) - 1)
+        delivered = []
+        self.nodes[1].deliver = lambda sender, kind, message: delivered.append(message)
+        self.gossip.deliver_due(1.0)
+        self.assertEqual([message.voted for message in delivered], [[second]])
+
+    def test_simulator_push_externalizes_without_pull_events(self):
+        np.random.seed(1)
+        random.seed(1)
+        simulator = Simulator(verbosity=0, n_nodes=5, max_simulation_time=10, topology='FULL', communication='push')
+        simulator.run()
+
+        self.assertGreater(simulator.gossip.delivered, 0)
+        self.assertGreater(simulator.gossip.sent[EXTERNALIZE], 0)
+        ledgers = [node.ledger.slots for node in simulator.nodes]
+        slots = min(len(slots) for slots in ledgers)
+        self.assertGreaterEqual(slots, 1)
+        for slot in range(1, slots + 1):
+            self.assertEqual(len({ledger[slot]['value'] for ledger in ledgers}), 1)
+
+        with self.assertRaises(ValueError):
+            Simulator(verbosity=0, n_nodes=2, topology='FULL', engine='array', communication='push')
+
+    def test_simulator_push_externalizes_on_sparse_topologies(self):
+        # Nominations of peers outside of the priority list are buffered, so slots keep externalizing when not
+        # every peer is a neighbour (random sparse networks need not enjoy quorum intersection, agreement is not checked)
+        for topology in ('BA', 'ER-SINGLEQUORUMSET'):
+            np.random.seed(1)
+            random.seed(1)
+            simulator = Simulator(verbosity=0, n_nodes=8, max_simulation_time=20, topology=topology, communication='push')
+            simulator.run()
+            self.assertGreaterEqual(min(len(node.ledger.slots) for node in simulator.nodes), 2, topology)
+
+if __name__ == "__main__":
+    unittest.main()
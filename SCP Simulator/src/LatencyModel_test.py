@@ -0,0 +1,47 @@
+import os
+import random
+import tempfile
+import unittest
+import numpy as np
+from LatencyModel import LatencyModel
+
+
+class LatencyModelTest(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(0)
+
+    def test_constant_latency(self):
+        latency = LatencyModel.of(0.2)
+        self.assertEqual(latency.sample(0, 1), 0.2)
+        self.assertEqual(LatencyModel.of(latency), latency)
+
+    def test_distributions_have_link_mean(self):
+        for distribution in ('uniform', 'exponential', 'lognormal'):
+            latency = LatencyModel(mean=0.1, distribution=distribution)
+            samples = [latency.sample(0, 1) for _ in range(20000)]
+            self.assertTrue(all(sample >= 0 for sample in samples))
+            self.assertAlmostEqual(np.mean(samples), 0.1, delta=0.005)
+
+    def test_matrix_sets_latency_per_link(self):
+        matrix = np.array([[0, 0.1, 0.5], [0.1, 0, 0.2], [0.5, 0.2, 0]])
+        with tempfile.TemporaryDirectory() as directory:
+            for path in (os.path.join(directory, 'latency.npy'), os.path.join(directory, 'latency.csv')):
+                if path.endswith('.npy'):
+                    np.save(path, matrix)
+                else:
+                    np.savetxt(path, matrix, delimiter=',')
+                latency = LatencyModel.of(path)
+                self.assertEqual(latency.sample(0, 2), 0.5)
+                self.assertEqual(latency.sample(2, 1), 0.2)
+
+    def test_invalid_latencies(self):
+        with self.assertRaises(ValueError):
+            LatencyModel(mean=-1)
+        with self.assertRaises(ValueError):
+            LatencyModel(matrix=np.zeros((2, 3)))
+        with self.assertRaises(ValueError):
+            LatencyModel(distribution='pareto')
+
+if __name__ == "__main__":
+    unittest.main()
@@ -53,6 +53,11 @@ class Log:
             logger.setLevel(level)
         return
 
+    def clear(self):
+        # Drop the logs kept in memory, e.g. between replicates of a simulation
+        self.log_stream.seek(0)
+        self.log_stream.truncate(0)
+
     def export_logs_to_txt(self, file_path):
         with open(file_path, 'w') as log_file:
             log_file.write(self.log_stream.getvalue())
@@ -4,7 +4,7 @@ Mempool
 =========================
 
 Author: Matija Piskorec
-Last update: August 2023
+Last update: October 2026
 
 Mempool class.
 
@@ -15,17 +15,17 @@ from Log import log
 from Event import Event
 from Transaction import Transaction
 from SCPNominate import SCPNominate
+from TransactionPool import TransactionPool
 # import Globals
 from Globals import Globals
 
-import numpy as np
 import random
 import os
 
 class Mempool():
 
     def __init__(self):
-        self.transactions = []
+        self.transactions = TransactionPool()
         self.messages = []
         self.log_path = 'simulator_mine_events.txt'
 
@@ -39,11 +39,11 @@ class Mempool():
         with open(self.log_path, 'a') as log_file:
             log_file.write(f"{Globals.simulation_time:.2f} - {message}\n")
 
-    def mine(self):
-        transaction_mined = Transaction(time=Globals.simulation_time)
-        if transaction_mined not in self.transactions:
+    def mine(self, transaction=None):
+        # Mines the given transaction (e.g. an arrival of a TransactionStream), or a new one with a random hash
+        transaction_mined = transaction if transaction is not None else Transaction(time=Globals.simulation_time)
+        if self.transactions.add(transaction_mined):
             log.mempool.info('Transaction %s mined to the mempool!', transaction_mined)
-            self.transactions.append(transaction_mined)
             if not os.path.exists(self.log_path):
                 with open(self.log_path, 'w') as log_file:
                     log_file.write("")
@@ -56,7 +56,7 @@ class Mempool():
 
     def get_transaction(self):
         if len(self.transactions) > 0:
-            transaction = np.random.choice(self.transactions) if len(self.transactions) > 0 else None
+            transaction = self.transactions.sample()
 
             log.mempool.info('Transaction %s retrieved from the mempool!', transaction)
         else:
@@ -67,7 +67,17 @@ class Mempool():
     def get_all_transactions(self):
         if len(self.transactions) > 0:
             log.mempool.info('All transactions retrieved from the mempool: %s', self.transactions)
-            return self.transactions.copy()  # Return a copy to avoid external mutation
+            return self.transactions.copy()  # Return a list copy (in FIFO order) to avoid external mutation
         else:
             log.mempool.info('No transactions in the mempool!')
             return []
+
+    def remove_transactions(self, transactions):
+        """
+        Remove transactions (or transaction IDs) from the mempool, returns how many were actually removed.
+        """
+        removed = 0
+        for tx in transactions:
+            if self.transactions.discard(tx) is not None:
+                removed += 1
+        return removed
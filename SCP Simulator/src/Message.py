@@ -4,36 +4,73 @@ Message
 =========================
 
 Author: Matija Piskorec
-Last update: August 2023
+Last update: October 2026
 
 Message superclass.
+
+Messages are compact and immutable: every subclass declares its fields in __slots__ and sets them once
+in __init__ through _set_fields. Each message gets an integer ID from a per-run counter (reset with
+Message.reset_ids() at the start of a simulation), which is also used as its precomputed hash.
 """
 
 from Log import log
 
-import time
-import uuid
+import itertools
 
-UUID_LENGTH = 10
+_message_ids = itertools.count()
 
 class Message():
 
-    def __new__(cls,**kwargs):
+    __slots__ = ('_message_id', '_broadcasted')
+
+    def __new__(cls, *args, **kwargs):
         new = object.__new__(cls)
-        new._message_id = uuid.uuid4().hex[:UUID_LENGTH]
-        new._broadcasted = kwargs['broadcasted'] if 'broadcasted' in kwargs else False
+        object.__setattr__(new, '_message_id', next(_message_ids))
+        object.__setattr__(new, '_broadcasted', kwargs['broadcasted'] if 'broadcasted' in kwargs else False)
         return new
 
+    @staticmethod
+    def reset_ids():
+        # Start message IDs from zero, so that runs with the same seed produce the same IDs
+        global _message_ids
+        _message_ids = itertools.count()
+
+    @classmethod
+    def _field_names(cls):
+        # All slots of the class hierarchy, base class first
+        names = []
+        for klass in reversed(cls.__mro__):
+            names.extend(klass.__dict__.get('__slots__', ()))
+        return names
+
+    def _set_fields(self, **fields):
+        for name, value in fields.items():
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError('%s message is immutable, cannot set %s' % (type(self).__name__, name))
+
+    def __delattr__(self, name):
+        raise AttributeError('%s message is immutable, cannot delete %s' % (type(self).__name__, name))
+
+    def __getstate__(self):
+        return {name: getattr(self, name) for name in self._field_names()}
+
+    def __setstate__(self, state):
+        self._set_fields(**state)
+
     def __repr__(self):
-        return '[%s message, data = %s]' % (type(self).__name__, self.__dict__)
+        return '[%s message, data = %s]' % (type(self).__name__, self.__getstate__())
 
     def __eq__(self, other):
-        # return message._message_id == self._message_id
         if isinstance(other, self.__class__):
             return other._message_id == self._message_id
         else:
             return False
 
+    def __hash__(self):
+        return self._message_id
+
     @property
     def message_id(self):
         return self._message_id
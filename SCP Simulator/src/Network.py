@@ -4,7 +4,7 @@ Network
 =========================
 
 Author: Matija Piskorec, Jaime de Vivero Woods
-Last update: March 2025
+Last update: October 2026
 
 Network class. Setup Stellar validator network by initializing nodes and setting their quorum sets based on a predefined topology.
 """
@@ -12,13 +12,25 @@ Network class. Setup Stellar validator network by initializing nodes and setting
 from Log import log
 from Node import Node
 from QuorumSet import QuorumSet
+from DependentsIndex import DependentsIndex
+from TopologyCache import TopologyCache
+from TopologyGenerator import TopologyGenerator, VERSION as GENERATOR_VERSION
+from TopologyStats import TopologyStats
 import json
-import networkx as nx
 
 class Network():
 
     topologies = ['FULL','ER-SINGLEQUORUMSET','ER_singlequorumset', 'ER_SQ_FIXED_DEGREE', 'BA', 'HARDCODE', 'LUNCH']
 
+    # Default parameters of the random graph generators (overridden by the parameters of generate_nodes), random
+    # topologies are the ones worth caching. ER topologies take either the edge probability p or the average degree.
+    generator_params = {
+        'ER-SINGLEQUORUMSET': {'p': 0.5},
+        'ER_singlequorumset': {'p': 0.5},
+        'ER_SQ_FIXED_DEGREE': {'degree': 10},
+        'BA': {'m': 5},
+    }
+
     @classmethod
     def parse_all_validators(cls, file_path):
         with open(file_path, 'r') as file:
@@ -43,10 +55,76 @@ class Network():
         return nodes
 
     @classmethod
-    def generate_nodes(cls,n_nodes=2,topology='FULL'):
+    def topology_params(cls, topology, **params):
+        """
+        Parameters of the random graph generator of topology, the defaults overridden by params.
+        """
+        unknown = set(params) - {'p', 'degree', 'm'}
+        if unknown:
+            raise ValueError('Unknown topology parameters %s' % sorted(unknown))
+        merged = dict(cls.generator_params.get(topology, {}))
+        if topology in ('ER-SINGLEQUORUMSET', 'ER_singlequorumset') and 'degree' in params and 'p' not in params:
+            merged['p'] = None # The average degree given instead of the edge probability
+        merged.update(params)
+        return merged
+
+    @classmethod
+    def generate_nodes(cls,n_nodes=2,topology='FULL',seed=None,cache_dir=None,**params):
+        """
+        Generate nodes of the topology and attach a DependentsIndex (who has whom in their quorum set) to them.
+
+        Random graphs take their parameters from generator_params, overridden by params (p, degree or m). With a
+        seed, they are generated reproducibly, and with a cache_dir as well, they are loaded from (or saved to) a
+        TopologyCache in that directory instead of being generated again.
+        """
+        params = cls.topology_params(topology, **params)
+        cache = None
+        if seed is not None and cache_dir is not None and topology in cls.generator_params:
+            cache = TopologyCache(cache_dir)
+            key = TopologyCache.key(topology, n_nodes, seed, dict(params, generator=GENERATOR_VERSION))
+            nodes = cache.load(key)
+            if nodes is not None:
+                return nodes
+
+        nodes = cls._generate_topology(n_nodes=n_nodes, topology=topology, seed=seed, params=params)
+        DependentsIndex.of(nodes) # Unless the generator attached one already
+        if cache is not None:
+            cache.save(key, nodes)
+        return nodes
+
+    @classmethod
+    def topology_stats(cls, nodes, seed=None):
+        """
+        TopologyStats of the graph linking every node to the members of its quorum set, computed on demand.
+        """
+        return TopologyStats.of(nodes, DependentsIndex.quorum_members, seed=seed)
+
+    @classmethod
+    def _flat_quorum_sets(cls, n_nodes, indptr, neighbors):
+        """
+        Nodes of a connected graph given as CSR arrays, the quorum set of each node being its neighbors and itself.
+        """
+        nodes = []
+        for i in range(n_nodes):
+            nodes.append(Node(i))
+            log.network.debug('Node created: %s', nodes[-1])
+
+        for i, node in enumerate(nodes):
+            quorum_members = [nodes[j] for j in neighbors[indptr[i]:indptr[i + 1]].tolist()] + [node]
+            log.network.debug('Adding nodes %s to the flat quorum of Node %s', [n.name for n in quorum_members], node)
+            node.set_quorum(nodes=quorum_members, inner_sets=[])
+        # The graph is undirected, so the dependents of a node are its neighbors
+        DependentsIndex.attach(nodes, indptr=indptr, indices=neighbors)
+
+        return nodes
+
+    @classmethod
+    def _generate_topology(cls,n_nodes=2,topology='FULL',seed=None,params=None):
 
         assert n_nodes > 0
         assert topology in cls.topologies
+        params = params if params is not None else cls.topology_params(topology)
+        rng = TopologyGenerator.rng(seed)
 
         nodes = []
 
@@ -70,25 +148,13 @@ class Network():
                     nodes.append(Node(i))
                     log.network.debug('Node created: %s', nodes[-1])
 
-                node_map = {node.name: node for node in nodes}
-
                 log.network.debug('Calculating quorum sets based on the network topology=%s', topology)
-                # Generate a random graph with n_nodes and 50% chance for each edge
-                graph = nx.fast_gnp_random_graph(n_nodes, 0.5)
-                # Find the largest connected component (LCC)
-                lcc_set = max(nx.connected_components(graph), key=len)
-                # Identify missing nodes (not in LCC)
-                missing = list(set(int(node.name) for node in nodes) - lcc_set)
-                if len(missing) > 0:
-                    log.network.debug('Nodes %s are not part of the LCC so they are excluded from all quorum sets!',
-                                      missing)
-                # Exclude nodes that are not in the LCC
-                nodes = [node for node in nodes if int(node.name) in lcc_set]
-                nodes = [node_map[i] for i in lcc_set]
+                # Generate a connected random graph with n_nodes and probability p (or average degree) for each edge
+                indptr, neighbors = TopologyGenerator.generate('ER', n_nodes, rng, p=params['p'], degree=params.get('degree'))
 
-                for node in nodes:
-                    # For each node, get its edges from the graph
-                    filtered_nodes = [nodes[edge[1]] for edge in graph.edges(node.name) if edge[1] < len(nodes)]
+                for i, node in enumerate(nodes):
+                    # For each node, get its neighbors in the graph
+                    filtered_nodes = [nodes[j] for j in neighbors[indptr[i]:indptr[i + 1]].tolist()]
 
                     if len(filtered_nodes) > 1:
                         filter_distribution = len(filtered_nodes) // 2  # Half to quorum, half to inner sets
@@ -120,153 +186,23 @@ class Network():
                 return nodes
 
             case 'ER_singlequorumset':
-                # 1) create all nodes
-                nodes = []
-                for i in range(n_nodes):
-                    nodes.append(Node(i))
-                    log.network.debug('Node created: %s', nodes[-1])
-                node_map = {int(n.name): n for n in nodes}
-
-                # 2) build random ER-SINGLEQUORUMSET graph & find LCC
-                log.network.debug('Building ER_singlequorumset graph with p=0.5')
-                graph = nx.fast_gnp_random_graph(n_nodes, 0.5)
-                lcc = max(nx.connected_components(graph), key=len)
-                missing = [i for i in range(n_nodes) if i not in lcc]
-                if missing:
-                    log.network.debug('Dropping isolated/excluded nodes: %s', missing)
-
-                # 3) restrict execution to the LCC
-                sq_nodes = [node_map[i] for i in lcc]
-
-                # 4) for each node, quorum = its LCC-neighbors + itself
-                for node in sq_nodes:
-                    idx = int(node.name)
-                    nbrs = [nbr for nbr in graph.neighbors(idx) if nbr in lcc]
-                    peers = [node_map[n] for n in nbrs]
-                    quorum_members = peers + [node]
-
-                    log.network.debug(
-                        'Adding nodes %s to the flat quorum of Node %s',
-                        [n.name for n in quorum_members], node
-                    )
-                    node.set_quorum(nodes=quorum_members, inner_sets=[])
-
-                # 5) return exactly the validators that made it into the LCC
-
-                # Calculate and log average peer degree for SCP nodes in LCC (excluding self)
-                peer_degrees = []
-                for node in sq_nodes:
-                    degree = len(node.quorum_set.nodes) - 1
-                    peer_degrees.append(degree)
-                avg_degree = sum(peer_degrees) / len(peer_degrees) if peer_degrees else 0
-
-                # Log to file
-                with open('simulator_events_log.txt', 'a') as f:
-                    f.write(
-                        f"[ER_singlequorumset] n_nodes={n_nodes}, LCC_size={len(sq_nodes)}, avg_peer_degree={avg_degree:.2f}\n")
-
-                return sq_nodes
+                log.network.debug('Building ER_singlequorumset graph with p=%s, degree=%s', params['p'], params.get('degree'))
+                indptr, neighbors = TopologyGenerator.generate('ER', n_nodes, rng, p=params['p'], degree=params.get('degree'))
+                return cls._flat_quorum_sets(n_nodes, indptr, neighbors)
 
             case 'ER_SQ_FIXED_DEGREE':
-                degree = 10
+                degree = params['degree']
                 if n_nodes * degree % 2 != 0:
                     raise ValueError("n_nodes * degree must be even for a regular graph.")
-
-                # 1) create all nodes
-                nodes = []
-                for i in range(n_nodes):
-                    nodes.append(Node(i))
-                    log.network.debug('Node created: %s', nodes[-1])
-                node_map = {int(n.name): n for n in nodes}
-
-                # 2) build random regular graph & find LCC (should be connected but double-check)
                 log.network.debug(f'Building random regular graph with degree={degree}')
-                graph = nx.random_regular_graph(degree, n_nodes)
-                lcc = max(nx.connected_components(graph), key=len)
-                missing = [i for i in range(n_nodes) if i not in lcc]
-                if missing:
-                    log.network.debug('Dropping isolated/excluded nodes: %s', missing)
-
-                # 3) restrict execution to the LCC
-                sq_nodes = [node_map[i] for i in lcc]
-
-                # 4) for each node, quorum = its LCC-neighbors + itself
-                for node in sq_nodes:
-                    idx = int(node.name)
-                    nbrs = [nbr for nbr in graph.neighbors(idx) if nbr in lcc]
-                    peers = [node_map[n] for n in nbrs]
-                    quorum_members = peers + [node]
-
-                    log.network.debug(
-                        'Adding nodes %s to the flat quorum of Node %s',
-                        [n.name for n in quorum_members], node
-                    )
-                    node.set_quorum(nodes=quorum_members, inner_sets=[])
-
-                # 5) return exactly the validators that made it into the LCC
-
-                # Calculate and log average peer degree for SCP nodes in LCC (excluding self)
-                peer_degrees = []
-                for node in sq_nodes:
-                    degree = len(node.quorum_set.nodes) - 1  # excluding self
-                    peer_degrees.append(degree)
-                avg_degree = sum(peer_degrees) / len(peer_degrees) if peer_degrees else 0
-
-                # Log to file
-                with open('simulator_events_log.txt', 'a') as f:
-                    f.write(
-                        f"[ER_SQ_FIXED_DEGREE] n_nodes={n_nodes}, LCC_size={len(sq_nodes)}, avg_peer_degree={avg_degree:.2f}\n")
-
-                return sq_nodes
+                indptr, neighbors = TopologyGenerator.generate('REGULAR', n_nodes, rng, degree=degree)
+                return cls._flat_quorum_sets(n_nodes, indptr, neighbors)
 
             case 'BA':
-                # 1) create all nodes
-                nodes = []
-                for i in range(n_nodes):
-                    nodes.append(Node(i))
-                    log.network.debug('Node created: %s', nodes[-1])
-                node_map = {int(n.name): n for n in nodes}
-
-                # 2) build BA graph & find LCC
-                m = 5  # degree is 2*m
+                m = params['m']  # degree is 2*m
                 log.network.debug(f'Building BA graph with m={m}')
-                graph = nx.barabasi_albert_graph(n_nodes, m)
-                lcc = max(nx.connected_components(graph), key=len)
-                missing = [i for i in range(n_nodes) if i not in lcc]
-                if missing:
-                    log.network.debug('Dropping isolated/excluded nodes: %s', missing)
-
-                # 3) restrict execution to the LCC
-                sq_nodes = [node_map[i] for i in lcc]
-
-                # 4) for each node, quorum = its LCC-neighbors + itself
-                for node in sq_nodes:
-                    idx = int(node.name)
-                    nbrs = [nbr for nbr in graph.neighbors(idx) if nbr in lcc]
-                    peers = [node_map[n] for n in nbrs]
-                    quorum_members = peers + [node]
-
-                    log.network.debug(
-                        'Adding nodes %s to the flat quorum of Node %s',
-                        [n.name for n in quorum_members], node
-                    )
-                    node.set_quorum(nodes=quorum_members, inner_sets=[])
-
-                # 5) return exactly the validators that made it into the LCC
-
-                # Calculate and log average peer degree for SCP nodes in LCC (excluding self)
-                peer_degrees = []
-                for node in sq_nodes:
-                    degree = len(node.quorum_set.nodes) - 1  # excluding self
-                    peer_degrees.append(degree)
-                avg_degree = sum(peer_degrees) / len(peer_degrees) if peer_degrees else 0
-
-                # Log to file
-                with open('simulator_events_log.txt', 'a') as f:
-                    f.write(
-                        f"[BA] n_nodes={n_nodes}, LCC_size={len(sq_nodes)}, avg_peer_degree={avg_degree:.2f}\n")
-
-                return sq_nodes
+                indptr, neighbors = TopologyGenerator.generate('BA', n_nodes, rng, m=m)
+                return cls._flat_quorum_sets(n_nodes, indptr, neighbors)
 
             case 'HARDCODE':
                 file_path = "quorumset_20250131_095020.json"
@@ -1,5 +1,7 @@
 from Log import log
 import unittest
+import numpy as np
+from DependentsIndex import DependentsIndex
 from Network import Network
 
 class NetworkTest(unittest.TestCase):
@@ -26,5 +28,25 @@ class NetworkTest(unittest.TestCase):
                 log.test.debug('Node %s, all peers in quorum set = %s',node.name,node.quorum_set.get_nodes())
                 self.assertTrue(len(node.quorum_set.nodes) > 1)
 
+    def test_generate_nodes_with_params(self):
+        nodes = Network.generate_nodes(n_nodes=200, topology='ER_SQ_FIXED_DEGREE', seed=1, degree=4)
+        self.assertEqual(len(nodes), 200)
+        self.assertTrue(all(len(node.quorum_set.nodes) <= 5 for node in nodes))
+
+        nodes = Network.generate_nodes(n_nodes=200, topology='ER_singlequorumset', seed=1, degree=6)
+        self.assertEqual(len(nodes), 200) # Connected graph, so no node is dropped
+        average = sum(len(node.quorum_set.nodes) - 1 for node in nodes) / len(nodes)
+        self.assertLess(abs(average - 6), 1)
+
+        nodes = Network.generate_nodes(n_nodes=200, topology='BA', seed=1, m=2)
+        self.assertEqual(sum(len(node.quorum_set.nodes) - 1 for node in nodes), 2 * (2 + 197 * 2))
+        # The index attached from the graph is the one built from the quorum sets
+        indptr, indices = nodes[0].dependents_index.csr()
+        rebuilt = DependentsIndex(nodes)
+        self.assertTrue(np.array_equal(indptr, rebuilt.indptr) and np.array_equal(indices, rebuilt.indices))
+
+        with self.assertRaises(ValueError):
+            Network.generate_nodes(n_nodes=20, topology='BA', k=2)
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
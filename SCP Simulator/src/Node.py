@@ -14,7 +14,6 @@ Documentation:
 [2] Nicolas Barry and Giuliano Losa and David Mazieres and Jed McCaleb and Stanislas Polu, The Stellar Consensus Protocol (SCP) - technical implementation draft, https://datatracker.ietf.org/doc/draft-mazieres-dinrg-scp/05/
 """
 import random
-from collections import deque
 
 import numpy as np
 from Log import log
@@ -28,12 +27,22 @@ from SCPCommit import SCPCommit
 from SCPExternalize import SCPExternalize
 from Value import Value
 from Storage import Storage
+from TransactionPool import TransactionPool
+from BroadcastLog import BroadcastLog
+from SlotState import SlotState
 from Globals import Globals
-import copy
+from Gossip import NOMINATE, PREPARE, COMMIT, EXTERNALIZE
 import xdrlib3
 import hashlib
 import os
 
+
+def slot_state_attribute(name):
+    # Node attribute which lives in the SlotState of the current slot
+    return property(lambda self: getattr(self.slot_state, name),
+                    lambda self, value: setattr(self.slot_state, name, value))
+
+
 class Node():
     name = None
     quorum_set = None
@@ -42,23 +51,49 @@ class Node():
     storage = None
     nomination_round = None
 
+    # Per-slot consensus state, dropped wholesale when a slot is externalized (see SlotState)
+    nomination_state = slot_state_attribute('nomination_state')
+    statement_counter = slot_state_attribute('statement_counter')
+    balloting_state = slot_state_attribute('balloting_state')
+    ballot_statement_counter = slot_state_attribute('ballot_statement_counter')
+    ballot_prepare_broadcast_flags = slot_state_attribute('ballot_prepare_broadcast_flags')
+    prepared_ballots = slot_state_attribute('prepared_ballots')
+    commit_ballot_state = slot_state_attribute('commit_ballot_state')
+    commit_ballot_statement_counter = slot_state_attribute('commit_ballot_statement_counter')
+    commit_ballot_broadcast_flags = slot_state_attribute('commit_ballot_broadcast_flags')
+    committed_ballots = slot_state_attribute('committed_ballots')
+
     def __init__(self, name, quorum_set=None, ledger=None, storage=None):
         self.name = name
         self.quorum_set = quorum_set if quorum_set is not None else QuorumSet(self)
+        self.dependents_index = None # DependentsIndex of the network, kept up to date when our quorum set changes
+        self.reset(ledger=ledger, storage=storage)
+
+        log.node.info('Initialized node %s, quorum_set=%s, ledger=%s, storage=%s.',
+                      self.name,
+                      self.quorum_set,
+                      self.ledger,
+                      self.storage)
+
+        self.log_path = 'simulator_events_log.txt'
+        self.log_nomination_data_path = 'nomination_phase_log.txt'
+
+    def reset(self, ledger=None, storage=None):
+        """
+        Reset all state of a run (ledger, mempool, slots, messages), keeping the name and quorum set, so that the
+        same nodes can run another replicate of a simulation (see Simulator.run_replicates).
+        """
         self.ledger = ledger if ledger is not None else Ledger(self)
         self.slot = 1
         self.mempool = None
-        self.tx_queue = deque()
+        self.tx_queue = TransactionPool() # FIFO queue of transactions waiting to be nominated, indexed by transaction ID
 
         self.storage = storage if storage is not None else Storage(self)
-        default_state = {'voted': [], 'accepted': [], 'confirmed': []}
-        self.nomination_state = copy.deepcopy(default_state)
-        self.balloting_state = copy.deepcopy(default_state)
-        self.statement_counter = {} # This hashmap (or dictionary) keeps track of all Values added and how many times unique nodes have made statements on it
-        # This dictionary looks like this {Value_hash: {'voted': {node_id: count,...}}, {'accepted': {node_id:count}}}
-        self.broadcast_flags = []  # Add every message here for other
-        self.received_broadcast_msgs = {} # This hashmap (or dictionary) keeps track of all Messages retrieved by each node
-        # This dictionary looks like this {{node.name: SCPNominate,...},...}
+        # Nomination, prepare and commit state of the current slot (nomination_state, statement_counter, balloting_state, ...)
+        self.slot_state = SlotState(self.slot)
+        self._broadcast_flags = BroadcastLog()  # Add every message here for other nodes, each message gets a sequence number
+        self.received_broadcast_msgs = {} # This hashmap (or dictionary) keeps a cursor into the broadcast flags of each node
+        # This dictionary looks like this {node.name: next unseen sequence number,...}
         self.priority_list = set()
         self.finalised_transactions = set()
         self._seen_finalised_ballots = set()
@@ -70,20 +105,12 @@ class Node():
         ###################################
         # PREPARE BALLOT PHASE STRUCTURES #
         ###################################
-        self.balloting_state = {'voted': {}, 'accepted': {}, 'confirmed': {}, 'aborted': {}} # This will look like: self.balloting_state = {'voted': {'value_hash_1': SCPBallot(counter=1, value=ValueObject1),},'accepted': { 'value_hash_2': SCPBallot(counter=3, value=ValueObject2)},'confirmed': { ... },'aborted': { ... }}
-        self.ballot_statement_counter = {} # This will use sets for node names as opposed to counts, so will look like: {SCPBallot1.value: {'voted': set(Node1), ‘accepted’: set(Node2, Node3), ‘confirmed’: set(), ‘aborted’: set(), SCPBallot2.value: {'voted': set(), ‘accepted’: set(), ‘confirmed’: set(), ‘aborted’: set(node1, node2, node3)}
-        self.ballot_prepare_broadcast_flags = set() # Add every SCPPrepare message here - this will look like
-        self.received_prepare_broadcast_msgs = {}
-        self.prepared_ballots = {} # This looks like: self.prepared_ballots[ballot.value] = SCPPrepare('aCounter': aCounter,'cCounter': cCounter,'hCounter': hCounter,'highestCounter': ballot.counter)
+        self.received_prepare_broadcast_msgs = {} # {node.name: next unseen sequence number}
 
         ###################################
         # SCPCOMMIT BALLOT PHASE STRUCTURES #
         ###################################
-        self.commit_ballot_state = {'voted': {}, 'accepted': {}, 'confirmed': {}} # This will look like: self.balloting_state = {'voted': {'value_hash_1': SCPBallot(counter=1, value=ValueObject1),},'accepted': { 'value_hash_2': SCPBallot(counter=3, value=ValueObject2)},'confirmed': { ... },'aborted': { ... }}
-        self.commit_ballot_statement_counter = {} # This will use sets for node names as opposed to counts, so will look like: {SCPBallot1.value: {'voted': set(Node1), ‘accepted’: set(Node2, Node3), ‘confirmed’: set(), ‘aborted’: set(), SCPBallot2.value: {'voted': set(), ‘accepted’: set(), ‘confirmed’: set(), ‘aborted’: set(node1, node2, node3)}
-        self.commit_ballot_broadcast_flags = set() # Add every SCPPrepare message here - this will look like
-        self.received_commit_ballot_broadcast_msgs = {}
-        self.committed_ballots = {} # This looks like: self.prepared_ballots[ballot.value] = SCPPrepare('aCounter': aCounter,'cCounter': cCounter,'hCounter': hCounter,'highestCounter': ballot.counter)
+        self.received_commit_ballot_broadcast_msgs = {} # {node.name: next unseen sequence number}
 
         ###################################
         # EXTERNALIZE PHASE STRUCTURES    #
@@ -92,15 +119,25 @@ class Node():
         self.externalized_slot_counter = set()
         self.peer_externalised_statements = {} # This will be used to track finalised slots for nodes, so will look like: {Node1: set(SCPExternalize(ballot, 1), SCPExternalize(ballot2, 3), Node2:{})}
 
-        log.node.info('Initialized node %s, quorum_set=%s, ledger=%s, storage=%s.',
-                      self.name,
-                      self.quorum_set,
-                      self.ledger,
-                      self.storage)
-
-
-        self.log_path = 'simulator_events_log.txt'
-        self.log_nomination_data_path = 'nomination_phase_log.txt'
+        ###################################
+        # PUSH GOSSIP STRUCTURES          #
+        ###################################
+        self.gossip = None # Gossip which pushes our broadcasts to subscribers, None when peers pull them
+        self._published_statements = set() # Content of every message pushed in the current slot (see statement_key)
+        self.future_externalize_msgs = {} # Pushed externalize messages for slots we have not reached yet, {slot: (message, sender)}
+        self.latest_pushed_msgs = {PREPARE: {}, COMMIT: {}} # Latest pushed ballot message of every peer, {kind: {peer name: (peer, message)}}
+        self.buffered_nominations = {} # Pushed nominations of peers not in our priority list yet, {peer name: (peer, message)}
+
+    # Broadcast flags are append-only logs with per-sender sequence numbers. Assigning a new collection
+    # withdraws the old messages but keeps the sequence numbers growing, so peers' cursors stay valid.
+    # Prepare and commit broadcast flags behave the same way, but live in the SlotState.
+    @property
+    def broadcast_flags(self):
+        return self._broadcast_flags
+
+    @broadcast_flags.setter
+    def broadcast_flags(self, messages):
+        self._broadcast_flags.replace(messages)
 
     def remove_finalized_transactions(self, finalized_value):
         """
@@ -240,7 +277,7 @@ class Node():
                 log.node.info('Node %s ignored transaction %s as it was already externalized.', self.name,
                               transaction_id)
                 # Do not add the transaction to the ledger in this branch.
-                self.mempool.transactions.remove(transaction)
+                self.mempool.transactions.discard(transaction)
                 self.log_to_file(
                     f"NODE - INFO - Node {self.name} ignored {transaction} as it was already externalized.")
                 return None  # Explicitly return None as the transaction is externalized.
@@ -255,11 +292,19 @@ class Node():
 
     # Set quorum to the nodes
     def set_quorum(self, nodes, inner_sets, threshold=None):
+        old_members = self._quorum_members_before_change()
         if threshold is not None:
             self.quorum_set.threshold = threshold
         self.quorum_set.set(nodes=nodes, inner_sets=inner_sets)
+        if old_members is not None:
+            self.dependents_index.update(self, old_members)
         return
 
+    def _quorum_members_before_change(self):
+        if self.dependents_index is None:
+            return None
+        return self.dependents_index.quorum_members(self)
+
     def attach_mempool(self, mempool):
         self.mempool = mempool
         return
@@ -291,10 +336,13 @@ class Node():
         """
         Broadcast SCPNominate message to the storage.
         """
+        self.publish_latest_nomination()
+
         # A node can nominate a value itself if it has the highest priority in the current round.
         #  If it does not have the highest priority, it waits for higher-priority nodes to propose values before deciding what to nominate
         self.check_update_nomination_round()
         self.get_priority_list()
+        self.process_buffered_nominations()
         if self.name in self.priority_list:
             msg = self.prepare_nomination_msg() # Prepares Values for Nomination and broadcasts message
             if msg is None:
@@ -316,20 +364,21 @@ class Node():
 
     def retrieve_broadcast_message(self, providing_node):
         """
-        Pull one unseen envelope from providing_node.broadcast_flags.
+        Pull the oldest unseen envelope from providing_node.broadcast_flags (in broadcast order rather than a
+        random unseen one, so that a single cursor per peer is enough to remember what was seen).
         Return None once I've seen them all, or they have none left.
         """
         # nothing to pull if they have no flags
         if not providing_node.broadcast_flags:
             return None
 
-        seen = self.received_broadcast_msgs.setdefault(providing_node.name, [])
-        unseen = [m for m in providing_node.broadcast_flags if m not in seen]
-        if not unseen:
+        cursor = self.received_broadcast_msgs.get(providing_node.name, 0)
+        entry = providing_node.broadcast_flags.next_after(cursor)
+        if entry is None:
             return None
 
-        msg = np.random.choice(unseen)
-        seen.append(msg)
+        seq, msg = entry
+        self.received_broadcast_msgs[providing_node.name] = seq + 1
 
         # if that nomination has already been externalized, drop it
         if self.is_message_externalized(msg):
@@ -382,35 +431,132 @@ class Node():
                 message = self.retrieve_broadcast_message(priority_node)
 
                 if message is not None:
-                    log.node.critical('Node %s receiving SCPNominate message', self.name)
-                    message = message.parse_message_state(message) # message is an array of 2 arrays, the first being the voted values and the second the accepted values
-                    self.process_received_message(message)
-                    self.update_statement_count(priority_node, message)
-                    log.node.info('Node %s retrieving messages from his highest priority neighbor Node %s!', self.name,priority_node.name)
+                    self.process_nomination_message(sender=priority_node, message=message)
+                else:
+                    log.node.info('Node %s has no messages to retrieve from his highest priority neighbor Node %s!', self.name, priority_node.name)
 
-                    voted_val = message[0] # message[0] is voted field
-                    if type(voted_val) is Value and self.check_Quorum_threshold(voted_val):
+    def process_nomination_message(self, sender, message):
+        """
+        Process SCPNominate message broadcast by sender (pulled from it, or pushed to us by gossip).
+        """
+        log.node.critical('Node %s receiving SCPNominate message', self.name)
+        message = message.parse_message_state(message) # message is an array of 2 arrays, the first being the voted values and the second the accepted values
+        self.process_received_message(message)
+        self.update_statement_count(sender, message)
+        log.node.info('Node %s retrieving messages from his highest priority neighbor Node %s!', self.name,sender.name)
 
-                        log.node.info('Quorum threshold met for voted value %s at Node %s', voted_val, self.name)
-                        self.update_nomination_state(voted_val, "voted")
+        voted_val = message[0] # message[0] is voted field
+        if type(voted_val) is Value and self.check_Quorum_threshold(voted_val):
 
-                    if type(voted_val) is Value and self.check_Blocking_threshold(voted_val):
-                        log.node.info('Blocking threshold met for value %s at Node %s', voted_val, self.name)
+            log.node.info('Quorum threshold met for voted value %s at Node %s', voted_val, self.name)
+            self.update_nomination_state(voted_val, "voted")
 
+        if type(voted_val) is Value and self.check_Blocking_threshold(voted_val):
+            log.node.info('Blocking threshold met for value %s at Node %s', voted_val, self.name)
 
-                    accepted_val = message[1] # message[1] is accepted field
-                    if type(accepted_val) is Value and self.check_Quorum_threshold(accepted_val):
+        accepted_val = message[1] # message[1] is accepted field
+        if type(accepted_val) is Value and self.check_Quorum_threshold(accepted_val):
 
-                        log.node.info('Quorum threshold met for accepted value %s at Node %s', accepted_val, self.name)
+            log.node.info('Quorum threshold met for accepted value %s at Node %s', accepted_val, self.name)
 
-                        self.update_nomination_state(accepted_val, "accepted")
+            self.update_nomination_state(accepted_val, "accepted")
 
-                    if type(accepted_val) is Value and self.check_Blocking_threshold(accepted_val):
-                        log.node.info('Blocking threshold met for value %s at Node %s', accepted_val, self.name)
+        if type(accepted_val) is Value and self.check_Blocking_threshold(accepted_val):
+            log.node.info('Blocking threshold met for value %s at Node %s', accepted_val, self.name)
 
+    def publish(self, kind, message):
+        """
+        Push a message we just broadcast to our subscribers, when push gossip is enabled.
+        """
+        if self.gossip is None:
+            return
+        # Like a real overlay, a statement we already flooded in this slot is not flooded again
+        key = self.statement_key(kind, message)
+        if key in self._published_statements:
+            return
+        self._published_statements.add(key)
+        self.gossip.publish(self, kind, message)
 
+    def publish_latest_nomination(self):
+        """
+        Push our current nomination state. Updates caused by received nominations are pushed at our own nominate
+        events rather than on every delivery, otherwise each delivery would trigger a new round of pushes.
+        """
+        if self.gossip is None or not self.broadcast_flags:
+            return
+        for message in self.broadcast_flags:
+            latest = message
+        self.publish(NOMINATE, latest)
+
+    @staticmethod
+    def statement_key(kind, message):
+        """
+        Content of a broadcast message at the time it is sent. Ballot counters get updated in place, so they are copied.
+        """
+        if kind == NOMINATE:
+            return kind, tuple(message.voted), tuple(message.accepted)
+        if kind == EXTERNALIZE:
+            slot_number, message = message
+            return kind, slot_number, message.ballot.value.hash
+        counters = tuple(getattr(message, name, None) for name in ('aCounter', 'hCounter', 'cCounter', 'preparedCounter'))
+        return (kind, message.ballot.counter, message.ballot.value.hash) + counters
+
+    def replay_pushed_messages(self, kind):
+        """
+        Process again the latest ballot messages peers pushed to us. Pushed messages are processed once on arrival,
+        so our own vote can only complete a quorum with statements which arrived before it if we replay them.
+        """
+        if self.gossip is None:
+            return
+        process = self.process_prepare_message if kind == PREPARE else self.process_commit_message
+        for peer, peer_message in list(self.latest_pushed_msgs[kind].values()):
+            process(peer_message, peer)
+
+    def process_buffered_nominations(self):
+        """
+        Process the buffered nominations of peers which are in our priority list by now. A statement is pushed only
+        once per slot, so a nomination dropped while its sender was not in our priority list would never come back.
+        """
+        slot = self.slot
+        for name, (peer, message) in list(self.buffered_nominations.items()):
+            if self.slot != slot:
+                return # Finished the slot, the rest was dropped with it
+            if peer in self.priority_list:
+                del self.buffered_nominations[name]
+                self.process_nomination_message(peer, message)
+
+    def deliver(self, sender, kind, message):
+        """
+        Process a message which sender pushed to us.
+        """
+        match kind:
+            case 'nominate':
+                # Same peers as receive_message pulls from
+                self.check_update_nomination_round()
+                self.get_priority_list()
+                # Nominations of other peers are kept until they get into our priority list (in later rounds)
+                self.buffered_nominations[sender.name] = (sender, message)
+                self.process_buffered_nominations()
+            case 'prepare':
+                self.latest_pushed_msgs[PREPARE][sender.name] = (sender, message)
+                self.process_prepare_message(message, sender)
+            case 'commit':
+                self.latest_pushed_msgs[COMMIT][sender.name] = (sender, message)
+                self.process_commit_message(message, sender)
+            case 'externalize':
+                slot_number, externalize_msg = message
+                if slot_number > self.slot:
+                    # Keep it until we reach that slot, a push is not repeated like random pulls are
+                    self.future_externalize_msgs.setdefault(slot_number, (externalize_msg, sender))
                 else:
-                    log.node.info('Node %s has no messages to retrieve from his highest priority neighbor Node %s!', self.name, priority_node.name)
+                    self.process_externalize_msg(slot_number, externalize_msg, sender)
+
+        if self.future_externalize_msgs:
+            while self.slot in self.future_externalize_msgs:
+                externalize_msg, externalize_sender = self.future_externalize_msgs.pop(self.slot)
+                self.process_externalize_msg(self.slot, externalize_msg, externalize_sender)
+            for slot_number in [slot_number for slot_number in self.future_externalize_msgs if slot_number < self.slot]:
+                del self.future_externalize_msgs[slot_number]
 
     def update_local_nomination_broadcast(self):
         """
@@ -426,7 +572,7 @@ class Node():
         # Create a new SCPNominate message with the latest nomination state
         new_nom_msg = SCPNominate(voted=voted_vals, accepted=accepted_vals, confirmed=confirmed_vals)
         # Replace the broadcast flags with just this new message
-        self.broadcast_flags = [new_nom_msg]
+        self.broadcast_flags = [new_nom_msg] # Pushed at our next nominate event, see publish_latest_nomination
         log.node.info("Node %s updated its local nomination broadcast flag: %s", self.name, new_nom_msg)
 
 
@@ -434,13 +580,7 @@ class Node():
         finalized_tx_ids = self.get_finalized_transaction_ids()
 
         # Prune any already-finalized tx from our current nomination state
-        for phase in ['voted', 'accepted', 'confirmed']:
-            pruned = []
-            for old_val in self.nomination_state.get(phase, []):
-                keep = {t for t in old_val.transactions if t.hash not in finalized_tx_ids}
-                if keep:
-                    pruned.append(Value(transactions=keep))
-            self.nomination_state[phase] = pruned
+        self.prune_finalised_nomination_values(finalized_tx_ids)
 
         incoming_voted = message[0]
         if isinstance(incoming_voted, Value):
@@ -490,6 +630,28 @@ class Node():
         self.update_local_nomination_broadcast() # Broadcast updated state
 
 
+    def prune_finalised_nomination_values(self, finalized_tx_ids):
+        """
+        Remove finalised transactions (given by their IDs) from the nomination state. Values are immutable,
+        so a phase is only rebuilt if one of its Values actually contains a finalised transaction.
+        """
+        for phase in ('voted', 'accepted', 'confirmed'):
+            values = self.nomination_state.get(phase)
+            if values is None:
+                self.nomination_state[phase] = []
+                continue
+            if not finalized_tx_ids or not any(tx.hash in finalized_tx_ids for val in values for tx in val.transactions):
+                continue
+
+            pruned = []
+            for old_val in values:
+                keep = [t for t in old_val.transactions if t.hash not in finalized_tx_ids]
+                if len(keep) == len(old_val.transactions):
+                    pruned.append(old_val)
+                elif keep:
+                    pruned.append(Value(transactions=keep))
+            self.nomination_state[phase] = pruned
+
     def is_value_already_present(self, new_value):
         """
         Checks if a Value (new_value) is already present in any nomination state
@@ -564,29 +726,17 @@ class Node():
         using a sliding-window queue. Every seen transaction is enqueued, and each slot
         nominates at most MAX_SLOT_TXS in FIFO order, ensuring no starvation.
         """
-        if not hasattr(self, 'tx_queue'):
-            from collections import deque
-            self.tx_queue = deque()
-
         all_tx = self.mempool.get_all_transactions()
         for tx in all_tx:
-            # Enqueue any new transactions from mempool
-            if tx.hash not in self.finalised_transactions and tx not in self.tx_queue:
-                self.tx_queue.append(tx)
+            # Enqueue any new transactions from mempool - tx_queue is hash-indexed so membership check is O(1)
+            if tx.hash not in self.finalised_transactions:
+                self.tx_queue.add(tx)
 
         self.collect_finalised_transactions()
         self.clean_prepare_and_commit_state()
-        for phase in ['voted', 'accepted', 'confirmed']:
-            pruned = []
-            for old_val in self.nomination_state.get(phase, []):
-                keep = {t for t in old_val.transactions if t.hash not in self.finalised_transactions}
-                if keep:
-                    pruned.append(Value(transactions=keep))
-            self.nomination_state[phase] = pruned
+        self.prune_finalised_nomination_values(self.finalised_transactions)
 
-        to_nominate = []
-        for _ in range(min(self.MAX_SLOT_TXS, len(self.tx_queue))):
-            to_nominate.append(self.tx_queue.popleft())
+        to_nominate = self.tx_queue.pop_batch(self.MAX_SLOT_TXS)
 
         if not to_nominate:
             log.node.info('Node %s found no transactions to nominate after queue processing.', self.name)
@@ -625,6 +775,7 @@ class Node():
         )
         self.storage.add_messages(message)
         self.broadcast_flags = [message]
+        self.publish(NOMINATE, message)
         log.node.info('Node %s prepared SCPNominate message: %s', self.name, message)
         return message
 
@@ -815,7 +966,7 @@ class Node():
                     val=val,
                     quorum=element,
                     threshold=threshold,
-                    node_statement_counter=self.statement_counter.copy()
+                    node_statement_counter=self.statement_counter
                 )
                 if threshold_met:
                     inner_sets_meeting_threshold_count += 1
@@ -923,6 +1074,7 @@ class Node():
         self.ballot_prepare_broadcast_flags.difference_update(to_remove)
         # add the fresh one
         self.ballot_prepare_broadcast_flags.add(new_msg)
+        self.publish(PREPARE, new_msg)
 
     def prepare_ballot_msg(self):
         """
@@ -993,6 +1145,7 @@ class Node():
                 log.node.info('Node %s has prepared SCPPrepare message with ballot %s, h_counter=%d, a_counter=%d, c_counter=%d.', self.name, confirmed_val, 0, 0,0)
 
             log.node.info('Node %s appended SCPPrepare message to its storage and state, message = %s', self.name, prepare_msg)
+            self.replay_pushed_messages(PREPARE)
         else:
             log.node.info('Node %s has not prepared SCPPrepare message as the ballot %s has already been finalised', self.name, ballot)
 
@@ -1096,7 +1249,7 @@ class Node():
             for element in inner_sets: # Keep to just 1 layer of depth for now - so only 1 inner set per quorum, [ [], [] ], not [ [], [[]] ]
                 if isinstance(element, list):
                         # 2. Check if the innerSets meet threshold
-                        threshold_met = self.quorum_set.check_prepare_threshold(ballot=ballot, quorum=element, threshold=threshold, prepare_statement_counter=self.ballot_statement_counter.copy())
+                        threshold_met = self.quorum_set.check_prepare_threshold(ballot=ballot, quorum=element, threshold=threshold, prepare_statement_counter=self.ballot_statement_counter)
                         if threshold_met:
                             inner_sets_meeting_threshold_count += 1
 
@@ -1137,25 +1290,22 @@ class Node():
 
 
     def retrieve_ballot_prepare_message(self, sending_node):
-        # Select a random ballot and check if its already been sent to the requesting_node
+        # Retrieve the oldest ballot the sending_node broadcast since our cursor and advance the cursor past it
         if len(sending_node.ballot_prepare_broadcast_flags) > 0:
-            if sending_node.name not in self.received_prepare_broadcast_msgs:
-                retrieved_message = np.random.choice(list(sending_node.ballot_prepare_broadcast_flags))
-                if self.check_if_finalised(retrieved_message.ballot):
-                    log.node.info(
-                            'Node %s: Value in Ballot %s is already finalized, skipping SCPCommit preparation.',
-                            self.name, retrieved_message.ballot.value)
-
-                    return None
-
-                self.received_prepare_broadcast_msgs[sending_node.name] = [retrieved_message]
-                return retrieved_message
+            cursor = self.received_prepare_broadcast_msgs.get(sending_node.name, 0)
+            entry = sending_node.ballot_prepare_broadcast_flags.next_after(cursor)
+            if entry is None:
+                return None
+
+            seq, retrieved_message = entry
+            self.received_prepare_broadcast_msgs[sending_node.name] = seq + 1
+            if self.check_if_finalised(retrieved_message.ballot):
+                log.node.info(
+                        'Node %s: Value in Ballot %s is already finalized, skipping SCPCommit preparation.',
+                        self.name, retrieved_message.ballot.value)
+                return None
 
-            else:
-                    retrieved_message = np.random.choice(list(sending_node.ballot_prepare_broadcast_flags))
-                    if retrieved_message not in self.received_prepare_broadcast_msgs[sending_node.name]:
-                        self.received_prepare_broadcast_msgs[sending_node.name].append(retrieved_message)
-                        return retrieved_message
+            return retrieved_message
         return None
 
 
@@ -1179,58 +1329,58 @@ class Node():
     def receive_prepare_message(self):
         """
         Pulls and processes received SCPPrepare messages
-        from a single randomly‐chosen peer in one go, using a set to track seen msgs.
+        from a single randomly‐chosen peer in one go, using a per-peer cursor to track seen msgs.
         """
         peer = self.quorum_set.retrieve_random_peer(self)
         if peer is None or peer is self:
             log.node.info('Node %s: no valid peer for prepare messages', self.name)
             return
 
-        existing = self.received_prepare_broadcast_msgs.get(peer.name)
-        if not isinstance(existing, set):
-            self.received_prepare_broadcast_msgs[peer.name] = set()
-        seen = self.received_prepare_broadcast_msgs[peer.name]
-
-        unseen = [msg for msg in peer.ballot_prepare_broadcast_flags if msg not in seen]
+        cursor = self.received_prepare_broadcast_msgs.get(peer.name, 0)
+        unseen, self.received_prepare_broadcast_msgs[peer.name] = peer.ballot_prepare_broadcast_flags.since(cursor)
         if not unseen:
             log.node.info('Node %s: no new prepare messages from %s', self.name, peer.name)
             return
         log.node.critical('Node %s processing SCPPrepare messages', self.name)
         for msg in unseen: # process all unseen prepare msgs
-            seen.add(msg)
+            self.process_prepare_message(msg, peer)
 
-            if self.check_if_finalised(msg.ballot):
-                log.node.info('Node %s: skipping finalized prepare %s from %s',
-                              self.name, msg.ballot, peer.name)
-                continue
+    def process_prepare_message(self, msg, peer):
+        """
+        Process SCPPrepare message broadcast by peer (pulled from it, or pushed to us by gossip).
+        """
+        if self.check_if_finalised(msg.ballot):
+            log.node.info('Node %s: skipping finalized prepare %s from %s',
+                          self.name, msg.ballot, peer.name)
+            return
 
-            self.process_prepare_ballot_message(msg, peer)
-            log.node.info('Node %s retrieved prepare from %s: %s',
-                          self.name, peer.name, msg.ballot)
-
-            b = msg.ballot
-            is_ballot = isinstance(b, SCPBallot)
-            b_hash = b.value.hash
-
-            if is_ballot and b_hash in self.balloting_state['voted'] \
-                    and self.check_Prepare_Quorum_threshold(b):
-                log.node.info('Node %s: quorum met for voted %s', self.name, b)
-                self.update_prepare_balloting_state(b, "voted")
-
-            elif is_ballot and b_hash in self.balloting_state['accepted'] \
-                    and self.check_Prepare_Quorum_threshold(b):
-                log.node.info('Node %s: quorum met for accepted %s', self.name, b)
-                self.update_prepare_balloting_state(b, "accepted")
-
-            for old_hash, old_ballot in list(self.balloting_state['voted'].items()):
-                if old_hash != b_hash and self.is_v_blocking(b):
-                    log.node.info('Node %s: %s v-blocks %s → aborting %s',
-                                  self.name, b, old_ballot, old_ballot)
-                    self.abort_ballots(b)
-                    # ensure you vote for the blocking ballot if not already
-                    if b_hash not in self.balloting_state['voted']:
-                        self.balloting_state['voted'][b_hash] = b
-                    break
+        self.process_prepare_ballot_message(msg, peer)
+        log.node.info('Node %s retrieved prepare from %s: %s',
+                      self.name, peer.name, msg.ballot)
+
+        b = msg.ballot
+        is_ballot = isinstance(b, SCPBallot)
+        b_hash = b.value.hash
+
+        if is_ballot and b_hash in self.balloting_state['voted'] \
+                and self.check_Prepare_Quorum_threshold(b):
+            log.node.info('Node %s: quorum met for voted %s', self.name, b)
+            self.update_prepare_balloting_state(b, "voted")
+
+        elif is_ballot and b_hash in self.balloting_state['accepted'] \
+                and self.check_Prepare_Quorum_threshold(b):
+            log.node.info('Node %s: quorum met for accepted %s', self.name, b)
+            self.update_prepare_balloting_state(b, "accepted")
+
+        for old_hash, old_ballot in list(self.balloting_state['voted'].items()):
+            if old_hash != b_hash and self.is_v_blocking(b):
+                log.node.info('Node %s: %s v-blocks %s → aborting %s',
+                              self.name, b, old_ballot, old_ballot)
+                self.abort_ballots(b)
+                # ensure you vote for the blocking ballot if not already
+                if b_hash not in self.balloting_state['voted']:
+                    self.balloting_state['voted'][b_hash] = b
+                break
 
     def retrieve_confirmed_prepare_ballot(self):
         if len(self.balloting_state['confirmed']) > 0:
@@ -1264,6 +1414,7 @@ class Node():
 
             commit_msg = SCPCommit(ballot=confirmed_ballot, preparedCounter=confirmed_ballot.counter)
             self.commit_ballot_broadcast_flags.add(commit_msg)
+            self.publish(COMMIT, commit_msg)
             self.commit_ballot_state['voted'][confirmed_ballot.value.hash] = confirmed_ballot
             if confirmed_ballot.value not in self.commit_ballot_statement_counter:
                     self.commit_ballot_statement_counter[confirmed_ballot.value] = {'voted': set(), 'accepted': set(), 'confirmed':set(), 'aborted':set()}
@@ -1273,6 +1424,7 @@ class Node():
             log.node.info('Node %s appended SCPCommit message to its storage and state, message = %s', self.name, commit_msg)
 
             log.node.critical('Node %s prepared and appended SCPCommit message message %s', self.name, commit_msg)
+            self.replay_pushed_messages(COMMIT)
         log.node.info('Node %s could not retrieve a confirmed SCPPrepare messages from its peer!')
 
 
@@ -1317,7 +1469,7 @@ class Node():
             for element in inner_sets: # Keep to just 1 layer of depth for now - so only 1 inner set per quorum, [ [], [] ], not [ [], [[]] ]
                 if isinstance(element, list):
                         # 2. Check if the innerSets meet threshold
-                        threshold_met = self.quorum_set.check_commit_threshold(ballot=ballot, quorum=element, threshold=threshold, commit_statement_counter=self.commit_ballot_statement_counter.copy())
+                        threshold_met = self.quorum_set.check_commit_threshold(ballot=ballot, quorum=element, threshold=threshold, commit_statement_counter=self.commit_ballot_statement_counter)
                         if threshold_met:
                             inner_sets_meeting_threshold_count += 1
 
@@ -1360,17 +1512,12 @@ class Node():
     def retrieve_ballot_commit_message(self, sending_node):
         # Check if there are any broadcast flags
         if len(sending_node.commit_ballot_broadcast_flags) > 0:
-            if sending_node.name not in self.received_commit_ballot_broadcast_msgs:
-                retrieved_message = np.random.choice(list(sending_node.commit_ballot_broadcast_flags))
-                self.received_commit_ballot_broadcast_msgs[sending_node.name] = [retrieved_message]
-                return retrieved_message
-
-            already_sent = self.received_commit_ballot_broadcast_msgs[sending_node.name]
-            if len(already_sent) < len(sending_node.commit_ballot_broadcast_flags):
-                # Choose a random message not yet sent
-                remaining_messages = list(set(sending_node.commit_ballot_broadcast_flags) - set(already_sent))
-                retrieved_message = np.random.choice(remaining_messages)
-                self.received_commit_ballot_broadcast_msgs[sending_node.name].append(retrieved_message)
+            # Oldest message not yet sent, found from our cursor into the sending_node broadcast log
+            cursor = self.received_commit_ballot_broadcast_msgs.get(sending_node.name, 0)
+            entry = sending_node.commit_ballot_broadcast_flags.next_after(cursor)
+            if entry is not None:
+                seq, retrieved_message = entry
+                self.received_commit_ballot_broadcast_msgs[sending_node.name] = seq + 1
                 return retrieved_message
 
         return None
@@ -1407,46 +1554,47 @@ class Node():
             log.node.info('Node %s: no valid peer for commit', self.name)
             return
 
-        existing = self.received_commit_ballot_broadcast_msgs.get(peer.name)
-        if not isinstance(existing, set):
-            self.received_commit_ballot_broadcast_msgs[peer.name] = set()
-        seen = self.received_commit_ballot_broadcast_msgs[peer.name]
-
-        unseen = [msg for msg in peer.commit_ballot_broadcast_flags if msg not in seen]
+        cursor = self.received_commit_ballot_broadcast_msgs.get(peer.name, 0)
+        unseen, self.received_commit_ballot_broadcast_msgs[peer.name] = peer.commit_ballot_broadcast_flags.since(cursor)
         if not unseen:
             log.node.info('Node %s: no new commit messages from %s', self.name, peer.name)
             return
 
         for msg in unseen:
-            log.node.critical('Node %s retrieved SCPCommit message %s from %s', self.name, msg, peer.name)
-            seen.add(msg)
-            b = msg.ballot
-            log.node.info('Node %s retrieved commit %s from %s', self.name, b, peer.name)
-
-            if self.is_ballot_finalized(b):
-                self.reset_prepare_ballot_phase(b)
-                self.reset_commit_phase_state(b)
-                continue
+            self.process_commit_message(msg, peer)
 
-            self.simple_process_commit_ballot_message(msg, peer)
-
-            bh = b.value.hash
-            if bh in self.commit_ballot_state['accepted'] and self.check_Commit_Quorum_threshold(b):
-                log.node.info('Node %s: quorum met for accepted commit %s', self.name, b)
-                self.update_commit_balloting_state(b, "accepted")
-                self.prepare_Externalize_msg()
-            elif bh in self.commit_ballot_state['voted'] and self.check_Commit_Quorum_threshold(b):
-                log.node.info('Node %s: quorum met for voted commit %s', self.name, b)
-                self.update_commit_balloting_state(b, "voted")
-
-            for old_hash, old_ballot in list(self.commit_ballot_state['voted'].items()):
-                if old_hash != bh and self._is_v_blocking_commit(b):
-                    log.node.info('Node %s: %s v-blocks %s → aborting', self.name, b, old_ballot)
-                    self.reset_commit_phase_state(old_ballot)
-                    # ensure you vote for the stronger ballot if not already
-                    if bh not in self.commit_ballot_state['voted']:
-                        self.commit_ballot_state['voted'][bh] = b
-                    break
+    def process_commit_message(self, msg, peer):
+        """
+        Process SCPCommit message broadcast by peer (pulled from it, or pushed to us by gossip).
+        """
+        log.node.critical('Node %s retrieved SCPCommit message %s from %s', self.name, msg, peer.name)
+        b = msg.ballot
+        log.node.info('Node %s retrieved commit %s from %s', self.name, b, peer.name)
+
+        if self.is_ballot_finalized(b):
+            self.reset_prepare_ballot_phase(b)
+            self.reset_commit_phase_state(b)
+            return
+
+        self.simple_process_commit_ballot_message(msg, peer)
+
+        bh = b.value.hash
+        if bh in self.commit_ballot_state['accepted'] and self.check_Commit_Quorum_threshold(b):
+            log.node.info('Node %s: quorum met for accepted commit %s', self.name, b)
+            self.update_commit_balloting_state(b, "accepted")
+            self.prepare_Externalize_msg()
+        elif bh in self.commit_ballot_state['voted'] and self.check_Commit_Quorum_threshold(b):
+            log.node.info('Node %s: quorum met for voted commit %s', self.name, b)
+            self.update_commit_balloting_state(b, "voted")
+
+        for old_hash, old_ballot in list(self.commit_ballot_state['voted'].items()):
+            if old_hash != bh and self._is_v_blocking_commit(b):
+                log.node.info('Node %s: %s v-blocks %s → aborting', self.name, b, old_ballot)
+                self.reset_commit_phase_state(old_ballot)
+                # ensure you vote for the stronger ballot if not already
+                if bh not in self.commit_ballot_state['voted']:
+                    self.commit_ballot_state['voted'][bh] = b
+                break
 
     def retrieve_confirmed_commit_ballot(self):
         if len(self.commit_ballot_state['confirmed']) > 0:
@@ -1472,10 +1620,11 @@ class Node():
         finalised_ballot = self.retrieve_confirmed_commit_ballot() # Retrieve a Value from the SCPPrepare 'confirmed' state
         if finalised_ballot is not None:
             externalize_msg = SCPExternalize(ballot=finalised_ballot, hCounter=finalised_ballot.counter, timestamp=Globals.simulation_time)
-            temp_value = copy.deepcopy(externalize_msg.ballot.value)
+            temp_value = externalize_msg.ballot.value # Values are immutable, so no copy is needed to survive the reset below
             # Store the externalized value in the ledger
             self.ledger.add_slot(self.slot, externalize_msg)
             self.externalize_broadcast_flags.add((self.slot, externalize_msg))
+            self.publish(EXTERNALIZE, (self.slot, externalize_msg))
             self.externalized_slot_counter.add(externalize_msg)
             log.node.info('Node %s appended SCPExternalize message for slot %d to its storage and state, message = %s', self.name, self.slot, externalize_msg)
 
@@ -1483,19 +1632,15 @@ class Node():
             # save to log file
             self.log_to_file(f"NODE - INFO - Node {self.name} appended SCPExternalize message for slot {self.slot} to its storage and state, message = {externalize_msg}")
 
-            # FULL reset of nomination, not just pruning
-            self.reset_nomination_state()
             self.priority_list.clear()
             self.last_nomination_start_time = Globals.simulation_time
-            self.reset_commit_phase_state(externalize_msg.ballot)
-            self.reset_prepare_ballot_phase(externalize_msg.ballot)
 
             # REMOVE TXS FROM MEMPOOL
             print("Temp Value is ", temp_value)
             self.remove_txs_from_mempool(temp_value)
 
-            self.slot += 1
-            self.nomination_round = 1
+            # Drop the whole slot state and move on to the next slot
+            self.finish_slot(temp_value)
 
         log.node.info('Node %s could not retrieve a confirmed SCPCommit message from its peer!')
 
@@ -1553,23 +1698,41 @@ class Node():
         self.peer_externalised_statements.setdefault(sending_node.name, set()).add((slot_number, message))
         # Optionally, add the (slot, message) tuple to this node's own broadcast flags (or remove it, as desired).
         self.externalize_broadcast_flags.add((slot_number, message))
+        self.publish(EXTERNALIZE, (slot_number, message))
         self.externalized_slot_counter.add(message)
 
-        self.nomination_round = 1
-
-        # FULL reset of nomination, not just pruning
-        self.reset_nomination_state()
         self.last_nomination_start_time = Globals.simulation_time
-        self.reset_commit_phase_state(message.ballot)
-        self.reset_prepare_ballot_phase(message.ballot)
 
         # REMOVE TXS FROM MEMPOOL
         self.remove_txs_from_mempool(message.ballot.value)
-        self.slot += 1
+
+        # Drop the whole slot state and move on to the next slot
+        self.finish_slot(message.ballot.value)
 
         log.node.info('Node %s has finalized slot %d with value %s', self.name, slot_number, message.ballot.value)
 
 
+    def finish_slot(self, finalised_value):
+        """
+        Drop the nomination, prepare and commit state of the current slot wholesale and start the next slot.
+        Transactions nominated in this slot which were not finalised are put back into the nomination queue.
+        """
+        finalised_tx_ids = {tx.hash for tx in finalised_value.transactions}
+        carried = 0
+        for tx in self.slot_state.nominated_transactions():
+            if tx.hash not in finalised_tx_ids and tx.hash not in self.finalised_transactions:
+                carried += self.tx_queue.add(tx)
+
+        self.slot += 1
+        self.slot_state = self.slot_state.next_slot(self.slot)
+        self.nomination_round = 1
+        self._published_statements.clear()
+        for latest in self.latest_pushed_msgs.values():
+            latest.clear()
+        self.buffered_nominations.clear()
+        log.node.info('Node %s finished slot %d, carried %d unfinalised transactions into slot %d',
+                      self.name, self.slot - 1, carried, self.slot)
+
     def reset_nomination_state(self):
         """
         Completely clear out any prior nomination state so that
@@ -1614,16 +1777,8 @@ class Node():
                 if not ballot_contains_finalized_tx(ballot)
             }
 
-        self.commit_ballot_broadcast_flags = {
-            msg for msg in self.commit_ballot_broadcast_flags
-            if not ballot_contains_finalized_tx(msg.ballot)
-        }
-
-        for node_name in list(self.received_commit_ballot_broadcast_msgs.keys()):
-            self.received_commit_ballot_broadcast_msgs[node_name] = [
-                msg for msg in self.received_commit_ballot_broadcast_msgs[node_name]
-                if not ballot_contains_finalized_tx(msg.ballot)
-            ]
+        # Cursors in received_commit_ballot_broadcast_msgs hold no messages, so only the broadcast log is pruned
+        self.commit_ballot_broadcast_flags.retain(lambda msg: not ballot_contains_finalized_tx(msg.ballot))
 
         log.node.info("Cleared commit-phase state for ballots containing any finalized transaction at Node %s",
                       self.name)
@@ -1655,16 +1810,8 @@ class Node():
             if value.hash != finalized_value_hash
         }
 
-        self.ballot_prepare_broadcast_flags = {
-            msg for msg in self.ballot_prepare_broadcast_flags
-            if msg.ballot.value.hash != finalized_value_hash
-        }
-
-        for node_name in list(self.received_prepare_broadcast_msgs.keys()):
-            self.received_prepare_broadcast_msgs[node_name] = [
-                msg for msg in self.received_prepare_broadcast_msgs[node_name]
-                if msg.ballot.value.hash != finalized_value_hash
-            ]
+        # Cursors in received_prepare_broadcast_msgs hold no messages, so only the broadcast log is pruned
+        self.ballot_prepare_broadcast_flags.retain(lambda msg: msg.ballot.value.hash != finalized_value_hash)
 
         log.node.info("Cleared prepare-ballot-phase state for ballots with value hash %s at Node %s",
                       finalized_value_hash, self.name)
@@ -1703,21 +1850,16 @@ class Node():
         """
         self.collect_finalised_transactions()
 
-        for tx in self.finalised_transactions:
-            try:
-                self.mempool.transactions.remove(tx)
-                log.mempool.info(
-                    "Removed finalized tx %s from mempool for Node %s.", tx, self.name
-                )
-            except ValueError:
-                pass
+        # finalised_transactions holds transaction IDs, which the mempool index accepts directly
+        removed = self.mempool.remove_transactions(self.finalised_transactions)
+        if removed:
+            log.mempool.info("Removed %d finalized txs from mempool for Node %s.", removed, self.name)
 
         for tx in value.transactions:
             print("TX IS ", tx)
-            try:
-                self.mempool.transactions.remove(tx)
+            if self.mempool.transactions.discard(tx) is not None:
                 log.mempool.info('Removed transaction %s from mempool for Node %s.', tx, self.name)
-            except ValueError:
+            else:
                 log.mempool.info('Transaction %s was not found in mempool for Node %s.', tx, self.name)
 
     def remove_all_finalized_nomination_transactions(self):
@@ -1747,8 +1889,10 @@ class Node():
             for value in self.nomination_state.get(key, []):
                 if hasattr(value, 'transactions'):
                     # Filter out any transactions whose hash is in finalized_hashes
-                    filtered_tx = {tx for tx in value.transactions if tx.hash not in finalized_hashes}
-                    if filtered_tx:
+                    filtered_tx = [tx for tx in value.transactions if tx.hash not in finalized_hashes]
+                    if len(filtered_tx) == len(value.transactions):
+                        new_values.append(value) # Nothing finalised, Values are immutable so it can be kept as is
+                    elif filtered_tx:
                         new_values.append(Value(transactions=filtered_tx))
                     else:
                         log.node.info("Removing an empty nomination value from '%s'.", key)
@@ -1785,7 +1929,7 @@ class Node():
                     flat.append(item)
             return flat
 
-        new_broadcast_flags = []
+        pruned_broadcast_flags = []
         for msg in self.broadcast_flags:
             remove_flag = False
             candidate_values = None
@@ -1808,9 +1952,10 @@ class Node():
                             log.node.info("Pruning broadcast message %s because candidate Value %s is finalized",
                                           msg, candidate.hash)
                             break
-            if not remove_flag:
-                new_broadcast_flags.append(msg)
-        self.broadcast_flags = new_broadcast_flags
+            if remove_flag:
+                pruned_broadcast_flags.append(msg)
+        # Withdraw in place so that the remaining messages keep their sequence numbers
+        self.broadcast_flags.difference_update(pruned_broadcast_flags)
 
         log.node.info("Pruning complete. Updated statement_counter: %s, broadcast_flags count: %d",
                       self.statement_counter, len(self.broadcast_flags))
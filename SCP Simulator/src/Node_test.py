@@ -15,6 +15,7 @@ from unittest.mock import MagicMock, patch
 from unittest import mock
 from Globals import Globals
 from QuorumSet import QuorumSet
+import tracemalloc
 
 
 class NodeTest(unittest.TestCase):
@@ -331,7 +332,9 @@ class NodeTest(unittest.TestCase):
 
         self.node.get_highest_priority_neighbor = MagicMock(return_value=self.priority_node)
         self.node.retrieve_broadcast_message = MagicMock(return_value=message)
-        message.parse_message_state = MagicMock(return_value=[value1, value2])
+        # Messages are immutable, so the method is patched on the class
+        patch.object(SCPNominate, 'parse_message_state', MagicMock(return_value=[value1, value2])).start()
+        self.addCleanup(patch.stopall)
         self.node.process_received_message = MagicMock()
         self.node.update_statement_count = MagicMock()
         self.node.check_Quorum_threshold = MagicMock(return_value=True)
@@ -364,7 +367,9 @@ class NodeTest(unittest.TestCase):
 
         self.node.get_highest_priority_neighbor = MagicMock(return_value=self.priority_node)
         self.node.retrieve_broadcast_message = MagicMock(return_value=message)
-        message.parse_message_state = MagicMock(return_value=[value1, []])
+        # Messages are immutable, so the method is patched on the class
+        patch.object(SCPNominate, 'parse_message_state', MagicMock(return_value=[value1, []])).start()
+        self.addCleanup(patch.stopall)
         self.node.process_received_message = MagicMock()
         self.node.update_statement_count = MagicMock()
         self.node.check_Quorum_threshold = MagicMock(return_value=True)
@@ -392,7 +397,9 @@ class NodeTest(unittest.TestCase):
 
         self.node.get_highest_priority_neighbor = MagicMock(return_value=self.priority_node)
         self.node.retrieve_broadcast_message = MagicMock(return_value=None)
-        message.parse_message_state = MagicMock()
+        # Messages are immutable, so the method is patched on the class
+        patch.object(SCPNominate, 'parse_message_state', MagicMock()).start()
+        self.addCleanup(patch.stopall)
         self.node.process_received_message = MagicMock()
         self.node.update_statement_count = MagicMock()
 
@@ -527,7 +534,7 @@ class NodeTest(unittest.TestCase):
             retrieved = self.node.retrieve_broadcast_message(self.retrieving_node)
 
             self.assertEqual(retrieved, None)
-            self.assertEqual([], self.node.broadcast_flags)
+            self.assertEqual([], list(self.node.broadcast_flags))
             self.assertEqual({}, self.node.received_broadcast_msgs)
 
     def test_retrieve_broadcast_message_returns_none_for_node_with_all_messages(self):
@@ -626,6 +633,50 @@ class NodeTest(unittest.TestCase):
         result = self.node.check_Quorum_threshold(value)
         self.assertTrue(result)
 
+    def test_quorum_threshold_check_does_not_allocate_per_call(self):
+        nodes = [Node("test_node%d" % i) for i in range(2, 8)]
+        self.node = Node(name="Node1")
+        self.node.quorum_set.set(nodes=nodes[:2], inner_sets=[nodes[2:4], nodes[4:]])
+
+        value = Value(transactions={Transaction(0)})
+        self.node.nomination_state = {"voted": [value], "accepted": [], "confirmed": []}
+        # Large statement counter, so that copying it on every check would show up clearly
+        self.node.statement_counter = {i: {"voted": set(), "accepted": set()} for i in range(500)}
+        self.node.statement_counter[value.hash] = {"voted": {node.name for node in nodes}, "accepted": set()}
+
+        self.assertTrue(self.node.check_Quorum_threshold(value)) # warm up
+        tracemalloc.start()
+        try:
+            before, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            for _ in range(200):
+                self.node.check_Quorum_threshold(value)
+            after, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        self.assertLess(after - before, 1024) # no allocation growth across events
+        self.assertLess(peak - before, 4096) # no per-event copies of the statement counter or quorum
+
+    def test_prune_finalised_nomination_values_keeps_unchanged_values(self):
+        self.node = Node(name="Node1")
+        tx1, tx2, tx3 = Transaction(0), Transaction(0), Transaction(0)
+        kept = Value(transactions={tx1})
+        mixed = Value(transactions={tx2, tx3})
+        voted = [kept]
+        self.node.nomination_state = {"voted": voted, "accepted": [kept, mixed], "confirmed": []}
+
+        self.node.prune_finalised_nomination_values(set())
+        self.assertIs(self.node.nomination_state["voted"], voted) # nothing finalised, nothing rebuilt
+
+        self.node.prune_finalised_nomination_values({tx2.hash})
+        self.assertIs(self.node.nomination_state["voted"], voted)
+        self.assertIs(self.node.nomination_state["accepted"][0], kept) # same Value object, not a copy
+        self.assertEqual(self.node.nomination_state["accepted"][1], Value(transactions={tx3}))
+
+        self.node.prune_finalised_nomination_values({tx1.hash})
+        self.assertEqual(self.node.nomination_state["voted"], [])
+
 
     def test_blocking_threshold_met(self):
         node2 = Node("test_node2")
@@ -1365,7 +1416,7 @@ class NodeTest(unittest.TestCase):
             retrieved = self.node.retrieve_ballot_prepare_message(self.retrieving_node)
 
             self.assertEqual(retrieved, None)
-            self.assertEqual(set(), self.node.ballot_prepare_broadcast_flags)
+            self.assertEqual([], list(self.node.ballot_prepare_broadcast_flags))
             self.assertEqual({}, self.node.received_prepare_broadcast_msgs)
 
     def test_retrieve_prepare_broadcast_message_returns_none_for_node_with_all_messages(self):
@@ -1831,7 +1882,7 @@ class NodeTest(unittest.TestCase):
             retrieved = self.node.retrieve_ballot_commit_message(self.retrieving_node)
 
             self.assertEqual(retrieved, None)
-            self.assertEqual(set(), self.node.commit_ballot_broadcast_flags)
+            self.assertEqual([], list(self.node.commit_ballot_broadcast_flags))
             self.assertEqual({}, self.node.received_commit_ballot_broadcast_msgs)
 
     def test_retrieve_commit_broadcast_message_returns_none_for_node_with_all_messages(self):
@@ -1966,6 +2017,31 @@ class NodeTest(unittest.TestCase):
         self.node.retrieve_confirmed_commit_ballot.assert_not_called()
         self.assertEqual(len(self.node.externalize_broadcast_flags), 0)
 
+    def test_finish_slot_drops_state_and_carries_unfinalised_transactions(self):
+        self.node = Node(name="1")
+        tx_finalised, tx_pending = Transaction(0), Transaction(0)
+        value = Value(transactions={tx_finalised, tx_pending})
+        ballot = SCPBallot(counter=1, value=value)
+        self.node.nomination_state['voted'].append(value)
+        self.node.balloting_state['confirmed'][value.hash] = ballot
+        self.node.commit_ballot_state['voted'][value.hash] = ballot
+        self.node.ballot_prepare_broadcast_flags.add(SCPPrepare(ballot=ballot))
+        old_state = self.node.slot_state
+
+        self.node.finish_slot(Value(transactions={tx_finalised}))
+
+        self.assertIsNot(self.node.slot_state, old_state)
+        self.assertEqual(self.node.slot, 2)
+        self.assertEqual(self.node.slot_state.slot, 2)
+        self.assertEqual(self.node.nomination_state['voted'], [])
+        self.assertEqual(self.node.balloting_state['confirmed'], {})
+        self.assertEqual(self.node.commit_ballot_state['voted'], {})
+        self.assertEqual(len(self.node.ballot_prepare_broadcast_flags), 0)
+        self.assertEqual(self.node.ballot_prepare_broadcast_flags.next_seq, 1) # peers' cursors stay valid
+        # Only the unfinalised transaction is carried over to the next slot
+        self.assertIn(tx_pending, self.node.tx_queue)
+        self.assertNotIn(tx_finalised, self.node.tx_queue)
+
     def test_retrieve_externalize_message_retrieves_correctly(self):
         self.node = Node("test_node")
         self.requesting_node = Node("requesting_node")
@@ -2109,9 +2185,9 @@ class NodeTest(unittest.TestCase):
         node.commit_ballot_broadcast_flags = {commit_msg_finalized, commit_msg_pending}
 
 
-        node.received_commit_ballot_broadcast_msgs = {
-            "peer1": [commit_msg_finalized, commit_msg_pending]
-        }
+        # peer1 has seen both messages, peer2 has not seen any yet
+        node.received_commit_ballot_broadcast_msgs = {"peer1": 2}
+        peer2_cursor = 0
 
         # Create a finalized_ballot that indicates tx_finalized is finalized.
         # Its Value contains only tx_finalized.
@@ -2145,12 +2221,10 @@ class NodeTest(unittest.TestCase):
         self.assertIn(commit_msg_pending, node.commit_ballot_broadcast_flags,
                       "Commit broadcast message with pending ballot should remain.")
 
-        # 4. Assert that in received_commit_ballot_broadcast_msgs, for each peer, messages with ballots containing tx_finalized are removed.
-        for peer, msgs in node.received_commit_ballot_broadcast_msgs.items():
-            self.assertNotIn(commit_msg_finalized, msgs,
-                             f"Received commit broadcast message with finalized transaction for peer {peer} should be removed.")
-            self.assertIn(commit_msg_pending, msgs,
-                          f"Received commit broadcast message with pending transaction for peer {peer} should remain.")
+        # 4. Assert that per-peer cursors are untouched and a peer pulling afterwards only sees the pending message.
+        self.assertEqual(node.received_commit_ballot_broadcast_msgs, {"peer1": 2})
+        unseen, _ = node.commit_ballot_broadcast_flags.since(peer2_cursor)
+        self.assertEqual(unseen, [commit_msg_pending])
 
 
     def test_reset_commit_phase_state_does_nothing_when_no_ballot_contains_finalized_tx(self):
@@ -2185,10 +2259,8 @@ class NodeTest(unittest.TestCase):
         commit_msg2 = SCPCommit(ballot=ballot_pending2, preparedCounter=ballot_pending2.counter)
         node.commit_ballot_broadcast_flags = [commit_msg1, commit_msg2]
 
-        # Set up received commit ballot broadcast messages for one peer.
-        node.received_commit_ballot_broadcast_msgs = {
-            "peer1": [commit_msg1, commit_msg2]
-        }
+        # Set up the cursor of one peer which has seen both messages.
+        node.received_commit_ballot_broadcast_msgs = {"peer1": 2}
 
         # Create a finalized_ballot that finalizes a transaction not present in any ballot.
         tx_unrelated = Transaction(600)
@@ -2206,11 +2278,10 @@ class NodeTest(unittest.TestCase):
                       "Pending commit broadcast message should remain.")
         self.assertIn(commit_msg2, node.commit_ballot_broadcast_flags,
                       "Pending commit broadcast message should remain.")
-        for peer, msgs in node.received_commit_ballot_broadcast_msgs.items():
-            self.assertIn(commit_msg1, msgs,
-                          f"Received message for peer {peer} should remain.")
-            self.assertIn(commit_msg2, msgs,
-                          f"Received message for peer {peer} should remain.")
+        self.assertEqual(node.received_commit_ballot_broadcast_msgs, {"peer1": 2},
+                         "Cursor for peer1 should remain unchanged.")
+        self.assertEqual(node.commit_ballot_broadcast_flags.sequence_number(commit_msg2), 1,
+                         "Remaining messages should keep their sequence numbers.")
 
     def test_reset_commit_phase_state_with_empty_commit_phase_state(self):
         """
@@ -2242,10 +2313,10 @@ class NodeTest(unittest.TestCase):
         self.assertEqual(node.received_commit_ballot_broadcast_msgs, {},
                          "Empty received_commit_ballot_broadcast_msgs should remain empty.")
 
-    def test_reset_commit_phase_state_removes_finalized_from_received_commit_ballot_broadcast_msgs_multiple_peers(self):
+    def test_reset_commit_phase_state_hides_finalized_from_multiple_peers(self):
         """
-        Test that when commit-phase broadcast messages are received by multiple peers,
-        any message containing a ballot with a finalized transaction is removed for each peer.
+        Test that when commit-phase broadcast messages are pulled by multiple peers,
+        no peer retrieves a message containing a ballot with a finalized transaction after reset.
         """
         node = Node("test_node")
         tx_finalized = Transaction(800)
@@ -2261,12 +2332,10 @@ class NodeTest(unittest.TestCase):
         # Use a list for commit_ballot_broadcast_flags.
         node.commit_ballot_broadcast_flags = [commit_msg_finalized, commit_msg_pending]
 
-        # Set up received commit ballot broadcast messages for multiple peers.
-        node.received_commit_ballot_broadcast_msgs = {
-            "peer1": [commit_msg_finalized, commit_msg_pending],
-            "peer2": [commit_msg_pending, commit_msg_finalized],
-            "peer3": [commit_msg_pending]
-        }
+        # Peers pulling from node with different cursors.
+        peer_nodes = [Node("peer1"), Node("peer2"), Node("peer3")]
+        peer_nodes[1].received_commit_ballot_broadcast_msgs = {node.name: 1}
+        peer_nodes[2].received_commit_ballot_broadcast_msgs = {node.name: 2}
 
         # Also set up commit_ballot_statement_counter and commit_ballot_state.
         node.commit_ballot_statement_counter = {
@@ -2285,12 +2354,12 @@ class NodeTest(unittest.TestCase):
         # Call reset_commit_phase_state.
         node.reset_commit_phase_state(finalized_ballot)
 
-        # Assert that in received_commit_ballot_broadcast_msgs, messages with ballots containing tx_finalized are removed.
-        for peer, msgs in node.received_commit_ballot_broadcast_msgs.items():
-            self.assertNotIn(commit_msg_finalized, msgs,
-                             f"For peer {peer}, commit message with finalized ballot should be removed.")
-            self.assertIn(commit_msg_pending, msgs,
-                          f"For peer {peer}, commit message with pending ballot should remain.")
+        # Assert that peers which have not seen the pending message retrieve it, and nobody retrieves the finalized one.
+        self.assertIs(peer_nodes[0].retrieve_ballot_commit_message(node), commit_msg_pending)
+        self.assertIs(peer_nodes[1].retrieve_ballot_commit_message(node), commit_msg_pending)
+        for peer in peer_nodes:
+            self.assertIsNone(peer.retrieve_ballot_commit_message(node),
+                              f"Peer {peer.name} should have no more commit messages to retrieve.")
 
 
     def test_reset_prepare_ballot_phase_removes_finalized_entries_and_keeps_nonfinalized(self):
@@ -2338,11 +2407,8 @@ class NodeTest(unittest.TestCase):
         # 4. Set up ballot_prepare_broadcast_flags as a list of SCPPrepare messages.
         node.ballot_prepare_broadcast_flags = [prepare_msg_finalized, prepare_msg_pending]
 
-        # 5. Set up received_prepare_broadcast_msgs for two peers.
-        node.received_prepare_broadcast_msgs = {
-            "peer1": [prepare_msg_finalized, prepare_msg_pending],
-            "peer2": [prepare_msg_pending, prepare_msg_finalized]
-        }
+        # 5. Set up a peer which has not pulled any prepare messages from node yet.
+        peer = Node("peer1")
 
         # Create a finalized_ballot that finalizes value_finalized.
         finalized_ballot = SCPBallot(counter=1, value=value_finalized)
@@ -2377,11 +2443,10 @@ class NodeTest(unittest.TestCase):
             self.assertNotEqual(msg.ballot.value.hash, value_finalized.hash,
                                 "ballot_prepare_broadcast_flags should not include a message with the finalized value.")
 
-        # (E) In received_prepare_broadcast_msgs: For each peer, no message with ballot.value.hash equal to the finalized value.
-        for peer, msgs in node.received_prepare_broadcast_msgs.items():
-            for msg in msgs:
-                self.assertNotEqual(msg.ballot.value.hash, value_finalized.hash,
-                                    f"Received prepare broadcast messages for peer {peer} should not include messages with the finalized value.")
+        # (E) A peer pulling from node afterwards only retrieves the message with the pending value.
+        self.assertIs(peer.retrieve_ballot_prepare_message(node), prepare_msg_pending)
+        self.assertIsNone(peer.retrieve_ballot_prepare_message(node))
+        self.assertEqual(peer.received_prepare_broadcast_msgs, {node.name: node.ballot_prepare_broadcast_flags.next_seq})
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -4,8 +4,11 @@ Quorum Set
 =========================
 
 Author: Matija Piskorec, Jaime de Vivero Woods
-Last update: May 2025
+Last update: October 2026
 QuorumSet class.
+
+get_nodes(), get_inner_sets() and get_quorum() return the quorum itself rather than copies, so they always
+reflect it (also after in-place changes of nodes/inner_sets). Callers must treat them as read-only.
 """
 import math
 import random
@@ -14,6 +17,7 @@ from Log import log
 import numpy as np
 
 THRESHOLD_DEFAULT = 35 # 25% threshold by default
+NO_SIGNERS = frozenset() # Shared default of statements nobody signed, never mutated
 
 class QuorumSet():
 
@@ -34,14 +38,14 @@ class QuorumSet():
                         self.node, self.threshold, self.nodes, self.inner_sets)
 
     def __repr__(self):
-        return '[Quorum Set: threshold=%(threshold)s, nodes=%(nodes)s.' % self.__dict__
+        return '[Quorum Set: threshold=%s, nodes=%s.' % (self.threshold, self.nodes)
 
     def is_inside(self, node):
         return len(list(filter(lambda x: x == node, self.nodes))) > 0
 
     # Remove node from quorum set
     def remove(self, node):
-        self.nodes = filter(lambda x: x != node, self.nodes)
+        self.nodes = [x for x in self.nodes if x != node]
         return
 
     # Set quorum to the nodes
@@ -65,11 +69,12 @@ class QuorumSet():
         else:
             return np.random.choice([node for node in self.nodes if node != self.node])
 
+    # The quorum itself, not a copy - callers must not mutate it, re-assign the quorum with set() instead
     def get_nodes(self):
-        return self.nodes.copy()
+        return self.nodes
 
     def get_inner_sets(self):
-        return self.inner_sets.copy()
+        return self.inner_sets
 
     @property
     def minimum_quorum(self):
@@ -81,11 +86,14 @@ class QuorumSet():
 
     def check_threshold(self, val, quorum, threshold, node_statement_counter):
         signed_counter = 0
-        # Safely get the entry for the candidate's hash; if not present, default to empty sets.
-        entry = node_statement_counter.get(val.hash, {"voted": set(), "accepted": set()})
+        # Safely get the entry for the candidate's hash; if not present, nobody signed it.
+        entry = node_statement_counter.get(val.hash)
+        if entry is None:
+            return threshold <= 0
+        voted, accepted = entry.get("voted", NO_SIGNERS), entry.get("accepted", NO_SIGNERS)
         for node in quorum:
             # Assuming you compare by node names (as done elsewhere)
-            if node.name in entry.get("voted", set()) or node.name in entry.get("accepted", set()):
+            if node.name in voted or node.name in accepted:
                 signed_counter += 1
         return signed_counter >= threshold
 
@@ -97,7 +105,7 @@ class QuorumSet():
 
         # For the ballot provided, iterate over voted, accepted & if counts meet threshold return True
         for state in ('voted', 'accepted'):
-            for node in prepare_statement_counter[ballot.value].get(state, set()):
+            for node in prepare_statement_counter[ballot.value].get(state, NO_SIGNERS):
                 if node in quorum and node not in seen:
                     seen.add(node)
                     signed_counter += 1
@@ -115,7 +123,7 @@ class QuorumSet():
 
         # For the ballot provided, iterate over voted, accepted & if counts meet threshold return True
         for state in ('voted', 'accepted'):
-            for node in commit_statement_counter[ballot.value].get(state, set()):
+            for node in commit_statement_counter[ballot.value].get(state, NO_SIGNERS):
                 if node in quorum and node not in seen:
                     seen.add(node)
                     signed_counter += 1
@@ -26,6 +26,13 @@ class QuorumSetTest(unittest.TestCase):
         check = self.node.quorum_set.check_threshold(value, quorum, threshold, statement_counter)
         self.assertTrue(check)
 
+    def test_check_threshold_without_statements(self):
+        quorum = [Node("test_node1"), Node("test_node2")]
+        value = Value(transactions={Transaction(0)})
+        self.assertFalse(self.node.quorum_set.check_threshold(value, quorum, 1, {}))
+        self.assertTrue(self.node.quorum_set.check_threshold(value, quorum, 1, {value.hash: {'accepted': {"test_node2": 1}}}))
+        self.assertFalse(self.node.quorum_set.check_threshold(value, quorum, 2, {value.hash: {'accepted': {"test_node2": 1}}}))
+
     def test_inner_set_blocking_threshold_is_met(self):
         test_node1 = Node("test_node1")
         test_node2 = Node("test_node2")
@@ -183,6 +190,15 @@ class QuorumSetTest(unittest.TestCase):
         self.node.quorum_set.nodes = [test_node1, test_node2]
         self.node.quorum_set.inner_sets = [[self.node, test_node3], [self.node, test_node4]]
 
+    def test_quorum_reflects_in_place_changes(self):
+        test_node1, test_node2 = Node("test_node1"), Node("test_node2")
+        self.node.quorum_set.set([test_node1], [])
+        self.assertEqual(list(self.node.quorum_set.get_nodes()), [test_node1])
+        self.node.quorum_set.nodes.append(test_node2)
+        self.node.quorum_set.inner_sets.append([test_node1])
+        self.assertEqual(list(self.node.quorum_set.get_nodes()), [test_node1, test_node2])
+        self.assertEqual(list(self.node.quorum_set.get_inner_sets()), [[test_node1]])
+
     def test_weight_with_no_nodes(self):
         # Test weight when there are no nodes and no inner sets
         self.node = Node("test_node")
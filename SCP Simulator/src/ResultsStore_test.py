@@ -0,0 +1,95 @@
+import multiprocessing
+import os
+import sqlite3
+import tempfile
+import unittest
+from ResultsStore import ResultsStore, flatten
+
+
+def put_rows(rows, worker):
+    for k in range(10):
+        rows.put({'worker': worker, 'k': k})
+
+
+class ResultsStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.store = ResultsStore(os.path.join(self.directory.name, 'results.sqlite'))
+
+    def test_typed_columns_and_flattened_params(self):
+        self.store.insert([{'node_count': 10, 'avg_inter_slot_time': 1.5, 'all_tests_passed': True, 'topology': 'BA',
+                            'sim_params': {'mine': {'tau': 1.0, 'tau_domain': 'self._nodes'}}}])
+        self.store.insert([{'node_count': 20, 'all_tests_passed': False, 'error': 'crashed'}])
+        connection = sqlite3.connect(self.store.path)
+        self.assertEqual(connection.execute('PRAGMA journal_mode').fetchone()[0], 'wal')
+        columns = self.store.columns(connection)
+        connection.close()
+        self.assertEqual(columns['node_count'], 'INTEGER')
+        self.assertEqual(columns['avg_inter_slot_time'], 'REAL')
+        self.assertEqual(columns['sim_params__mine__tau'], 'REAL')
+        self.assertEqual(columns['sim_params'], 'TEXT')
+
+        rows = list(self.store.query('SELECT node_count, sim_params__mine__tau, error FROM runs ORDER BY id'))
+        self.assertEqual(rows, [{'node_count': 10, 'sim_params__mine__tau': 1.0, 'error': None},
+                                {'node_count': 20, 'sim_params__mine__tau': None, 'error': 'crashed'}])
+        self.assertEqual(next(self.store.query('SELECT sim_params FROM runs'))['sim_params'],
+                         '{"mine": {"tau": 1.0, "tau_domain": "self._nodes"}}')
+
+    def test_job_keys(self):
+        self.assertEqual(self.store.job_keys(), set())
+        self.store.insert([{'node_count': 5}])
+        self.assertEqual(self.store.job_keys(), set())
+        self.store.insert([{'node_count': 5, 'job_key': 'a'}, {'node_count': 5, 'job_key': 'a'}, {'node_count': 6, 'job_key': 'b'}])
+        self.assertEqual(self.store.job_keys(), {'a', 'b'})
+
+    def test_flatten(self):
+        self.assertEqual(flatten({'a b': [1, 2], 'ok': True, 'p': {'x': 1}}),
+                         {'a_b': '[1, 2]', 'ok': 1, 'p': '{"x": 1}', 'p__x': 1})
+
+    def test_single_writer_fed_by_processes(self):
+        rows = multiprocessing.Queue()
+        with self.store.writer(rows) as writer:
+            workers = [multiprocessing.Process(target=put_rows, args=(rows, worker)) for worker in range(4)]
+            for process in workers:
+                process.start()
+            for process in workers:
+                process.join()
+        self.assertEqual(writer.written, 40)
+        counts = list(self.store.query('SELECT worker, COUNT(*) AS n FROM runs GROUP BY worker ORDER BY worker'))
+        self.assertEqual(counts, [{'worker': worker, 'n': 10} for worker in range(4)])
+
+    def test_writer_retries_busy_database_and_fails_loudly(self):
+        writer = self.store.writer()
+        insert, calls = self.store.insert, []
+        def flaky_insert(rows, connection=None):
+            calls.append(len(rows))
+            if len(calls) == 1:
+                raise sqlite3.OperationalError('database is locked')
+            if any(row.get('bad') for row in rows):
+                raise sqlite3.InterfaceError('Error binding parameter')
+            insert(rows, connection=connection)
+        self.store.insert = flaky_insert
+        writer.start()
+        writer.put({'k': 1})
+        writer.put({'k': 2})
+        writer.put({'k': 3, 'bad': True})
+        with self.assertRaises(RuntimeError):
+            writer.close()
+        self.assertEqual((writer.written, writer.failed), (2, 1))
+        self.assertEqual([row['k'] for row in self.store.query('SELECT k FROM runs ORDER BY k')], [1, 2])
+
+    def test_to_csv(self):
+        with self.store.writer() as writer:
+            writer.put({'node_count': 5, 'topology': 'FULL'})
+        path = os.path.join(self.directory.name, 'results.csv')
+        self.store.to_csv(path)
+        with open(path) as file:
+            lines = file.read().splitlines()
+        self.assertEqual(lines[0], 'id,recorded_at,node_count,topology')
+        self.assertTrue(lines[1].endswith(',5,FULL'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,11 +1,12 @@
 from SCPBallot import SCPBallot
+from Message import Message
+
+class SCPCommit(Message):
+    __slots__ = ('ballot', 'preparedCounter', 'hCounter', 'cCounter')
 
-class SCPCommit:
     def __init__(self, ballot: SCPBallot, preparedCounter: int, hCounter: int = 0, cCounter: int = 0):
-        self.ballot = ballot
-        self.preparedCounter = preparedCounter # This is the counter of the highest accepted prepared ballot--maintained identically to the "prepared" field in the PREPARE phase. Since the "value" field will always be the same as "ballot", only the counter is sent in the COMMIT phase
-        self.hCounter = hCounter
-        self.cCounter = cCounter
+        # preparedCounter is the counter of the highest accepted prepared ballot--maintained identically to the "prepared" field in the PREPARE phase. Since the "value" field will always be the same as "ballot", only the counter is sent in the COMMIT phase
+        self._set_fields(ballot=ballot, preparedCounter=preparedCounter, hCounter=hCounter, cCounter=cCounter)
 
     def __repr__(self):
         return (f"SCPCommit(ballot={self.ballot}, preparedCounter={self.preparedCounter}, hCounter={self.hCounter}, cCounter={self.cCounter})")
@@ -1,11 +1,13 @@
 from SCPBallot import SCPBallot
+from Message import Message
 import time
 
-class SCPExternalize:
+class SCPExternalize(Message):
+    __slots__ = ('ballot', 'hCounter', '_time')
+
     def __init__(self, ballot: SCPBallot, hCounter: int = 0, timestamp=None):
-        self.ballot = ballot
-        self.hCounter = hCounter
-        self._time = timestamp if timestamp is not None else time.time() # add this to keep track of next slots nomination round
+        # _time is added to keep track of next slots nomination round
+        self._set_fields(ballot=ballot, hCounter=hCounter, _time=timestamp if timestamp is not None else time.time())
 
     def __repr__(self):
         return (f"SCPExternalize(ballot={self.ballot}, hCounter={self.hCounter}, time={self._time})")
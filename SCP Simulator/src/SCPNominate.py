@@ -4,7 +4,7 @@ SCPNominate
 =========================
 
 Author: Matija Piskorec, Jaime de Vivero Woods
-Last update: July 2024
+Last update: October 2026
 
 SCPNominate message class.
 """
@@ -17,13 +17,14 @@ import random
 
 class SCPNominate(Message):
 
+    __slots__ = ('_voted', '_accepted')
+
     def __init__(self,**kwargs):
 
         assert all([isinstance(vote,Value) for vote in kwargs['voted']])
         assert all([isinstance(accept,Value) for accept in kwargs['accepted']])
 
-        self._voted = kwargs['voted']
-        self._accepted = kwargs['accepted']
+        self._set_fields(_voted=kwargs['voted'], _accepted=kwargs['accepted'])
 
         log.message.info('Created SCPNominate message, data = %s', self)
 
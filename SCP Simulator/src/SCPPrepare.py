@@ -1,13 +1,12 @@
 from typing import Optional
 from SCPBallot import SCPBallot
+from Message import Message
+
+class SCPPrepare(Message):
+    __slots__ = ('ballot', 'prepared', 'aCounter', 'hCounter', 'cCounter')
 
-class SCPPrepare:
     def __init__(self, ballot: SCPBallot, prepared: Optional[SCPBallot] = None, aCounter: int = 0, hCounter: int = 0, cCounter: int = 0):
-        self.ballot = ballot
-        self.prepared = prepared
-        self.aCounter = aCounter
-        self.hCounter = hCounter
-        self.cCounter = cCounter
+        self._set_fields(ballot=ballot, prepared=prepared, aCounter=aCounter, hCounter=hCounter, cCounter=cCounter)
 
     def __repr__(self):
         return (f"SCPPrepare(ballot={self.ballot}, prepared={self.prepared}, "
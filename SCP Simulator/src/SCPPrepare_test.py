@@ -4,6 +4,7 @@ from State import State
 from Value import Value
 from SCPBallot import SCPBallot
 from SCPPrepare import SCPPrepare
+import pickle
 
 class SCPPrepare_test(unittest.TestCase):
     def setUp(self):
@@ -24,5 +25,21 @@ class SCPPrepare_test(unittest.TestCase):
     def test_scp_prepare_repr(self):
         self.assertEqual(repr(self.scp_prepare), f"SCPPrepare(ballot={self.ballot}, prepared={self.prepared}, aCounter=1, hCounter=2, cCounter=1)")
 
+    def test_scp_prepare_is_immutable_and_slotted(self):
+        self.assertFalse(hasattr(self.scp_prepare, '__dict__'))
+        with self.assertRaises(AttributeError):
+            self.scp_prepare.aCounter = 5
+        self.assertEqual(self.scp_prepare.aCounter, 1)
+
+    def test_scp_prepare_ids_and_hash(self):
+        other = SCPPrepare(ballot=self.ballot)
+        self.assertGreater(other.message_id, self.scp_prepare.message_id)
+        self.assertEqual(hash(other), other.message_id)
+        self.assertNotEqual(other, self.scp_prepare)
+
+        copied = pickle.loads(pickle.dumps(self.scp_prepare))
+        self.assertEqual(copied, self.scp_prepare)
+        self.assertEqual(copied.hCounter, 2)
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
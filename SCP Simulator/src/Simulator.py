@@ -23,6 +23,8 @@ Logging levels and verbosity levels (higher includes lower):
 
 import argparse
 import copy
+import os
+import random
 import time
 import sys
 import numpy as np
@@ -35,28 +37,80 @@ from Mempool import Mempool
 # import Globals
 from Globals import Globals
 from SCPExternalize import SCPExternalize
+from Message import Message
+from ArrayEngine import ArrayEngine
+from Gossip import Gossip, PULL_EVENTS, LATENCY_DEFAULT
+from LatencyModel import LatencyModel, DISTRIBUTIONS as LATENCY_DISTRIBUTIONS
+from Transaction import Transaction
+from TransactionStream import TransactionStream
 
 VERBOSITY_DEFAULT = 5
 N_NODES_DEFAULT = 50
+ENGINES = ('object', 'array')
+SCHEDULERS = ('gillespie', 'rounds')
+COMMUNICATIONS = ('pull', 'push')
+ROUND_TIME_DEFAULT = 1.0
+REPLICATE_DIR = 'replicate_%d' # Directory of the logs of every replicate, relative to the working directory
 
 class Simulator:
     '''
     Command line (CLI) interface for the simulator.
     '''
 
-    def __init__(self,verbosity=VERBOSITY_DEFAULT,n_nodes=N_NODES_DEFAULT, max_simulation_time=50, simulation_params=None, topology='BA', **kvargs):
+    def __init__(self,verbosity=VERBOSITY_DEFAULT,n_nodes=N_NODES_DEFAULT, max_simulation_time=50, simulation_params=None, topology='BA', engine='object', scheduler='gillespie', round_time=ROUND_TIME_DEFAULT, communication='pull', latency=LATENCY_DEFAULT, topology_seed=None, topology_cache_dir=None, topology_params=None, transaction_stream=None, **kvargs):
 
         self._verbosity = verbosity
         self._n_nodes = n_nodes
         self._nodes = []
         self._max_simulation_time = max_simulation_time
         self.topology = topology
+        # Transactions arrive from a TransactionStream instead of the mine event if given (common random numbers),
+        # on the topology of the stream unless topology_seed is given
+        self.transaction_stream = transaction_stream
+        if transaction_stream is not None and topology_seed is None:
+            topology_seed = transaction_stream.topology_seed
+        # With a seed the random topology is reproducible, and cached in topology_cache_dir if given (see TopologyCache)
+        self.topology_seed = topology_seed
+        self.topology_cache_dir = topology_cache_dir
+        # Parameters of the random topology (p, degree or m), overriding Network.generator_params
+        self.topology_params = dict(topology_params or {})
+
+        if engine not in ENGINES:
+            raise ValueError('Unknown engine %s, expected one of %s' % (engine, ENGINES))
+        self.engine = engine
+        self.array_engine = None
+
+        # Rounds scheduler advances all nodes in lockstep, which only the array engine can do in bulk
+        if scheduler not in SCHEDULERS:
+            raise ValueError('Unknown scheduler %s, expected one of %s' % (scheduler, SCHEDULERS))
+        if scheduler == 'rounds' and engine != 'array':
+            raise ValueError('Scheduler rounds requires the array engine')
+        if scheduler == 'rounds' and transaction_stream is not None:
+            raise ValueError('Scheduler rounds mines transactions every round, it cannot follow a transaction stream')
+        self.scheduler = scheduler
+        self.round_time = round_time
+
+        # Nodes either pull messages from random peers, or broadcasts are pushed to subscribers (object engine only)
+        if communication not in COMMUNICATIONS:
+            raise ValueError('Unknown communication %s, expected one of %s' % (communication, COMMUNICATIONS))
+        if communication == 'push' and engine != 'object':
+            raise ValueError('Communication push requires the object engine')
+        self.communication = communication
+        self.latency = latency # LatencyModel, constant latency or path of a latency matrix, for pushed messages
+        self.gossip = None
 
         self._set_logging()
 
         self.timeStart = time.time()
+        Message.reset_ids() # message IDs are per run
         # ER_singlequorumset
-        self._nodes = Network.generate_nodes(n_nodes=self._n_nodes, topology=self.topology)
+        self._nodes = Network.generate_nodes(n_nodes=self._n_nodes, topology=self.topology,
+                                             seed=self.topology_seed, cache_dir=self.topology_cache_dir,
+                                             **self.topology_params)
+
+        # Array engine keeps the SCP state of all nodes in NumPy arrays built from the generated quorum sets
+        if self.engine == 'array':
+            self.array_engine = ArrayEngine.from_nodes(self._nodes)
 
         if simulation_params is not None:
             self.simulation_params = simulation_params
@@ -95,6 +149,10 @@ class Simulator:
     def nodes(self):
         return self._nodes
 
+    @property
+    def max_simulation_time(self):
+        return self._max_simulation_time
+
     def _set_logging(self):
 
         # Setting logger and verbosity level
@@ -116,8 +174,64 @@ class Simulator:
         check = all(isinstance(node.externalized_slot_counter, SCPExternalize) for node in self._nodes)
         return check
 
+    def reset(self, seed=None):
+        """
+        Reset the state of a run (simulation time, message IDs, in-memory logs and the state of all nodes), keeping
+        the topology and the compiled quorum sets, and seed the random number generators with seed if given.
+        """
+        Globals.simulation_time = 0
+        Globals.slot = 1
+        Message.reset_ids()
+        log.clear()
+        for node in self._nodes:
+            node.reset()
+        if self.array_engine is not None:
+            self.array_engine.reset()
+        self.gossip = None
+        if seed is not None:
+            random.seed(seed)
+            np.random.seed(seed)
+
+    def run_replicates(self, replicates, seeds=None, directory=REPLICATE_DIR):
+        """
+        Run replicates of the simulation back to back in this process, on the same network: the topology is built
+        (and quorum sets compiled) once, and only the state of a run is reset before every replicate. Replicate k
+        runs with seeds[k] (unseeded by default) and writes its logs to directory % k, which is yielded once the
+        replicate finished (so that its logs can be parsed before the next one runs). With a transaction stream,
+        replicate k draws its arrivals from the seed of the stream + k, so replicate k of every configuration sharing
+        the stream sees the same transactions.
+        """
+        seeds = list(seeds) if seeds is not None else [None] * replicates
+        if len(seeds) != replicates:
+            raise ValueError('Expected %d seeds, got %d' % (replicates, len(seeds)))
+        cwd = os.getcwd()
+        transaction_seed = self.transaction_stream.seed if self.transaction_stream is not None else None
+        for replicate, seed in enumerate(seeds):
+            path = os.path.abspath(directory % replicate)
+            os.makedirs(path, exist_ok=True)
+            self.reset(seed=seed)
+            if transaction_seed is not None:
+                self.transaction_stream.reset(transaction_seed + replicate)
+            os.chdir(path)
+            try:
+                self.run()
+            finally:
+                os.chdir(cwd)
+            if self._verbosity:
+                log.simulator.info('Finished replicate %d of %d with seed %s.', replicate + 1, replicates, seed)
+            yield path
+
     def run(self):
 
+        self.start()
+        self.advance(self._max_simulation_time)
+        log.export_logs_to_txt("ledger_logs.txt")
+
+    def start(self):
+        """
+        Prepare a run (mempools, gossip, events and the Gillespie algorithm) without advancing the simulation time,
+        run() is start() followed by advance(max_simulation_time).
+        """
         if self._verbosity:
             log.simulator.info('Started simulation vith verbosity level %s and %s nodes for simulation time %s.',
                                self._verbosity, self._n_nodes, self._max_simulation_time)
@@ -125,8 +239,18 @@ class Simulator:
         if self._verbosity:
             log.simulator.debug('Creating %s nodes.', self._n_nodes)
 
-        for node in self._nodes:
-            node.attach_mempool(Mempool())
+        if self.engine == 'object':
+            for node in self._nodes:
+                node.attach_mempool(Mempool())
+
+        if self.communication == 'push':
+            self.gossip = Gossip(self._nodes, latency=self.latency)
+
+        if self.scheduler == 'rounds':
+            if self._verbosity:
+                log.simulator.debug('Running synchronous rounds of %s simulation time.', self.round_time)
+            Globals.simulation_time = 0.0
+            return
 
         # Run Gillespie algorithm
         if self._verbosity:
@@ -147,14 +271,78 @@ class Simulator:
         # Remove events for which we don't have simulation parameters
         self._events = [event for event in self._events if event.simulation_params is not None]
 
-        gillespie = Gillespie(self._events, max_time=self._max_simulation_time)
+        # Pushed messages are delivered on arrival, so there is nothing for nodes to pull
+        if self.gossip is not None:
+            self._events = [event for event in self._events if event.name not in PULL_EVENTS]
+
+        # Transactions of a stream are mined when they arrive, in between the events
+        if self.transaction_stream is not None:
+            self.transaction_stream.reset()
+            self._events = [event for event in self._events if event.name != 'mine']
 
-        # Run simulation
-        while gillespie.check_max_time():
-            event_random, Globals.simulation_time = gillespie.next_event()
+        self._gillespie = Gillespie(self._events, max_time=self._max_simulation_time)
+
+    def advance(self, until):
+        """
+        Run the simulation started with start() up to simulation time until.
+        """
+        if self.scheduler == 'rounds':
+            self._run_rounds(until)
+            return
+
+        gillespie = self._gillespie
+        while gillespie.time < until:
+            event_random, event_time = gillespie.next_event()
+            if self.transaction_stream is not None:
+                # Arrivals after until are left to the next advance, so every configuration mines the same ones
+                self._mine_arrivals(min(event_time, until))
+            Globals.simulation_time = event_time
             self._handle_event(event_random)
+            if self.gossip is not None:
+                self.gossip.deliver_due(Globals.simulation_time)
 
-        log.export_logs_to_txt("ledger_logs.txt")
+    def update_simulation_params(self, simulation_params):
+        """
+        Change the parameters (e.g. tau) of events of a started simulation, from the next event on. Only events which
+        had simulation parameters when the simulation started can be changed.
+        """
+        for name, params in simulation_params.items():
+            if name not in self.simulation_params:
+                raise ValueError('No simulation parameters for event %s, it is not part of the simulation' % name)
+            # Events share the dicts of self.simulation_params, so updating them in place changes the events too
+            self.simulation_params[name].update({key: value for key, value in params.items() if key != 'tau_domain'})
+        if self.scheduler != 'rounds':
+            self._gillespie.update_rates()
+
+    def _run_rounds(self, until):
+        """
+        Synchronous alternative to the Gillespie algorithm - every node performs all of its actions once per round.
+        """
+        mine_tau = self.simulation_params['mine']['tau']
+        retrieve_tau = self.simulation_params['retrieve_transaction_from_mempool']['tau']
+
+        while Globals.simulation_time < until:
+            Globals.simulation_time += self.round_time
+            self.array_engine.step_round(self.round_time, mine_tau=mine_tau, retrieve_tau=retrieve_tau)
+
+            if self._verbosity:
+                log.simulator.info('Finished round at simulation time = %.3f', Globals.simulation_time)
+
+    def _mine_arrivals(self, time):
+        """
+        Mine the transactions of the stream which arrive up to time, each at its own arrival time.
+        """
+        for arrival in self.transaction_stream.due(time):
+            Globals.simulation_time = arrival.time
+            i = TransactionStream.node_index(arrival, len(self._nodes))
+            if self.array_engine is not None:
+                self.array_engine.handle_event('mine', node=i)
+            else:
+                self._nodes[i].mempool.mine(Transaction(time=arrival.time, tx_hash=arrival.hash))
+
+    def _random_node(self):
+        # Same draw as np.random.choice(self._nodes), without converting the list of nodes to an array every event
+        return self._nodes[np.random.randint(len(self._nodes))]
 
     def _handle_event(self,event):
         """
@@ -165,45 +353,49 @@ class Simulator:
             # log.simulator.info('Handling event %s at simulation time = %.3f',event.name,self._simulation_time)
             log.simulator.info('Handling event %s at simulation time = %.3f',event.name,Globals.simulation_time)
 
+        if self.array_engine is not None:
+            self.array_engine.handle_event(event.name)
+            return
+
         match event.name:
             case 'mine': # CREATE TRANSACTION
-                node = np.random.choice(self._nodes)
+                node = self._random_node()
                 node.mempool.mine()
 
             case 'retrieve_transaction_from_mempool':
-                node_random = np.random.choice(self._nodes)
+                node_random = self._random_node()
                 node_random.retrieve_transaction_from_mempool()
 
             case 'nominate':
-                random_node = np.random.choice(self._nodes)
+                random_node = self._random_node()
                 random_node.nominate()
 
             case 'retrieve_message_from_peer':
-                random_node = np.random.choice(self._nodes)
+                random_node = self._random_node()
                 random_node.receive_message()
 
             case 'prepare_ballot':
-                random_node = np.random.choice(self._nodes)
+                random_node = self._random_node()
                 random_node.prepare_ballot_msg()
 
             case 'receive_prepare_message':
-                random_node = np.random.choice(self._nodes)
+                random_node = self._random_node()
                 random_node.receive_prepare_message()
 
             case 'prepare_commit':
-                random_node = np.random.choice(self._nodes)
+                random_node = self._random_node()
                 random_node.prepare_SCPCommit_msg()
 
             case 'receive_commit_message':
-                random_node = np.random.choice(self._nodes)
+                random_node = self._random_node()
                 random_node.receive_commit_message()
 
             case 'prepare_externalize_message':
-                random_node = np.random.choice(self._nodes)
+                random_node = self._random_node()
                 random_node.prepare_Externalize_msg()
 
             case 'receive_externalize_msg':
-                random_node = np.random.choice(self._nodes)
+                random_node = self._random_node()
                 random_node.receive_Externalize_msg()
 
 
@@ -213,9 +405,32 @@ if __name__=='__main__':
     parser=argparse.ArgumentParser()
     parser.add_argument("--verbosity","-v", type=int, default=VERBOSITY_DEFAULT, help="Verbosity level (0-5).")
     parser.add_argument("--nodes","-n", type=int, default=N_NODES_DEFAULT, help="Number of nodes.")
+    parser.add_argument("--engine","-e", choices=ENGINES, default='object', help="Consensus engine - objects per node or arrays over all nodes.")
+    parser.add_argument("--scheduler","-s", choices=SCHEDULERS, default='gillespie', help="Random asynchronous events or synchronous rounds (array engine only).")
+    parser.add_argument("--round-time", type=float, default=ROUND_TIME_DEFAULT, help="Simulation time of one synchronous round.")
+    parser.add_argument("--communication","-c", choices=COMMUNICATIONS, default='pull', help="Nodes pull messages from random peers, or broadcasts are pushed to subscribers.")
+    parser.add_argument("--latency", default=LATENCY_DEFAULT, help="Mean latency of pushed messages - constant, or path of a .npy/.csv matrix of link latencies.")
+    parser.add_argument("--latency-distribution", choices=LATENCY_DISTRIBUTIONS, default='constant', help="Distribution of latencies around the mean latency of a link.")
+    parser.add_argument("--topology-seed", type=int, default=None, help="Seed of the random topology.")
+    parser.add_argument("--topology-cache", default=None, help="Directory in which seeded topologies are cached.")
+    parser.add_argument("--p", type=float, default=None, help="Edge probability of ER topologies.")
+    parser.add_argument("--degree", type=int, default=None, help="Degree of ER_SQ_FIXED_DEGREE, or average degree of ER topologies.")
+    parser.add_argument("--m", type=int, default=None, help="Edges of every new node of BA topologies.")
+    parser.add_argument("--replicates", type=int, default=1, help="Replicates run back to back on the same network, with logs in replicate_<k> directories.")
+    parser.add_argument("--seed", type=int, default=None, help="Seed of the first replicate, replicate k runs with seed + k.")
+    parser.add_argument("--transaction-seed", type=int, default=None, help="Transactions arrive from a stream with this seed (shared by all configurations using it) instead of the mine event, on the topology of the stream unless --topology-seed is given.")
     args = parser.parse_args()
 
-    simulator = Simulator(verbosity=args.verbosity,n_nodes=args.nodes)
-
-    simulator.run()
+    # Stream arrives at the rate of the default mine event, one transaction per node per unit of simulation time
+    transaction_stream = TransactionStream(args.transaction_seed, rate=args.nodes) if args.transaction_seed is not None else None
+    simulator = Simulator(verbosity=args.verbosity,n_nodes=args.nodes,transaction_stream=transaction_stream,engine=args.engine,scheduler=args.scheduler,round_time=args.round_time,communication=args.communication,latency=LatencyModel.of(args.latency,args.latency_distribution),topology_seed=args.topology_seed,topology_cache_dir=args.topology_cache,topology_params={name: value for name, value in [('p', args.p), ('degree', args.degree), ('m', args.m)] if value is not None})
+
+    if args.replicates > 1:
+        seeds = [args.seed + k for k in range(args.replicates)] if args.seed is not None else None
+        for path in simulator.run_replicates(args.replicates, seeds=seeds):
+            print('Replicate logs in %s' % path)
+    else:
+        if args.seed is not None:
+            simulator.reset(seed=args.seed)
+        simulator.run()
 
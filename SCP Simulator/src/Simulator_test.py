@@ -0,0 +1,99 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from Globals import Globals
+from Simulator import Simulator
+from TransactionStream import TransactionStream
+
+
+class SimulatorReplicatesTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.cwd = os.getcwd()
+        os.chdir(self.directory.name)
+        self.addCleanup(os.chdir, self.cwd)
+
+    def read(self, path, name):
+        with open(os.path.join(path, name)) as file:
+            return file.read()
+
+    def test_seeded_replicates_repeat_exactly(self):
+        simulator = Simulator(verbosity=0, n_nodes=4, max_simulation_time=6, topology='FULL')
+        quorum_sets = [node.quorum_set for node in simulator.nodes]
+        paths = list(simulator.run_replicates(3, seeds=[1, 2, 1]))
+
+        self.assertEqual(paths, [os.path.abspath('replicate_%d' % k) for k in range(3)])
+        self.assertEqual(os.getcwd(), os.path.realpath(self.directory.name))
+        # A replicate does not depend on the ones run before it
+        self.assertEqual(self.read(paths[0], 'simulator_events_log.txt'), self.read(paths[2], 'simulator_events_log.txt'))
+        self.assertEqual(self.read(paths[0], 'simulator_mine_events.txt'), self.read(paths[2], 'simulator_mine_events.txt'))
+        self.assertNotEqual(self.read(paths[0], 'simulator_mine_events.txt'), self.read(paths[1], 'simulator_mine_events.txt'))
+        self.assertEqual([node.quorum_set for node in simulator.nodes], quorum_sets)
+        self.assertGreaterEqual(min(len(node.ledger.slots) for node in simulator.nodes), 1)
+
+        with self.assertRaises(ValueError):
+            list(simulator.run_replicates(2, seeds=[1]))
+
+    def test_push_replicates_repeat_exactly(self):
+        simulator = Simulator(verbosity=0, n_nodes=4, max_simulation_time=6, topology='FULL', communication='push')
+        ledgers = []
+        for path in simulator.run_replicates(2, seeds=[1, 1]):
+            ledgers.append([{slot: entry['value'].hash for slot, entry in node.ledger.slots.items()} for node in simulator.nodes])
+        self.assertEqual(ledgers[0], ledgers[1])
+        self.assertGreaterEqual(min(len(ledger) for ledger in ledgers[0]), 1)
+
+        simulator.reset()
+        for node in simulator.nodes:
+            self.assertEqual((node._published_statements, node.future_externalize_msgs, node.buffered_nominations), (set(), {}, {}))
+            self.assertFalse(any(node.latest_pushed_msgs.values()))
+
+    def test_reset_keeps_topology(self):
+        simulator = Simulator(verbosity=0, n_nodes=4, max_simulation_time=6, topology='FULL')
+        np.random.seed(3)
+        simulator.run()
+        quorum_set = simulator.nodes[0].quorum_set
+        self.assertGreater(Globals.simulation_time, 0)
+
+        simulator.reset()
+        self.assertEqual(Globals.simulation_time, 0)
+        for node in simulator.nodes:
+            self.assertEqual((node.slot, node.ledger.slots, node.mempool, len(node.broadcast_flags)), (1, {}, None, 0))
+        self.assertIs(simulator.nodes[0].quorum_set, quorum_set)
+
+    def test_array_engine_replicates(self):
+        simulator = Simulator(verbosity=0, n_nodes=6, max_simulation_time=20, topology='FULL', engine='array', scheduler='rounds')
+        indices = simulator.array_engine.indices
+        ledgers = []
+        for path in simulator.run_replicates(2, seeds=[5, 5]):
+            ledgers.append(simulator.array_engine.ledger.copy())
+            self.assertTrue(simulator.array_engine.check_agreement())
+        self.assertTrue(np.array_equal(ledgers[0], ledgers[1]))
+        self.assertIs(simulator.array_engine.indices, indices)
+
+    def test_common_transaction_stream(self):
+        # Configurations sharing a stream mine the same transactions at the same times, whatever else they draw
+        stream = TransactionStream(11, rate=4.0)
+        mined = []
+        for k, (seed, topology) in enumerate([(1, 'FULL'), (2, 'FULL'), (1, 'BA')]):
+            simulator = Simulator(verbosity=0, n_nodes=4, max_simulation_time=5, topology=topology,
+                                  topology_params={'m': 2} if topology == 'BA' else None, transaction_stream=stream)
+            for path in simulator.run_replicates(1, seeds=[seed], directory='config_%d_%%d' % k):
+                mined.append([line.split(' - ', 1)[1] for line in self.read(path, 'simulator_mine_events.txt').splitlines()])
+        self.assertEqual(simulator.topology_seed, 11)
+        self.assertEqual(mined[0], mined[1])
+        self.assertEqual(mined[0], mined[2])
+        self.assertEqual(len(mined[0]), len(list(TransactionStream(11, rate=4.0).due(5))))
+
+        simulator = Simulator(verbosity=0, n_nodes=4, max_simulation_time=5, topology='FULL', engine='array', transaction_stream=stream)
+        simulator.run()
+        self.assertEqual(stream.next, len(mined[0]))
+        self.assertGreater(simulator.array_engine.pending.sum() + simulator.array_engine.queued.sum(), 0)
+        with self.assertRaises(ValueError):
+            Simulator(verbosity=0, n_nodes=4, engine='array', scheduler='rounds', transaction_stream=stream)
+
+
+if __name__ == "__main__":
+    unittest.main()
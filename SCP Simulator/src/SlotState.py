@@ -0,0 +1,89 @@
+"""
+=========================
+SlotState
+=========================
+
+Author: Matija Piskorec, Jaime de Vivero Woods
+Last update: October 2026
+
+SlotState class.
+
+Nomination, prepare and commit state of a Node for a single slot. When a slot is externalized the Node
+drops its SlotState wholesale and starts the next slot with a fresh one, so the cost of finishing a slot
+does not depend on how much state has accumulated during it. Only transactions which were nominated in
+the slot but not finalised are carried over (see Node.finish_slot).
+
+Prepare and commit broadcast logs of the next slot continue the sequence numbers of the previous slot,
+so that cursors which peers keep into these logs remain valid across slots.
+"""
+
+from BroadcastLog import BroadcastLog
+
+
+class SlotState():
+
+    def __init__(self, slot, prepare_seq=0, commit_seq=0):
+        self.slot = slot
+
+        ###################################
+        # NOMINATION PHASE STRUCTURES     #
+        ###################################
+        self.nomination_state = {'voted': [], 'accepted': [], 'confirmed': []}
+        self.statement_counter = {} # This hashmap (or dictionary) keeps track of all Values added and how many times unique nodes have made statements on it
+        # This dictionary looks like this {Value_hash: {'voted': {node_id: count,...}}, {'accepted': {node_id:count}}}
+
+        ###################################
+        # PREPARE BALLOT PHASE STRUCTURES #
+        ###################################
+        self.balloting_state = {'voted': {}, 'accepted': {}, 'confirmed': {}, 'aborted': {}} # This will look like: {'voted': {'value_hash_1': SCPBallot(counter=1, value=ValueObject1),},'accepted': { 'value_hash_2': SCPBallot(counter=3, value=ValueObject2)},'confirmed': { ... },'aborted': { ... }}
+        self.ballot_statement_counter = {} # This will use sets for node names as opposed to counts, so will look like: {SCPBallot1.value: {'voted': set(Node1), 'accepted': set(Node2, Node3), 'confirmed': set(), 'aborted': set()}, ...}
+        self._ballot_prepare_broadcast_flags = BroadcastLog(start_seq=prepare_seq) # Add every SCPPrepare message here
+        self.prepared_ballots = {} # This looks like: self.prepared_ballots[ballot.value] = SCPPrepare('aCounter': aCounter,'cCounter': cCounter,'hCounter': hCounter,'highestCounter': ballot.counter)
+
+        ###################################
+        # SCPCOMMIT BALLOT PHASE STRUCTURES #
+        ###################################
+        self.commit_ballot_state = {'voted': {}, 'accepted': {}, 'confirmed': {}} # Same layout as balloting_state, without 'aborted'
+        self.commit_ballot_statement_counter = {} # Same layout as ballot_statement_counter
+        self._commit_ballot_broadcast_flags = BroadcastLog(start_seq=commit_seq) # Add every SCPCommit message here
+        self.committed_ballots = {}
+
+    def __repr__(self):
+        return '[SlotState, slot = %s, voted = %s, prepare ballots = %s, commit ballots = %s]' % (
+            self.slot, self.nomination_state.get('voted'), len(self.balloting_state['voted']), len(self.commit_ballot_state['voted']))
+
+    # Assigning a collection replaces the messages in the log but keeps its sequence numbers growing
+    @property
+    def ballot_prepare_broadcast_flags(self):
+        return self._ballot_prepare_broadcast_flags
+
+    @ballot_prepare_broadcast_flags.setter
+    def ballot_prepare_broadcast_flags(self, messages):
+        self._ballot_prepare_broadcast_flags.replace(messages)
+
+    @property
+    def commit_ballot_broadcast_flags(self):
+        return self._commit_ballot_broadcast_flags
+
+    @commit_ballot_broadcast_flags.setter
+    def commit_ballot_broadcast_flags(self, messages):
+        self._commit_ballot_broadcast_flags.replace(messages)
+
+    def next_slot(self, slot=None):
+        """
+        Fresh state for the following slot (or the given slot number).
+        """
+        return SlotState(self.slot + 1 if slot is None else slot,
+                         prepare_seq=self._ballot_prepare_broadcast_flags.next_seq,
+                         commit_seq=self._commit_ballot_broadcast_flags.next_seq)
+
+    def nominated_transactions(self):
+        """
+        All transactions in the nomination state of this slot, without duplicates.
+        """
+        transactions = {}
+        for phase in ('voted', 'accepted', 'confirmed'):
+            for value in self.nomination_state.get(phase, []):
+                for tx in value.transactions:
+                    transactions[tx.hash] = tx
+        return list(transactions.values())
@@ -0,0 +1,44 @@
+import unittest
+from SlotState import SlotState
+from SCPBallot import SCPBallot
+from SCPPrepare import SCPPrepare
+from Transaction import Transaction
+from Value import Value
+
+
+class SlotStateTest(unittest.TestCase):
+
+    def test_next_slot_starts_empty(self):
+        state = SlotState(1)
+        value = Value(transactions={Transaction(0)})
+        state.nomination_state['voted'].append(value)
+        state.statement_counter[value.hash] = {'voted': {'node'}, 'accepted': set()}
+        state.balloting_state['voted'][value.hash] = SCPBallot(counter=1, value=value)
+
+        next_state = state.next_slot()
+        self.assertEqual(next_state.slot, 2)
+        self.assertEqual(next_state.nomination_state, {'voted': [], 'accepted': [], 'confirmed': []})
+        self.assertEqual(next_state.statement_counter, {})
+        self.assertEqual(next_state.balloting_state['voted'], {})
+
+    def test_next_slot_continues_broadcast_sequence_numbers(self):
+        state = SlotState(1)
+        ballot = SCPBallot(counter=1, value=Value(transactions={Transaction(0)}))
+        state.ballot_prepare_broadcast_flags.add(SCPPrepare(ballot=ballot))
+        state.ballot_prepare_broadcast_flags.add(SCPPrepare(ballot=ballot))
+
+        next_state = state.next_slot(5)
+        self.assertEqual(next_state.slot, 5)
+        self.assertEqual(len(next_state.ballot_prepare_broadcast_flags), 0)
+        self.assertEqual(next_state.ballot_prepare_broadcast_flags.next_seq, 2)
+        self.assertEqual(next_state.commit_ballot_broadcast_flags.next_seq, 0)
+
+    def test_nominated_transactions_are_unique(self):
+        state = SlotState(1)
+        tx1, tx2, tx3 = Transaction(0), Transaction(0), Transaction(0)
+        state.nomination_state['voted'] = [Value(transactions={tx1, tx2})]
+        state.nomination_state['accepted'] = [Value(transactions={tx2, tx3})]
+        self.assertCountEqual(state.nominated_transactions(), [tx1, tx2, tx3])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,183 @@
+"""
+=========================
+SweepRunner
+=========================
+
+Author: Matija Piskorec, Jaime de Vivero Woods
+Last update: October 2026
+
+SweepRunner class.
+
+Runs a parameter sweep (a list of jobs, each a JSON serializable dict of simulation parameters, topology and
+seed) on a pool of processes, and can be stopped and started again at any time without losing or repeating work.
+
+Every job is keyed by the SHA-1 of the job together with the code version (the SHA-1 of the simulator sources,
+see code_version), and its result is stored under that key in the results directory as soon as it finishes, so:
+- jobs whose results are already stored are skipped (also when the same job appears twice in a sweep);
+- after a crash or Ctrl-C, running the sweep again runs only the jobs which did not finish;
+- changing the simulator code makes all jobs run again.
+Unseeded jobs (with a seed of None) draw new random numbers every time they run, so they are neither stored nor
+deduplicated: every one of them runs, every time.
+Jobs which raise are retried in the worker up to retries times, and failed jobs are not stored (they run again
+on the next run). Results stream back with imap_unordered, in chunks of chunksize jobs, and are stored (and
+passed to on_result) by the parent process only, so results never get interleaved.
+A result is stored before on_result records it (e.g. queues its row for a ResultsStore), so a crash in between
+would leave a stored job whose row is missing. Given the keys of the jobs on_result already recorded (emitted,
+e.g. ResultsStore.job_keys), run passes the stored results of the other jobs to on_result again first.
+
+Usage: see scripts/parallel_simulations.py
+"""
+
+import glob
+import hashlib
+import json
+import multiprocessing
+import os
+import tempfile
+import traceback
+
+from Log import log
+
+RETRIES_DEFAULT = 2 # Attempts after the first one
+
+
+def code_version(directory):
+    """
+    SHA-1 of all Python sources in directory, it changes whenever the simulator does.
+    """
+    digest = hashlib.sha1()
+    for path in sorted(glob.glob(os.path.join(directory, '*.py'))):
+        digest.update(os.path.basename(path).encode())
+        with open(path, 'rb') as file:
+            digest.update(file.read())
+    return digest.hexdigest()
+
+
+def unseeded(job):
+    return 'seed' in job and job['seed'] is None
+
+
+class SweepRunner():
+
+    def __init__(self, worker, results_dir, code_version=None, processes=None, retries=RETRIES_DEFAULT, chunksize=1):
+        """
+        worker takes a job and returns its result (a JSON serializable dict), it must be a module level function
+        so that it can be sent to the processes of the pool.
+        """
+        self.worker = worker
+        self.results_dir = results_dir
+        self.code_version = code_version
+        self.processes = processes
+        self.retries = retries
+        self.chunksize = chunksize
+        os.makedirs(results_dir, exist_ok=True)
+
+    def __repr__(self):
+        return '[SweepRunner, results = %s, processes = %s, retries = %s]' % (self.results_dir, self.processes, self.retries)
+
+    def key(self, job):
+        description = json.dumps({'code': self.code_version, 'job': job}, sort_keys=True)
+        return hashlib.sha1(description.encode()).hexdigest()
+
+    def keys(self, jobs):
+        """
+        Key of every job, unseeded jobs get keys of their own (and no stored result).
+        """
+        keys = []
+        for k, job in enumerate(jobs):
+            key = self.key(job)
+            keys.append('%s-unseeded-%d' % (key, k) if unseeded(job) else key)
+        return keys
+
+    def path(self, key):
+        return os.path.join(self.results_dir, key + '.json')
+
+    def load(self, key):
+        """
+        Stored result of the job with key, or None if it did not finish yet.
+        """
+        path = self.path(key)
+        if not os.path.exists(path):
+            return None
+        with open(path, 'r') as file:
+            return json.load(file)['result']
+
+    def save(self, key, job, result):
+        # Write to a temporary file first, so that an interrupted run never leaves a partially written result
+        descriptor, temporary = tempfile.mkstemp(dir=self.results_dir, suffix='.json')
+        with os.fdopen(descriptor, 'w') as file:
+            json.dump({'key': key, 'code': self.code_version, 'job': job, 'result': result}, file, sort_keys=True)
+        os.replace(temporary, self.path(key))
+
+    def pending(self, jobs):
+        """
+        (key, job) of the jobs without a stored result, every job once.
+        """
+        pending, seen = [], set()
+        for key, job in zip(self.keys(jobs), jobs):
+            if key not in seen and not os.path.exists(self.path(key)):
+                pending.append((key, job))
+            seen.add(key)
+        return pending
+
+    def run(self, jobs, on_result=None, emitted=None):
+        """
+        Run all jobs without a stored result and return the results of all jobs (None for failed jobs), in the
+        order of jobs. on_result(job, result, error) is called in this process as every job finishes, and first for
+        the stored jobs whose keys are not in emitted (unless emitted is None).
+        """
+        jobs = list(jobs)
+        keys = self.keys(jobs)
+        pending = self.pending(jobs)
+        log.simulator.info('Sweep of %d jobs: %d stored, %d to run', len(jobs), len(jobs) - len(pending), len(pending))
+
+        if on_result is not None and emitted is not None:
+            missing = {key for key, _ in pending} | set(emitted)
+            for key, job in zip(keys, jobs):
+                if key not in missing:
+                    missing.add(key)
+                    result = self.load(key)
+                    if result is not None:
+                        log.simulator.warning('Job %s was stored but not recorded, recording it again', key[:12])
+                        on_result(job, result, None)
+
+        results = {}
+        if pending:
+            processes = min(self.processes or os.cpu_count() or 1, len(pending))
+            with multiprocessing.Pool(processes, initializer=_start_worker, initargs=(self.worker, self.retries)) as pool:
+                try:
+                    for key, job, result, error in pool.imap_unordered(_run_job, pending, chunksize=self.chunksize):
+                        if error is None:
+                            if not unseeded(job):
+                                self.save(key, job, result)
+                            results[key] = result
+                        else:
+                            log.simulator.warning('Job %s failed after %d attempts: %s', key[:12], self.retries + 1, error)
+                        if on_result is not None:
+                            on_result(job, result, error)
+                except KeyboardInterrupt:
+                    pool.terminate()
+                    log.simulator.warning('Sweep interrupted, %d jobs finished, run it again to resume', len(results))
+                    raise
+        return [results.get(key) if key in results else self.load(key) for key in keys]
+
+
+_worker = None
+
+
+def _start_worker(worker, retries):
+    global _worker
+    _worker = (worker, retries)
+
+
+def _run_job(item):
+    key, job = item
+    worker, retries = _worker
+    error = None
+    for attempt in range(retries + 1):
+        try:
+            return key, job, worker(job), None
+        except Exception:
+            error = traceback.format_exc()
+            log.simulator.warning('Job %s failed (attempt %d of %d)', key[:12], attempt + 1, retries + 1)
+    return key, job, None, error
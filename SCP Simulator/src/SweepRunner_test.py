@@ -0,0 +1,102 @@
+import os
+import tempfile
+import unittest
+from SweepRunner import SweepRunner, code_version
+
+
+def square(job):
+    return {'square': job['x'] ** 2}
+
+
+def fail(job):
+    raise RuntimeError('simulation crashed')
+
+
+def flaky(job):
+    # Fails the first time it runs a job, leaving a marker file behind
+    marker = os.path.join(job['directory'], 'attempted-%d' % job['x'])
+    if not os.path.exists(marker):
+        open(marker, 'w').close()
+        raise RuntimeError('first attempt')
+    return {'square': job['x'] ** 2}
+
+
+class SweepRunnerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.results_dir = os.path.join(self.directory.name, 'results')
+
+    def test_stored_results_are_skipped(self):
+        jobs = [{'x': x, 'topology': 'BA', 'seed': 1} for x in range(5)]
+        finished = []
+        runner = SweepRunner(square, self.results_dir, code_version='v1', processes=2, chunksize=2)
+        results = runner.run(jobs + jobs[:2], on_result=lambda job, result, error: finished.append(job['x']))
+        self.assertEqual(results, [{'square': x ** 2} for x in list(range(5)) + [0, 1]])
+        self.assertEqual(sorted(finished), list(range(5))) # Every job once
+
+        # A second run (e.g. after an interruption) only loads the stored results
+        finished.clear()
+        again = SweepRunner(fail, self.results_dir, code_version='v1').run(jobs, on_result=lambda *args: finished.append(args))
+        self.assertEqual(again, results[:5])
+        self.assertEqual(finished, [])
+        self.assertEqual(runner.pending(jobs + [{'x': 5, 'topology': 'BA', 'seed': 1}]), [(runner.key({'x': 5, 'topology': 'BA', 'seed': 1}), {'x': 5, 'topology': 'BA', 'seed': 1})])
+
+        # Another code version runs everything again
+        self.assertEqual(len(SweepRunner(square, self.results_dir, code_version='v2').pending(jobs)), 5)
+
+    def test_stored_jobs_not_recorded_are_recorded_on_resume(self):
+        jobs = [{'x': x, 'seed': 1} for x in range(3)]
+        runner = SweepRunner(square, self.results_dir, code_version='v1', processes=1)
+        recorded = {}
+        def record(job, result, error):
+            if job['x'] == 1 and not recorded.get('crashed'):
+                recorded['crashed'] = True
+                raise KeyboardInterrupt # Dies after the result was stored, before its row was written
+            recorded[runner.key(job)] = result
+        with self.assertRaises(KeyboardInterrupt):
+            runner.run(jobs, on_result=record)
+        self.assertTrue(os.path.exists(runner.path(runner.key(jobs[1]))))
+        self.assertNotIn(runner.key(jobs[1]), recorded)
+
+        emitted = set(recorded) - {'crashed'}
+        finished = []
+        results = runner.run(jobs, on_result=lambda job, result, error: finished.append(job['x']), emitted=emitted)
+        self.assertEqual(results, [{'square': x ** 2} for x in range(3)])
+        self.assertEqual(sorted(finished), sorted({0, 1, 2} - {job['x'] for job in jobs if runner.key(job) in emitted}))
+        self.assertIn(1, finished)
+
+    def test_unseeded_jobs_always_run(self):
+        jobs = [{'x': 2, 'seed': None}] * 3 + [{'x': 3, 'seed': 1}]
+        finished = []
+        runner = SweepRunner(square, self.results_dir, code_version='v1', processes=2)
+        self.assertEqual(runner.run(jobs, on_result=lambda job, result, error: finished.append(job['x'])), [{'square': 4}] * 3 + [{'square': 9}])
+        self.assertEqual(sorted(finished), [2, 2, 2, 3])
+        # Only the seeded job is stored, the unseeded ones run again
+        self.assertEqual(len(os.listdir(self.results_dir)), 1)
+        self.assertEqual([job for _, job in runner.pending(jobs)], jobs[:3])
+
+    def test_failed_jobs_are_retried_and_not_stored(self):
+        jobs = [{'x': x, 'directory': self.directory.name} for x in range(3)]
+        self.assertEqual(SweepRunner(flaky, self.results_dir, processes=2, retries=1).run(jobs),
+                         [{'square': 0}, {'square': 1}, {'square': 4}])
+
+        errors = []
+        runner = SweepRunner(fail, self.results_dir, code_version='v1', processes=1, retries=1)
+        self.assertEqual(runner.run([{'x': 1}], on_result=lambda job, result, error: errors.append(error)), [None])
+        self.assertIn('simulation crashed', errors[0])
+        self.assertEqual(len(runner.pending([{'x': 1}])), 1)
+
+    def test_code_version_follows_sources(self):
+        with open(os.path.join(self.directory.name, 'Node.py'), 'w') as file:
+            file.write('x = 1\n')
+        before = code_version(self.directory.name)
+        self.assertEqual(before, code_version(self.directory.name))
+        with open(os.path.join(self.directory.name, 'Node.py'), 'w') as file:
+            file.write('x = 2\n')
+        self.assertNotEqual(before, code_version(self.directory.name))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,131 @@
+"""
+=========================
+TopologyCache
+=========================
+
+Author: Matija Piskorec, Jaime de Vivero Woods
+Last update: October 2026
+
+TopologyCache class.
+
+On-disk cache of generated topologies, so that sweeps which repeat the same (topology, n_nodes, seed) load the
+quorum sets of all nodes from a compact .npz file instead of generating the random graph again.
+Files are keyed by the topology, its generator parameters and the seed, and only seeded topologies are cached
+(without a seed every run draws a different graph).
+
+A file stores the node names, their quorum set thresholds and quorum set members as indices into the names:
+top level members as CSR arrays (members_indptr, members), and inner sets as two levels of CSR arrays
+(inner_indptr gives the inner sets of each node, inner_members_indptr the members of each inner set). Inner
+sets which are single nodes rather than lists of nodes are flagged in inner_is_node. The DependentsIndex of the
+nodes is stored as well (dependents_indptr, dependents), so loading does not need to rebuild it.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+
+import numpy as np
+
+from Log import log
+from Node import Node
+from DependentsIndex import DependentsIndex
+
+FORMAT_VERSION = 1
+
+
+class TopologyCache():
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def __repr__(self):
+        return '[TopologyCache, directory = %s]' % self.directory
+
+    @staticmethod
+    def key(topology, n_nodes, seed, params):
+        """
+        File name of the topology generated with the given parameters and seed.
+        """
+        description = json.dumps({'topology': topology, 'n_nodes': n_nodes, 'seed': seed, 'params': params,
+                                  'version': FORMAT_VERSION}, sort_keys=True)
+        digest = hashlib.sha1(description.encode()).hexdigest()[:16]
+        return '%s-n%d-seed%s-%s.npz' % (topology, n_nodes, seed, digest)
+
+    def path(self, key):
+        return os.path.join(self.directory, key)
+
+    def load(self, key):
+        """
+        Nodes with the cached quorum sets and their DependentsIndex attached, or None when the topology is not cached.
+        """
+        path = self.path(key)
+        if not os.path.exists(path):
+            return None
+        with np.load(path, allow_pickle=False) as data:
+            nodes = [Node(name) for name in data['names'].tolist()]
+            thresholds = data['thresholds'].tolist()
+            members_indptr, members = data['members_indptr'], data['members'].tolist()
+            inner_indptr = data['inner_indptr']
+            inner_members_indptr, inner_members = data['inner_members_indptr'], data['inner_members'].tolist()
+            inner_is_node = data['inner_is_node'].tolist()
+            dependents_indptr, dependents = data['dependents_indptr'], data['dependents']
+
+        for i, node in enumerate(nodes):
+            quorum = [nodes[j] for j in members[members_indptr[i]:members_indptr[i + 1]]]
+            inner_sets = []
+            for k in range(inner_indptr[i], inner_indptr[i + 1]):
+                inner_nodes = [nodes[j] for j in inner_members[inner_members_indptr[k]:inner_members_indptr[k + 1]]]
+                if inner_is_node[k]:
+                    inner_sets.extend(inner_nodes)
+                else:
+                    inner_sets.append(inner_nodes)
+            node.set_quorum(quorum, inner_sets, threshold=thresholds[i])
+        DependentsIndex.attach(nodes, indptr=dependents_indptr, indices=dependents)
+
+        log.network.debug('Loaded topology of %d nodes from %s', len(nodes), path)
+        return nodes
+
+    def save(self, key, nodes):
+        """
+        Write the quorum sets of nodes to the cache, return False if they refer to nodes which are not in nodes.
+        """
+        dependents_indptr, dependents = DependentsIndex.of(nodes).csr()
+        position = {node.name: i for i, node in enumerate(nodes)}
+        members_indptr, members = [0], []
+        inner_indptr, inner_members_indptr, inner_members, inner_is_node = [0], [0], [], []
+        try:
+            for node in nodes:
+                members.extend(position[member.name] for member in node.quorum_set.get_nodes())
+                members_indptr.append(len(members))
+                for inner_set in node.quorum_set.get_inner_sets():
+                    is_node = not isinstance(inner_set, list)
+                    inner_members.extend(position[member.name] for member in ([inner_set] if is_node else inner_set))
+                    inner_members_indptr.append(len(inner_members))
+                    inner_is_node.append(is_node)
+                inner_indptr.append(len(inner_is_node))
+        except KeyError as error:
+            log.network.warning('Not caching topology, quorum sets refer to node %s outside of the network', error)
+            return False
+
+        arrays = {
+            'names': np.array([node.name for node in nodes]),
+            'thresholds': np.array([node.quorum_set.threshold for node in nodes], dtype=float),
+            'members_indptr': np.array(members_indptr, dtype=np.int64),
+            'members': np.array(members, dtype=np.int64),
+            'inner_indptr': np.array(inner_indptr, dtype=np.int64),
+            'inner_members_indptr': np.array(inner_members_indptr, dtype=np.int64),
+            'inner_members': np.array(inner_members, dtype=np.int64),
+            'inner_is_node': np.array(inner_is_node, dtype=bool),
+            'dependents_indptr': dependents_indptr,
+            'dependents': dependents,
+        }
+        # Write to a temporary file first, so that parallel runs never load a partially written file
+        descriptor, temporary = tempfile.mkstemp(dir=self.directory, suffix='.npz')
+        with os.fdopen(descriptor, 'wb') as file:
+            np.savez_compressed(file, **arrays)
+        os.replace(temporary, self.path(key))
+
+        log.network.debug('Saved topology of %d nodes to %s', len(nodes), self.path(key))
+        return True
@@ -0,0 +1,51 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from Network import Network
+from TopologyCache import TopologyCache
+
+
+def quorum_sets(nodes):
+    def names(members):
+        return [member.name for member in members]
+    return [(node.name, node.quorum_set.threshold, names(node.quorum_set.get_nodes()),
+             [names(inner) if isinstance(inner, list) else inner.name for inner in node.quorum_set.get_inner_sets()])
+            for node in nodes]
+
+
+class TopologyCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.cwd = os.getcwd()
+        os.chdir(self.directory.name) # generators log to simulator_events_log.txt
+        self.addCleanup(os.chdir, self.cwd)
+        self.cache_dir = os.path.join(self.directory.name, 'cache')
+
+    def test_warm_run_loads_same_quorum_sets_without_generating(self):
+        for topology in ('ER-SINGLEQUORUMSET', 'BA', 'ER_SQ_FIXED_DEGREE'):
+            cold = Network.generate_nodes(n_nodes=30, topology=topology, seed=3, cache_dir=self.cache_dir)
+            with patch('Network.TopologyGenerator.generate') as generate:
+                warm = Network.generate_nodes(n_nodes=30, topology=topology, seed=3, cache_dir=self.cache_dir)
+                generate.assert_not_called()
+            self.assertEqual(quorum_sets(warm), quorum_sets(cold))
+            self.assertTrue(all(node.dependents_index is warm[0].dependents_index for node in warm))
+            for warm_node, cold_node in zip(warm, cold):
+                self.assertEqual([node.name for node in warm[0].dependents_index.dependents(warm_node)],
+                                 [node.name for node in cold[0].dependents_index.dependents(cold_node)])
+
+    def test_key_depends_on_generator_seed_and_parameters(self):
+        keys = {TopologyCache.key('BA', 30, 1, {'m': 5}), TopologyCache.key('BA', 30, 2, {'m': 5}),
+                TopologyCache.key('BA', 30, 1, {'m': 3}), TopologyCache.key('BA', 31, 1, {'m': 5}),
+                TopologyCache.key('ER_singlequorumset', 30, 1, {'m': 5})}
+        self.assertEqual(len(keys), 5)
+
+    def test_unseeded_topologies_are_not_cached(self):
+        Network.generate_nodes(n_nodes=20, topology='BA', cache_dir=self.cache_dir)
+        Network.generate_nodes(n_nodes=20, topology='FULL', seed=1, cache_dir=self.cache_dir)
+        self.assertFalse(os.path.exists(self.cache_dir) and os.listdir(self.cache_dir))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import unittest
+import numpy as np
+from TopologyGenerator import TopologyGenerator
+
+
+class TopologyGeneratorTest(unittest.TestCase):
+
+    def assertConnected(self, n, indptr, neighbors):
+        edges = np.column_stack([np.repeat(np.arange(n), np.diff(indptr)), neighbors])
+        self.assertEqual(len(set(TopologyGenerator.components(n, edges).tolist())), 1)
+
+    def test_erdos_renyi_pairs_and_edge_count(self):
+        n = 7
+        edges = TopologyGenerator.erdos_renyi(n, 1.0, TopologyGenerator.rng(0))
+        self.assertEqual(sorted(map(tuple, edges.tolist())), [(i, j) for i in range(n) for j in range(i + 1, n)])
+
+        n, p = 2000, 0.01
+        edges = TopologyGenerator.erdos_renyi(n, p, TopologyGenerator.rng(1))
+        expected = p * n * (n - 1) / 2
+        self.assertLess(abs(len(edges) - expected), 5 * np.sqrt(expected))
+        self.assertTrue(np.all(edges[:, 0] < edges[:, 1]))
+        self.assertEqual(len(np.unique(edges, axis=0)), len(edges))
+
+    def test_barabasi_albert_edge_count(self):
+        n, m = 500, 3
+        edges = TopologyGenerator.barabasi_albert(n, m, TopologyGenerator.rng(2))
+        self.assertEqual(len(edges), m + (n - m - 1) * m)
+        with self.assertRaises(ValueError):
+            TopologyGenerator.barabasi_albert(5, 5, TopologyGenerator.rng(2))
+
+    def test_random_regular_degree(self):
+        n, degree = 1000, 6
+        indptr, neighbors = TopologyGenerator.adjacency(n, TopologyGenerator.random_regular(n, degree, TopologyGenerator.rng(3)))
+        degrees = np.diff(indptr)
+        self.assertLessEqual(degrees.max(), degree)
+        self.assertGreater(degrees.mean(), degree - 0.1)
+        with self.assertRaises(ValueError):
+            TopologyGenerator.random_regular(5, 3, TopologyGenerator.rng(3))
+
+    def test_components_and_connect(self):
+        edges = np.array([[0, 1], [1, 2], [3, 4]])
+        self.assertEqual(TopologyGenerator.components(6, edges).tolist(), [0, 0, 0, 3, 3, 5])
+        connected = TopologyGenerator.connect_components(6, edges, TopologyGenerator.rng(4))
+        self.assertEqual(len(connected), len(edges) + 2)
+        self.assertEqual(set(TopologyGenerator.components(6, connected).tolist()), {0})
+
+    def test_generated_graphs_are_connected_and_seeded(self):
+        n = 300
+        for kind, params in [('ER', {'p': 0.002}), ('ER', {'degree': 2}), ('BA', {'m': 2}), ('REGULAR', {'degree': 2})]:
+            indptr, neighbors = TopologyGenerator.generate(kind, n, TopologyGenerator.rng(5), **params)
+            self.assertEqual(len(indptr), n + 1)
+            self.assertConnected(n, indptr, neighbors)
+            # Neighbors of every node are sorted, distinct and not the node itself
+            for i in range(n):
+                row = neighbors[indptr[i]:indptr[i + 1]]
+                self.assertTrue(np.all(np.diff(row) > 0))
+                self.assertNotIn(i, row)
+
+            again = TopologyGenerator.generate(kind, n, TopologyGenerator.rng(5), **params)
+            self.assertTrue(np.array_equal(again[1], neighbors))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,168 @@
+"""
+=========================
+TopologyStats
+=========================
+
+Author: Matija Piskorec, Jaime de Vivero Woods
+Last update: October 2026
+
+TopologyStats class.
+
+Statistics of a generated topology, computed on demand instead of at generation time: nothing is computed
+until a statistic is asked for, and every statistic is computed once. The topology is taken as an undirected
+graph in CSR arrays (indptr, neighbors), e.g. from TopologyGenerator.adjacency or from the nodes of a network
+with TopologyStats.of.
+
+Exact diameter and clustering take O(N*E), so they are approximated:
+- diameter_bounds: double sweep BFS (BFS from a random node, then from the farthest node found) gives a lower
+  bound, and twice the eccentricity of any node (or the size of the component - 1) an upper bound, both within
+  the largest component.
+- clustering: average local clustering coefficient over a random sample of nodes (nodes with fewer than two
+  neighbors count as 0, as in networkx.average_clustering).
+"""
+
+from functools import cached_property
+
+import numpy as np
+
+from TopologyGenerator import TopologyGenerator
+
+SWEEPS_DEFAULT = 4
+CLUSTERING_SAMPLES_DEFAULT = 1000
+
+
+class TopologyStats():
+
+    def __init__(self, indptr, neighbors, seed=None):
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.neighbors = np.asarray(neighbors, dtype=np.int64)
+        self.n_nodes = len(self.indptr) - 1
+        self.seed = seed
+
+    def __repr__(self):
+        return '[TopologyStats, nodes = %s, edges = %s]' % (self.n_nodes, self.n_edges)
+
+    @classmethod
+    def of(cls, nodes, neighbors_of, seed=None):
+        """
+        Statistics of the graph of nodes in which node is linked to every node of neighbors_of(node) (e.g. its
+        peers or quorum set members), as an undirected graph. Neighbors which are not in nodes are left out.
+        """
+        position = {node.name: i for i, node in enumerate(nodes)}
+        edges = [(i, position[other.name]) for i, node in enumerate(nodes) for other in neighbors_of(node)
+                 if other.name in position]
+        edges = TopologyGenerator.simple_edges(np.array(edges, dtype=np.int64).reshape(-1, 2))
+        return cls(*TopologyGenerator.adjacency(len(position), edges), seed=seed)
+
+    def rng(self):
+        return np.random.default_rng(self.seed)
+
+    @cached_property
+    def n_edges(self):
+        return len(self.neighbors) // 2
+
+    @cached_property
+    def degrees(self):
+        return np.diff(self.indptr)
+
+    @cached_property
+    def mean_degree(self):
+        return float(self.degrees.mean()) if self.n_nodes else 0.0
+
+    @cached_property
+    def components(self):
+        """
+        Component label of every node (see TopologyGenerator.components).
+        """
+        sources = np.repeat(np.arange(self.n_nodes, dtype=np.int64), self.degrees)
+        return TopologyGenerator.components(self.n_nodes, np.column_stack([sources, self.neighbors]))
+
+    @cached_property
+    def n_components(self):
+        return len(np.unique(self.components))
+
+    @cached_property
+    def largest_component_size(self):
+        return int(np.bincount(self.components).max()) if self.n_nodes else 0
+
+    def _neighbors_of(self, nodes):
+        """
+        Neighbors of all of nodes, the CSR slices of the nodes concatenated.
+        """
+        starts = self.indptr[nodes]
+        counts = self.indptr[nodes + 1] - starts
+        offsets = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+        return self.neighbors[offsets]
+
+    def distances(self, source):
+        """
+        BFS distances from source, -1 for nodes which are not reachable from it.
+        """
+        distance = np.full(self.n_nodes, -1, dtype=np.int64)
+        distance[source] = 0
+        frontier = np.array([source], dtype=np.int64)
+        level = 0
+        while len(frontier):
+            level += 1
+            reached = np.unique(self._neighbors_of(frontier))
+            frontier = reached[distance[reached] < 0]
+            distance[frontier] = level
+        return distance
+
+    def diameter_bounds(self, sweeps=SWEEPS_DEFAULT):
+        """
+        (lower, upper) bounds of the diameter of the largest component, from sweeps double sweeps.
+        """
+        if self.n_nodes == 0:
+            return 0, 0
+        rng = self.rng()
+        largest = np.flatnonzero(self.components == np.bincount(self.components).argmax())
+        lower, upper = 0, len(largest) - 1
+        for _ in range(sweeps):
+            start = rng.choice(largest)
+            distance = self.distances(start)
+            farthest = int(distance.argmax())
+            upper = min(upper, 2 * int(distance[farthest]))
+            distance = self.distances(farthest)
+            eccentricity = int(distance.max())
+            lower, upper = max(lower, eccentricity), min(upper, 2 * eccentricity)
+        return lower, upper
+
+    @cached_property
+    def diameter(self):
+        return self.diameter_bounds()
+
+    def clustering(self, samples=CLUSTERING_SAMPLES_DEFAULT):
+        """
+        Average local clustering coefficient of a random sample of nodes (of all nodes, if there are fewer).
+        """
+        if self.n_nodes == 0:
+            return 0.0
+        indptr, neighbors = self.indptr, self.neighbors
+        rng = self.rng()
+        sample = np.arange(self.n_nodes) if samples >= self.n_nodes else rng.choice(self.n_nodes, samples, replace=False)
+        coefficients = np.zeros(len(sample))
+        for k, v in enumerate(sample.tolist()):
+            own = neighbors[indptr[v]:indptr[v + 1]]
+            degree = len(own)
+            if degree < 2:
+                continue
+            # Links among the neighbors of v, every one counted from both of its ends
+            links = np.isin(self._neighbors_of(own), own).sum() // 2
+            coefficients[k] = 2 * links / (degree * (degree - 1))
+        return float(coefficients.mean())
+
+    @cached_property
+    def average_clustering(self):
+        return self.clustering()
+
+    def as_dict(self):
+        """
+        All statistics, e.g. for a row of results.
+        """
+        lower, upper = self.diameter
+        return {'n_nodes': self.n_nodes, 'n_edges': self.n_edges, 'mean_degree': self.mean_degree,
+                'min_degree': int(self.degrees.min()) if self.n_nodes else 0,
+                'max_degree': int(self.degrees.max()) if self.n_nodes else 0,
+                'n_components': self.n_components, 'largest_component_size': self.largest_component_size,
+                'diameter_lower': lower, 'diameter_upper': upper, 'average_clustering': self.average_clustering}
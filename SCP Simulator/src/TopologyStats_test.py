@@ -0,0 +1,47 @@
+import unittest
+import networkx as nx
+import numpy as np
+from Network import Network
+from TopologyGenerator import TopologyGenerator
+from TopologyStats import TopologyStats
+
+
+class TopologyStatsTest(unittest.TestCase):
+
+    def graph_of(self, stats):
+        graph = nx.Graph()
+        graph.add_nodes_from(range(stats.n_nodes))
+        sources = np.repeat(np.arange(stats.n_nodes), stats.degrees)
+        graph.add_edges_from(zip(sources.tolist(), stats.neighbors.tolist()))
+        return graph
+
+    def test_approximations_bound_networkx(self):
+        for kind, params in [('ER', {'degree': 4}), ('BA', {'m': 2})]:
+            stats = TopologyStats(*TopologyGenerator.generate(kind, 400, TopologyGenerator.rng(1), **params), seed=0)
+            graph = self.graph_of(stats)
+            lower, upper = stats.diameter
+            self.assertLessEqual(lower, nx.diameter(graph))
+            self.assertGreaterEqual(upper, nx.diameter(graph))
+            # All nodes sampled gives the exact average clustering
+            self.assertAlmostEqual(stats.clustering(samples=400), nx.average_clustering(graph))
+            self.assertEqual(stats.n_edges, graph.number_of_edges())
+            self.assertEqual(stats.n_components, 1)
+
+    def test_path_and_components(self):
+        # Path 0-1-2-3 and a separate edge 4-5
+        stats = TopologyStats(*TopologyGenerator.adjacency(6, np.array([[0, 1], [1, 2], [2, 3], [4, 5]])))
+        self.assertEqual(stats.distances(0).tolist(), [0, 1, 2, 3, -1, -1])
+        self.assertEqual(stats.diameter, (3, 3))
+        self.assertEqual((stats.n_components, stats.largest_component_size), (2, 4))
+        self.assertEqual(stats.average_clustering, 0.0)
+
+    def test_network_stats_on_demand(self):
+        nodes = Network.generate_nodes(n_nodes=5, topology='FULL')
+        stats = Network.topology_stats(nodes)
+        self.assertEqual(stats.as_dict()['n_edges'], 10)
+        self.assertEqual(stats.diameter[0], 1)
+        self.assertLessEqual(stats.diameter[1], 2)
+        self.assertEqual(stats.average_clustering, 1.0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -14,8 +14,8 @@ from Log import log
 import random
 
 class Transaction():
-    def __init__(self,time=None):
-        self._hash = '%x' % random.getrandbits(32)
+    def __init__(self,time=None,tx_hash=None):
+        self._hash = tx_hash if tx_hash is not None else '%x' % random.getrandbits(32)
         self._time = time if time is not None else time.time()
         log.transaction.info('Created transaction with hash %s and time %s', self._hash,self._time)
 
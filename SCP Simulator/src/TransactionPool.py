@@ -0,0 +1,149 @@
+"""
+=========================
+TransactionPool
+=========================
+
+Author: Matija Piskorec, Jaime de Vivero Woods
+Last update: October 2026
+
+TransactionPool class.
+
+Insertion-ordered, hash-indexed container of transactions used by the Mempool and by the
+nomination queue of each Node. Transactions are indexed by their hash (transaction ID), so that
+add, membership, removal, random sampling and FIFO batch pops are all O(1) per transaction.
+
+Layout:
+    _items - dense list of transactions, used for O(1) uniform random sampling
+    _index - {tx_id: position in _items}, used for O(1) membership and swap-remove
+    _order - deque of (tx_id, seq) tuples in insertion order, used for FIFO pops and iteration
+    _seq   - {tx_id: seq} of the live entry in _order, stale (removed) entries are skipped lazily
+"""
+
+from collections import deque
+import itertools
+
+import numpy as np
+
+
+class TransactionPool():
+
+    def __init__(self, transactions=None):
+        self._items = []
+        self._index = {}
+        self._order = deque()
+        self._seq = {}
+        self._counter = itertools.count()
+
+        if transactions is not None:
+            for tx in transactions:
+                self.add(tx)
+
+    def __repr__(self):
+        return repr(list(self))
+
+    def __len__(self):
+        return len(self._items)
+
+    def __bool__(self):
+        return len(self._items) > 0
+
+    def __iter__(self):
+        # Iterate in insertion (FIFO) order, skipping entries that were removed in the meantime
+        for tx_id, seq in list(self._order):
+            if self._seq.get(tx_id) == seq:
+                yield self._items[self._index[tx_id]]
+
+    def __contains__(self, tx):
+        return self._key(tx) in self._index
+
+    @staticmethod
+    def _key(tx):
+        # Transactions are indexed by their ID, but plain IDs can also be used for lookups
+        return tx if isinstance(tx, str) else tx.hash
+
+    def add(self, tx):
+        """
+        Add transaction to the end of the pool. Returns False if it is already in the pool.
+        """
+        tx_id = tx.hash
+        if tx_id in self._index:
+            return False
+
+        self._index[tx_id] = len(self._items)
+        self._items.append(tx)
+
+        seq = next(self._counter)
+        self._seq[tx_id] = seq
+        self._order.append((tx_id, seq))
+        return True
+
+    # Keep list-like API so that existing callers (and tests) can keep using append
+    def append(self, tx):
+        self.add(tx)
+
+    def discard(self, tx):
+        """
+        Remove transaction (or transaction ID) from the pool if present. Returns the removed transaction or None.
+        """
+        tx_id = self._key(tx)
+        position = self._index.pop(tx_id, None)
+        if position is None:
+            return None
+
+        # Swap-remove from the dense list so that removal is O(1)
+        removed = self._items[position]
+        last = self._items.pop()
+        if position < len(self._items):
+            self._items[position] = last
+            self._index[last.hash] = position
+
+        # Entry in _order becomes stale and is skipped when popped or iterated over
+        del self._seq[tx_id]
+        self._compact()
+        return removed
+
+    def remove(self, tx):
+        # Same semantics as list.remove - raise ValueError if the transaction is not in the pool
+        if self.discard(tx) is None:
+            raise ValueError('%s not in transaction pool' % (tx,))
+
+    def sample(self):
+        """
+        Uniformly random transaction from the pool, or None if the pool is empty.
+        """
+        if not self._items:
+            return None
+        return self._items[np.random.randint(len(self._items))]
+
+    def popleft(self):
+        """
+        Remove and return the oldest transaction in the pool.
+        """
+        while self._order:
+            tx_id, seq = self._order.popleft()
+            if self._seq.get(tx_id) == seq:
+                return self.discard(tx_id)
+        raise IndexError('pop from an empty transaction pool')
+
+    def pop_batch(self, max_size):
+        """
+        Remove and return up to max_size oldest transactions in FIFO order.
+        """
+        batch = []
+        while self._items and len(batch) < max_size:
+            batch.append(self.popleft())
+        return batch
+
+    def copy(self):
+        return list(self)
+
+    def clear(self):
+        self._items.clear()
+        self._index.clear()
+        self._order.clear()
+        self._seq.clear()
+
+    def _compact(self):
+        # Drop stale entries from the FIFO order once they outnumber the live ones
+        if len(self._order) > 32 and len(self._order) > 2 * len(self._items):
+            self._order = deque((tx_id, seq) for tx_id, seq in self._order if self._seq.get(tx_id) == seq)
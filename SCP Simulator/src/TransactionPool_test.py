@@ -0,0 +1,56 @@
+import unittest
+from TransactionPool import TransactionPool
+from Transaction import Transaction
+
+
+class TransactionPoolTest(unittest.TestCase):
+
+    def setUp(self):
+        self.txs = [Transaction(0) for _ in range(5)]
+        self.pool = TransactionPool(self.txs)
+
+    def test_add_ignores_duplicates(self):
+        self.assertFalse(self.pool.add(self.txs[0]))
+        self.assertEqual(len(self.pool), 5)
+
+    def test_contains_by_transaction_and_id(self):
+        self.assertIn(self.txs[2], self.pool)
+        self.assertIn(self.txs[2].hash, self.pool)
+        self.assertNotIn(Transaction(0), self.pool)
+
+    def test_iteration_keeps_insertion_order_after_removal(self):
+        self.pool.remove(self.txs[1])
+        self.pool.discard(self.txs[3].hash)
+        self.assertEqual(list(self.pool), [self.txs[0], self.txs[2], self.txs[4]])
+
+    def test_remove_missing_raises_value_error(self):
+        with self.assertRaises(ValueError):
+            self.pool.remove(Transaction(0))
+        self.assertIsNone(self.pool.discard(Transaction(0)))
+
+    def test_pop_batch_is_fifo(self):
+        self.assertEqual(self.pool.pop_batch(3), self.txs[:3])
+        self.assertEqual(self.pool.pop_batch(10), self.txs[3:])
+        self.assertEqual(len(self.pool), 0)
+        self.assertEqual(self.pool.pop_batch(10), [])
+
+    def test_readded_transaction_goes_to_the_back(self):
+        self.pool.remove(self.txs[0])
+        self.pool.add(self.txs[0])
+        self.assertEqual(self.pool.pop_batch(5), self.txs[1:] + [self.txs[0]])
+
+    def test_sample_returns_member(self):
+        for _ in range(20):
+            self.assertIn(self.pool.sample(), self.txs)
+        self.assertIsNone(TransactionPool().sample())
+
+    def test_many_removals_compact_order(self):
+        txs = [Transaction(0) for _ in range(200)]
+        pool = TransactionPool(txs)
+        for tx in txs[:150]:
+            pool.remove(tx)
+        self.assertLessEqual(len(pool._order), 2 * len(pool) + 1)
+        self.assertEqual(list(pool), txs[150:])
+
+if __name__ == '__main__':
+    unittest.main()
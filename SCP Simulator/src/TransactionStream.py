@@ -0,0 +1,106 @@
+"""
+=========================
+TransactionStream
+=========================
+
+Author: Matija Piskorec, Jaime de Vivero Woods
+Last update: October 2026
+
+TransactionStream class.
+
+Common random numbers for comparing configurations: the arrivals of new transactions (their times, the node each
+one arrives at, their hashes and their fees) are drawn from generators of their own, seeded with the seed of the
+stream, instead of from the random events of the simulation. Configurations run with streams of the same seed
+(different topologies, consensus engines, or SCP against PoW) see exactly the same transactions at the same
+times, so the differences between their metrics come from the configurations and not from the workload, and far
+fewer replicates are needed to tell them apart. The stream also gives the seed of the topology (the seed of the
+stream by default), so that the compared configurations share their network too.
+
+Arrivals are a Poisson process with the given rate (transactions per unit of simulation time, n_nodes / tau of
+the event which used to create transactions). An arrival goes to node floor(position * n_nodes) for a uniform
+position in [0, 1), so that networks of different sizes can share a stream. Fees are log-normal, rounded down
+and at least 1 (SCP ignores them). The stream is generated lazily in blocks, and every quantity has its own
+generator, so arrivals do not depend on how far ahead they were generated or on which quantities were used. The
+arrays of arrivals double their capacity when full, so generating n arrivals takes O(n) time and memory.
+
+Usage: Simulator(..., transaction_stream=TransactionStream(seed, rate=n_nodes / tau))
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+BLOCK_SIZE = 1024 # Arrivals generated at a time
+FEE_MEAN_LOG = 3.5
+FEE_SIGMA = 1.2
+
+Arrival = namedtuple('Arrival', ['time', 'position', 'hash', 'fee'])
+
+
+class TransactionStream():
+
+    def __init__(self, seed, rate, topology_seed=None, fee_mean_log=FEE_MEAN_LOG, fee_sigma=FEE_SIGMA):
+        if rate <= 0:
+            raise ValueError('Expected a positive arrival rate, got %s' % rate)
+        self.rate = rate
+        self.topology_seed = topology_seed if topology_seed is not None else seed
+        self.fee_mean_log = fee_mean_log
+        self.fee_sigma = fee_sigma
+        self.reset(seed)
+
+    def __repr__(self):
+        return '[TransactionStream, seed = %s, rate = %s, delivered = %s]' % (self.seed, self.rate, self.next)
+
+    def reset(self, seed=None):
+        """
+        Rewind the stream to its first arrival, and draw a new stream from seed if given (keeping the topology seed).
+        """
+        self.next = 0
+        if seed is None:
+            return
+        self.seed = seed
+        self._times_rng, self._positions_rng, self._hashes_rng, self._fees_rng = [
+            np.random.default_rng(child) for child in np.random.SeedSequence(seed).spawn(4)]
+        self.generated = 0 # Arrivals generated so far, the arrays below hold more once their capacity grew
+        self.times = np.empty(0)
+        self.positions = np.empty(0)
+        self.hashes = np.empty(0, dtype=np.int64)
+        self.fees = np.empty(0, dtype=np.int64)
+
+    def _extend(self):
+        n, end = self.generated, self.generated + BLOCK_SIZE
+        if end > len(self.times): # Full, double the capacity instead of copying all arrivals for every block
+            capacity = max(2 * len(self.times), end)
+            self.times, self.positions, self.hashes, self.fees = [
+                np.concatenate([array[:n], np.empty(capacity - n, dtype=array.dtype)])
+                for array in (self.times, self.positions, self.hashes, self.fees)]
+
+        start = self.times[n - 1] if n else 0.0
+        self.times[n:end] = start + np.cumsum(self._times_rng.exponential(1 / self.rate, BLOCK_SIZE))
+        self.positions[n:end] = self._positions_rng.random(BLOCK_SIZE)
+        self.hashes[n:end] = self._hashes_rng.integers(0, 2 ** 32, BLOCK_SIZE, dtype=np.int64)
+        self.fees[n:end] = np.maximum(1, np.exp(self._fees_rng.normal(self.fee_mean_log, self.fee_sigma, BLOCK_SIZE)).astype(np.int64))
+        self.generated = end
+
+    def arrival(self, k):
+        """
+        Arrival k of the stream, with its hash formatted like the hashes of transactions.
+        """
+        while k >= self.generated:
+            self._extend()
+        return Arrival(float(self.times[k]), float(self.positions[k]), '%x' % self.hashes[k], int(self.fees[k]))
+
+    def due(self, time):
+        """
+        Yield the arrivals up to simulation time which were not delivered yet, in order of time.
+        """
+        while True:
+            arrival = self.arrival(self.next)
+            if arrival.time > time:
+                return
+            self.next += 1
+            yield arrival
+
+    @staticmethod
+    def node_index(arrival, n_nodes):
+        return min(int(arrival.position * n_nodes), n_nodes - 1)
@@ -4,9 +4,12 @@ Value
 =========================
 
 Author: Matija Piskorec
-Last update: August 2023
+Last update: October 2026
 
 Value class.
+
+Values are immutable - transactions are frozen on creation, so a Value (and its hash) can be shared
+between nomination state, ballots and messages without copying.
 """
 
 from Log import log
@@ -15,16 +18,24 @@ from State import State
 
 import random
 
+
+class TransactionSet(frozenset):
+    # Frozen set of transactions which prints like a plain set, as log parsers expect "transactions = {...}"
+    def __repr__(self):
+        return '{%s}' % ', '.join(repr(tx) for tx in self) if self else 'set()'
+
+
 class Value():
 
     def __init__(self,**kwargs):
 
-        self._transactions = kwargs['transactions'] if 'transactions' in kwargs else []
+        transactions = kwargs['transactions'] if 'transactions' in kwargs else ()
+        self._transactions = transactions if isinstance(transactions, TransactionSet) else TransactionSet(transactions)
 
         # All transactions have to be of type Transaction - empty list is also allowed!
         assert all([isinstance(transaction,Transaction) for transaction in self._transactions])
 
-        self._hash = hash(frozenset(self._transactions))
+        self._hash = hash(self._transactions)
         self._state = kwargs['state'] if 'state' in kwargs else State.init
 
         log.value.info('Created value, hash = %s, state = %s, transactions = %s',
@@ -36,7 +47,7 @@ class Value():
         return '[Value, hash = %s, state = %s, transactions = %s]' % (self._hash,self._state,self._transactions)
 
     def __eq__(self, other):
-        return (self.hash == other.hash and self.state == other.state and set(self.transactions) == set(other.transactions))
+        return (self.hash == other.hash and self.state == other.state and self._transactions == other.transactions)
 
 
     def __hash__(self):
@@ -63,11 +74,4 @@ class Value():
         combined_txs = set()
         for value in values:
             combined_txs.update(value.transactions)
-        return Value(transactions=combined_txs)
-
-    @transactions.setter
-    def transactions(self, tx_list):
-        # sanity check
-        assert all(isinstance(tx, Transaction) for tx in tx_list)
-        self._transactions = tx_list
-        self._hash = hash(frozenset(self._transactions))
\ No newline at end of file
+        return Value(transactions=combined_txs)
\ No newline at end of file
@@ -0,0 +1,171 @@
+"""
+=========================
+WarmStart
+=========================
+
+Author: Matija Piskorec, Jaime de Vivero Woods
+Last update: October 2026
+
+WarmStart class.
+
+Runs branches of one simulation which differ only in their simulation parameters (taus) and seeds, without
+repeating the setup for every branch: the network is built once in this process and optionally warmed up (run
+with the parameters it was built with) up to a simulation time, and every branch is then a forked child process
+which continues from there with its own parameters and seed. Children share the memory of the setup with this
+process copy-on-write, so only the pages a branch changes are copied.
+
+The warm-up runs in the warmup directory and every branch in its own directory (branch_<k>), which starts with
+a copy of the logs of the warm-up, so that the logs of a branch cover the whole run. A branch is a dict with
+simulation_params (overriding those of the warm-up, see Simulator.update_simulation_params), seed and
+max_simulation_time (of the simulator by default). summarize(simulator, branch, path) runs in the child after
+the branch finished, and its result (a JSON serializable dict) is passed back to this process.
+
+Requires os.fork (Linux, macOS). Forking copies only the calling thread, so run it before starting any threads.
+
+Usage: python WarmStart.py --nodes 50 --warmup 10 --max-simulation-time 60 --taus 0.5 1.0 2.0 --seeds 1 2 3
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import traceback
+
+import numpy as np
+
+from Log import log
+from Globals import Globals
+
+WARMUP_DIR = 'warmup'
+BRANCH_DIR = 'branch_%d'
+RESULT_FILE = 'branch.json'
+
+
+class WarmStart():
+
+    def __init__(self, simulator, warmup_time=0.0, directory='.'):
+        self.simulator = simulator
+        self.warmup_time = warmup_time
+        self.directory = os.path.abspath(directory)
+        self.warmed_up = False
+
+    def __repr__(self):
+        return '[WarmStart, warm-up time = %s, directory = %s]' % (self.warmup_time, self.directory)
+
+    def warm_up(self):
+        """
+        Start the simulation and run it up to the warm-up time, in the warmup directory.
+        """
+        path = os.path.join(self.directory, WARMUP_DIR)
+        os.makedirs(path, exist_ok=True)
+        cwd = os.getcwd()
+        os.chdir(path)
+        try:
+            self.simulator.start()
+            if self.warmup_time > 0:
+                self.simulator.advance(self.warmup_time)
+        finally:
+            os.chdir(cwd)
+        self.warmed_up = True
+        log.simulator.info('Warmed up %s nodes to simulation time %.3f', self.simulator.n_nodes, Globals.simulation_time)
+
+    def run(self, branches, summarize=None, processes=None):
+        """
+        Run all branches from the warmed up simulation, at most processes (all CPUs by default) at a time, and
+        return the results of summarize of all branches in their order (None for failed branches).
+        """
+        if not hasattr(os, 'fork'):
+            raise RuntimeError('Warm starts require os.fork, which is not available on this platform')
+        if not self.warmed_up:
+            self.warm_up()
+        processes = processes or os.cpu_count() or 1
+
+        sys.stdout.flush()
+        sys.stderr.flush()
+        running = {}
+        results = [None] * len(branches)
+        queued = list(enumerate(branches))
+        while queued or running:
+            while queued and len(running) < processes:
+                k, branch = queued.pop(0)
+                path = os.path.join(self.directory, BRANCH_DIR % k)
+                os.makedirs(path, exist_ok=True)
+                if os.path.exists(os.path.join(path, RESULT_FILE)):
+                    os.remove(os.path.join(path, RESULT_FILE))
+                pid = os.fork()
+                if pid == 0:
+                    self._run_branch(branch, path, summarize) # Never returns
+                running[pid] = (k, path)
+
+            pid, status = os.wait()
+            if pid not in running: # Not one of our branches
+                continue
+            k, path = running.pop(pid)
+            if os.waitstatus_to_exitcode(status) == 0:
+                with open(os.path.join(path, RESULT_FILE), 'r') as file:
+                    results[k] = json.load(file)
+            else:
+                log.simulator.warning('Branch %d failed, see the logs in %s', k, path)
+        return results
+
+    def _run_branch(self, branch, path, summarize):
+        # Runs in the forked child, which must leave with os._exit so that it never returns into the caller's code
+        code = 1
+        try:
+            for name in os.listdir(os.path.join(self.directory, WARMUP_DIR)):
+                if name.endswith('.txt'):
+                    shutil.copy(os.path.join(self.directory, WARMUP_DIR, name), path)
+            os.chdir(path)
+
+            seed = branch.get('seed')
+            if seed is not None:
+                random.seed(seed)
+                np.random.seed(seed)
+            simulator = self.simulator
+            simulator.update_simulation_params(branch.get('simulation_params', {}))
+            simulator.advance(branch.get('max_simulation_time', simulator.max_simulation_time))
+            log.export_logs_to_txt('ledger_logs.txt')
+
+            result = summarize(simulator, branch, path) if summarize is not None else {'simulation_time': Globals.simulation_time}
+            descriptor, temporary = tempfile.mkstemp(dir=path, suffix='.json')
+            with os.fdopen(descriptor, 'w') as file:
+                json.dump(result, file)
+            os.replace(temporary, os.path.join(path, RESULT_FILE))
+            code = 0
+        except BaseException:
+            traceback.print_exc()
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os._exit(code)
+
+
+if __name__=='__main__':
+
+    from Network import Network
+    from Simulator import Simulator
+
+    parser=argparse.ArgumentParser()
+    parser.add_argument("--nodes","-n", type=int, default=50, help="Number of nodes.")
+    parser.add_argument("--topology","-t", choices=Network.topologies, default='BA', help="Network topology.")
+    parser.add_argument("--topology-seed", type=int, default=None, help="Seed of the random topology.")
+    parser.add_argument("--warmup", type=float, default=0.0, help="Simulation time of the shared warm-up.")
+    parser.add_argument("--max-simulation-time", type=float, default=50, help="Simulation time at which every branch stops.")
+    parser.add_argument("--taus", type=float, nargs='+', required=True, help="Tau of the mine event of every branch.")
+    parser.add_argument("--seeds", type=int, nargs='+', default=None, help="Seed of every branch.")
+    parser.add_argument("--processes", type=int, default=None, help="Branches run at a time (default: all CPUs).")
+    parser.add_argument("--directory", default='.', help="Directory of the warm-up and branch logs.")
+    args = parser.parse_args()
+    if args.seeds is not None and len(args.seeds) != len(args.taus):
+        parser.error("Must supply one --seeds value per tau")
+
+    simulator = Simulator(verbosity=0, n_nodes=args.nodes, max_simulation_time=args.max_simulation_time,
+                          topology=args.topology, topology_seed=args.topology_seed)
+    branches = [{'simulation_params': {'mine': {'tau': tau}}, 'seed': args.seeds[k] if args.seeds else None}
+                for k, tau in enumerate(args.taus)]
+    warm_start = WarmStart(simulator, warmup_time=args.warmup, directory=args.directory)
+    for branch, result in zip(branches, warm_start.run(branches, processes=args.processes)):
+        print('%s: %s' % (branch, result))
@@ -0,0 +1,71 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from Globals import Globals
+from Simulator import Simulator
+from WarmStart import WarmStart, WARMUP_DIR, BRANCH_DIR
+
+
+def count_slots(simulator, branch, path):
+    return {'slots': min(len(node.ledger.slots) for node in simulator.nodes), 'time': Globals.simulation_time,
+            'mine_tau': simulator.simulation_params['mine']['tau']}
+
+
+def fail(simulator, branch, path):
+    raise RuntimeError('summary failed')
+
+
+class WarmStartTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        np.random.seed(2)
+
+    def read(self, *path):
+        with open(os.path.join(self.directory.name, *path)) as file:
+            return file.read()
+
+    def test_branches_continue_from_warm_up(self):
+        simulator = Simulator(verbosity=0, n_nodes=4, max_simulation_time=8, topology='FULL')
+        warm_start = WarmStart(simulator, warmup_time=3, directory=self.directory.name)
+        branches = [{'simulation_params': {'mine': {'tau': 0.5}}, 'seed': 1},
+                    {'simulation_params': {'mine': {'tau': 2.0}}, 'seed': 2, 'max_simulation_time': 6},
+                    {'simulation_params': {'mine': {'tau': 0.5}}, 'seed': 1}]
+        results = warm_start.run(branches, summarize=count_slots, processes=2)
+
+        self.assertEqual([result['mine_tau'] for result in results], [0.5, 2.0, 0.5])
+        self.assertGreaterEqual(results[0]['time'], 8)
+        self.assertLess(results[1]['time'], results[0]['time'])
+        self.assertGreaterEqual(min(result['slots'] for result in results), 1)
+        # This process stays at the end of the warm-up, branches run in the children only
+        self.assertLess(Globals.simulation_time, 6)
+        self.assertEqual(simulator.simulation_params['mine']['tau'], 1.0)
+
+        warm_up = self.read(WARMUP_DIR, 'simulator_mine_events.txt')
+        branch_logs = [self.read(BRANCH_DIR % k, 'simulator_mine_events.txt') for k in range(3)]
+        for log in branch_logs:
+            self.assertTrue(log.startswith(warm_up))
+        self.assertEqual(branch_logs[0], branch_logs[2]) # Same parameters and seed
+        self.assertNotEqual(branch_logs[0], branch_logs[1])
+
+    def test_failed_branch(self):
+        simulator = Simulator(verbosity=0, n_nodes=4, max_simulation_time=2, topology='FULL')
+        warm_start = WarmStart(simulator, directory=self.directory.name)
+        self.assertEqual(warm_start.run([{'seed': 1}], summarize=fail), [None])
+        result, = warm_start.run([{'seed': 1}])
+        self.assertGreaterEqual(result['simulation_time'], 2)
+
+    def test_update_simulation_params(self):
+        simulator = Simulator(verbosity=0, n_nodes=4, max_simulation_time=2, topology='FULL')
+        simulator.start()
+        rate = simulator._gillespie.lambda_sum
+        simulator.update_simulation_params({'mine': {'tau': 0.1}})
+        self.assertAlmostEqual(simulator._gillespie.lambda_sum - rate, 4 / 0.1 - 4 / 1.0)
+        with self.assertRaises(ValueError):
+            simulator.update_simulation_params({'unknown_event': {'tau': 1.0}})
+
+
+if __name__ == "__main__":
+    unittest.main()